@@ -264,15 +264,22 @@ async def get_system_status(
     # For POC, aggregate status from key components
     app_statuses = await app_registry.list_active_applications() # Assuming this returns a list of statuses
     server_statuses = await mcp_hub.list_servers() # Assuming this returns List[ServerStatus]
-    # TODO: Get sandbox statuses from SandboxManager (maybe a list_all_sandboxes method needed) (Issue #XX)
-    # sandbox_statuses = await sandbox_manager.list_all_sandboxes() # Assuming such a method exists
+    sandbox_statuses = await sandbox_manager.list_all_sandboxes() # One labeled Docker list call for all apps
 
     # TODO: Get status from other services (StateManager, EventBus, LoggingService, OptimizationOracle)
     # This might require adding status methods to their interfaces/implementations. (Issue #XX)
-    state_manager_status = {"status": "unknown"} # Placeholder
-    logging_service_status = {"status": "unknown"} # Placeholder
-    metric_collector_status = {"status": "unknown"} # Placeholder
-    event_bus_status = {"status": "unknown"} # Placeholder
+    state_manager_status = {
+        "status": "unknown",
+        "definition_file_cache": state_manager.get_definition_cache_stats(),
+        "definition_writes": state_manager.get_definition_write_stats(),
+        "git_object_cache": state_manager.get_git_object_cache_stats(),
+        "definition_repos": state_manager.get_definition_repo_stats(),
+    }
+    logging_service_status = {"status": "unknown", "pipeline": logging_service.get_pipeline_stats(), "limits": logging_service.get_limit_stats(),
+                              "store": logging_service.get_store_stats()}
+    metric_collector_status = {"status": "unknown", "handles": metric_collector.get_handle_stats(), "series": metric_collector.get_series_counts()}
+    event_bus_status = {"status": "unknown", "events": event_bus.get_event_stats(), "subscriptions": event_bus.get_subscription_stats(),
+                        "stream": await event_bus.get_stream_stats()}
     optimization_oracle_status = {"status": "unknown"} # Placeholder
 
 
@@ -280,7 +287,7 @@ async def get_system_status(
         "status": "ok", # TODO: Determine overall status based on component statuses (Issue #XX)
         "applications": app_statuses,
         "mcp_servers": server_statuses,
-        # "sandboxes": sandbox_statuses,
+        "sandboxes": sandbox_statuses,
         "state_manager": state_manager_status,
         "logging_service": logging_service_status,
         "metric_collector": metric_collector_status,
@@ -289,6 +296,28 @@ async def get_system_status(
     }
 
 
+# Logs Router
+logs_router = APIRouter(prefix="/logs", tags=["logs"])
+
+@logs_router.get("/")
+async def query_logs(
+    traceId: Optional[str] = None,
+    appId: Optional[str] = None,
+    componentId: Optional[str] = None,
+    level: Optional[str] = None,
+    since: Optional[float] = None,
+    until: Optional[float] = None,
+    limit: int = 100,
+    logging_service: LoggingServiceInterface = Depends(get_logging_service)
+):
+    """Queries stored log messages by trace, application, component, minimum level and time range (Unix timestamps), newest first."""
+    response = await logging_service.query_logs(traceId=traceId, appId=appId, componentId=componentId, level=level,
+                                                since=since, until=until, limit=limit)
+    if response.get("success"):
+        return response.get("logs", [])
+    raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=response.get("message", "Failed to query logs"))
+
+
 # Users Router
 users_router = APIRouter(prefix="/users", tags=["users"])
 
@@ -361,8 +390,70 @@ app.include_router(applications_router)
 app.include_router(requests_router)
 app.include_router(tools_router)
 app.include_router(status_router)
+app.include_router(logs_router)
 app.include_router(users_router) # Include the new users router
 
+@app.on_event("startup")
+async def start_sandbox_pool_reaper():
+    """Starts reaping idle pooled sandbox containers."""
+    sandbox_manager_instance.start_pool_reaper()
+
+@app.on_event("startup")
+async def start_metric_buffer_flusher():
+    """Starts flushing buffered metric updates (if buffering is enabled)."""
+    metric_collector_instance.start_buffer_flusher()
+
+@app.on_event("startup")
+async def start_metric_series_expiry():
+    """Starts expiring metric series that stopped changing."""
+    metric_collector_instance.start_series_expiry()
+
+@app.on_event("startup")
+async def start_log_retention():
+    """Starts deleting log store segments beyond the retention limits."""
+    logging_service_instance.start_log_retention()
+
+@app.on_event("startup")
+async def start_event_stream():
+    """Starts publishing to and consuming from the EventBus's Redis stream (if the stream backend is enabled)."""
+    event_bus_instance.start_event_stream()
+
+@app.on_event("startup")
+async def check_runtime_state_connection():
+    """Verifies Redis is reachable; runtime state connections are otherwise opened lazily by the pool."""
+    if not await state_manager_instance.check_runtime_state_connection():
+        print("Warning: Runtime state store (Redis) is not reachable.") # Basic logging
+
+@app.on_event("shutdown")
+async def close_runtime_state_connections():
+    """Disconnects the StateManager's Redis connection pool."""
+    await state_manager_instance.close()
+
+@app.on_event("shutdown")
+async def flush_metrics():
+    """Applies buffered metric updates and stops the flusher."""
+    await metric_collector_instance.close()
+
+@app.on_event("shutdown")
+async def close_sandbox_connections():
+    """Closes the RequestRouter's keep-alive connections to sandboxes."""
+    await request_router_instance.close()
+
+@app.on_event("shutdown")
+async def shutdown_sandbox_manager():
+    """Destroys pooled sandbox containers and stops Docker worker threads on shutdown."""
+    await sandbox_manager_instance.close()
+
+@app.on_event("shutdown")
+async def close_event_bus():
+    """Stops consuming the event stream, lets subscribers handle queued events, then stops the EventBus workers."""
+    await event_bus_instance.close()
+
+@app.on_event("shutdown")
+async def flush_logs():
+    """Writes buffered log messages and stops the log writer thread. Registered last so shutdown logs are kept."""
+    await logging_service_instance.close()
+
 # TODO: Add event handlers for startup and shutdown (e.g., connecting to core services) (Issue #XX)
 # @app.on_event("startup")
 # async def startup_event():
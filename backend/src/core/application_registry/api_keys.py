@@ -0,0 +1,161 @@
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+import hashlib
+import hmac
+import secrets
+import time
+import bcrypt # Import bcrypt for hashing API key secrets
+
+# API keys have the form "<prefix>_<key_id>_<secret>". The key_id is public and indexed on the
+# ApiKey row, so a key is looked up by key_id and verified with a single bcrypt check of the secret.
+API_KEY_PREFIX = "pak"
+KEY_ID_BYTES = 8 # 16 hex characters
+SECRET_BYTES = 32
+
+# Defaults for the verified-key cache; override via the api_key_cache_config argument of ApplicationRegistry
+DEFAULT_API_KEY_CACHE_CONFIG: Dict[str, Any] = {
+    "max_entries": 10000, # Least recently used keys are evicted beyond this
+    "ttl_seconds": 300.0, # Verified keys are re-checked against the database after this long
+}
+
+
+def generate_api_key() -> Tuple[str, str, str]:
+    """
+    Generates a new API key.
+
+    Returns:
+        A tuple of (key_id, full API key to hand to the caller once, bcrypt hash of the secret to store).
+    """
+    key_id = secrets.token_hex(KEY_ID_BYTES)
+    secret = secrets.token_urlsafe(SECRET_BYTES)
+    hashed_secret = bcrypt.hashpw(secret.encode("utf-8"), bcrypt.gensalt()).decode("utf-8")
+    return key_id, f"{API_KEY_PREFIX}_{key_id}_{secret}", hashed_secret
+
+
+def parse_api_key(api_key: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits an API key into its public key_id and its secret.
+
+    Args:
+        api_key: The full API key.
+
+    Returns:
+        A tuple of (key_id, secret), or None if the key is not in the expected format.
+    """
+    parts = api_key.split("_", 2) if api_key else []
+    if len(parts) != 3 or parts[0] != API_KEY_PREFIX or len(parts[1]) != KEY_ID_BYTES * 2 or not parts[2]:
+        return None
+    return parts[1], parts[2]
+
+
+def verify_api_key_secret(secret: str, hashed_secret: str) -> bool:
+    """
+    Checks an API key secret against its stored bcrypt hash. This costs a full bcrypt round;
+    call it off the event loop.
+
+    Args:
+        secret: The secret part of the API key.
+        hashed_secret: The stored bcrypt hash.
+
+    Returns:
+        True if the secret matches.
+    """
+    try:
+        return bcrypt.checkpw(secret.encode("utf-8"), hashed_secret.encode("utf-8"))
+    except ValueError: # Malformed stored hash
+        return False
+
+
+class VerifiedApiKeyCache:
+    """
+    A bounded, TTL'd LRU cache of API keys that recently passed bcrypt verification.
+
+    Entries are keyed by key_id and hold a SHA-256 digest of the full key, so a cache hit is a dict
+    lookup plus a constant-time digest comparison instead of a bcrypt round and a database query.
+    The plaintext key is never stored.
+    """
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached keys.
+            ttl_seconds: How long a verified key is served from the cache.
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Dict[str, Any]]]" = OrderedDict() # key_id -> (digest, expires_at, metadata)
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, key_id: str, api_key: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the cached validation metadata for a key if it was verified recently.
+
+        Args:
+            key_id: The public key ID parsed from the key.
+            api_key: The full API key presented by the caller.
+
+        Returns:
+            The cached metadata (appId, userId, permissions), or None on a miss.
+        """
+        entry = self._entries.get(key_id)
+        if entry is None:
+            self._misses += 1
+            return None
+        digest, expires_at, metadata = entry
+        if time.monotonic() >= expires_at:
+            del self._entries[key_id]
+            self._misses += 1
+            return None
+        if not hmac.compare_digest(digest, _digest(api_key)):
+            self._misses += 1 # Wrong secret for a known key_id; the caller falls back to full verification
+            return None
+        self._entries.move_to_end(key_id)
+        self._hits += 1
+        return metadata
+
+    def put(self, key_id: str, api_key: str, metadata: Dict[str, Any]):
+        """
+        Caches a key that just passed full verification.
+
+        Args:
+            key_id: The public key ID.
+            api_key: The full, verified API key.
+            metadata: The validation metadata to serve on later hits.
+        """
+        self._entries[key_id] = (_digest(api_key), time.monotonic() + self.ttl_seconds, metadata)
+        self._entries.move_to_end(key_id)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def invalidate(self, key_id: Optional[str] = None, app_id: Optional[str] = None):
+        """
+        Drops cached keys. With no arguments the whole cache is cleared.
+
+        Args:
+            key_id: Drop only this key.
+            app_id: Drop every key belonging to this application.
+        """
+        if key_id is None and app_id is None:
+            self._entries.clear()
+            return
+        if key_id is not None:
+            self._entries.pop(key_id, None)
+        if app_id is not None:
+            for cached_key_id in [k for k, (_, _, metadata) in self._entries.items() if metadata.get("appId") == app_id]:
+                del self._entries[cached_key_id]
+
+    def get_stats(self) -> Dict[str, int]:
+        """
+        Returns cache effectiveness counters.
+
+        Returns:
+            A dictionary with hits, misses and the current number of entries.
+        """
+        return {"hits": self._hits, "misses": self._misses, "size": len(self._entries)}
+
+
+def _digest(api_key: str) -> bytes:
+    """SHA-256 of the full key; safe to keep in memory and fast to compare."""
+    return hashlib.sha256(api_key.encode("utf-8")).digest()
@@ -1,10 +1,10 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Callable
+import asyncio
 import os
 import yaml # Using PyYAML for parsing definition files
-import bcrypt # Import bcrypt for hashing API keys
 # TODO: Consider using json for some config files if needed
 
-from sqlmodel import Session # Import Session for database interaction
+from sqlmodel import Session, select # Import Session and select for database interaction
 from backend.src.db.models import ApiKey # Import the ApiKey model
 
 # Import necessary data models from core.shared.data_models
@@ -22,6 +22,14 @@ from core.shared.data_models.data_models import (
 )
 
 from core.interfaces.application_registry_interface import ApplicationRegistryInterface
+from backend.src.core.application_registry.route_table import RouteTable
+from backend.src.core.application_registry.api_keys import (
+    DEFAULT_API_KEY_CACHE_CONFIG,
+    VerifiedApiKeyCache,
+    generate_api_key,
+    parse_api_key,
+    verify_api_key_secret,
+)
 from core.interfaces.state_manager_interface import StateManagerInterface
 
 # Define AppStatus enum if not already in data models (as per placeholder comment)
@@ -43,21 +51,52 @@ class ApplicationRegistry(ApplicationRegistryInterface):
     It acts as the central source of truth for registered applications and their metadata,
     interacting with the StateManager for persistent storage of AppDefinitions.
     """
-    def __init__(self, state_manager: StateManagerInterface, db_session: Session):
+    def __init__(self, state_manager: StateManagerInterface, db_session: Session, api_key_cache_config: Optional[Dict[str, Any]] = None):
         """
         Initializes the ApplicationRegistry.
 
         Args:
             state_manager: An instance of StateManagerInterface used to access application definition state.
             db_session: A database session instance.
+            api_key_cache_config: Optional overrides for DEFAULT_API_KEY_CACHE_CONFIG (size and TTL of the verified-key cache).
         """
         self.state_manager = state_manager
         self.db_session = db_session
-        # TODO: Initialize internal cache for AppDefinitions if needed for performance (Issue #XX)
-        # self._app_definitions_cache: Dict[str, AppDefinition] = {}
+        # Cache of parsed AppDefinitions: app_id -> (definition repo HEAD commit, AppDefinition).
+        # An entry is only served while the repo HEAD still matches, so commits made outside the
+        # registry (e.g., StateManager.apply_definition_diff) invalidate it implicitly.
+        self._app_definitions_cache: Dict[str, Tuple[str, AppDefinition]] = {}
+        self._app_definitions_cache_hits = 0
+        self._app_definitions_cache_misses = 0
+        # Compiled HTTP route tables, rebuilt whenever the cached AppDefinition for an app changes
+        self._route_tables: Dict[str, RouteTable] = {}
+        # Recently verified API keys, so the hot path skips bcrypt and the database
+        api_key_cache_config = {**DEFAULT_API_KEY_CACHE_CONFIG, **(api_key_cache_config or {})}
+        self._verified_api_keys = VerifiedApiKeyCache(api_key_cache_config["max_entries"], api_key_cache_config["ttl_seconds"])
+        self._definition_loaded_listeners: List[Callable[[AppDefinition], None]] = []
         # TODO: Initialize internal state for tracking active applications (maybe a simple dict for POC) (Issue #XX)
         self._active_applications: Dict[str, AppStatus] = {} # Basic tracking for POC
 
+    def add_definition_loaded_listener(self, listener: Callable[[AppDefinition], None]):
+        """
+        Registers a callback invoked with an AppDefinition whenever it is parsed from the definition
+        state or saved (register/update), e.g. to apply the app's metric configuration.
+        Cache hits do not invoke it.
+
+        Args:
+            listener: Callable taking the AppDefinition. Errors are logged and ignored.
+        """
+        self._definition_loaded_listeners.append(listener)
+
+    def _notify_definition_loaded(self, definition: AppDefinition):
+        """Passes a freshly loaded or saved AppDefinition to the definition-loaded listeners."""
+        for listener in self._definition_loaded_listeners:
+            try:
+                listener(definition)
+            except Exception as e:
+                print(f"Error in definition-loaded listener for {definition.appId}: {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+
     async def _get_app_definition(self, app_id: str) -> Optional[AppDefinition]:
         """
         Retrieves and parses the AppDefinition for a given app_id from the StateManager.
@@ -68,19 +107,91 @@ class ApplicationRegistry(ApplicationRegistryInterface):
         Returns:
             The parsed AppDefinition object, or None if the definition file does not exist or parsing fails.
         """
+        revision = await self._get_cacheable_revision(app_id)
+        cached = self._app_definitions_cache.get(app_id)
+        if cached is not None and revision is not None and cached[0] == revision:
+            self._app_definitions_cache_hits += 1
+            return cached[1]
+        self._app_definitions_cache_misses += 1
+        if revision is None:
+            self.invalidate_app_definition_cache(app_id) # Nor may route lookups use the cached route table
+
         definition_content = await self.state_manager.get_definition_file_content(app_id, "app_definition.yaml")
         if definition_content:
             try:
                 # Assuming app_definition.yaml contains the YAML representation of AppDefinition
                 definition_data = yaml.safe_load(definition_content)
                 # TODO: Add validation using Pydantic or similar if AppDefinition is a Pydantic model (Issue #XX)
-                return AppDefinition(**definition_data)
+                definition = AppDefinition(**definition_data)
+                self._notify_definition_loaded(definition)
+                if revision is not None and not self.state_manager.has_pending_definition_writes(app_id): # No write started while reading
+                    self._cache_app_definition(app_id, revision, definition)
+                return definition
             except (yaml.YAMLError, TypeError, AttributeError) as e:
                 print(f"Error parsing AppDefinition for {app_id}: {e}")
                 # TODO: Log this error properly (Issue #XX)
                 return None
+        self.invalidate_app_definition_cache(app_id) # Definition file is gone
         return None
 
+    async def _get_cacheable_revision(self, app_id: str) -> Optional[str]:
+        """
+        Returns the definition revision to key cached AppDefinitions on, or None if nothing may be cached:
+        the app has no revision yet, or has writes on disk that are not committed (e.g. coalesced), so
+        its files may be ahead of HEAD. Pending writes are not flushed, to keep commits off the request path.
+        """
+        if self.state_manager.has_pending_definition_writes(app_id):
+            return None
+        return await self.state_manager.get_definition_revision(app_id)
+
+    def _cache_app_definition(self, app_id: str, revision: str, definition: AppDefinition, route_table: Optional[RouteTable] = None):
+        """
+        Stores a parsed AppDefinition and its compiled route table for the given repo revision.
+
+        Args:
+            app_id: The ID of the application.
+            revision: The definition repo HEAD commit the definition was read at.
+            definition: The parsed AppDefinition.
+            route_table: A pre-built RouteTable; compiled from the definition if not given.
+        """
+        if route_table is None:
+            try:
+                route_table = RouteTable.from_components(definition.components)
+            except ValueError as e:
+                # The file was changed outside register/update (e.g., by a diff); serve no routes
+                print(f"Error compiling routes for {app_id}: {e}")
+                # TODO: Log this error properly (Issue #XX)
+                route_table = RouteTable()
+        self._app_definitions_cache[app_id] = (revision, definition)
+        self._route_tables[app_id] = route_table
+
+    def invalidate_app_definition_cache(self, app_id: Optional[str] = None):
+        """
+        Drops cached AppDefinitions so the next lookup re-reads them from the StateManager.
+
+        Args:
+            app_id: The ID of the application to invalidate. If None, the whole cache is cleared.
+        """
+        if app_id is None:
+            self._app_definitions_cache.clear()
+            self._route_tables.clear()
+        else:
+            self._app_definitions_cache.pop(app_id, None)
+            self._route_tables.pop(app_id, None)
+
+    def get_app_definition_cache_stats(self) -> Dict[str, int]:
+        """
+        Returns hit/miss counters and the current size of the parsed AppDefinition cache.
+
+        Returns:
+            A dictionary with 'hits', 'misses' and 'size' keys.
+        """
+        return {
+            "hits": self._app_definitions_cache_hits,
+            "misses": self._app_definitions_cache_misses,
+            "size": len(self._app_definitions_cache),
+        }
+
     async def _set_app_definition(self, app_id: str, definition: AppDefinition, message: str):
         """
         Serializes and saves the AppDefinition for a given app_id to the StateManager.
@@ -89,12 +200,24 @@ class ApplicationRegistry(ApplicationRegistryInterface):
             app_id: The ID of the application.
             definition: The AppDefinition object to save.
             message: The Git commit message for the StateManager operation.
+
+        Raises:
+            ValueError: If the definition's component routes conflict with each other.
         """
+        # Compile routes before saving so a definition with conflicting routes is rejected
+        route_table = RouteTable.from_components(definition.components)
+        # Invalidate before writing so a failed commit never leaves a stale entry behind
+        self.invalidate_app_definition_cache(app_id)
         try:
             # Assuming AppDefinition can be serialized to YAML
             definition_content = yaml.dump(definition.model_dump() if hasattr(definition, 'model_dump') else definition.__dict__) # Use model_dump for Pydantic v2+, __dict__ otherwise
             await self.state_manager.set_definition_file_content(app_id, "app_definition.yaml", definition_content, message)
             print(f"Saved AppDefinition for {app_id}") # Basic logging
+            self._notify_definition_loaded(definition)
+            # Prime the cache so the route table is compiled once per register/update
+            revision = await self._get_cacheable_revision(app_id)
+            if revision is not None:
+                self._cache_app_definition(app_id, revision, definition, route_table)
         except Exception as e:
             print(f"Error saving AppDefinition for {app_id}: {e}")
             # TODO: Log this error properly (Issue #XX)
@@ -159,7 +282,8 @@ class ApplicationRegistry(ApplicationRegistryInterface):
 
         # Simple merge logic for POC - update fields from updated_definition_fields
         # A more robust implementation would use update_mask and handle nested structures (Issue #XX)
-        updated_definition_data = existing_definition.model_dump() if hasattr(existing_definition, 'model_dump') else existing_definition.__dict__
+        # Copy __dict__ so the merge never mutates the (possibly cached) existing definition
+        updated_definition_data = existing_definition.model_dump() if hasattr(existing_definition, 'model_dump') else dict(existing_definition.__dict__)
         updated_definition_data.update(updated_definition_fields)
 
         try:
@@ -208,6 +332,8 @@ class ApplicationRegistry(ApplicationRegistryInterface):
 
             if appId in self._active_applications:
                 del self._active_applications[appId] # Basic status tracking for POC
+            self.invalidate_app_definition_cache(appId)
+            self._verified_api_keys.invalidate(app_id=appId)
 
             print(f"Application '{appId}' deregistered successfully.") # Basic logging
             # TODO: Return a proper success response (DeregisterApplicationResponse) (Issue #XX)
@@ -301,16 +427,18 @@ class ApplicationRegistry(ApplicationRegistryInterface):
     async def get_component_definition(self, appId: str, componentId: Optional[str] = None, routeInput: Optional[Dict[str, Any]] = None) -> Dict[str, Any]: # TODO: Return GetComponentDefinitionResponse (Issue #XX)
         """
         Retrieves the definition for a specific component within an application.
-        Component lookup might be based on componentId or input routing logic.
-        For POC, assumes componentId is provided and looks it up in the ComponentRegistry.
+        Component lookup is either by componentId or, when componentId is not given, by resolving
+        routeInput (an HttpRequestDetails or a dict with 'method' and 'path') against the app's
+        compiled route table.
 
         Args:
             appId: The ID of the application.
             componentId: The ID of the component to retrieve (for direct lookup).
-            routeInput: Optional input data for routing logic (ignored in POC).
+            routeInput: Optional HTTP request details used to resolve the component by route.
 
         Returns:
-            A dictionary containing the component definition or an error message.
+            A dictionary containing the component definition or an error message. Route-based
+            lookups also include 'componentId', 'routePattern' and 'pathParameters'.
         """
         definition = await self._get_app_definition(appId)
         if not definition:
@@ -336,7 +464,27 @@ class ApplicationRegistry(ApplicationRegistryInterface):
                  print(f"Error: Component '{componentId}' not found in registry for application '{appId}'.")
                  # TODO: Return a proper error response (Issue #XX)
                  return {"success": False, "message": f"Component '{componentId}' not found"}
-        # TODO: Implement logic for routing based on routeInput if componentId is None (Issue #XX)
+        if not componentId and routeInput and isinstance(component_registry, dict):
+            method = routeInput.get("method") if isinstance(routeInput, dict) else getattr(routeInput, "method", None)
+            path = routeInput.get("path") if isinstance(routeInput, dict) else getattr(routeInput, "path", None)
+            if not method or not path:
+                return {"success": False, "message": "Route input requires 'method' and 'path'"}
+            route_table = self._route_tables.get(appId)
+            if route_table is None:
+                # Definition was not cacheable (no repo revision); compile for this lookup only
+                route_table = RouteTable.from_components(component_registry)
+            route_match = route_table.resolve(method, path)
+            if route_match and route_match.component_id in component_registry:
+                return {
+                    "success": True,
+                    "componentDefinition": component_registry[route_match.component_id],
+                    "componentId": route_match.component_id,
+                    "routePattern": route_match.route_pattern,
+                    "pathParameters": route_match.path_parameters,
+                }
+            print(f"Error: No route matches {method} {path} for application '{appId}'.")
+            # TODO: Distinguish 404 from 405 (path matched, method not allowed) (Issue #XX)
+            return {"success": False, "message": f"No component route matches {method} {path}"}
 
         print(f"Error: Invalid request for component definition for application '{appId}'.")
         # TODO: Return a proper error response (Issue #XX)
@@ -384,7 +532,9 @@ class ApplicationRegistry(ApplicationRegistryInterface):
     async def validate_api_key(self, apiKey: str) -> Dict[str, Any]: # TODO: Return ValidateApiKeyResponse (Issue #XX)
         """
         Validates an API key against stored keys.
-        For POC, this is a placeholder and does not perform actual validation.
+        Keys have the form "pak_<key_id>_<secret>": the row is looked up by its indexed key_id and the
+        secret is checked with a single bcrypt verification. Recently verified keys are served from
+        a bounded TTL cache without touching bcrypt or the database.
 
         Args:
             apiKey: The API key to validate.
@@ -392,38 +542,102 @@ class ApplicationRegistry(ApplicationRegistryInterface):
         Returns:
             A dictionary indicating success/failure and associated metadata (app, user, permissions) if valid.
         """
-        print(f"Validating API key: {apiKey[:4]}...") # Log first few chars for security
-
-        # TODO: Implement proper API key hashing and comparison (Issue #XX)
-        # This requires retrieving the hashed key from the database based on some identifier.
-        # For now, we'll query by the hashed key directly, which is NOT secure.
-        # A proper implementation would involve a lookup table or a different key structure.
-        # This is a temporary implementation for POC database integration.
+        parsed = parse_api_key(apiKey)
+        if parsed is None:
+            print("API key validation failed: malformed key.") # Never log key material
+            return {"success": False, "message": "Invalid or inactive API key"}
+        key_id, secret = parsed
 
-        # Hash the incoming API key for comparison (temporary approach)
-        # TODO: Refine this lookup strategy (Issue #XX)
-        hashed_input_key = bcrypt.hashpw(apiKey.encode('utf-8'), bcrypt.gensalt()).decode('utf-8') # This is just to match the 'hashed_key' field type
+        cached = self._verified_api_keys.get(key_id, apiKey)
+        if cached is not None:
+            return {"success": True, **cached}
 
-        # Query the database for an active API key matching the hashed key
-        # TODO: This query is insecure as it relies on matching the hashed key directly.
-        # A proper approach would be to lookup by a key ID or prefix and then compare hashes. (Issue #XX)
-        statement = select(ApiKey).where(ApiKey.hashed_key == hashed_input_key, ApiKey.is_active == True)
+        statement = select(ApiKey).where(ApiKey.key_id == key_id, ApiKey.is_active == True)
         result = self.db_session.exec(statement).first()
-
-        if result:
-            print(f"API key validated successfully for app: {result.app_id}") # Basic logging
-            # Return associated metadata
-            permissions_list = result.permissions.split(',') if result.permissions else [] # Parse comma-separated permissions
-            return {
-                "success": True,
-                "appId": result.app_id,
-                "userId": result.user_id,
-                "permissions": permissions_list
-            }
-        else:
-            print(f"API key validation failed for key: {apiKey[:4]}...") # Log first few chars
+        # bcrypt is deliberately slow; keep it off the event loop
+        if result is None or not await asyncio.to_thread(verify_api_key_secret, secret, result.hashed_key):
+            print(f"API key validation failed for key id: {key_id}") # Basic logging
             return {"success": False, "message": "Invalid or inactive API key"}
 
+        print(f"API key validated successfully for app: {result.app_id}") # Basic logging
+        metadata = {
+            "appId": result.app_id,
+            "userId": result.user_id,
+            "permissions": result.permissions.split(',') if result.permissions else [], # Parse comma-separated permissions
+        }
+        self._verified_api_keys.put(key_id, apiKey, metadata)
+        return {"success": True, **metadata}
+
+    async def create_api_key(self, appId: str, userId: Optional[str] = None, permissions: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Creates and stores a new API key for an application. Only the bcrypt hash of the
+        key's secret is stored; the full key is returned once and cannot be recovered later.
+
+        Args:
+            appId: The ID of the application the key grants access to.
+            userId: Optional ID of the user owning the key.
+            permissions: Optional list of permissions granted by the key.
+
+        Returns:
+            A dictionary with success status, the key ID and the full API key.
+        """
+        key_id, api_key, hashed_secret = await asyncio.to_thread(generate_api_key)
+        db_key = ApiKey(
+            key_id=key_id,
+            app_id=appId,
+            hashed_key=hashed_secret,
+            user_id=userId,
+            permissions=",".join(permissions or []),
+            is_active=True,
+        )
+        try:
+            self.db_session.add(db_key)
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error creating API key for app {appId}: {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            return {"success": False, "message": f"Failed to create API key: {e}"}
+        print(f"Created API key {key_id} for app {appId}") # Basic logging
+        return {"success": True, "keyId": key_id, "apiKey": api_key}
+
+    async def set_api_key_active(self, keyId: str, is_active: bool) -> Dict[str, Any]:
+        """
+        Activates or revokes an API key. The key is dropped from the verified-key cache so the change
+        takes effect immediately rather than after the cache TTL.
+
+        Args:
+            keyId: The public key ID of the API key.
+            is_active: False to revoke the key, True to re-activate it.
+
+        Returns:
+            A dictionary indicating success or failure.
+        """
+        db_key = self.db_session.exec(select(ApiKey).where(ApiKey.key_id == keyId)).first()
+        if db_key is None:
+            return {"success": False, "message": f"API key {keyId} not found"}
+        try:
+            db_key.is_active = is_active
+            self.db_session.add(db_key)
+            self.db_session.commit()
+        except Exception as e:
+            self.db_session.rollback()
+            print(f"Error updating API key {keyId}: {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            return {"success": False, "message": f"Failed to update API key: {e}"}
+        finally:
+            self._verified_api_keys.invalidate(key_id=keyId)
+        return {"success": True, "keyId": keyId, "isActive": is_active}
+
+    def get_api_key_cache_stats(self) -> Dict[str, int]:
+        """
+        Returns statistics for the verified API key cache.
+
+        Returns:
+            A dictionary with hits, misses and the current number of cached keys.
+        """
+        return self._verified_api_keys.get_stats()
+
 
     async def get_application_permissions(self, appId: str) -> Dict[str, Any]: # TODO: Return GetApplicationPermissionsResponse (Issue #XX)
         """
@@ -0,0 +1,221 @@
+from dataclasses import dataclass, field
+from typing import Optional, Dict, Any, List
+
+# Bit assigned to each HTTP method in a route's method bitmap.
+# A RouteMatcher with no methods listed matches any method (ALL_METHODS).
+HTTP_METHOD_BITS: Dict[str, int] = {
+    "GET": 1 << 0,
+    "POST": 1 << 1,
+    "PUT": 1 << 2,
+    "PATCH": 1 << 3,
+    "DELETE": 1 << 4,
+    "HEAD": 1 << 5,
+    "OPTIONS": 1 << 6,
+}
+ALL_METHODS = (1 << len(HTTP_METHOD_BITS)) - 1
+
+
+def methods_to_bitmap(methods: Optional[List[str]]) -> int:
+    """
+    Converts a list of HTTP method names into a method bitmap.
+
+    Args:
+        methods: Method names (case-insensitive). None or empty means all methods.
+
+    Returns:
+        The bitmap with one bit set per method.
+
+    Raises:
+        ValueError: If an unknown HTTP method is given.
+    """
+    if not methods:
+        return ALL_METHODS
+    bitmap = 0
+    for method in methods:
+        bit = HTTP_METHOD_BITS.get(method.upper())
+        if bit is None:
+            raise ValueError(f"Unsupported HTTP method in route matcher: {method}")
+        bitmap |= bit
+    return bitmap
+
+
+def _split_path(path: str) -> List[str]:
+    """Splits a URL path into non-empty segments, ignoring any query string."""
+    path = path.split("?", 1)[0]
+    return [segment for segment in path.split("/") if segment]
+
+
+@dataclass
+class RouteMatch:
+    """Result of resolving an HTTP request against a RouteTable."""
+    component_id: str
+    route_pattern: str
+    path_parameters: Dict[str, str] = field(default_factory=dict)
+
+
+@dataclass
+class _RouteEntry:
+    """A route registered on a terminal trie node."""
+    methods_bitmap: int
+    component_id: str
+    route_pattern: str
+    param_names: List[str]
+
+
+class _RouteNode:
+    """A trie node for one path segment."""
+    __slots__ = ("static_children", "param_child", "catch_all", "entries", "methods_bitmap")
+
+    def __init__(self):
+        self.static_children: Dict[str, "_RouteNode"] = {}
+        self.param_child: Optional["_RouteNode"] = None # Matches any single segment (":name")
+        self.catch_all: Optional["_RouteNode"] = None # Matches the remaining path ("*name")
+        self.entries: List[_RouteEntry] = []
+        self.methods_bitmap = 0 # Union of entry bitmaps, for a fast method check
+
+
+class RouteTable:
+    """
+    A compiled per-application routing index built from component RouteMatchers.
+
+    Routes are stored in a trie over path segments. Static segments are looked up by
+    dict access, ":name" segments capture one path segment and a trailing "*name"
+    segment captures the rest of the path. Resolution costs O(path depth) in the common
+    case instead of a scan over every route, and static segments take precedence over
+    parameters, which take precedence over catch-alls.
+    """
+    def __init__(self):
+        self._root = _RouteNode()
+        self._route_count = 0
+
+    @classmethod
+    def from_components(cls, components: Dict[str, Any]) -> "RouteTable":
+        """
+        Builds a RouteTable from an application's component registry.
+        Components may be ComponentDefinition objects or plain dicts (as loaded from YAML);
+        components without a route matcher are skipped.
+
+        Args:
+            components: Mapping of componentId to component definition.
+
+        Returns:
+            The compiled RouteTable.
+        """
+        table = cls()
+        for component_id, component in (components or {}).items():
+            route_matcher = _get_field(component, "route_matcher")
+            if not route_matcher:
+                continue
+            path_pattern = _get_field(route_matcher, "path_pattern")
+            if not path_pattern:
+                continue
+            table.add_route(path_pattern, _get_field(route_matcher, "methods"), component_id)
+        return table
+
+    def __len__(self) -> int:
+        return self._route_count
+
+    def add_route(self, path_pattern: str, methods: Optional[List[str]], component_id: str):
+        """
+        Adds a route to the table.
+
+        Args:
+            path_pattern: The path pattern, e.g. "/api/users/:id" or "/static/*path".
+            methods: HTTP methods the route accepts. None or empty means all methods.
+            component_id: The component handling matching requests.
+
+        Raises:
+            ValueError: If the pattern is invalid or conflicts with an existing route.
+        """
+        methods_bitmap = methods_to_bitmap(methods)
+        segments = _split_path(path_pattern)
+        node = self._root
+        param_names: List[str] = []
+        for index, segment in enumerate(segments):
+            if segment.startswith("*"):
+                if index != len(segments) - 1:
+                    raise ValueError(f"Catch-all segment must be last in route pattern: {path_pattern}")
+                param_names.append(segment[1:] or "*")
+                if node.catch_all is None:
+                    node.catch_all = _RouteNode()
+                node = node.catch_all
+            elif segment.startswith(":"):
+                param_names.append(segment[1:])
+                if node.param_child is None:
+                    node.param_child = _RouteNode()
+                node = node.param_child
+            else:
+                node = node.static_children.setdefault(segment, _RouteNode())
+
+        if node.methods_bitmap & methods_bitmap:
+            conflicting = next(e for e in node.entries if e.methods_bitmap & methods_bitmap)
+            raise ValueError(
+                f"Route '{path_pattern}' for component '{component_id}' conflicts with "
+                f"'{conflicting.route_pattern}' for component '{conflicting.component_id}'"
+            )
+        node.entries.append(_RouteEntry(methods_bitmap, component_id, path_pattern, param_names))
+        node.methods_bitmap |= methods_bitmap
+        self._route_count += 1
+
+    def resolve(self, method: str, path: str) -> Optional[RouteMatch]:
+        """
+        Resolves an HTTP method and path to a component.
+
+        Args:
+            method: The HTTP method of the request.
+            path: The request path (a query string, if present, is ignored).
+
+        Returns:
+            A RouteMatch with extracted path parameters, or None if no route matches.
+        """
+        method_bit = HTTP_METHOD_BITS.get(method.upper(), 0)
+        if not method_bit:
+            return None
+        segments = _split_path(path)
+        values: List[str] = []
+        node = self._match(self._root, segments, 0, method_bit, values)
+        if node is None:
+            return None
+        for entry in node.entries:
+            if entry.methods_bitmap & method_bit:
+                return RouteMatch(
+                    component_id=entry.component_id,
+                    route_pattern=entry.route_pattern,
+                    path_parameters=dict(zip(entry.param_names, values)),
+                )
+        return None
+
+    def _match(self, node: _RouteNode, segments: List[str], index: int, method_bit: int, values: List[str]) -> Optional[_RouteNode]:
+        """Depth-first trie walk; backtracks only when a more specific branch dead-ends."""
+        if index == len(segments):
+            if node.methods_bitmap & method_bit:
+                return node
+            # An empty remainder may still satisfy a catch-all
+            if node.catch_all is not None and node.catch_all.methods_bitmap & method_bit:
+                values.append("")
+                return node.catch_all
+            return None
+
+        segment = segments[index]
+        static_child = node.static_children.get(segment)
+        if static_child is not None:
+            found = self._match(static_child, segments, index + 1, method_bit, values)
+            if found is not None:
+                return found
+        if node.param_child is not None:
+            values.append(segment)
+            found = self._match(node.param_child, segments, index + 1, method_bit, values)
+            if found is not None:
+                return found
+            values.pop()
+        if node.catch_all is not None and node.catch_all.methods_bitmap & method_bit:
+            values.append("/".join(segments[index:]))
+            return node.catch_all
+        return None
+
+
+def _get_field(obj: Any, name: str) -> Any:
+    """Reads a field from either a dataclass-like object or a dict."""
+    if isinstance(obj, dict):
+        return obj.get(name)
+    return getattr(obj, name, None)
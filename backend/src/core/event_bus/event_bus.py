@@ -1,81 +1,576 @@
-from typing import Callable, List, Dict, Any
-import asyncio # evently is asyncio-based
-import evently # Import the evently library
+from typing import Callable, List, Dict, Any, Optional, Awaitable, Tuple
+import asyncio
+import dataclasses
+import inspect
+import itertools
+import time
 
 # Import necessary data models from core.shared.data_models
 from core.shared.data_models.data_models import Event # Assuming Event data model exists (Issue #XX)
 
 from core.interfaces.event_bus_interface import EventBusInterface
 
+from backend.src.core.event_bus.subscriber_queue import SubscriberQueue, DEFAULT_EVENT_BUS_CONFIG
+from backend.src.core.event_bus.topic_trie import (TopicTrie, split_topic, pattern_covers, validate_pattern, SINGLE_WILDCARD, MULTI_WILDCARD,
+                                                  APP_TOPIC_PREFIX)
+from backend.src.core.event_bus.event_stream import RedisEventStream, StreamEntry
+from backend.src.core.state_manager.runtime_codecs import RuntimeValueSerializer, RuntimeValueDecodeError
+from backend.src.core.metric_collector.quantile_sketch import DDSketch
+
+
+# Attribute set on events read from the stream; it identifies their _StreamDelivery, also for copies read back from a spill file
+STREAM_DELIVERY_ATTRIBUTE = "_stream_delivery"
+
+
+class _Subscription:
+    """A handler subscribed to an event type pattern, with its own queue and worker tasks."""
+    def __init__(self, event_type: str, handler: Callable, queue: SubscriberQueue, app_id: Optional[str] = None):
+        self.event_type = event_type
+        self.handler = handler
+        self.queue = queue
+        self.app_id = app_id
+        self.workers: List[asyncio.Task] = []
+
+
+class _StreamDelivery:
+    """A stream entry being handled locally; it is acked once every matching subscription handled it."""
+    __slots__ = ("key", "entry_id", "remaining", "idle_since")
+
+    def __init__(self, key: int, entry_id: bytes, remaining: int):
+        self.key = key
+        self.entry_id = entry_id
+        self.remaining = remaining
+        self.idle_since = time.monotonic() # When the entry's idle time in the consumer group was last reset
+
+
 class EventBus(EventBusInterface):
     """
     Provides an in-memory event bus for asynchronous communication between core framework components.
     It allows components to publish events and subscribe handler functions to specific event types.
-    Uses the `evently` library for underlying event handling logic.
+
+    Every subscription has its own bounded priority queue and worker task(s). Publishing only puts the
+    event on the subscribers' queues and returns, so a slow subscriber never stalls the publisher (unless
+    its event type uses the "block" overflow policy); it only fills its own queue. The overflow policy
+    (drop_oldest, block or spill) decides what happens when a queue is full. Per event type, the bus
+    counts published, delivered and dropped events and handler errors, and measures queue depth and lag
+    (time from publish until a handler starts on the event).
+
+    Subscriptions may use wildcard patterns ("trigger:*", "app.app1.#"); a TopicTrie finds the matching
+    subscriptions of an event type in O(topic depth). A subscription made on behalf of an app to another
+    app's "app.<appId>..." topics is checked against that app's inter-app permissions once, when
+    subscribing; the decision is cached and events are never checked individually.
+
+    With the optional Redis Streams backend enabled, published events are appended to a Redis stream
+    instead of being queued directly; a consumer task reads them back through a consumer group and queues
+    them for the local subscriptions. Each event is then handled by one replica of the group, and is
+    acked only after all its local subscriptions handled it, so it survives restarts and is redelivered
+    (at least once) if a replica dies or drops it. replay() re-reads past events from an offset.
+    Replicas should subscribe to the same event types: an entry read by a replica without a matching
+    subscription is left pending and only reaches another replica once it is claimed, after
+    claim_idle_seconds. An entry whose handler fails is not acked either, so it is retried. An entry
+    delivered max_unhandled_deliveries times without being handled (no replica subscribes to it, or its
+    handler keeps failing) is acked and counted as dropped.
     """
-    def __init__(self):
+    def __init__(self, config: Optional[Dict[str, Any]] = None, stream_config: Optional[Dict[str, Any]] = None):
         """
-        Initializes the EventBus with an `evently.EventBus` instance.
+        Initializes the EventBus.
+
+        Args:
+            config: Optional overrides (see DEFAULT_EVENT_BUS_CONFIG).
+            stream_config: Optional Redis Streams backend settings (see DEFAULT_EVENT_STREAM_CONFIG); disabled by default.
         """
-        self._event_bus = evently.EventBus()
-        print("EventBus initialized using evently.") # Basic logging
-        # Note: evently handles the internal storage and dispatching,
-        # no need for manual queue or subscriber registry here.
+        self._config = {**DEFAULT_EVENT_BUS_CONFIG, **(config or {})}
+        self._stream: Optional[RedisEventStream] = RedisEventStream.from_config(stream_config)
+        self._stream_serializer = RuntimeValueSerializer.from_config()
+        self._stream_consumer: Optional[asyncio.Task] = None
+        self._stream_deliveries: Dict[int, _StreamDelivery] = {} # The events' STREAM_DELIVERY_ATTRIBUTE -> their stream entry
+        self._stream_delivery_keys = itertools.count(1)
+        self._stream_entries_in_flight: Dict[bytes, _StreamDelivery] = {}
+        self._subscriptions: Dict[str, List[_Subscription]] = {}
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._lag: Dict[str, DDSketch] = {}
+        self._topics = TopicTrie()
+        self._permission_provider: Optional[Callable[[str], Awaitable[Dict[str, Any]]]] = None
+        self._permission_cache: Dict[Tuple[str, str], List[str]] = {} # (subscriber app, publisher app) -> allowed event patterns
+        print("EventBus initialized with bounded per-subscriber queues.") # Basic logging
 
-    async def publish(self, event: Event):
+    async def publish(self, event: Event, priority: Optional[int] = None):
         """
         Publish an event to the bus. The event will be dispatched to all subscribed
         handlers for the event's type.
 
         Args:
             event: The Event object to publish.
+            priority: Optional priority (lower values are delivered first). Defaults to the event's
+                      "priority" attribute, then the event type's configured priority.
         """
         print(f"Publishing event: {event.event_type} (Event ID: {getattr(event, 'eventId', 'N/A')})") # Basic logging, assuming eventId exists
         try:
-            # evently's publish method takes the event type and the event data
-            await self._event_bus.publish(event.event_type, event)
+            await self._enqueue(event, priority)
         except Exception as e:
             print(f"Error publishing event {event.event_type}: {e}") # Basic logging
             # TODO: Log this error properly (Issue #XX)
-            # TODO: Consider error handling or retry mechanisms for publishing (Issue #XX)
 
 
-    async def subscribe(self, event_type: str, handler: Callable):
+    async def publish_batch(self, events: List[Event]):
+        """
+        Publish several events at once. A failure to publish one event is logged and
+        does not affect the others.
+
+        Args:
+            events: The Event objects to publish.
+        """
+        if not events:
+            return
+        print(f"Publishing batch of {len(events)} event(s)") # Basic logging
+        for event in events:
+            try:
+                await self._enqueue(event, None)
+            except Exception as e:
+                print(f"Error publishing event {event.event_type}: {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+
+
+    def set_permission_provider(self, provider: Callable[[str], Awaitable[Dict[str, Any]]]):
+        """
+        Sets the source of inter-app permissions, e.g. ApplicationRegistry.get_application_permissions.
+
+        Args:
+            provider: Async callable taking an app ID and returning {"success": ..., "permissions": [...]}, where each
+                      permission has allowed_source_app_id and allowed_events (attributes or dictionary keys).
+        """
+        self._permission_provider = provider
+        self._permission_cache.clear()
+
+    def invalidate_permissions(self, app_id: Optional[str] = None):
         """
-        Subscribe an asynchronous handler function to a specific event type.
-        The handler will be called whenever an event of the specified type is published.
+        Drops cached permission decisions involving an app (or all of them), e.g. after its definition changed.
+        Existing subscriptions are not re-checked.
 
         Args:
-            event_type: The type of event to subscribe to.
-            handler: The async callable function to handle the event. This function should accept one argument, the Event object.
+            app_id: The app whose decisions to drop, or None for all.
+        """
+        if app_id is None:
+            self._permission_cache.clear()
+            return
+        for key in [key for key in self._permission_cache if app_id in key]:
+            del self._permission_cache[key]
+
+    async def subscribe(self, event_type: str, handler: Callable, app_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Subscribe a handler function to an event type or pattern.
+        The handler will be called whenever an event of a matching type is published.
+
+        Args:
+            event_type: The event type, or a pattern where "*" matches one segment and a final "#" any number of
+                        segments (segments are separated by "." or ":"), e.g. "trigger:*" or "app.app1.#".
+            handler: The callable to handle the event (async or not). It receives one argument, the Event object.
+            app_id: The application subscribing, if any. Subscribing to another app's "app.<appId>..." topics
+                    requires that app's permission.
+
+        Returns:
+            A dictionary with "success" and, on failure, "message".
         """
         print(f"Subscribing handler {handler.__name__} to event type: {event_type}") # Basic logging
+        error = validate_pattern(event_type)
+        if error:
+            print(f"Error subscribing handler {handler.__name__} to event type {event_type}: {error}") # Basic logging
+            return {"success": False, "message": error}
+        if app_id is not None and not await self._is_subscription_allowed(app_id, event_type):
+            print(f"Application '{app_id}' is not permitted to subscribe to '{event_type}'") # Basic logging
+            return {"success": False, "message": f"Application '{app_id}' is not permitted to subscribe to '{event_type}'"}
+        subscriptions = self._subscriptions.setdefault(event_type, [])
+        if any(subscription.handler == handler for subscription in subscriptions):
+            return {"success": True} # Already subscribed
         try:
-            # evently's subscribe method takes the event type and the handler
-            self._event_bus.subscribe(event_type, handler)
-        except Exception as e:
+            queue = SubscriberQueue(
+                maxsize=self._config["queue_size"],
+                overflow_policy=self._config["overflow_policies"].get(event_type, self._config["overflow_policy"]),
+                spill_path=self._config["spill_path"],
+                max_spilled_events=self._config["max_spilled_events"],
+                name=f"{event_type}-{handler.__name__}",
+            )
+        except ValueError as e:
             print(f"Error subscribing handler {handler.__name__} to event type {event_type}: {e}") # Basic logging
-            # TODO: Log this error properly (Issue #XX)
+            if not subscriptions:
+                del self._subscriptions[event_type]
+            return {"success": False, "message": str(e)}
+        subscription = _Subscription(event_type, handler, queue, app_id)
+        for _ in range(max(1, self._config["workers_per_subscriber"])):
+            subscription.workers.append(asyncio.create_task(self._run_worker(subscription)))
+        subscriptions.append(subscription)
+        self._topics.add(event_type, subscription)
+        return {"success": True}
 
 
     async def unsubscribe(self, event_type: str, handler: Callable):
         """
-        Unsubscribe a handler function from a specific event type.
-        The handler will no longer receive events of this type.
+        Unsubscribe a handler function from an event type or pattern.
+        The handler will no longer receive events of this type; events still queued for it are dropped.
 
         Args:
-            event_type: The type of event to unsubscribe from.
-            handler: The async callable function to unsubscribe.
+            event_type: The event type or pattern the handler was subscribed with.
+            handler: The callable to unsubscribe.
         """
         print(f"Unsubscribing handler {handler.__name__} from event type: {event_type}") # Basic logging
+        subscriptions = self._subscriptions.get(event_type, [])
+        for subscription in [subscription for subscription in subscriptions if subscription.handler == handler]:
+            subscriptions.remove(subscription)
+            self._topics.remove(event_type, subscription)
+            await self._stop(subscription)
+        if not subscriptions:
+            self._subscriptions.pop(event_type, None)
+
+    async def close(self, drain_timeout: float = 5.0):
+        """
+        Waits up to drain_timeout for queued events to be handled, then stops all workers.
+        With the stream backend, stops reading from the stream first and flushes pending writes and acks last.
+
+        Args:
+            drain_timeout: Maximum seconds to wait for the queues to empty.
+        """
+        if self._stream_consumer is not None:
+            self._stream_consumer.cancel()
+            await asyncio.gather(self._stream_consumer, return_exceptions=True)
+            self._stream_consumer = None
+        deadline = time.monotonic() + drain_timeout
+        while time.monotonic() < deadline and any(len(subscription.queue) for subscription in self._all_subscriptions()):
+            await asyncio.sleep(0.01)
+        for subscription in self._all_subscriptions():
+            self._topics.remove(subscription.event_type, subscription)
+            await self._stop(subscription)
+        self._subscriptions.clear()
+        if self._stream is not None:
+            await self._stream.close() # Unacked entries stay pending and are claimed by another replica
+
+    def get_event_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns per-event-type counters.
+
+        Returns:
+            A dictionary mapping published event types to published, delivered, dropped, handler_errors and
+            lag_seconds (count, p50, p99 and max of the time between publish and handling). delivered,
+            dropped and handler_errors count per subscriber, so one published event can be delivered several times.
+        """
+        stats = {}
+        for event_type, counters in list(self._stats.items()):
+            lag = self._lag.get(event_type)
+            stats[event_type] = {**counters, "lag_seconds": lag.summary((0.5, 0.99)) if lag is not None else None}
+        return stats
+
+    def start_event_stream(self):
+        """
+        Starts the Redis Streams backend's background tasks and the consumer. No-op if the backend is disabled.
+        Must be called from a running event loop (e.g. on application startup).
+        """
+        if self._stream is None or self._stream_consumer is not None:
+            return
+        self._stream.start()
+        self._stream_consumer = asyncio.create_task(self._run_stream_consumer())
+        print(f"EventBus consuming stream '{self._stream.stream}' as '{self._stream.consumer}' in group '{self._stream.group}'.") # Basic logging
+
+    async def replay(self, handler: Callable, start_id: str = "-", end_id: str = "+", pattern: str = MULTI_WILDCARD,
+                     limit: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Re-reads stored events from an offset and hands the matching ones to a handler, in order.
+        Replayed events bypass the subscriber queues and the consumer group (nothing is acked).
+
+        Args:
+            handler: The callable to handle each event (async or not).
+            start_id: First stream entry ID (inclusive), e.g. the last ID a component processed prefixed with "("
+                      (exclusive), a millisecond timestamp, or "-" for the oldest retained event.
+            end_id: Last stream entry ID (inclusive); "+" for the newest.
+            pattern: Only events whose type matches this pattern are replayed.
+            limit: Maximum number of entries to read.
+
+        Returns:
+            A dictionary with "success", "replayed", "last_id" (the last entry read, to resume from) and,
+            on failure, "message".
+        """
+        if self._stream is None:
+            return {"success": False, "message": "The event stream backend is not enabled"}
+        error = validate_pattern(pattern)
+        if error:
+            return {"success": False, "message": error}
+        replayed, read, last_id = 0, 0, None
         try:
-            # evently's unsubscribe method takes the event type and the handler
-            self._event_bus.unsubscribe(event_type, handler)
+            while limit is None or read < limit:
+                page = self._stream.config["read_batch_size"] if limit is None else min(self._stream.config["read_batch_size"], limit - read)
+                entries = await self._stream.read_range(start_id if last_id is None else f"({last_id}", end_id, page)
+                for entry_id, fields in entries:
+                    last_id = entry_id.decode() if isinstance(entry_id, bytes) else entry_id
+                    event = self._decode_stream_entry(fields)
+                    if event is None or not pattern_covers(pattern, event.event_type):
+                        continue
+                    result = handler(event)
+                    if inspect.isawaitable(result):
+                        await result
+                    replayed += 1
+                read += len(entries)
+                if len(entries) < page:
+                    break
         except Exception as e:
-            print(f"Error unsubscribing handler {handler.__name__} from event type {event_type}: {e}") # Basic logging
-            # TODO: Log this error properly (Issue #XX)
+            print(f"Error replaying events from {start_id}: {e}") # Basic logging
+            return {"success": False, "message": str(e), "replayed": replayed, "last_id": last_id}
+        return {"success": True, "replayed": replayed, "last_id": last_id}
+
+    async def get_stream_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns the Redis Streams backend's counters, stream length and consumer group backlog.
+
+        Returns:
+            The stats (see RedisEventStream.get_stats) plus in_flight (entries being handled locally),
+            or None if the backend is disabled.
+        """
+        if self._stream is None:
+            return None
+        return {**await self._stream.get_stats(), "in_flight": len(self._stream_entries_in_flight)}
+
+    def get_subscription_stats(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns per-pattern subscription gauges.
+
+        Returns:
+            A dictionary mapping subscribed event types/patterns to subscribers, queue_depth (events waiting in
+            their queues, including spilled ones), dropped and spilled.
+        """
+        return {
+            pattern: {
+                "subscribers": len(subscriptions),
+                "queue_depth": sum(len(subscription.queue) for subscription in subscriptions),
+                "dropped": sum(subscription.queue.dropped for subscription in subscriptions),
+                "spilled": sum(subscription.queue.spilled_total for subscription in subscriptions),
+            }
+            for pattern, subscriptions in self._subscriptions.items()
+        }
+
+    async def _enqueue(self, event: Event, priority: Optional[int]):
+        """Puts an event on the queue of every subscription matching its type, or appends it to the stream."""
+        event_type = event.event_type
+        self._event_stats(event_type)["published"] += 1
+        if priority is None:
+            priority = getattr(event, "priority", None)
+        if self._stream is not None:
+            fields = self._encode_stream_entry(event, priority)
+            if self._stream.config["publish_sync"]:
+                await self._stream.append_now([fields])
+            else:
+                self._stream.append(fields)
+            return
+        await self._dispatch(event, priority)
+
+    async def _dispatch(self, event: Event, priority: Optional[int]):
+        """Puts an event on the queue of every subscription matching its type."""
+        event_type = event.event_type
+        subscriptions = self._topics.match(event_type)
+        if not subscriptions:
+            return
+        if priority is None:
+            priority = self._config["event_priorities"].get(event_type, self._config["default_priority"])
+        for subscription in subscriptions:
+            if subscription.queue.overflow_policy == "block":
+                dropped = await subscription.queue.put(event, priority, self._config["block_timeout_seconds"])
+            else:
+                dropped = subscription.queue.put_nowait(event, priority)
+            if dropped is not None:
+                self._event_stats(event_type)["dropped"] += 1
+                if self._stream_deliveries:
+                    self._forget_stream_delivery(dropped) # Never acked, so it is claimed and redelivered
+
+    async def _run_worker(self, subscription: _Subscription):
+        """Hands the events of one subscription's queue to its handler, one at a time."""
+        while True:
+            published_at, event = await subscription.queue.get()
+            stats = self._event_stats(event.event_type)
+            lag = self._lag.get(event.event_type)
+            if lag is None:
+                lag = self._lag[event.event_type] = DDSketch()
+            lag.add(time.monotonic() - published_at)
+            try:
+                result = subscription.handler(event)
+                if inspect.isawaitable(result):
+                    await result
+                stats["delivered"] += 1
+            except asyncio.CancelledError:
+                if self._stream_deliveries:
+                    self._forget_stream_delivery(event) # Interrupted, so left for redelivery
+                raise
+            except Exception as e:
+                stats["handler_errors"] += 1
+                print(f"Error in handler {subscription.handler.__name__} for event type {subscription.event_type}: {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+                if self._stream_deliveries:
+                    self._forget_stream_delivery(event) # Not acked, so it is claimed and retried
+                continue
+            if self._stream_deliveries:
+                self._complete_stream_delivery(event)
+
+    async def _run_stream_consumer(self):
+        """
+        Reads the stream through the consumer group and dispatches entries locally. Periodically refreshes
+        the entries still being handled here and claims stale ones.
+        """
+        config = self._stream.config
+        next_claim = time.monotonic()
+        while True:
+            try:
+                full = len(self._stream_entries_in_flight) >= config["max_in_flight"]
+                if time.monotonic() >= next_claim:
+                    next_claim = time.monotonic() + config["claim_interval_seconds"]
+                    await self._refresh_stream_deliveries()
+                    if not full:
+                        await self._consume_stream_entries(await self._stream.claim_stale(), claimed=True)
+                if full:
+                    await asyncio.sleep(0.01) # Wait for the local subscribers to catch up
+                    continue
+                await self._consume_stream_entries(await self._stream.read())
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Error reading event stream '{self._stream.stream}': {e}") # Basic logging
+                await asyncio.sleep(1.0) # Back off while Redis is unavailable
+
+    async def _consume_stream_entries(self, entries: List[StreamEntry], claimed: bool = False):
+        """
+        Dispatches stream entries to the local subscriptions, tracking them until they can be acked.
+
+        Entries without a matching local subscription are not acked, so another replica can claim them.
+        Claimed entries already delivered max_unhandled_deliveries times (never reaching a subscription,
+        or failing in a handler each time) are acked without being dispatched again, and counted as dropped.
+        """
+        entries = [(entry_id, fields) for entry_id, fields in entries if entry_id not in self._stream_entries_in_flight] # Others are still being handled here
+        counts = await self._stream.delivery_counts([entry_id for entry_id, _ in entries]) if claimed and entries else {}
+        for entry_id, fields in entries:
+            event = self._decode_stream_entry(fields)
+            if event is None:
+                self._stream.ack(entry_id) # Undecodable; redelivering it would not help
+                continue
+            if counts.get(entry_id, 0) >= self._stream.config["max_unhandled_deliveries"]:
+                self._stream.ack(entry_id)
+                self._event_stats(event.event_type)["dropped"] += 1
+                print(f"Giving up on stream event {event.event_type} ({entry_id!r}) after {counts[entry_id]} deliveries") # Basic logging
+                continue
+            subscribers = len(self._topics.match(event.event_type))
+            if not subscribers:
+                continue # Left pending for a replica that subscribes to it
+            delivery = _StreamDelivery(next(self._stream_delivery_keys), entry_id, subscribers) # Counted before dispatching, which may yield to the workers
+            setattr(event, STREAM_DELIVERY_ATTRIBUTE, delivery.key)
+            self._stream_deliveries[delivery.key] = delivery
+            self._stream_entries_in_flight[entry_id] = delivery
+            priority = fields.get(b"priority")
+            await self._dispatch(event, int(priority) if priority else None)
+
+    def _complete_stream_delivery(self, event: Event):
+        """Counts one subscription as done with a stream event, acking the entry when it was the last one."""
+        delivery = self._stream_deliveries.get(getattr(event, STREAM_DELIVERY_ATTRIBUTE, None))
+        if delivery is None:
+            return
+        delivery.remaining -= 1
+        if delivery.remaining <= 0:
+            del self._stream_deliveries[delivery.key]
+            self._stream_entries_in_flight.pop(delivery.entry_id, None)
+            self._stream.ack(delivery.entry_id)
+
+    def _forget_stream_delivery(self, event: Event):
+        """Stops tracking a stream event that a subscription will not handle; its entry stays pending and is claimed again."""
+        delivery = self._stream_deliveries.pop(getattr(event, STREAM_DELIVERY_ATTRIBUTE, None), None)
+        if delivery is not None:
+            self._stream_entries_in_flight.pop(delivery.entry_id, None)
+
+    async def _refresh_stream_deliveries(self):
+        """Resets the idle time of entries handled here for a while, so other replicas do not claim them meanwhile."""
+        cutoff = time.monotonic() - self._stream.config["claim_idle_seconds"] / 2
+        deliveries = [delivery for delivery in self._stream_entries_in_flight.values() if delivery.idle_since < cutoff]
+        if not deliveries:
+            return
+        await self._stream.touch([delivery.entry_id for delivery in deliveries])
+        now = time.monotonic()
+        for delivery in deliveries:
+            delivery.idle_since = now
+
+    def _encode_stream_entry(self, event: Event, priority: Optional[int]) -> Dict[str, Any]:
+        """Encodes an event as stream entry fields; the type and priority stay readable for XRANGE tools."""
+        data = dataclasses.asdict(event) if dataclasses.is_dataclass(event) else dict(vars(event))
+        data.pop(STREAM_DELIVERY_ATTRIBUTE, None)
+        fields = {"type": event.event_type, "data": self._stream_serializer.dumps(data)}
+        if priority is not None:
+            fields["priority"] = str(priority)
+        return fields
+
+    def _decode_stream_entry(self, fields: Dict[bytes, bytes]) -> Optional[Event]:
+        """Rebuilds an Event from stream entry fields. Attributes that are not Event fields are kept as attributes."""
+        try:
+            data = self._stream_serializer.loads(fields.get(b"data"))
+            names = {field.name for field in dataclasses.fields(Event)}
+            event = Event(**{name: value for name, value in data.items() if name in names})
+            for name, value in data.items():
+                if name not in names:
+                    setattr(event, name, value)
+            return event
+        except (RuntimeValueDecodeError, AttributeError, TypeError) as e:
+            print(f"Error decoding stream event {fields.get(b'type')!r}: {e}") # Basic logging
+            return None
+
+    async def _stop(self, subscription: _Subscription):
+        """Cancels a subscription's workers and discards its queued events and spill file."""
+        for worker in subscription.workers:
+            worker.cancel()
+        await asyncio.gather(*subscription.workers, return_exceptions=True)
+        subscription.workers = []
+        while self._stream_deliveries and len(subscription.queue):
+            _, event = await subscription.queue.get()
+            self._forget_stream_delivery(event) # Left pending for redelivery
+        subscription.queue.close()
+
+    async def _is_subscription_allowed(self, app_id: str, pattern: str) -> bool:
+        """
+        Decides whether an app may subscribe to a pattern. The events one app grants another are cached.
+
+        Patterns outside the "app." namespace and within the app's own namespace are allowed. For another
+        app's namespace, that app must list the subscriber as allowed_source_app_id of an inter-app permission
+        whose allowed_events cover the rest of the pattern. Wildcards that could span apps are not allowed.
+        """
+        segments = split_topic(pattern)
+        if segments[0] in (SINGLE_WILDCARD, MULTI_WILDCARD):
+            return False # Would include every app's topics
+        if segments[0] != APP_TOPIC_PREFIX:
+            return True
+        if len(segments) < 2 or segments[1] in (SINGLE_WILDCARD, MULTI_WILDCARD):
+            return False
+        owner_app_id = segments[1]
+        if owner_app_id == app_id:
+            return True
+        key = (app_id, owner_app_id)
+        granted = self._permission_cache.get(key)
+        if granted is None:
+            granted = []
+            if self._permission_provider is not None:
+                try:
+                    response = await self._permission_provider(owner_app_id)
+                except Exception as e:
+                    print(f"Error getting permissions of application '{owner_app_id}': {e}") # Basic logging
+                    return False # Not cached, so the next subscribe retries
+                for permission in (response or {}).get("permissions", []) or []:
+                    # Both InterAppPermission shapes in use: allowed_source_app_id/allowed_events and target_app_id/allowed_actions
+                    source = _permission_field(permission, "allowed_source_app_id") or _permission_field(permission, "target_app_id")
+                    if source == app_id:
+                        granted.extend(_permission_field(permission, "allowed_events") or _permission_field(permission, "allowed_actions") or [])
+            self._permission_cache[key] = granted
+        rest = ".".join(segments[2:])
+        return any(pattern_covers(allowed_events, rest) for allowed_events in granted)
+
+    def _all_subscriptions(self) -> List[_Subscription]:
+        return [subscription for subscriptions in self._subscriptions.values() for subscription in subscriptions]
+
+    def _event_stats(self, event_type: str) -> Dict[str, int]:
+        stats = self._stats.get(event_type)
+        if stats is None:
+            stats = self._stats[event_type] = {"published": 0, "delivered": 0, "dropped": 0, "handler_errors": 0}
+        return stats
+
 
-    # evently handles the event processing loop internally when publish/subscribe are used.
-    # No need for a separate _process_events or _dispatch_event method here.
-    # TODO: Consider adding methods for listing subscribers or event types if needed for debugging/monitoring (Issue #XX)
-    # TODO: Consider adding support for persistent event storage or a distributed message queue for robustness/scalability (Issue #XX)
+def _permission_field(permission: Any, name: str) -> Any:
+    """Reads a field of an inter-app permission given as an object or a dictionary."""
+    if isinstance(permission, dict):
+        return permission.get(name)
+    return getattr(permission, name, None)
@@ -0,0 +1,348 @@
+from typing import Optional, Dict, Any, List, Tuple
+from collections import deque
+import asyncio
+import os
+import socket
+import time
+
+import redis
+import redis.asyncio
+
+# Defaults for the durable Redis Streams backend of the EventBus; override via the stream_config argument of EventBus
+DEFAULT_EVENT_STREAM_CONFIG: Dict[str, Any] = {
+    "enabled": False,
+    "redis": {"host": "localhost", "port": 6379, "db": 0}, # Connection settings for redis.asyncio.Redis
+    "stream": "nexus:events", # One stream holds all event types
+    "consumer_group": "nexus-backend", # Replicas in the same group share the events (each is handled by one replica)
+    "consumer_name": None, # Unique per replica; None uses "<hostname>-<pid>"
+    "group_start_id": "$", # Where a newly created group starts: "$" for new events only, "0" for everything retained
+    "read_batch_size": 100, # Entries per XREADGROUP
+    "read_block_ms": 1000,
+    "max_in_flight": 1000, # Entries read but not yet acked; reading pauses above this
+    "publish_batch_size": 200, # XADDs per pipeline
+    "publish_flush_interval_seconds": 0.005,
+    "publish_sync": False, # True makes publish wait for XADD; False buffers in memory for at most the flush interval
+    "max_publish_buffer": 100000, # Buffered events beyond this are dropped (oldest first)
+    "ack_batch_size": 200,
+    "ack_flush_interval_seconds": 0.05,
+    "claim_idle_seconds": 60.0, # Entries pending this long (e.g. from a crashed replica) are claimed and redelivered
+    "claim_interval_seconds": 15.0, # Keep below half of claim_idle_seconds: entries still being handled are refreshed this often
+    "max_unhandled_deliveries": 10, # An entry delivered this often without being handled (no subscriber, handler errors) is acked
+    "max_stream_length": 1000000, # Approximate MAXLEN applied on XADD; None disables length trimming
+    "retention_seconds": 7 * 24 * 3600, # Entries older than this are trimmed (XTRIM MINID); None disables
+    "trim_interval_seconds": 60.0,
+}
+
+# A stream entry as returned by redis-py: (entry ID, {field: value})
+StreamEntry = Tuple[bytes, Dict[bytes, bytes]]
+
+
+class RedisEventStream:
+    """
+    Durable event log on a Redis stream, read through a consumer group.
+
+    append() only buffers entries; a publisher task writes them with pipelined XADDs (MAXLEN ~ trimming).
+    Consumers read batches with XREADGROUP and ack() entries once handled; acks are sent in batches.
+    Entries left pending longer than claim_idle_seconds (a crashed replica, or an event this replica
+    dropped) are claimed again with XAUTOCLAIM, so delivery is at-least-once; touch() keeps entries
+    that take long to handle from being claimed meanwhile. read_range() reads entries by ID for
+    replays, independent of the group.
+    """
+    def __init__(self, client: redis.asyncio.Redis, config: Optional[Dict[str, Any]] = None):
+        """
+        Initializes the stream backend. Call start() from a running event loop.
+
+        Args:
+            client: The asyncio Redis client (created with decode_responses=False).
+            config: Optional overrides (see DEFAULT_EVENT_STREAM_CONFIG).
+        """
+        self._client = client
+        self.config: Dict[str, Any] = {**DEFAULT_EVENT_STREAM_CONFIG, **(config or {})}
+        self.stream = self.config["stream"]
+        self.group = self.config["consumer_group"]
+        self.consumer = self.config["consumer_name"] or f"{socket.gethostname()}-{os.getpid()}"
+        self._outbox: deque = deque()
+        self._acks: List[bytes] = []
+        self._publish_wakeup = asyncio.Event()
+        self._stopping = asyncio.Event() # Set by close(); the publisher and acker finish their current batch and exit
+        self._tasks: List[asyncio.Task] = [] # Publisher and acker
+        self._trim_task: Optional[asyncio.Task] = None
+        self._group_ready = False
+        self._claim_cursor: Any = "0-0" # XAUTOCLAIM resumes here, so entries that keep coming back cannot starve the rest
+        self._stats = {"published": 0, "publish_errors": 0, "publish_dropped": 0, "read": 0, "claimed": 0, "acked": 0, "trimmed": 0}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> Optional["RedisEventStream"]:
+        """
+        Builds the backend with its own Redis client, unless disabled.
+
+        Args:
+            config: Optional overrides (see DEFAULT_EVENT_STREAM_CONFIG).
+
+        Returns:
+            The RedisEventStream, or None if "enabled" is false.
+        """
+        config = {**DEFAULT_EVENT_STREAM_CONFIG, **(config or {})}
+        if not config["enabled"]:
+            return None
+        client = redis.asyncio.Redis(**config["redis"], decode_responses=False)
+        return cls(client, config)
+
+    def start(self):
+        """Starts the publisher, acker and trimming tasks. No-op if already running."""
+        if self._tasks:
+            return
+        self._tasks = [asyncio.create_task(self._run_publisher()), asyncio.create_task(self._run_acker())]
+        self._trim_task = asyncio.create_task(self._run_trimmer())
+
+    async def ensure_group(self):
+        """Creates the consumer group (and the stream) if it does not exist yet."""
+        if self._group_ready:
+            return
+        try:
+            await self._client.xgroup_create(self.stream, self.group, id=self.config["group_start_id"], mkstream=True)
+        except redis.exceptions.ResponseError as e:
+            if "BUSYGROUP" not in str(e):
+                raise
+        self._group_ready = True
+
+    def append(self, fields: Dict[str, Any]):
+        """
+        Buffers an entry for the publisher task. Does not wait for Redis.
+
+        Args:
+            fields: The entry's fields.
+        """
+        if len(self._outbox) >= self.config["max_publish_buffer"]:
+            self._outbox.popleft()
+            self._stats["publish_dropped"] += 1
+        self._outbox.append(fields)
+        if len(self._outbox) >= self.config["publish_batch_size"]:
+            self._publish_wakeup.set()
+
+    async def append_now(self, entries: List[Dict[str, Any]]) -> List[bytes]:
+        """
+        Writes entries with one pipelined round trip.
+
+        Args:
+            entries: The entries' fields.
+
+        Returns:
+            The IDs Redis assigned.
+
+        Raises:
+            redis.exceptions.RedisError: If the write fails.
+        """
+        pipe = self._client.pipeline(transaction=False)
+        max_length = self.config["max_stream_length"]
+        for fields in entries:
+            if max_length:
+                pipe.xadd(self.stream, fields, maxlen=max_length, approximate=True)
+            else:
+                pipe.xadd(self.stream, fields)
+        ids = await pipe.execute()
+        self._stats["published"] += len(entries)
+        return ids
+
+    async def read(self, count: Optional[int] = None, block_ms: Optional[int] = None) -> List[StreamEntry]:
+        """
+        Reads new entries for this consumer (XREADGROUP), waiting up to block_ms for some to arrive.
+
+        Returns:
+            The entries, oldest first.
+        """
+        await self.ensure_group()
+        response = await self._client.xreadgroup(self.group, self.consumer, {self.stream: ">"},
+                                                 count=count or self.config["read_batch_size"],
+                                                 block=self.config["read_block_ms"] if block_ms is None else block_ms)
+        entries = [entry for _, stream_entries in (response or []) for entry in stream_entries]
+        self._stats["read"] += len(entries)
+        return entries
+
+    async def claim_stale(self, count: Optional[int] = None) -> List[StreamEntry]:
+        """
+        Claims entries of the group that were delivered but not acked for claim_idle_seconds (XAUTOCLAIM).
+        Each call continues the scan of the pending entries where the previous one stopped.
+
+        Returns:
+            The claimed entries; deleted (trimmed) entries are skipped.
+        """
+        await self.ensure_group()
+        response = await self._client.xautoclaim(self.stream, self.group, self.consumer,
+                                                 min_idle_time=int(self.config["claim_idle_seconds"] * 1000),
+                                                 start_id=self._claim_cursor, count=count or self.config["read_batch_size"])
+        self._claim_cursor = response[0] if response else "0-0"
+        entries = [entry for entry in (response[1] if response else []) if entry and entry[1]]
+        self._stats["claimed"] += len(entries)
+        return entries
+
+    async def touch(self, entry_ids: List[bytes]):
+        """
+        Resets the idle time of entries this consumer is still handling (XCLAIM JUSTID), so claim_stale()
+        of other replicas leaves them alone. Does not count as a delivery.
+
+        Args:
+            entry_ids: IDs of entries pending for this consumer.
+        """
+        await self._client.xclaim(self.stream, self.group, self.consumer, 0, entry_ids, justid=True)
+
+    async def delivery_counts(self, entry_ids: List[bytes]) -> Dict[bytes, int]:
+        """
+        Reads how often pending entries were delivered (XPENDING), with one pipelined round trip.
+
+        Args:
+            entry_ids: IDs of pending entries.
+
+        Returns:
+            A dictionary mapping the IDs to their delivery counts; entries no longer pending are left out.
+        """
+        pipe = self._client.pipeline(transaction=False)
+        for entry_id in entry_ids:
+            pipe.xpending_range(self.stream, self.group, min=entry_id, max=entry_id, count=1)
+        counts = {}
+        for entry_id, pending in zip(entry_ids, await pipe.execute()):
+            if pending:
+                counts[entry_id] = pending[0]["times_delivered"]
+        return counts
+
+    def ack(self, entry_id: bytes):
+        """Buffers an acknowledgement; the acker task sends them in batches (XACK)."""
+        self._acks.append(entry_id)
+
+    async def flush_acks(self):
+        """Sends buffered acknowledgements."""
+        while self._acks:
+            batch, self._acks = self._acks[:self.config["ack_batch_size"]], self._acks[self.config["ack_batch_size"]:]
+            try:
+                await self._client.xack(self.stream, self.group, *batch)
+                self._stats["acked"] += len(batch)
+            except asyncio.CancelledError:
+                self._acks[:0] = batch # Acking twice is harmless
+                raise
+            except redis.exceptions.RedisError as e:
+                self._acks[:0] = batch # Retried on the next flush
+                print(f"Error acknowledging {len(batch)} events: {e}") # Basic logging
+                return
+
+    async def flush_outbox(self):
+        """
+        Writes buffered entries in batches. On failure, or if cancelled, they stay buffered for the next
+        attempt (a batch cancelled after Redis stored it is written again: delivery is at-least-once).
+        """
+        while self._outbox:
+            batch = [self._outbox.popleft() for _ in range(min(len(self._outbox), self.config["publish_batch_size"]))]
+            try:
+                await self.append_now(batch)
+            except asyncio.CancelledError:
+                self._outbox.extendleft(reversed(batch))
+                raise
+            except redis.exceptions.RedisError as e:
+                self._outbox.extendleft(reversed(batch))
+                self._stats["publish_errors"] += 1
+                print(f"Error publishing {len(batch)} events to stream {self.stream}: {e}") # Basic logging
+                raise
+
+    async def read_range(self, start_id: str = "-", end_id: str = "+", count: Optional[int] = None) -> List[StreamEntry]:
+        """
+        Reads entries by ID (XRANGE), e.g. to replay from an offset. Does not affect the consumer group.
+
+        Args:
+            start_id: First entry ID (inclusive); "-" for the oldest. Prefix with "(" to exclude it.
+            end_id: Last entry ID (inclusive); "+" for the newest.
+            count: Maximum number of entries.
+
+        Returns:
+            The entries, oldest first.
+        """
+        return await self._client.xrange(self.stream, min=start_id, max=end_id, count=count)
+
+    async def trim(self, now: Optional[float] = None) -> int:
+        """
+        Removes entries older than retention_seconds (XTRIM MINID, approximate).
+
+        Returns:
+            The number of removed entries.
+        """
+        retention = self.config["retention_seconds"]
+        if not retention:
+            return 0
+        now = time.time() if now is None else now
+        removed = await self._client.xtrim(self.stream, minid=f"{int((now - retention) * 1000)}-0", approximate=True)
+        self._stats["trimmed"] += removed or 0
+        return removed or 0
+
+    async def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns local counters plus the stream's length and the group's pending entries and lag.
+
+        Returns:
+            A dictionary with published, publish_errors, publish_dropped, publish_buffered, read, claimed,
+            acked, ack_buffered, trimmed, stream_length, pending and lag (None where Redis is unreachable).
+        """
+        stats: Dict[str, Any] = {**self._stats, "publish_buffered": len(self._outbox), "ack_buffered": len(self._acks),
+                                 "stream_length": None, "pending": None, "lag": None}
+        try:
+            stats["stream_length"] = await self._client.xlen(self.stream)
+            for group in await self._client.xinfo_groups(self.stream):
+                name = group.get("name")
+                if name in (self.group, self.group.encode()):
+                    stats["pending"] = group.get("pending")
+                    stats["lag"] = group.get("lag") # Redis 7+
+        except redis.exceptions.RedisError as e:
+            print(f"Error reading stats of stream {self.stream}: {e}") # Basic logging
+        return stats
+
+    async def close(self):
+        """
+        Stops the background tasks, writes buffered entries and acks, and closes the Redis client.
+        The publisher and acker are stopped cooperatively, so a batch they are writing is never cut off.
+        """
+        self._stopping.set()
+        self._publish_wakeup.set()
+        if self._trim_task is not None:
+            self._trim_task.cancel() # Holds no data
+            await asyncio.gather(self._trim_task, return_exceptions=True)
+            self._trim_task = None
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        try:
+            await self.flush_outbox()
+        except redis.exceptions.RedisError:
+            pass # Already reported; the buffered events are lost
+        await self.flush_acks()
+        await self._client.aclose()
+
+    async def _run_publisher(self):
+        """Writes buffered entries whenever a batch is full or the flush interval passed, until close()."""
+        while not self._stopping.is_set():
+            try:
+                await asyncio.wait_for(self._publish_wakeup.wait(), self.config["publish_flush_interval_seconds"])
+            except asyncio.TimeoutError:
+                pass
+            self._publish_wakeup.clear()
+            try:
+                await self.flush_outbox()
+            except redis.exceptions.RedisError:
+                await self._wait_stopping(1.0) # Back off while Redis is unavailable
+
+    async def _run_acker(self):
+        """Sends buffered acknowledgements periodically, until close()."""
+        while not self._stopping.is_set():
+            await self._wait_stopping(self.config["ack_flush_interval_seconds"])
+            await self.flush_acks()
+
+    async def _wait_stopping(self, timeout: float):
+        """Sleeps for timeout seconds, or until close() is called."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), timeout)
+        except asyncio.TimeoutError:
+            pass
+
+    async def _run_trimmer(self):
+        """Applies the time-based retention periodically."""
+        while True:
+            await asyncio.sleep(self.config["trim_interval_seconds"])
+            try:
+                await self.trim()
+            except redis.exceptions.RedisError as e:
+                print(f"Error trimming stream {self.stream}: {e}") # Basic logging
@@ -0,0 +1,206 @@
+from typing import Optional, Dict, Any, Tuple
+from collections import deque
+import asyncio
+import os
+import pickle
+import tempfile
+import time
+
+# Defaults for the EventBus; override via the config argument of EventBus
+DEFAULT_EVENT_BUS_CONFIG: Dict[str, Any] = {
+    "queue_size": 1000, # Events buffered per subscriber
+    # What publish does when a subscriber's queue is full:
+    #   "drop_oldest" - the oldest event of the lowest priority is dropped to make room
+    #   "block"       - publish waits up to block_timeout_seconds for room, then drops the new event
+    #   "spill"       - events are appended to a spill file and read back in order once the queue has room
+    "overflow_policy": "drop_oldest",
+    "block_timeout_seconds": 1.0,
+    "spill_path": None, # Directory for spill files; None uses a temporary directory
+    "max_spilled_events": 1000000, # Per subscriber; further events are dropped
+    "workers_per_subscriber": 1, # Concurrent handler calls per subscriber; with more than one, events may complete out of order
+    "default_priority": 5, # Lower values are delivered first
+    "event_priorities": {}, # event_type -> priority
+    "overflow_policies": {}, # event_type -> overflow policy, overriding overflow_policy
+}
+
+OVERFLOW_POLICIES = ("drop_oldest", "block", "spill")
+
+# A queued event: (time.monotonic() when published, event)
+QueuedEvent = Tuple[float, Any]
+
+
+class SubscriberQueue:
+    """
+    A bounded priority queue of events for one subscriber.
+
+    Events are kept in one FIFO per priority level, so put_nowait() and get() are O(1) (plus the number
+    of distinct priorities, which is small). When the queue is full, the overflow policy decides what
+    happens. Under "spill", events go to an append-only file instead and, to keep their order, every
+    later event does too until the worker has read the file back. Not thread-safe: use it from the event loop.
+    """
+    def __init__(self, maxsize: int = 1000, overflow_policy: str = "drop_oldest", spill_path: Optional[str] = None,
+                 max_spilled_events: int = 1000000, name: str = "subscriber"):
+        """
+        Initializes the queue.
+
+        Args:
+            maxsize: Maximum number of events held in memory.
+            overflow_policy: One of OVERFLOW_POLICIES.
+            spill_path: Directory for the spill file (for "spill"); None uses a temporary directory.
+            max_spilled_events: Maximum number of events in the spill file.
+            name: Used in the spill file name.
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}'; expected one of {', '.join(OVERFLOW_POLICIES)}")
+        self.maxsize = max(1, maxsize)
+        self.overflow_policy = overflow_policy
+        self.spill_path = spill_path
+        self.max_spilled_events = max_spilled_events
+        self.name = name
+        self._levels: Dict[int, deque] = {}
+        self._size = 0
+        self._not_empty = asyncio.Event()
+        self._not_full = asyncio.Event()
+        self._not_full.set()
+        self._spill_file = None
+        self._spill_file_path: Optional[str] = None
+        self._spill_read_offset = 0
+        self._spilled = 0 # Events in the spill file not yet read back
+        self.dropped = 0
+        self.spilled_total = 0
+
+    def __len__(self) -> int:
+        """The number of queued events, including spilled ones."""
+        return self._size + self._spilled
+
+    def put_nowait(self, event: Any, priority: int, published_at: Optional[float] = None) -> Optional[Any]:
+        """
+        Queues an event without waiting, applying the overflow policy if the queue is full ("block" drops here).
+
+        Args:
+            event: The event.
+            priority: Its priority; lower values are delivered first.
+            published_at: time.monotonic() when it was published (for lag measurement).
+
+        Returns:
+            The event that was dropped (the new one or, for "drop_oldest", an older one), or None.
+        """
+        item = (time.monotonic() if published_at is None else published_at, event)
+        if self._spilled or (self._size >= self.maxsize and self.overflow_policy == "spill"):
+            return self._spill(item, priority)
+        dropped = None
+        if self._size >= self.maxsize:
+            if self.overflow_policy != "drop_oldest":
+                self.dropped += 1
+                return event
+            dropped = self._pop(lowest=True)[1]
+            self.dropped += 1
+        self._push(item, priority)
+        return dropped
+
+    async def put(self, event: Any, priority: int, timeout: float) -> Optional[Any]:
+        """
+        Queues an event; under "block", first waits up to timeout for room.
+
+        Args:
+            event: The event.
+            priority: Its priority; lower values are delivered first.
+            timeout: Maximum seconds to wait for room.
+
+        Returns:
+            The dropped event, or None.
+        """
+        published_at = time.monotonic()
+        if self.overflow_policy == "block" and self._size >= self.maxsize:
+            try:
+                await asyncio.wait_for(self._wait_not_full(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        return self.put_nowait(event, priority, published_at)
+
+    async def get(self) -> QueuedEvent:
+        """
+        Waits for and returns the next event: the oldest of the highest priority.
+
+        Returns:
+            (time it was published, event).
+        """
+        while not self._size:
+            if self._spilled:
+                self._read_spill()
+                continue
+            self._not_empty.clear()
+            await self._not_empty.wait()
+        return self._pop(lowest=False)
+
+    def depth_by_priority(self) -> Dict[int, int]:
+        """Returns the number of in-memory events per priority."""
+        return {priority: len(level) for priority, level in self._levels.items() if level}
+
+    def close(self):
+        """Deletes the spill file, discarding spilled events."""
+        if self._spill_file is not None:
+            self._spill_file.close()
+            self._spill_file = None
+            try:
+                os.remove(self._spill_file_path)
+            except OSError:
+                pass
+        self._spilled = 0
+
+    def _push(self, item: QueuedEvent, priority: int):
+        level = self._levels.get(priority)
+        if level is None:
+            level = self._levels[priority] = deque()
+        level.append(item)
+        self._size += 1
+        self._not_empty.set()
+        if self._size >= self.maxsize:
+            self._not_full.clear()
+
+    def _pop(self, lowest: bool) -> QueuedEvent:
+        """Removes the oldest event of the highest priority, or with lowest=True of the lowest priority."""
+        for priority in sorted(self._levels, reverse=lowest):
+            level = self._levels[priority]
+            if level:
+                self._size -= 1
+                self._not_full.set()
+                return level.popleft()
+        raise IndexError("pop from an empty SubscriberQueue")
+
+    async def _wait_not_full(self):
+        while self._size >= self.maxsize:
+            self._not_full.clear()
+            await self._not_full.wait()
+
+    def _spill(self, item: QueuedEvent, priority: int) -> Optional[Any]:
+        """Appends an event to the spill file. Writes are buffered; nothing is fsynced."""
+        if self._spilled >= self.max_spilled_events:
+            self.dropped += 1
+            return item[1]
+        if self._spill_file is None:
+            directory = self.spill_path or tempfile.gettempdir()
+            os.makedirs(directory, exist_ok=True)
+            descriptor, self._spill_file_path = tempfile.mkstemp(prefix=f"event-spill-{self.name}-", dir=directory)
+            self._spill_file = os.fdopen(descriptor, "w+b")
+        self._spill_file.seek(0, os.SEEK_END)
+        pickle.dump((priority, item), self._spill_file)
+        self._spilled += 1
+        self.spilled_total += 1
+        self._not_empty.set()
+        return None
+
+    def _read_spill(self):
+        """Moves spilled events back into memory, up to the free capacity, in the order they were spilled."""
+        self._spill_file.flush()
+        self._spill_file.seek(self._spill_read_offset)
+        while self._spilled and self._size < self.maxsize:
+            priority, item = pickle.load(self._spill_file)
+            self._push(item, priority)
+            self._spilled -= 1
+        self._spill_read_offset = self._spill_file.tell()
+        if not self._spilled: # Fully read back: start over with an empty file
+            self._spill_file.seek(0)
+            self._spill_file.truncate()
+            self._spill_read_offset = 0
+
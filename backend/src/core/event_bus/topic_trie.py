@@ -0,0 +1,187 @@
+from typing import Optional, Dict, Any, List, Tuple
+import re
+
+# Topics are split into segments at "." and ":", so "trigger:new_data", "app.app1.trigger:new_data" and
+# "http:/api/trigger" are all hierarchical. In subscription patterns, "*" matches exactly one segment and
+# "#" (only as the last segment) matches any number of segments, including none.
+_SEPARATORS = re.compile(r"[.:]")
+SINGLE_WILDCARD = "*"
+MULTI_WILDCARD = "#"
+
+# Topics of an application's own events start with "app.<appId>"; subscribing to another app's topics needs its permission
+APP_TOPIC_PREFIX = "app"
+
+
+def split_topic(topic: str) -> Tuple[str, ...]:
+    """Splits a topic or pattern into its segments."""
+    return tuple(_SEPARATORS.split(topic))
+
+
+def app_topic(app_id: str, event_type: str) -> str:
+    """
+    Returns the topic an application's own event is published under, "app.<appId>.<event_type>".
+    Event types already in the app's namespace are returned unchanged; any other event type, including
+    one in another app's namespace, is nested below the app's prefix.
+
+    Raises:
+        ValueError: If the app ID is not a single segment, or the event type is empty or contains wildcards.
+    """
+    if not app_id or _SEPARATORS.search(app_id) or SINGLE_WILDCARD in app_id or MULTI_WILDCARD in app_id:
+        raise ValueError(f"Invalid application ID for a topic: '{app_id}'")
+    if not event_type or SINGLE_WILDCARD in event_type or MULTI_WILDCARD in event_type:
+        raise ValueError(f"Invalid event type: '{event_type}'")
+    if split_topic(event_type)[:2] == (APP_TOPIC_PREFIX, app_id):
+        return event_type
+    return f"{APP_TOPIC_PREFIX}.{app_id}.{event_type}"
+
+
+def validate_pattern(pattern: str) -> Optional[str]:
+    """
+    Checks a subscription pattern.
+
+    Returns:
+        An error message, or None if the pattern is valid.
+    """
+    segments = split_topic(pattern)
+    if MULTI_WILDCARD in segments[:-1]:
+        return f"'{MULTI_WILDCARD}' may only be the last segment of a pattern: '{pattern}'"
+    for segment in segments:
+        if segment != SINGLE_WILDCARD and segment != MULTI_WILDCARD and (SINGLE_WILDCARD in segment or MULTI_WILDCARD in segment):
+            return f"Wildcards must be whole segments: '{pattern}'"
+    return None
+
+
+def pattern_covers(pattern: str, other: str) -> bool:
+    """
+    Returns whether every topic matched by other is also matched by pattern (e.g. "trigger:*" covers
+    "trigger:new_data" and "trigger:*", but not "trigger:#").
+    """
+    outer, inner = split_topic(pattern), split_topic(other)
+    for i, segment in enumerate(outer):
+        if segment == MULTI_WILDCARD:
+            return True
+        if i >= len(inner):
+            return False
+        if segment == SINGLE_WILDCARD:
+            if inner[i] == MULTI_WILDCARD:
+                return False
+        elif segment != inner[i]:
+            return False
+    return len(outer) == len(inner)
+
+
+class _TrieNode:
+    __slots__ = ("children", "values")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {} # Segment (or wildcard) -> child
+        self.values: List[Any] = [] # Values of patterns ending here
+
+
+class TopicTrie:
+    """
+    Maps subscription patterns (with "*" and "#" wildcards) to values, e.g. subscriptions.
+
+    match() walks the trie along the topic's segments, following the literal child plus the "*" and "#"
+    children at each level, so its cost depends on the topic's depth and the wildcards actually used,
+    not on the number of patterns. Results are cached per topic until the trie changes.
+    """
+    def __init__(self, max_cached_topics: int = 10000):
+        """
+        Initializes an empty trie.
+
+        Args:
+            max_cached_topics: Maximum number of topics whose match results are cached.
+        """
+        self._root = _TrieNode()
+        self.max_cached_topics = max(0, max_cached_topics)
+        self._cache: Dict[str, Tuple[Any, ...]] = {}
+        self._patterns = 0
+
+    def __len__(self) -> int:
+        """The number of (pattern, value) entries."""
+        return self._patterns
+
+    def add(self, pattern: str, value: Any):
+        """
+        Adds a value under a pattern.
+
+        Raises:
+            ValueError: If the pattern is invalid (see validate_pattern).
+        """
+        error = validate_pattern(pattern)
+        if error:
+            raise ValueError(error)
+        node = self._root
+        for segment in split_topic(pattern):
+            child = node.children.get(segment)
+            if child is None:
+                child = node.children[segment] = _TrieNode()
+            node = child
+        node.values.append(value)
+        self._patterns += 1
+        self._cache.clear()
+
+    def remove(self, pattern: str, value: Any) -> bool:
+        """
+        Removes a value from a pattern, pruning nodes that become empty.
+
+        Returns:
+            True if the value was found.
+        """
+        path = [self._root]
+        for segment in split_topic(pattern):
+            child = path[-1].children.get(segment)
+            if child is None:
+                return False
+            path.append(child)
+        try:
+            path[-1].values.remove(value)
+        except ValueError:
+            return False
+        segments = split_topic(pattern)
+        for depth in range(len(segments), 0, -1):
+            node = path[depth]
+            if node.values or node.children:
+                break
+            del path[depth - 1].children[segments[depth - 1]]
+        self._patterns -= 1
+        self._cache.clear()
+        return True
+
+    def match(self, topic: str) -> Tuple[Any, ...]:
+        """
+        Returns the values of all patterns matching a topic.
+
+        Args:
+            topic: A concrete topic (wildcard characters are matched literally).
+
+        Returns:
+            The matching values, in no particular order.
+        """
+        cached = self._cache.get(topic)
+        if cached is not None:
+            return cached
+        found: List[Any] = []
+        self._collect(self._root, split_topic(topic), 0, found)
+        result = tuple(found)
+        if len(self._cache) >= self.max_cached_topics:
+            self._cache.clear() # Topics are few in practice; start over rather than track recency
+        if self.max_cached_topics:
+            self._cache[topic] = result
+        return result
+
+    def _collect(self, node: _TrieNode, segments: Tuple[str, ...], depth: int, found: List[Any]):
+        multi = node.children.get(MULTI_WILDCARD)
+        if multi is not None:
+            found.extend(multi.values) # "#" matches the remaining segments, including none
+        if depth == len(segments):
+            found.extend(node.values)
+            return
+        segment = segments[depth]
+        child = node.children.get(segment) if segment != MULTI_WILDCARD else None # "#" in a topic is not a wildcard
+        if child is not None:
+            self._collect(child, segments, depth + 1, found)
+        single = node.children.get(SINGLE_WILDCARD)
+        if single is not None and single is not child:
+            self._collect(single, segments, depth + 1, found)
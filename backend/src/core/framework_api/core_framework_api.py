@@ -1,4 +1,4 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List, Callable
 from datetime import datetime # Needed for placeholder log message
 # TODO: Import a library for parsing/validating data models (e.g., Pydantic) (Issue #XX)
 
@@ -20,6 +20,7 @@ from core.interfaces.application_registry_interface import ApplicationRegistryIn
 from core.interfaces.state_manager_interface import StateManagerInterface # Add StateManagerInterface dependency
 from core.interfaces.tool_manager_interface import ToolManagerInterface # Add ToolManagerInterface dependency
 from core.interfaces.event_bus_interface import EventBusInterface # Add EventBusInterface dependency
+from backend.src.core.event_bus.topic_trie import app_topic
 
 
 class CoreFrameworkAPI(CoreFrameworkAPIInterface):
@@ -201,28 +202,44 @@ class CoreFrameworkAPI(CoreFrameworkAPIInterface):
             return None # Or raise gRPC exception
 
 
-    async def set_runtime_state(self, appId: str, key: str, value: Any): # TODO: Define gRPC method signature (Issue #XX)
+    async def set_runtime_state(self, appId: str, key: str, value: Any, ttl_seconds: Optional[int] = None,
+                                compare_and_set: bool = False, expected_value: Any = None) -> bool: # TODO: Define gRPC method signature (Issue #XX)
         """
         Sets a runtime state value for an application via the StateManager.
         Exposed via gRPC for sandboxes to update volatile state.
 
+        With compare_and_set=True the write is atomic and conditional: it only happens if the current
+        value equals expected_value (or, with expected_value=None, if the key does not exist yet, e.g. to take a lock).
+
         Args:
             appId: The ID of the application.
             key: The key for the runtime value.
             value: The value to set.
+            ttl_seconds: Optional time-to-live in seconds.
+            compare_and_set: Whether to make the write conditional on expected_value.
+            expected_value: The value the key must currently hold when compare_and_set is True.
+
+        Returns:
+            True if the value was written, False if a compare-and-set condition did not hold or an error occurred.
         """
         print(f"CoreFrameworkAPI received request to set runtime state key '{key}' for app '{appId}'.") # Basic logging
         try:
-            await self.state_manager.set_runtime_value(appId, key, value)
+            if compare_and_set:
+                written = await self.state_manager.compare_and_set_runtime_value(appId, key, expected_value, value, ttl_seconds)
+                if not written:
+                    print(f"CoreFrameworkAPI did not set runtime state key '{key}': current value did not match.") # Basic logging
+                return written # TODO: Return a gRPC response (Issue #XX)
+            await self.state_manager.set_runtime_value(appId, key, value, ttl_seconds)
             print(f"CoreFrameworkAPI successfully set runtime state key '{key}'.") # Basic logging
-            # TODO: Return a gRPC response (e.g., Empty or status) (Issue #XX)
+            return True # TODO: Return a gRPC response (e.g., Empty or status) (Issue #XX)
         except Exception as e:
             print(f"Error setting runtime state key '{key}' for app '{appId}': {e}") # Basic logging
             # TODO: Log this error properly (Issue #XX)
             # TODO: Return a gRPC error response (Issue #XX)
+            return False
 
 
-    async def delete_runtime_state(self, appId: str, key: str): # TODO: Define gRPC method signature (Issue #XX)
+    async def delete_runtime_state(self, appId: str, key: str, compare_and_delete: bool = False, expected_value: Any = None) -> bool: # TODO: Define gRPC method signature (Issue #XX)
         """
         Deletes a runtime state value for an application via the StateManager.
         Exposed via gRPC for sandboxes to delete volatile state.
@@ -230,19 +247,159 @@ class CoreFrameworkAPI(CoreFrameworkAPIInterface):
         Args:
             appId: The ID of the application.
             key: The key for the runtime value to delete.
+            compare_and_delete: Whether to delete only if the current value equals expected_value
+                                (e.g. releasing a lock still held by the caller's token).
+            expected_value: The value the key must currently hold when compare_and_delete is True.
+
+        Returns:
+            False if a compare-and-delete condition did not hold or an error occurred, True otherwise.
         """
         print(f"CoreFrameworkAPI received request to delete runtime state key '{key}' for app '{appId}'.") # Basic logging
         try:
+            if compare_and_delete:
+                return await self.state_manager.compare_and_delete_runtime_value(appId, key, expected_value) # TODO: Return a gRPC response (Issue #XX)
             await self.state_manager.delete_runtime_value(appId, key)
             print(f"CoreFrameworkAPI successfully deleted runtime state key '{key}'.") # Basic logging
-            # TODO: Return a gRPC response (e.g., Empty or status) (Issue #XX)
+            return True # TODO: Return a gRPC response (e.g., Empty or status) (Issue #XX)
         except Exception as e:
             print(f"Error deleting runtime state key '{key}' for app '{appId}': {e}") # Basic logging
             # TODO: Log this error properly (Issue #XX)
             # TODO: Return a gRPC error response (Issue #XX)
+            return False
+
+
+    async def increment_runtime_state(self, appId: str, key: str, amount: int = 1, ttl_seconds: Optional[int] = None) -> Optional[int]: # TODO: Define gRPC method signature (Issue #XX)
+        """
+        Atomically increments an integer runtime state value (negative amounts decrement) via the StateManager.
+        Exposed via gRPC so sandboxes can keep hot counters in Redis without read-modify-write round trips.
+
+        Args:
+            appId: The ID of the application.
+            key: The key of the counter.
+            amount: The amount to add.
+            ttl_seconds: Optional time-to-live, applied when the counter is created (fixed-window counters).
+
+        Returns:
+            The value after the increment, or None if an error occurred (e.g. the value is not an integer).
+        """
+        try:
+            return await self.state_manager.increment_runtime_value(appId, key, amount, ttl_seconds) # TODO: Return a gRPC response (Issue #XX)
+        except Exception as e:
+            print(f"Error incrementing runtime state key '{key}' for app '{appId}': {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            # TODO: Return a gRPC error response (Issue #XX)
+            return None
+
+
+    async def scan_runtime_state_keys(self, appId: str, pattern: str = "*", limit: Optional[int] = None) -> List[str]: # TODO: Define gRPC method signature (Issue #XX)
+        """
+        Lists an application's runtime state keys matching a glob pattern via the StateManager.
+        Exposed via gRPC for sandboxes to enumerate their own volatile state.
+
+        Args:
+            appId: The ID of the application.
+            pattern: Glob pattern for keys (e.g., 'session:*').
+            limit: Optional maximum number of keys to return.
+
+        Returns:
+            The matching keys, or an empty list on error.
+        """
+        try:
+            return await self.state_manager.scan_runtime_keys(appId, pattern, limit) # TODO: Return a gRPC response (Issue #XX)
+        except Exception as e:
+            print(f"Error scanning runtime state keys for app '{appId}': {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            # TODO: Return a gRPC error response (Issue #XX)
+            return []
+
+
+    async def expire_runtime_states(self, appId: str, ttl_seconds: int, pattern: str = "*") -> int: # TODO: Define gRPC method signature (Issue #XX)
+        """
+        Sets a time-to-live on every runtime state key of an application matching a glob pattern via the StateManager.
+
+        Args:
+            appId: The ID of the application.
+            ttl_seconds: The time-to-live in seconds. 0 expires the keys immediately.
+            pattern: Glob pattern for keys.
+
+        Returns:
+            The number of keys whose time-to-live was set, or 0 on error.
+        """
+        print(f"CoreFrameworkAPI received request to expire runtime state keys matching '{pattern}' for app '{appId}' in {ttl_seconds}s.") # Basic logging
+        try:
+            return await self.state_manager.expire_runtime_values(appId, ttl_seconds, pattern) # TODO: Return a gRPC response (Issue #XX)
+        except Exception as e:
+            print(f"Error expiring runtime state keys for app '{appId}': {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            # TODO: Return a gRPC error response (Issue #XX)
+            return 0
 
 
-    async def get_definition_file(self, appId: str, path: str) -> Optional[str]: # TODO: Define gRPC method signature and return type (Issue #XX)
+    async def get_runtime_states(self, appId: str, keys: List[str]) -> Dict[str, Any]: # TODO: Define gRPC method signature and return type (Issue #XX)
+        """
+        Retrieves several runtime state values for an application in one StateManager round trip.
+        Exposed via gRPC for sandboxes that read many keys per request.
+
+        Args:
+            appId: The ID of the application.
+            keys: The keys to retrieve.
+
+        Returns:
+            A dictionary mapping each existing key to its value (missing keys are omitted), or an empty dict on error.
+        """
+        print(f"CoreFrameworkAPI received request for {len(keys)} runtime state keys for app '{appId}'.") # Basic logging
+        try:
+            return await self.state_manager.get_runtime_values(appId, keys) # TODO: Return values in a gRPC response object (Issue #XX)
+        except Exception as e:
+            print(f"Error getting runtime state keys for app '{appId}': {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            # TODO: Return a gRPC error response (Issue #XX)
+            return {}
+
+
+    async def set_runtime_states(self, appId: str, values: Dict[str, Any], ttl_seconds: Optional[int] = None): # TODO: Define gRPC method signature (Issue #XX)
+        """
+        Sets several runtime state values for an application atomically in one StateManager round trip.
+        Exposed via gRPC for sandboxes that write many keys per request.
+
+        Args:
+            appId: The ID of the application.
+            values: A dictionary mapping keys to the values to set.
+            ttl_seconds: Optional time-to-live in seconds, applied to every key.
+        """
+        print(f"CoreFrameworkAPI received request to set {len(values)} runtime state keys for app '{appId}'.") # Basic logging
+        try:
+            await self.state_manager.set_runtime_values(appId, values, ttl_seconds)
+            # TODO: Return a gRPC response (e.g., Empty or status) (Issue #XX)
+        except Exception as e:
+            print(f"Error setting runtime state keys for app '{appId}': {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            # TODO: Return a gRPC error response (Issue #XX)
+
+
+    async def delete_runtime_states(self, appId: str, keys: List[str]) -> int: # TODO: Define gRPC method signature (Issue #XX)
+        """
+        Deletes several runtime state values for an application in one StateManager round trip.
+        Exposed via gRPC for sandboxes to delete volatile state in bulk.
+
+        Args:
+            appId: The ID of the application.
+            keys: The keys to delete.
+
+        Returns:
+            The number of keys deleted, or 0 on error.
+        """
+        print(f"CoreFrameworkAPI received request to delete {len(keys)} runtime state keys for app '{appId}'.") # Basic logging
+        try:
+            return await self.state_manager.delete_runtime_values(appId, keys) # TODO: Return a gRPC response (Issue #XX)
+        except Exception as e:
+            print(f"Error deleting runtime state keys for app '{appId}': {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            # TODO: Return a gRPC error response (Issue #XX)
+            return 0
+
+
+    async def get_definition_file(self, appId: str, path: str, revision: Optional[str] = None) -> Optional[str]: # TODO: Define gRPC method signature and return type (Issue #XX)
         """
         Retrieves the content of a definition file for an application from the StateManager.
         Exposed via gRPC for sandboxes to access definition/config files.
@@ -250,13 +407,14 @@ class CoreFrameworkAPI(CoreFrameworkAPIInterface):
         Args:
             appId: The ID of the application.
             path: The path to the file relative to the application's definition root.
+            revision: Optional commit hash or ref to read a consistent snapshot from; defaults to the current working tree.
 
         Returns:
             The content of the file as a string, or None/error if not found or an error occurs.
         """
         print(f"CoreFrameworkAPI received request for definition file '{path}' for app '{appId}'.") # Basic logging
         try:
-            content = await self.state_manager.get_definition_file_content(appId, path)
+            content = await self.state_manager.get_definition_file_content(appId, path, revision)
             print(f"CoreFrameworkAPI returning definition file content for '{path}'.") # Basic logging
             return content # TODO: Return content in a gRPC response object (Issue #XX)
         except Exception as e:
@@ -289,16 +447,19 @@ class CoreFrameworkAPI(CoreFrameworkAPIInterface):
             return ToolResult(tool_use_id=tool_call.tool_use_id, content=f"Error executing tool: {e}", is_error=True)
 
 
-    async def publish_event(self, event: Event): # TODO: Define gRPC method signature (Issue #XX)
+    async def publish_event(self, appId: str, event: Event): # TODO: Define gRPC method signature (Issue #XX)
         """
         Publishes an event received from a sandbox via the EventBus.
-        Exposed via gRPC for sandboxes to publish events.
+        Exposed via gRPC for sandboxes to publish events. The event is published under the
+        application's own "app.<appId>." namespace.
 
         Args:
+            appId: The ID of the application whose sandbox publishes the event.
             event: The Event object received from the sandbox.
         """
         print(f"CoreFrameworkAPI received request to publish event: {event.event_type}.") # Basic logging
         try:
+            event.event_type = app_topic(appId, event.event_type)
             await self.event_bus.publish(event)
             print(f"CoreFrameworkAPI successfully published event: {event.event_type}.") # Basic logging
             # TODO: Return a gRPC response (e.g., Empty or status) (Issue #XX)
@@ -308,6 +469,23 @@ class CoreFrameworkAPI(CoreFrameworkAPIInterface):
             # TODO: Return a gRPC error response (Issue #XX)
 
 
+    async def subscribe_to_events(self, appId: str, event_type: str, handler: Callable) -> Dict[str, Any]: # TODO: Define gRPC method signature (Issue #XX)
+        """
+        Subscribes a handler to events on behalf of an application.
+        Subscriptions to another application's "app.<appId>..." events require that application's inter-app permission.
+
+        Args:
+            appId: The ID of the subscribing application.
+            event_type: The event type or pattern (see EventBus.subscribe).
+            handler: The callable receiving the events, e.g. one forwarding them to the application's sandbox.
+
+        Returns:
+            A dictionary with "success" and, on failure, "message".
+        """
+        print(f"CoreFrameworkAPI received request from '{appId}' to subscribe to events: {event_type}.") # Basic logging
+        return await self.event_bus.subscribe(event_type, handler, app_id=appId)
+
+
     # TODO: Add internal methods for interacting with core services (Issue #XX)
     # TODO: Implement the actual gRPC server logic to expose these methods (Issue #XX)
     # This would involve using grpcio.aio.server and adding the generated service to it.
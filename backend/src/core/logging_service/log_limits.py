@@ -0,0 +1,199 @@
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+import logging
+import threading
+import time
+import zlib
+
+# Defaults for log rate limits and sampling; override via the limit_config argument of LoggingService
+DEFAULT_LOG_LIMIT_CONFIG: Dict[str, Any] = {
+    # Token buckets for application log messages: a sustained rate per second plus a burst allowance
+    "app_rate_per_second": 200.0,
+    "app_burst": 1000,
+    "component_rate_per_second": 50.0,
+    "component_burst": 250,
+    "app_overrides": {}, # app_id -> {"rate_per_second": ..., "burst": ...}
+    # Fraction of traces whose messages are kept. The decision is a hash of the traceId, so a sampled
+    # trace keeps all of its messages (framework and application); messages without a traceId are kept.
+    "trace_sample_rate": 1.0,
+    "bypass_level": "error", # Messages at or above this level skip sampling and rate limits
+    "max_tracked_buckets": 10000, # Least recently used buckets beyond this are dropped (a new bucket starts full)
+    "suppressed_apps_reported": 10,
+}
+
+
+class TokenBucket:
+    """A token bucket: holds up to burst tokens, refilled at rate_per_second."""
+    __slots__ = ("rate_per_second", "burst", "tokens", "updated")
+
+    def __init__(self, rate_per_second: float, burst: float, now: float):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.tokens = burst
+        self.updated = now
+
+    def refill(self, now: float) -> float:
+        """Adds the tokens accrued since the last refill and returns the current number of tokens."""
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate_per_second)
+        self.updated = now
+        return self.tokens
+
+
+class LogLimiter:
+    """
+    Decides which log messages LoggingService keeps.
+
+    Every message is subject to deterministic trace sampling. Application messages additionally draw one
+    token from their app's bucket and one from their component's bucket; a message is suppressed if
+    either is empty. Messages at or above bypass_level are always kept. Suppressed messages are counted
+    per reason and per app.
+    """
+    def __init__(self, app_rate_per_second: float = 200.0, app_burst: float = 1000, component_rate_per_second: float = 50.0,
+                 component_burst: float = 250, app_overrides: Optional[Dict[str, Dict[str, float]]] = None,
+                 trace_sample_rate: float = 1.0, bypass_level: str = "error", max_tracked_buckets: int = 10000,
+                 suppressed_apps_reported: int = 10):
+        """
+        Initializes the limiter.
+
+        Args:
+            app_rate_per_second: Sustained application messages per second per app.
+            app_burst: Messages an app may log at once before the rate applies.
+            component_rate_per_second: Sustained application messages per second per component of an app.
+            component_burst: Messages a component may log at once before the rate applies.
+            app_overrides: Per-app rate_per_second/burst replacing the app defaults.
+            trace_sample_rate: Fraction of traceIds whose messages are kept, between 0 and 1.
+            bypass_level: Level name at or above which messages are never suppressed.
+            max_tracked_buckets: Maximum number of token buckets kept.
+            suppressed_apps_reported: Number of apps with the most suppressed messages listed in get_stats().
+        """
+        self.app_rate_per_second = app_rate_per_second
+        self.app_burst = app_burst
+        self.component_rate_per_second = component_rate_per_second
+        self.component_burst = component_burst
+        self.app_overrides = app_overrides or {}
+        self.trace_sample_rate = min(1.0, max(0.0, trace_sample_rate))
+        self._sample_threshold = int(self.trace_sample_rate * 0xFFFFFFFF)
+        self.bypass_level = getattr(logging, bypass_level.upper(), logging.ERROR)
+        self.max_tracked_buckets = max(1, max_tracked_buckets)
+        self.suppressed_apps_reported = suppressed_apps_reported
+        self._buckets: "OrderedDict[Tuple[str, ...], TokenBucket]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._counts = {"kept": 0, "bypassed": 0, "sampled_out": 0, "rate_limited_app": 0, "rate_limited_component": 0}
+        self._suppressed_by_app: Dict[str, int] = {}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> "LogLimiter":
+        """
+        Builds a limiter from DEFAULT_LOG_LIMIT_CONFIG merged with overrides.
+
+        Args:
+            config: Optional overrides (see DEFAULT_LOG_LIMIT_CONFIG).
+
+        Returns:
+            The LogLimiter.
+        """
+        config = {**DEFAULT_LOG_LIMIT_CONFIG, **(config or {})}
+        return cls(config["app_rate_per_second"], config["app_burst"], config["component_rate_per_second"], config["component_burst"],
+                   config["app_overrides"], config["trace_sample_rate"], config["bypass_level"], config["max_tracked_buckets"],
+                   config["suppressed_apps_reported"])
+
+    def is_trace_sampled(self, traceId: Optional[str]) -> bool:
+        """
+        Returns whether messages of a trace are kept. The same traceId always gives the same answer.
+
+        Args:
+            traceId: The trace ID, or None.
+
+        Returns:
+            True if the trace is sampled (or there is no traceId).
+        """
+        if traceId is None or self.trace_sample_rate >= 1.0:
+            return True
+        return zlib.crc32(traceId.encode("utf-8")) <= self._sample_threshold
+
+    def admit_framework(self, level: int, traceId: Optional[str] = None) -> bool:
+        """
+        Decides whether to keep a framework message (trace sampling only).
+
+        Args:
+            level: The numeric logging level.
+            traceId: The message's trace ID.
+
+        Returns:
+            True if the message should be logged.
+        """
+        return self._admit(level, traceId, None, None)
+
+    def admit_application(self, level: int, appId: Optional[str], component_name: Optional[str], traceId: Optional[str] = None) -> bool:
+        """
+        Decides whether to keep an application message (trace sampling and rate limits).
+
+        Args:
+            level: The numeric logging level.
+            appId: The application that logged the message.
+            component_name: The component that logged the message.
+            traceId: The message's trace ID.
+
+        Returns:
+            True if the message should be logged.
+        """
+        return self._admit(level, traceId, appId or "unknown", component_name or "unknown")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns limiter counters.
+
+        Returns:
+            A dictionary with kept, bypassed, sampled_out, rate_limited_app, rate_limited_component, suppressed
+            (their total), tracked_buckets and top_suppressed_apps (app_id -> suppressed messages, highest first).
+        """
+        with self._lock:
+            counts = dict(self._counts)
+            top = sorted(self._suppressed_by_app.items(), key=lambda item: item[1], reverse=True)[:self.suppressed_apps_reported]
+            tracked = len(self._buckets)
+        suppressed = counts["sampled_out"] + counts["rate_limited_app"] + counts["rate_limited_component"]
+        return {**counts, "suppressed": suppressed, "tracked_buckets": tracked, "top_suppressed_apps": dict(top)}
+
+    def _admit(self, level: int, traceId: Optional[str], app_id: Optional[str], component_name: Optional[str]) -> bool:
+        """Applies bypass, sampling and (for application messages) rate limits, and counts the outcome."""
+        with self._lock:
+            if level >= self.bypass_level:
+                self._counts["bypassed"] += 1
+                return True
+            reason = None
+            if not self.is_trace_sampled(traceId):
+                reason = "sampled_out"
+            elif app_id is not None:
+                now = time.monotonic()
+                app_bucket = self._bucket((app_id,), now)
+                component_bucket = self._bucket((app_id, component_name), now)
+                if app_bucket.refill(now) < 1:
+                    reason = "rate_limited_app"
+                elif component_bucket.refill(now) < 1:
+                    reason = "rate_limited_component"
+                else:
+                    app_bucket.tokens -= 1
+                    component_bucket.tokens -= 1
+            if reason is None:
+                self._counts["kept"] += 1
+                return True
+            self._counts[reason] += 1
+            if app_id is not None:
+                self._suppressed_by_app[app_id] = self._suppressed_by_app.get(app_id, 0) + 1
+            return False
+
+    def _bucket(self, key: Tuple[str, ...], now: float) -> TokenBucket:
+        """Returns the bucket for an app (1-tuple) or app component (2-tuple), creating it full. Caller holds self._lock."""
+        bucket = self._buckets.get(key)
+        if bucket is not None:
+            self._buckets.move_to_end(key)
+            return bucket
+        if len(key) == 1:
+            override = self.app_overrides.get(key[0], {})
+            bucket = TokenBucket(override.get("rate_per_second", self.app_rate_per_second), override.get("burst", self.app_burst), now)
+        else:
+            bucket = TokenBucket(self.component_rate_per_second, self.component_burst, now)
+        self._buckets[key] = bucket
+        if len(self._buckets) > self.max_tracked_buckets:
+            self._buckets.popitem(last=False)
+        return bucket
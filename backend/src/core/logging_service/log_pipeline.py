@@ -0,0 +1,203 @@
+from typing import Optional, Dict, Any, List, Callable
+from collections import deque
+import asyncio
+import threading
+import time
+
+# Defaults for the asynchronous log pipeline; override via the pipeline_config argument of LoggingService
+DEFAULT_LOG_PIPELINE_CONFIG: Dict[str, Any] = {
+    "capacity": 10000, # Records buffered between producers and the writer thread
+    "batch_size": 256, # Records handed to the writer per call
+    "flush_interval_seconds": 0.05, # The writer wakes up at least this often
+    # What happens to a new record while the buffer is full:
+    #   "drop_oldest" - the ring buffer overwrites the oldest record
+    #   "drop"        - the new record is dropped
+    #   "sample"      - above sample_threshold, only every sample_rate-th record is kept; at capacity, new records are dropped
+    #   "block"       - async producers wait up to block_timeout_seconds for space, then drop
+    "overflow_policy": "drop_oldest",
+    "sample_threshold": 0.5, # Fraction of capacity at which the "sample" policy starts sampling
+    "sample_rate": 10,
+    "block_timeout_seconds": 1.0,
+}
+
+OVERFLOW_POLICIES = ("drop_oldest", "drop", "sample", "block")
+
+
+class AsyncLogPipeline:
+    """
+    Moves log records from producers (the event loop) to a background writer thread through a bounded
+    in-memory ring buffer, so formatting and I/O never run on the event loop.
+
+    submit() only appends to a deque (thread-safe without a lock) and, once a batch is ready, wakes the
+    writer. The writer drains the buffer in batches of batch_size and passes each batch to write_batch.
+    When the buffer is full the overflow policy decides what is lost; every loss is counted.
+    """
+    def __init__(self, write_batch: Callable[[List[Any]], None], capacity: int = 10000, batch_size: int = 256,
+                 flush_interval_seconds: float = 0.05, overflow_policy: str = "drop_oldest", sample_threshold: float = 0.5,
+                 sample_rate: int = 10, block_timeout_seconds: float = 1.0, name: str = "log-pipeline"):
+        """
+        Initializes the pipeline and starts its writer thread.
+
+        Args:
+            write_batch: Called on the writer thread with each batch of records, in submission order.
+            capacity: Maximum number of buffered records.
+            batch_size: Maximum number of records per write_batch call.
+            flush_interval_seconds: Maximum time a record waits before the writer wakes up.
+            overflow_policy: One of OVERFLOW_POLICIES.
+            sample_threshold: Fraction of capacity above which the "sample" policy samples.
+            sample_rate: Keep one of this many records while sampling.
+            block_timeout_seconds: How long the "block" policy waits for space before dropping.
+            name: Name of the writer thread.
+        """
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy '{overflow_policy}'; expected one of {', '.join(OVERFLOW_POLICIES)}")
+        self.capacity = max(1, capacity)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval_seconds = flush_interval_seconds
+        self.overflow_policy = overflow_policy
+        self.sample_threshold = max(1, int(self.capacity * sample_threshold))
+        self.sample_rate = max(1, sample_rate)
+        self.block_timeout_seconds = block_timeout_seconds
+        self._write_batch = write_batch
+        # With maxlen, append() on a full deque discards the oldest record: the ring buffer of "drop_oldest"
+        self._buffer: deque = deque(maxlen=self.capacity if overflow_policy == "drop_oldest" else None)
+        self._wakeup = threading.Event()
+        self._idle = threading.Event() # Set whenever the writer has nothing left to write
+        self._idle.set()
+        self._closed = False
+        self._sample_counter = 0
+        self._stats = {"submitted": 0, "written": 0, "batches": 0, "dropped_overflow": 0, "dropped_sampled": 0,
+                       "write_errors": 0, "high_water": 0}
+        self._writer = threading.Thread(target=self._run_writer, name=name, daemon=True)
+        self._writer.start()
+
+    @classmethod
+    def from_config(cls, write_batch: Callable[[List[Any]], None], config: Optional[Dict[str, Any]] = None) -> "AsyncLogPipeline":
+        """
+        Builds a pipeline from DEFAULT_LOG_PIPELINE_CONFIG merged with overrides.
+
+        Args:
+            write_batch: Called on the writer thread with each batch of records.
+            config: Optional overrides (see DEFAULT_LOG_PIPELINE_CONFIG).
+
+        Returns:
+            The started AsyncLogPipeline.
+        """
+        config = {**DEFAULT_LOG_PIPELINE_CONFIG, **(config or {})}
+        return cls(write_batch, config["capacity"], config["batch_size"], config["flush_interval_seconds"], config["overflow_policy"],
+                   config["sample_threshold"], config["sample_rate"], config["block_timeout_seconds"])
+
+    def submit(self, record: Any) -> bool:
+        """
+        Buffers a record without blocking. Under the "block" policy, a full buffer drops the record
+        here; use submit_async to wait for space instead.
+
+        Args:
+            record: The record to write.
+
+        Returns:
+            True if the record was buffered, False if it was dropped.
+        """
+        if self._closed:
+            return False
+        self._stats["submitted"] += 1
+        size = len(self._buffer)
+        if size >= self.capacity:
+            self._stats["dropped_overflow"] += 1
+            if self.overflow_policy != "drop_oldest": # Otherwise append() below overwrites the oldest record
+                return False
+        elif self.overflow_policy == "sample" and size >= self.sample_threshold:
+            self._sample_counter += 1
+            if self._sample_counter % self.sample_rate:
+                self._stats["dropped_sampled"] += 1
+                return False
+        self._buffer.append(record)
+        size = len(self._buffer)
+        if size > self._stats["high_water"]:
+            self._stats["high_water"] = size
+        if size >= self.batch_size:
+            self._wakeup.set()
+        self._idle.clear()
+        return True
+
+    async def submit_async(self, record: Any) -> bool:
+        """
+        Buffers a record; under the "block" policy, waits (without blocking the event loop) for space first.
+
+        Args:
+            record: The record to write.
+
+        Returns:
+            True if the record was buffered, False if it was dropped.
+        """
+        if self.overflow_policy == "block" and len(self._buffer) >= self.capacity and not self._closed:
+            self._wakeup.set()
+            deadline = time.monotonic() + self.block_timeout_seconds
+            while len(self._buffer) >= self.capacity and time.monotonic() < deadline:
+                await asyncio.sleep(0.001)
+        return self.submit(record)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wakes the writer and waits until everything buffered so far has been written.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            True if the buffer was drained within the timeout.
+        """
+        self._wakeup.set()
+        return self._idle.wait(timeout)
+
+    def close(self, timeout: Optional[float] = 5.0):
+        """
+        Stops accepting records, writes what is buffered and stops the writer thread.
+
+        Args:
+            timeout: Maximum seconds to wait for the writer.
+        """
+        self._closed = True
+        self._wakeup.set()
+        self._writer.join(timeout)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns pipeline counters.
+
+        Returns:
+            A dictionary with submitted, written, batches, dropped_overflow, dropped_sampled, write_errors,
+            high_water (largest buffer size seen), buffered (current size), capacity and overflow_policy.
+        """
+        return {**self._stats, "buffered": len(self._buffer), "capacity": self.capacity, "overflow_policy": self.overflow_policy}
+
+    def _run_writer(self):
+        """Writer thread: waits for a full batch or the flush interval, then drains the buffer."""
+        while True:
+            self._wakeup.wait(self.flush_interval_seconds)
+            self._wakeup.clear()
+            self._drain()
+            if self._closed:
+                self._drain() # Records submitted while the last drain ran
+                self._idle.set()
+                return
+
+    def _drain(self):
+        """Writes every buffered record, batch_size at a time."""
+        buffer = self._buffer
+        while buffer:
+            batch = []
+            try:
+                while len(batch) < self.batch_size:
+                    batch.append(buffer.popleft())
+            except IndexError:
+                pass # Buffer emptied
+            try:
+                self._write_batch(batch)
+                self._stats["written"] += len(batch)
+            except Exception as e:
+                self._stats["write_errors"] += 1
+                print(f"Error writing {len(batch)} log records: {e}") # Basic logging
+            self._stats["batches"] += 1
+        if not buffer:
+            self._idle.set()
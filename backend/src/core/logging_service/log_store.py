@@ -0,0 +1,258 @@
+from typing import Optional, Dict, Any, List, Tuple
+import json
+import os
+import sqlite3
+import threading
+import time
+
+# Defaults for the local log store; override via the store_config argument of LoggingService
+DEFAULT_LOG_STORE_CONFIG: Dict[str, Any] = {
+    "path": None, # Directory holding the segment files; None disables the store
+    "segment_seconds": 3600, # Each segment file holds the messages of one time window
+    "retention_seconds": 7 * 24 * 3600, # Segments whose window ended longer ago than this are deleted
+    "max_total_bytes": 10 * 1024 ** 3, # Oldest segments are deleted while the store is larger than this
+    "retention_interval_seconds": 60.0,
+    "max_query_results": 1000,
+}
+
+_SEGMENT_PREFIX = "logs-"
+_SEGMENT_SUFFIX = ".sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS logs (
+    ts REAL NOT NULL,
+    level INTEGER NOT NULL,
+    trace_id TEXT,
+    app_id TEXT,
+    component TEXT,
+    request_id TEXT,
+    line TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS logs_trace ON logs (trace_id, ts) WHERE trace_id IS NOT NULL;
+CREATE INDEX IF NOT EXISTS logs_app ON logs (app_id, ts);
+CREATE INDEX IF NOT EXISTS logs_component ON logs (component, ts);
+CREATE INDEX IF NOT EXISTS logs_level ON logs (level, ts);
+CREATE INDEX IF NOT EXISTS logs_ts ON logs (ts);
+"""
+
+# A stored row: (ts, level, trace_id, app_id, component, request_id, line)
+LogRow = Tuple[float, int, Optional[str], Optional[str], Optional[str], Optional[str], str]
+
+
+class LogStore:
+    """
+    An append-only log store made of SQLite segment files, one per time window (segment_seconds).
+
+    Each segment indexes traceId, appId, component, level and timestamp, so lookups are index seeks
+    in the few segments a query's time range covers. Retention deletes whole segment files (by age and
+    by total size) instead of deleting rows. append() is called from LoggingService's log writer thread;
+    queries open their own read-only connections and can run concurrently with it (WAL mode).
+    """
+    def __init__(self, path: str, segment_seconds: int = 3600, retention_seconds: float = 7 * 24 * 3600,
+                 max_total_bytes: int = 10 * 1024 ** 3, max_query_results: int = 1000):
+        """
+        Initializes the store, creating its directory if needed.
+
+        Args:
+            path: Directory holding the segment files.
+            segment_seconds: Length of the time window of one segment.
+            retention_seconds: Maximum age of a segment (measured from the end of its window).
+            max_total_bytes: Maximum total size of all segments.
+            max_query_results: Upper bound for the limit of a query.
+        """
+        self.path = path
+        self.segment_seconds = max(1, int(segment_seconds))
+        self.retention_seconds = retention_seconds
+        self.max_total_bytes = max_total_bytes
+        self.max_query_results = max_query_results
+        os.makedirs(path, exist_ok=True)
+        self._writers: Dict[int, sqlite3.Connection] = {} # Window start -> write connection (owned by the writer thread)
+        self._lock = threading.Lock() # Serializes appends with segment deletion
+        self._stats = {"appended": 0, "segments_deleted": 0}
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> Optional["LogStore"]:
+        """
+        Builds a store from DEFAULT_LOG_STORE_CONFIG merged with overrides.
+
+        Args:
+            config: Optional overrides (see DEFAULT_LOG_STORE_CONFIG).
+
+        Returns:
+            The LogStore, or None if no path is configured.
+        """
+        config = {**DEFAULT_LOG_STORE_CONFIG, **(config or {})}
+        if not config["path"]:
+            return None
+        return cls(config["path"], config["segment_seconds"], config["retention_seconds"], config["max_total_bytes"],
+                   config["max_query_results"])
+
+    def append(self, rows: List[LogRow]):
+        """
+        Appends rows, each to the segment of its timestamp's window, in one transaction per segment.
+
+        Args:
+            rows: The rows to store.
+        """
+        by_window: Dict[int, List[LogRow]] = {}
+        for row in rows:
+            by_window.setdefault(self._window(row[0]), []).append(row)
+        with self._lock:
+            for window, window_rows in by_window.items():
+                connection = self._writer(window)
+                with connection:
+                    connection.executemany("INSERT INTO logs VALUES (?, ?, ?, ?, ?, ?, ?)", window_rows)
+            self._stats["appended"] += len(rows)
+            # Keep write connections only for the two newest windows (late messages of the previous window)
+            for window in sorted(self._writers)[:-2]:
+                self._writers.pop(window).close()
+
+    def query(self, traceId: Optional[str] = None, appId: Optional[str] = None, componentId: Optional[str] = None,
+              level: Optional[int] = None, since: Optional[float] = None, until: Optional[float] = None,
+              limit: int = 100) -> List[Dict[str, Any]]:
+        """
+        Returns stored messages matching all given filters, newest first.
+
+        Args:
+            traceId: Only messages of this trace.
+            appId: Only messages of this application.
+            componentId: Only messages of this component.
+            level: Only messages at or above this numeric logging level.
+            since: Only messages logged at or after this Unix timestamp.
+            until: Only messages logged before this Unix timestamp.
+            limit: Maximum number of messages (capped at max_query_results).
+
+        Returns:
+            The messages as dictionaries, in the same JSON structure as the console output.
+        """
+        limit = max(0, min(limit, self.max_query_results))
+        conditions, params = [], []
+        for column, value in (("trace_id", traceId), ("app_id", appId), ("component", componentId)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        if level is not None:
+            conditions.append("level >= ?")
+            params.append(level)
+        if since is not None:
+            conditions.append("ts >= ?")
+            params.append(since)
+        if until is not None:
+            conditions.append("ts < ?")
+            params.append(until)
+        # With a level filter, "+ts" stops SQLite from preferring to scan the ts index for the ordering over seeking the level index
+        order = "+ts" if level is not None else "ts"
+        sql = "SELECT line FROM logs" + (" WHERE " + " AND ".join(conditions) if conditions else "") + f" ORDER BY {order} DESC LIMIT ?"
+        results: List[Dict[str, Any]] = []
+        for window, segment_path in reversed(self._segments()):
+            if len(results) >= limit:
+                break
+            if since is not None and window + self.segment_seconds <= since:
+                break # This and all older segments end before the range
+            if until is not None and window >= until:
+                continue
+            try:
+                connection = sqlite3.connect(f"file:{segment_path}?mode=ro", uri=True)
+            except sqlite3.OperationalError:
+                continue # Deleted by retention since listing
+            try:
+                for (line,) in connection.execute(sql, (*params, limit - len(results))):
+                    results.append(json.loads(line))
+            except sqlite3.OperationalError as e:
+                print(f"Error querying log segment {segment_path}: {e}") # Basic logging
+            finally:
+                connection.close()
+        return results
+
+    def enforce_retention(self, now: Optional[float] = None) -> int:
+        """
+        Deletes segments older than retention_seconds, then the oldest segments while the store exceeds
+        max_total_bytes. The newest segment is never deleted.
+
+        Args:
+            now: The current Unix time (for tests).
+
+        Returns:
+            The number of deleted segments.
+        """
+        now = time.time() if now is None else now
+        with self._lock:
+            segments = self._segments()
+            sizes = {window: self._segment_size(segment_path) for window, segment_path in segments}
+            total = sum(sizes.values())
+            deleted = 0
+            for window, segment_path in segments[:-1]:
+                expired = window + self.segment_seconds + self.retention_seconds <= now
+                if not expired and total <= self.max_total_bytes:
+                    break
+                writer = self._writers.pop(window, None)
+                if writer is not None:
+                    writer.close()
+                for suffix in ("", "-wal", "-shm"):
+                    try:
+                        os.remove(segment_path + suffix)
+                    except FileNotFoundError:
+                        pass
+                total -= sizes[window]
+                deleted += 1
+            self._stats["segments_deleted"] += deleted
+        return deleted
+
+    def close(self):
+        """Closes the write connections."""
+        with self._lock:
+            for connection in self._writers.values():
+                connection.close()
+            self._writers.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns store counters.
+
+        Returns:
+            A dictionary with appended, segments_deleted, segments and total_bytes.
+        """
+        segments = self._segments()
+        return {**self._stats, "segments": len(segments),
+                "total_bytes": sum(self._segment_size(segment_path) for _, segment_path in segments)}
+
+    def _window(self, ts: float) -> int:
+        """Returns the start of the time window a timestamp falls into."""
+        return int(ts // self.segment_seconds) * self.segment_seconds
+
+    def _writer(self, window: int) -> sqlite3.Connection:
+        """Returns the write connection of a window's segment, creating the segment if needed. Caller holds self._lock."""
+        connection = self._writers.get(window)
+        if connection is None:
+            connection = sqlite3.connect(self._segment_path(window), check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.executescript(_SCHEMA)
+            self._writers[window] = connection
+        return connection
+
+    def _segment_path(self, window: int) -> str:
+        return os.path.join(self.path, f"{_SEGMENT_PREFIX}{window}{_SEGMENT_SUFFIX}")
+
+    def _segments(self) -> List[Tuple[int, str]]:
+        """Returns (window start, path) of every segment, oldest first."""
+        segments = []
+        for name in os.listdir(self.path):
+            if name.startswith(_SEGMENT_PREFIX) and name.endswith(_SEGMENT_SUFFIX):
+                try:
+                    window = int(name[len(_SEGMENT_PREFIX):-len(_SEGMENT_SUFFIX)])
+                except ValueError:
+                    continue
+                segments.append((window, os.path.join(self.path, name)))
+        return sorted(segments)
+
+    @staticmethod
+    def _segment_size(segment_path: str) -> int:
+        """Returns the size of a segment including its WAL file."""
+        size = 0
+        for suffix in ("", "-wal"):
+            try:
+                size += os.path.getsize(segment_path + suffix)
+            except OSError:
+                pass
+        return size
@@ -1,6 +1,8 @@
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
+import asyncio
 import json
 import logging
+import time
 from datetime import datetime # Needed for timestamp if not provided in LogMessage
 
 # Import necessary data models from core.shared.data_models
@@ -8,6 +10,10 @@ from core.shared.data_models.data_models import LogMessage # Assuming LogMessage
 
 from core.interfaces.logging_service_interface import LoggingServiceInterface
 
+from backend.src.core.logging_service.log_limits import LogLimiter
+from backend.src.core.logging_service.log_pipeline import AsyncLogPipeline
+from backend.src.core.logging_service.log_store import LogStore, DEFAULT_LOG_STORE_CONFIG
+
 # Custom JSON formatter for Python logging
 class JsonFormatter(logging.Formatter):
     """
@@ -31,7 +37,7 @@ class JsonFormatter(logging.Formatter):
             "timestamp": timestamp,
             "level": record.levelname.lower(),
             "message": record.getMessage(),
-            "component_name": record.name, # Use logger name as component_name by default
+            "component_name": getattr(record, 'component_name', record.name), # Use logger name as component_name by default
             # Mandatory context fields (will be populated from LogMessage metadata if available)
             "traceId": getattr(record, 'traceId', None),
             "appId": getattr(record, 'appId', None),
@@ -52,11 +58,23 @@ class LoggingService(LoggingServiceInterface):
     Provides structured logging capabilities for the Core Framework and application sandboxes.
     It collects, processes, and outputs log messages in a standardized JSON format.
     Uses Python's built-in logging module with a custom formatter.
+
+    Log calls only buffer the message in an AsyncLogPipeline; LogRecords are built, formatted and written
+    to the logger's handlers in batches on the pipeline's writer thread, so logging adds no formatting
+    or I/O time to request handling. A LogLimiter decides first which messages are kept (trace sampling
+    for all messages; per-app and per-component rate limits for application messages). If a store path is
+    configured, the writer thread also appends every written message to a queryable LogStore.
     """
-    def __init__(self):
+    def __init__(self, pipeline_config: Optional[Dict[str, Any]] = None, limit_config: Optional[Dict[str, Any]] = None,
+                 store_config: Optional[Dict[str, Any]] = None):
         """
         Configures the Python logger for structured JSON output to the console.
-        Initializes the root logger for the framework.
+        Initializes the root logger for the framework and starts the log pipeline.
+
+        Args:
+            pipeline_config: Optional overrides for the log pipeline (see DEFAULT_LOG_PIPELINE_CONFIG).
+            limit_config: Optional overrides for log sampling and rate limits (see DEFAULT_LOG_LIMIT_CONFIG).
+            store_config: Optional overrides for the local log store (see DEFAULT_LOG_STORE_CONFIG); it is enabled by setting "path".
         """
         self._logger = logging.getLogger("nexus_cocreate_ai") # Get a root logger for the framework
         self._logger.setLevel(logging.INFO) # Set default logging level (TODO: Make configurable - Issue #XX)
@@ -68,6 +86,14 @@ class LoggingService(LoggingServiceInterface):
             console_handler.setFormatter(formatter)
             self._logger.addHandler(console_handler)
 
+        store_config = {**DEFAULT_LOG_STORE_CONFIG, **(store_config or {})}
+        self._store = LogStore.from_config(store_config)
+        self._store_formatter = JsonFormatter()
+        self._retention_interval_seconds = store_config["retention_interval_seconds"]
+        self._retention_task: Optional[asyncio.Task] = None
+        self._pipeline = AsyncLogPipeline.from_config(self._write_records, pipeline_config)
+        self._limiter = LogLimiter.from_config(limit_config)
+
         print("LoggingService initialized with JSON console output.") # Basic logging
 
     async def log_framework_message(
@@ -95,6 +121,8 @@ class LoggingService(LoggingServiceInterface):
         """
         # Get the logging level from the string, default to INFO if invalid
         log_level = getattr(logging, level.upper(), logging.INFO)
+        if not self._logger.isEnabledFor(log_level) or not self._limiter.admit_framework(log_level, traceId):
+            return
 
         # Prepare extra context for the JsonFormatter
         extra_context = {
@@ -107,11 +135,11 @@ class LoggingService(LoggingServiceInterface):
         # Filter out None values from extra_context before passing to avoid clutter
         extra_context = {k: v for k, v in extra_context.items() if v is not None}
 
-        # Log the message using the configured logger
-        self._logger.log(log_level, message, extra=extra_context)
+        # Hand the message to the pipeline; the writer thread logs it using the configured logger
+        await self._enqueue(log_level, message, extra_context)
 
 
-    async def log_application_message(self, log_message: LogMessage):
+    async def log_application_message(self, log_message: LogMessage, component_name: Optional[str] = None):
         """
         Logs a structured message originating from an application sandbox.
         This method receives a LogMessage data model directly from the sandbox output.
@@ -119,15 +147,22 @@ class LoggingService(LoggingServiceInterface):
         Args:
             log_message: The LogMessage object received from the application sandbox.
                          This object is expected to contain fields like level, message,
-                         component_name, appId, requestId, taskId, context, and metadata.
+                         appId, requestId, taskId and context.
+            component_name: The application component that produced the message (e.g. the routed component ID).
+                            LogMessage has no component field of its own; one set on it takes precedence.
         """
+        # LogMessage does not define component_name or metadata; accept them if a producer sets them anyway
+        component_name = getattr(log_message, "component_name", None) or component_name
         # Get the logging level from the LogMessage object, default to INFO if invalid
         log_level = getattr(logging, log_message.level.upper(), logging.INFO)
+        # Sampling and per-app/per-component rate limits (disabled levels do not use up tokens); errors bypass both
+        if not self._logger.isEnabledFor(log_level) or not self._limiter.admit_application(log_level, log_message.appId, component_name, log_message.traceId):
+            return
 
         # Prepare extra context from the LogMessage data model for the JsonFormatter
         # The formatter is designed to pick up these fields from the 'extra' dict
         extra_context = {
-            'component_name': log_message.component_name,
+            'component_name': component_name,
             'traceId': log_message.traceId,
             'appId': log_message.appId,
             'requestId': log_message.requestId,
@@ -136,13 +171,190 @@ class LoggingService(LoggingServiceInterface):
             # Note: log_message.timestamp could be used, but the formatter uses record.created by default.
             # If the original application timestamp is critical, the formatter needs adjustment
             # or it should be included within the 'metadata' field.
-            'metadata': log_message.metadata # Pass metadata from the LogMessage
+            'metadata': getattr(log_message, "metadata", None) # Pass metadata if the producer attached any
         }
          # Filter out None values from extra_context before passing
         extra_context = {k: v for k, v in extra_context.items() if v is not None}
 
-        # Log the message using the configured logger
-        self._logger.log(log_level, log_message.message, extra=extra_context)
+        # Hand the message to the pipeline; the writer thread logs it using the configured logger
+        await self._enqueue(log_level, log_message.message, extra_context)
+
+
+    async def log_application_messages(self, log_messages: List[LogMessage], component_name: Optional[str] = None):
+        """
+        Logs a batch of structured messages from an application sandbox in one call,
+        e.g. all logs returned with one sandbox response.
+
+        Args:
+            log_messages: The LogMessage objects received from the application sandbox.
+            component_name: The application component that produced the messages (see log_application_message).
+        """
+        for log_message in log_messages:
+            await self.log_application_message(log_message, component_name)
+
+
+    async def query_logs(
+        self,
+        traceId: Optional[str] = None,
+        appId: Optional[str] = None,
+        componentId: Optional[str] = None,
+        level: Optional[str] = None,
+        since: Optional[float] = None,
+        until: Optional[float] = None,
+        limit: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Queries the local log store. Filters are combined; results are newest first.
+
+        Args:
+            traceId: Only messages of this trace.
+            appId: Only messages of this application.
+            componentId: Only messages of this component.
+            level: Only messages at or above this level (e.g. "warning"). Case-insensitive.
+            since: Only messages logged at or after this Unix timestamp.
+            until: Only messages logged before this Unix timestamp.
+            limit: Maximum number of messages.
+
+        Returns:
+            A dictionary with "success" and either "logs" (list of log entries) or "message".
+        """
+        if self._store is None:
+            return {"success": False, "message": "Log store is not enabled"}
+        min_level = None
+        if level is not None:
+            min_level = logging.getLevelName(level.upper())
+            if not isinstance(min_level, int):
+                return {"success": False, "message": f"Unknown log level '{level}'"}
+        try:
+            logs = await asyncio.to_thread(self._store.query, traceId, appId, componentId, min_level, since, until, limit)
+        except Exception as e:
+            print(f"Error querying log store: {e}") # Basic logging
+            return {"success": False, "message": f"Error querying logs: {e}"}
+        return {"success": True, "logs": logs}
+
+    def start_log_retention(self):
+        """Starts deleting log store segments beyond the retention limits. No-op without a store or if already running."""
+        if self._store is None or (self._retention_task is not None and not self._retention_task.done()):
+            return
+        self._retention_task = asyncio.create_task(self._run_log_retention())
+
+    async def _run_log_retention(self):
+        """Periodically applies the log store's age and size limits."""
+        while True:
+            try:
+                await asyncio.to_thread(self._store.enforce_retention)
+            except Exception as e:
+                print(f"Error applying log retention: {e}") # Basic logging
+            await asyncio.sleep(self._retention_interval_seconds)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every message logged so far has been written.
+
+        Args:
+            timeout: Maximum seconds to wait, or None to wait indefinitely.
+
+        Returns:
+            True if everything was written within the timeout.
+        """
+        return self._pipeline.flush(timeout)
+
+    async def close(self):
+        """Writes buffered messages, stops the log pipeline's writer thread and the retention task, and closes the log store."""
+        if self._retention_task is not None:
+            self._retention_task.cancel()
+            try:
+                await self._retention_task
+            except asyncio.CancelledError:
+                pass
+            self._retention_task = None
+        await asyncio.to_thread(self._pipeline.close)
+        if self._store is not None:
+            self._store.close()
+
+    def get_pipeline_stats(self) -> Dict[str, Any]:
+        """
+        Returns log pipeline counters (buffered, written and dropped messages).
+
+        Returns:
+            A dictionary as returned by AsyncLogPipeline.get_stats().
+        """
+        return self._pipeline.get_stats()
+
+    def get_limit_stats(self) -> Dict[str, Any]:
+        """
+        Returns log sampling and rate limit counters (kept, bypassed and suppressed messages).
+
+        Returns:
+            A dictionary as returned by LogLimiter.get_stats().
+        """
+        return self._limiter.get_stats()
+
+    def get_store_stats(self) -> Optional[Dict[str, Any]]:
+        """
+        Returns log store counters, or None if the store is not enabled.
+
+        Returns:
+            A dictionary as returned by LogStore.get_stats(), or None.
+        """
+        return self._store.get_stats() if self._store is not None else None
+
+    async def _enqueue(self, log_level: int, message: str, extra_context: Dict[str, Any]):
+        """Buffers a message for the writer thread."""
+        await self._pipeline.submit_async((time.time(), log_level, message, extra_context))
+
+    def _write_records(self, entries: List[tuple]):
+        """
+        Writes a batch of buffered messages to the logger's handlers and the log store. Runs on the pipeline's writer thread.
+
+        Stream handlers receive the whole batch in one write; other handlers are called per record.
+        """
+        records = []
+        for created, log_level, message, extra_context in entries:
+            record = self._logger.makeRecord(self._logger.name, log_level, "(unknown file)", 0, message, None, None, extra=extra_context)
+            record.created = created # When the message was logged, not when it was written
+            record.msecs = (created - int(created)) * 1000
+            if self._logger.filter(record):
+                records.append(record)
+        if not records:
+            return
+        for handler in self._handlers():
+            accepted = [record for record in records if record.levelno >= handler.level and handler.filter(record)]
+            if not accepted:
+                continue
+            if isinstance(handler, logging.StreamHandler) and getattr(handler, "stream", None) is not None:
+                text = handler.terminator.join(handler.format(record) for record in accepted) + handler.terminator
+                handler.acquire()
+                try:
+                    handler.stream.write(text)
+                    handler.flush()
+                finally:
+                    handler.release()
+            else:
+                for record in accepted:
+                    handler.handle(record)
+        if self._store is not None:
+            try:
+                self._store.append([
+                    (record.created, record.levelno, getattr(record, 'traceId', None), getattr(record, 'appId', None),
+                     getattr(record, 'component_name', None), getattr(record, 'requestId', None), self._store_formatter.format(record))
+                    for record in records
+                ])
+            except Exception as e:
+                print(f"Error appending {len(records)} messages to the log store: {e}") # Basic logging
+
+    def _handlers(self) -> List[logging.Handler]:
+        """Returns the handlers a record logged on the framework logger reaches, as Logger.callHandlers does."""
+        handlers = []
+        logger = self._logger
+        while logger:
+            handlers.extend(logger.handlers)
+            if not logger.propagate:
+                break
+            logger = logger.parent
+        if not handlers and logging.lastResort:
+            handlers.append(logging.lastResort)
+        return handlers
 
 
     # TODO: Add internal methods for configuring logging output (e.g., to file, remote endpoint) (Issue #XX)
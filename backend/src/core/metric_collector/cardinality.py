@@ -0,0 +1,128 @@
+from typing import Optional, Dict, Any, List, Tuple
+import threading
+import time
+
+# Defaults for bounding the number of time series per metric; override via the cardinality_config argument of MetricCollector
+DEFAULT_CARDINALITY_CONFIG: Dict[str, Any] = {
+    "default_max_series": 2000, # Label sets per metric; further ones are recorded under OVERFLOW_LABEL_VALUE
+    "max_series": {}, # Per-metric overrides: metric name -> max series
+    # Counter/histogram series that did not change for this long are removed. Gauges hold state and never expire. 0 disables expiry.
+    "series_ttl_seconds": 3600.0,
+    "sweep_interval_seconds": 60.0,
+}
+
+# Label value every label of a metric gets once the metric is at its series limit
+OVERFLOW_LABEL_VALUE = "__other__"
+
+
+class CardinalityGuard:
+    """
+    Tracks the label sets (series) of one labelled metric and bounds their number.
+
+    admit() is called when a handle binds label values it has not cached yet: known and new series under
+    the limit pass through, further new series are folded into a single overflow series whose label
+    values are all OVERFLOW_LABEL_VALUE. expire() removes series whose value has not changed for the
+    TTL (comparing against the previous sweep), so the hot path does no bookkeeping at all.
+    """
+    def __init__(self, name: str, kind: str, metric: Any, labelnames: Tuple[str, ...], max_series: int = 2000):
+        """
+        Initializes the guard.
+
+        Args:
+            name: The metric name.
+            kind: "counter", "gauge" or "histogram".
+            metric: The prometheus_client metric.
+            labelnames: The label names in the order the metric was created with.
+            max_series: Maximum number of series before new label sets overflow.
+        """
+        self.name = name
+        self.kind = kind
+        self.metric = metric
+        self.labelnames = labelnames
+        self.max_series = max(1, max_series)
+        self._overflow_key = tuple(OVERFLOW_LABEL_VALUE for _ in labelnames)
+        self._series: Dict[Tuple[str, ...], List[Any]] = {} # Label values -> [last seen value, time it last changed]
+        self._lock = threading.Lock()
+        self.overflowed = 0 # Binds redirected to the overflow series
+        self.expired = 0
+
+    def __len__(self) -> int:
+        return len(self._series)
+
+    def admit(self, labels: Dict[str, str]) -> Dict[str, str]:
+        """
+        Registers a label set and returns the labels to record it under.
+
+        Args:
+            labels: Label name -> value (stringified).
+
+        Returns:
+            The same labels, or the overflow labels if the metric is at its limit and this label set is new.
+        """
+        key = tuple(labels[name] for name in self.labelnames)
+        with self._lock:
+            if key in self._series:
+                return labels
+            if len(self._series) < self.max_series or key == self._overflow_key:
+                self._series[key] = [None, time.monotonic()]
+                return labels
+            self.overflowed += 1
+            if self._overflow_key not in self._series: # The overflow series does not count against the limit
+                self._series[self._overflow_key] = [None, time.monotonic()]
+        return dict(zip(self.labelnames, self._overflow_key))
+
+    def expire(self, ttl_seconds: float, now: Optional[float] = None) -> List[Tuple[str, ...]]:
+        """
+        Removes series whose value has not changed for ttl_seconds. Gauges are never expired.
+
+        Args:
+            ttl_seconds: How long a series may stay unchanged.
+            now: The current time.monotonic() value (for tests).
+
+        Returns:
+            The label values of the removed series.
+        """
+        if self.kind == "gauge" or ttl_seconds <= 0:
+            return []
+        now = time.monotonic() if now is None else now
+        current = self._current_values()
+        removed = []
+        with self._lock:
+            for key, state in list(self._series.items()):
+                value = current.get(key)
+                if value != state[0]:
+                    state[0], state[1] = value, now
+                elif now - state[1] >= ttl_seconds:
+                    del self._series[key]
+                    removed.append(key)
+        for key in removed:
+            try:
+                self.metric.remove(*key)
+            except KeyError:
+                pass # Never written (e.g. admitted but not yet flushed from a buffer)
+        self.expired += len(removed)
+        return removed
+
+    def forget(self):
+        """Drops all tracked series (after metric.clear())."""
+        with self._lock:
+            self._series.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns series counters.
+
+        Returns:
+            A dictionary with series, max_series, overflowed and expired.
+        """
+        return {"series": len(self._series), "max_series": self.max_series, "overflowed": self.overflowed, "expired": self.expired}
+
+    def _current_values(self) -> Dict[Tuple[str, ...], float]:
+        """Reads each series' activity value: a counter's total or a histogram's observation count."""
+        suffix = "_total" if self.kind == "counter" else "_count"
+        values = {}
+        for family in self.metric.collect():
+            for sample in family.samples:
+                if sample.name.endswith(suffix):
+                    values[tuple(sample.labels[name] for name in self.labelnames)] = sample.value
+        return values
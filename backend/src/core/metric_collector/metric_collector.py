@@ -1,4 +1,5 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Tuple, Sequence
+import asyncio
 import prometheus_client
 import threading # Potentially needed for running the metrics server in a separate thread
 import time # Potentially needed for timing metrics
@@ -7,6 +8,23 @@ import time # Potentially needed for timing metrics
 from core.shared.data_models.data_models import Metric # Assuming Metric data model exists (Issue #XX)
 
 from core.interfaces.metric_collector_interface import MetricCollectorInterface
+from backend.src.core.metric_collector.metric_handles import DEFAULT_METRIC_HANDLE_CONFIG, MetricHandle, MetricBuffer
+from backend.src.core.metric_collector.quantile_sketch import DDSketch, merge_sketches
+from backend.src.core.metric_collector.cardinality import DEFAULT_CARDINALITY_CONFIG, CardinalityGuard
+
+# Defaults for histograms; override via the histogram_config argument of MetricCollector
+DEFAULT_HISTOGRAM_CONFIG: Dict[str, Any] = {
+    # Bucket upper bounds per metric name, merged with overrides; other histograms use default_buckets
+    "buckets": {
+        "request_router_sandbox_execution_duration_seconds": [0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 45.0, 60.0],
+        "request_router_tool_call_duration_seconds": [0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0],
+    },
+    "default_buckets": None, # None uses prometheus_client's defaults (5 ms to 10 s)
+    # Histograms that also feed an in-process quantile sketch per label set (see get_quantiles)
+    "quantile_sketch_metrics": ["request_router_sandbox_execution_duration_seconds", "request_router_tool_call_duration_seconds"],
+    "sketch_relative_accuracy": 0.01, # Quantiles are within 1% of the true value
+    "sketch_max_bins": 2048,
+}
 
 class MetricCollector(MetricCollectorInterface):
     """
@@ -15,15 +33,41 @@ class MetricCollector(MetricCollectorInterface):
     to update counters, gauges, and histograms. Metrics can be exposed in Prometheus
     exposition format.
     """
-    def __init__(self):
+    def __init__(self, handle_config: Optional[Dict[str, Any]] = None, histogram_config: Optional[Dict[str, Any]] = None,
+                 cardinality_config: Optional[Dict[str, Any]] = None):
         """
         Initializes the MetricCollector with a Prometheus CollectorRegistry and internal dictionaries
         to keep track of registered metrics.
+
+        Args:
+            handle_config: Optional overrides for DEFAULT_METRIC_HANDLE_CONFIG (bound child cache size and buffering).
+            histogram_config: Optional overrides for DEFAULT_HISTOGRAM_CONFIG (per-metric buckets and quantile sketches).
+                              Per-metric "buckets" are merged with the defaults.
+            cardinality_config: Optional overrides for DEFAULT_CARDINALITY_CONFIG (series limits and expiry of stale series).
         """
         self._registry = prometheus_client.CollectorRegistry()
         self._counters: Dict[str, prometheus_client.Counter] = {}
         self._gauges: Dict[str, prometheus_client.Gauge] = {}
         self._histograms: Dict[str, prometheus_client.Histogram] = {}
+        self._labelnames: Dict[str, Tuple[str, ...]] = {} # Metric name -> label names it was created with
+        self.handle_config: Dict[str, Any] = {**DEFAULT_METRIC_HANDLE_CONFIG, **(handle_config or {})}
+        self._handles: Dict[Tuple[str, str, Tuple[str, ...]], MetricHandle] = {} # (kind, name, labelnames) -> handle
+        self._buffer: Optional[MetricBuffer] = MetricBuffer() if self.handle_config["buffer_flush_interval_seconds"] > 0 else None
+        self._buffer_flush_task: Optional[asyncio.Task] = None
+        histogram_config = histogram_config or {}
+        self.histogram_config: Dict[str, Any] = {**DEFAULT_HISTOGRAM_CONFIG, **histogram_config,
+                                                 "buckets": {**DEFAULT_HISTOGRAM_CONFIG["buckets"], **histogram_config.get("buckets", {})}}
+        self._sketched_metrics = set(self.histogram_config["quantile_sketch_metrics"])
+        self._sketches: Dict[str, Dict[Tuple[Tuple[str, str], ...], DDSketch]] = {} # Metric name -> sorted label items -> sketch
+        self._app_histogram_configs: Dict[str, Dict[str, Any]] = {} # app_id -> histogram settings last applied from its definition
+        self.cardinality_config: Dict[str, Any] = {**DEFAULT_CARDINALITY_CONFIG, **(cardinality_config or {})}
+        self._guards: Dict[str, CardinalityGuard] = {} # Labelled metric name -> guard bounding its series
+        self._series_expiry_task: Optional[asyncio.Task] = None
+        # Series counts per metric, exported with the metrics themselves (set on every scrape)
+        self._series_gauge = prometheus_client.Gauge("metric_collector_series", "Time series per metric", ["metric"], registry=self._registry)
+        self._series_limit_gauge = prometheus_client.Gauge("metric_collector_series_limit", "Series limit per metric", ["metric"], registry=self._registry)
+        self._series_overflow_gauge = prometheus_client.Gauge("metric_collector_series_overflowed", "Label sets recorded under the overflow series",
+                                                              ["metric"], registry=self._registry)
         print("MetricCollector initialized.") # Basic logging
         # TODO: Consider starting a separate thread/process for an HTTP server to expose metrics (Issue #XX)
         # if needed for direct scraping by Prometheus. For now, metrics can be generated
@@ -48,6 +92,7 @@ class MetricCollector(MetricCollectorInterface):
                 labelnames=labelnames,
                 registry=self._registry
             )
+            self._labelnames[name] = tuple(labelnames)
         return self._counters[name]
 
     def _get_or_create_gauge(self, name: str, labelnames: list[str]) -> prometheus_client.Gauge:
@@ -69,6 +114,7 @@ class MetricCollector(MetricCollectorInterface):
                 labelnames=labelnames,
                 registry=self._registry
             )
+            self._labelnames[name] = tuple(labelnames)
         return self._gauges[name]
 
     def _get_or_create_histogram(self, name: str, labelnames: list[str]) -> prometheus_client.Histogram:
@@ -84,15 +130,285 @@ class MetricCollector(MetricCollectorInterface):
         """
         if name not in self._histograms:
             print(f"Creating new histogram metric: {name} with labels {labelnames}") # Basic logging
-            # TODO: Define appropriate buckets based on expected values for different metrics (Issue #XX)
+            buckets = self.histogram_config["buckets"].get(name) or self.histogram_config["default_buckets"]
             self._histograms[name] = prometheus_client.Histogram(
                 name,
                 f'Histogram metric for {name}', # TODO: Add more descriptive help text (Issue #XX)
                 labelnames=labelnames,
-                registry=self._registry
+                registry=self._registry,
+                **({"buckets": buckets} if buckets else {})
             )
+            self._labelnames[name] = tuple(labelnames)
         return self._histograms[name]
 
+    def counter(self, name: str, labelnames: Sequence[str] = ()) -> MetricHandle:
+        """
+        Returns a handle for a counter metric with fixed label names, creating the metric if needed.
+        Use handle.bind(*label_values).inc() on hot paths instead of increment_counter.
+
+        Args:
+            name: The name of the counter metric.
+            labelnames: The label names, in the order bind() takes their values.
+
+        Returns:
+            The cached MetricHandle.
+
+        Raises:
+            ValueError: If the metric already exists with a different set of label names.
+        """
+        return self._get_handle("counter", name, tuple(labelnames))
+
+    def gauge(self, name: str, labelnames: Sequence[str] = ()) -> MetricHandle:
+        """
+        Returns a handle for a gauge metric with fixed label names, creating the metric if needed.
+        Gauge updates are never buffered.
+
+        Args:
+            name: The name of the gauge metric.
+            labelnames: The label names, in the order bind() takes their values.
+
+        Returns:
+            The cached MetricHandle.
+
+        Raises:
+            ValueError: If the metric already exists with a different set of label names.
+        """
+        return self._get_handle("gauge", name, tuple(labelnames))
+
+    def histogram(self, name: str, labelnames: Sequence[str] = ()) -> MetricHandle:
+        """
+        Returns a handle for a histogram metric with fixed label names, creating the metric if needed.
+
+        Args:
+            name: The name of the histogram metric.
+            labelnames: The label names, in the order bind() takes their values.
+
+        Returns:
+            The cached MetricHandle.
+
+        Raises:
+            ValueError: If the metric already exists with a different set of label names.
+        """
+        return self._get_handle("histogram", name, tuple(labelnames))
+
+    def _get_handle(self, kind: str, name: str, labelnames: Tuple[str, ...]) -> MetricHandle:
+        """Returns the cached handle for (kind, name, labelnames), creating the metric and handle on first use."""
+        handle = self._handles.get((kind, name, labelnames))
+        if handle is not None:
+            return handle
+        if name in self._labelnames and sorted(self._labelnames[name]) != sorted(labelnames):
+            raise ValueError(f"Metric {name} has labels {list(self._labelnames[name])}, not {list(labelnames)}")
+        create = {"counter": self._get_or_create_counter, "gauge": self._get_or_create_gauge, "histogram": self._get_or_create_histogram}[kind]
+        metric = create(name, list(labelnames))
+        guard = self._guards.get(name)
+        if guard is None and labelnames:
+            max_series = self.cardinality_config["max_series"].get(name, self.cardinality_config["default_max_series"])
+            guard = self._guards[name] = CardinalityGuard(name, kind, metric, self._labelnames[name], max_series)
+        sketch_for = (lambda labels: self._get_or_create_sketch(name, labels)) if kind == "histogram" and name in self._sketched_metrics else None
+        handle = MetricHandle(name, kind, metric, labelnames, self.handle_config["max_bound_children"], self._buffer, sketch_for, guard)
+        self._handles[(kind, name, labelnames)] = handle
+        return handle
+
+    def configure_histogram(self, name: str, buckets: Optional[Sequence[float]] = None, quantile_sketch: Optional[bool] = None):
+        """
+        Sets the buckets of a histogram and whether it feeds quantile sketches, e.g. from an application's
+        metric configuration. Must be called before the histogram is first used.
+
+        Args:
+            name: The name of the histogram metric.
+            buckets: Bucket upper bounds, or None to keep the configured ones.
+            quantile_sketch: Whether observations also feed per-label-set quantile sketches, or None to keep the setting.
+
+        Raises:
+            ValueError: If the histogram already exists.
+        """
+        if name in self._histograms:
+            raise ValueError(f"Histogram {name} already exists; its configuration can no longer change")
+        if buckets is not None:
+            self.histogram_config["buckets"][name] = sorted(buckets)
+        if quantile_sketch is True:
+            self._sketched_metrics.add(name)
+        elif quantile_sketch is False:
+            self._sketched_metrics.discard(name)
+
+    def apply_app_metric_config(self, app_id: str, metric_config: Optional[Dict[str, Any]]):
+        """
+        Applies the histogram settings of an application's metric configuration (the "metrics" entry of its
+        definition's config), e.g. {"histograms": {"my_latency_seconds": {"buckets": [0.1, 1.0], "quantile_sketch": True}}}.
+        Called whenever the app's definition is loaded; settings unchanged since the last call are skipped.
+        Histograms that already exist keep their configuration, and invalid settings are logged and ignored.
+
+        Args:
+            app_id: The ID of the application.
+            metric_config: The application's metric configuration, or None if it has none.
+        """
+        histograms = (metric_config or {}).get("histograms") or {}
+        if self._app_histogram_configs.get(app_id) == histograms:
+            return
+        self._app_histogram_configs[app_id] = histograms
+        for name, settings in histograms.items():
+            try:
+                self.configure_histogram(name, settings.get("buckets"), settings.get("quantile_sketch"))
+            except (ValueError, TypeError, AttributeError) as e:
+                print(f"Warning: Histogram configuration of {name} from app {app_id} not applied: {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+
+    def get_quantiles(self, name: str, labels: Optional[Dict[str, str]] = None,
+                      quantiles: Sequence[float] = (0.5, 0.95, 0.99)) -> Optional[Dict[str, Any]]:
+        """
+        Returns quantiles of a sketched histogram, computed locally (no Prometheus query), since startup.
+        Label sets matching `labels` are merged, so {"app_id": app_id} summarizes every component of an app.
+
+        Args:
+            name: The name of a histogram listed in quantile_sketch_metrics.
+            labels: Label values to match; None or {} merges every label set.
+            quantiles: The quantiles to compute.
+
+        Returns:
+            A dictionary with count, sum, min, max and "p50"/"p95"/"p99"-style keys, or None if nothing matched.
+        """
+        matching = [sketch for label_items, sketch in list(self._sketches.get(name, {}).items()) if _labels_match(label_items, labels)]
+        merged = matching[0] if len(matching) == 1 else merge_sketches(matching)
+        return merged.summary(quantiles) if merged else None
+
+    def get_quantiles_by_label(self, name: str, group_by: str, labels: Optional[Dict[str, str]] = None,
+                               quantiles: Sequence[float] = (0.5, 0.95, 0.99)) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns quantiles of a sketched histogram per value of one label, e.g. per component of an app.
+
+        Args:
+            name: The name of a histogram listed in quantile_sketch_metrics.
+            group_by: The label to group by (e.g. "component_id").
+            labels: Label values to match first (e.g. {"app_id": app_id}).
+            quantiles: The quantiles to compute.
+
+        Returns:
+            A dictionary mapping each value of group_by to a summary as returned by get_quantiles.
+        """
+        groups: Dict[str, List[DDSketch]] = {}
+        for label_items, sketch in list(self._sketches.get(name, {}).items()):
+            value = dict(label_items).get(group_by)
+            if value is not None and _labels_match(label_items, labels):
+                groups.setdefault(value, []).append(sketch)
+        return {value: merge_sketches(sketches).summary(quantiles) for value, sketches in groups.items()}
+
+    def _get_or_create_sketch(self, name: str, labels: Dict[str, str]) -> DDSketch:
+        """Returns the quantile sketch of a histogram's label set, creating it on first use."""
+        sketches = self._sketches.setdefault(name, {})
+        key = tuple(sorted(labels.items()))
+        sketch = sketches.get(key)
+        if sketch is None:
+            sketch = sketches[key] = DDSketch(self.histogram_config["sketch_relative_accuracy"], self.histogram_config["sketch_max_bins"])
+        return sketch
+
+    def expire_stale_series(self) -> int:
+        """
+        Removes counter and histogram series that did not change for series_ttl_seconds (see CardinalityGuard.expire),
+        together with their quantile sketches, and resets the bound children of affected metrics.
+
+        Returns:
+            The number of series removed.
+        """
+        ttl_seconds = self.cardinality_config["series_ttl_seconds"]
+        if ttl_seconds <= 0:
+            return 0
+        self.flush_buffered_metrics() # Buffered updates count as changes and must not land on removed children
+        removed_total = 0
+        for name, guard in list(self._guards.items()):
+            removed = guard.expire(ttl_seconds)
+            if not removed:
+                continue
+            removed_total += len(removed)
+            for handle in list(self._handles.values()):
+                if handle.name == name:
+                    handle.clear()
+            sketches = self._sketches.get(name)
+            if sketches:
+                for key in removed:
+                    sketches.pop(tuple(sorted(zip(guard.labelnames, key))), None)
+        if removed_total:
+            print(f"Expired {removed_total} stale metric series.") # Basic logging
+        return removed_total
+
+    def get_series_counts(self) -> Dict[str, Dict[str, Any]]:
+        """
+        Returns the current number of series of every labelled metric.
+
+        Returns:
+            A dictionary mapping metric name to its series, max_series, overflowed and expired counts.
+        """
+        return {name: guard.get_stats() for name, guard in self._guards.items()}
+
+    def start_series_expiry(self):
+        """
+        Starts the background task that expires stale series every sweep_interval_seconds.
+        Must be called from a running event loop (e.g., a FastAPI startup handler). A no-op when expiry is disabled.
+        """
+        if self.cardinality_config["series_ttl_seconds"] > 0 and (self._series_expiry_task is None or self._series_expiry_task.done()):
+            self._series_expiry_task = asyncio.create_task(self._run_series_expiry())
+
+    async def _run_series_expiry(self):
+        """Background loop for start_series_expiry."""
+        while True:
+            await asyncio.sleep(self.cardinality_config["sweep_interval_seconds"])
+            try:
+                self.expire_stale_series()
+            except Exception as e:
+                print(f"Error expiring stale metric series: {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+
+    def flush_buffered_metrics(self) -> int:
+        """
+        Applies buffered counter increments and histogram observations. A no-op when buffering is disabled.
+
+        Returns:
+            The number of updates applied.
+        """
+        return self._buffer.flush() if self._buffer else 0
+
+    def start_buffer_flusher(self):
+        """
+        Starts the background task that flushes buffered metrics every buffer_flush_interval_seconds.
+        Must be called from a running event loop (e.g., a FastAPI startup handler). A no-op when buffering is disabled.
+        """
+        if self._buffer and (self._buffer_flush_task is None or self._buffer_flush_task.done()):
+            self._buffer_flush_task = asyncio.create_task(self._run_buffer_flusher())
+
+    async def close(self):
+        """Stops the background tasks and applies any remaining buffered updates. Call once on application shutdown."""
+        for task in (self._buffer_flush_task, self._series_expiry_task):
+            if task is not None:
+                task.cancel()
+        self._buffer_flush_task = None
+        self._series_expiry_task = None
+        self.flush_buffered_metrics()
+
+    def get_handle_stats(self) -> Dict[str, Any]:
+        """
+        Returns counters of the metric handles and the update buffer.
+
+        Returns:
+            A dictionary with the number of handles, cached bound children and, if buffering is enabled, buffer stats.
+        """
+        stats: Dict[str, Any] = {
+            "handles": len(self._handles),
+            "bound_children": sum(handle.bound_children for handle in self._handles.values()),
+            "buffered": self._buffer is not None,
+        }
+        if self._buffer:
+            stats["buffer"] = self._buffer.get_stats()
+        return stats
+
+    async def _run_buffer_flusher(self):
+        """Background loop for start_buffer_flusher."""
+        while True:
+            await asyncio.sleep(self.handle_config["buffer_flush_interval_seconds"])
+            try:
+                self.flush_buffered_metrics()
+            except Exception as e:
+                print(f"Error flushing buffered metrics: {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+
     async def increment_counter(self, name: str, labels: Optional[Dict[str, str]] = None):
         """
         Increments a counter metric by 1.
@@ -101,13 +417,11 @@ class MetricCollector(MetricCollectorInterface):
             name: The name of the counter metric.
             labels: Optional dictionary of label key-value pairs.
         """
-        labelnames = list(labels.keys()) if labels else []
         try:
-            counter = self._get_or_create_counter(name, labelnames)
             if labels:
-                counter.labels(**labels).inc()
+                self.counter(name, tuple(labels)).bind(*labels.values()).inc()
             else:
-                counter.inc()
+                self.counter(name).bind().inc()
             # print(f"Incremented counter: {name} with labels {labels}") # Optional: Log every increment
         except Exception as e:
             print(f"Error incrementing counter {name} with labels {labels}: {e}") # Basic logging
@@ -123,13 +437,11 @@ class MetricCollector(MetricCollectorInterface):
             value: The value to set.
             labels: Optional dictionary of label key-value pairs.
         """
-        labelnames = list(labels.keys()) if labels else []
         try:
-            gauge = self._get_or_create_gauge(name, labelnames)
             if labels:
-                gauge.labels(**labels).set(value)
+                self.gauge(name, tuple(labels)).bind(*labels.values()).set(value)
             else:
-                gauge.set(value)
+                self.gauge(name).bind().set(value)
             # print(f"Set gauge: {name} to {value} with labels {labels}") # Optional: Log every set
         except Exception as e:
             print(f"Error setting gauge {name} to {value} with labels {labels}: {e}") # Basic logging
@@ -145,13 +457,11 @@ class MetricCollector(MetricCollectorInterface):
             value: The value to observe.
             labels: Optional dictionary of label key-value pairs.
         """
-        labelnames = list(labels.keys()) if labels else []
         try:
-            histogram = self._get_or_create_histogram(name, labelnames)
             if labels:
-                histogram.labels(**labels).observe(value)
+                self.histogram(name, tuple(labels)).bind(*labels.values()).observe(value)
             else:
-                histogram.observe(value)
+                self.histogram(name).bind().observe(value)
             # print(f"Observed histogram: {name} with value {value} and labels {labels}") # Optional: Log every observe
         except Exception as e:
             print(f"Error observing histogram {name} with value {value} and labels {labels}: {e}") # Basic logging
@@ -168,6 +478,11 @@ class MetricCollector(MetricCollectorInterface):
         """
         print("Generating latest metrics.") # Basic logging
         try:
+            self.flush_buffered_metrics() # Scrapes include updates still in the buffer
+            for name, guard in self._guards.items():
+                self._series_gauge.labels(name).set(len(guard))
+                self._series_limit_gauge.labels(name).set(guard.max_series)
+                self._series_overflow_gauge.labels(name).set(guard.overflowed)
             return prometheus_client.generate_latest(self._registry)
         except Exception as e:
             print(f"Error generating latest metrics: {e}") # Basic logging
@@ -177,3 +492,11 @@ class MetricCollector(MetricCollectorInterface):
     # TODO: Add methods for collecting system-level metrics if needed (CPU, memory, network) (Issue #XX)
     # This might involve using libraries like psutil.
     # TODO: Implement a push gateway integration or an internal HTTP server for scraping (Issue #XX)
+
+
+def _labels_match(label_items: Tuple[Tuple[str, str], ...], labels: Optional[Dict[str, str]]) -> bool:
+    """Whether a label set (sorted (name, value) pairs) has all the given label values."""
+    if not labels:
+        return True
+    present = dict(label_items)
+    return all(present.get(name) == str(value) for name, value in labels.items())
@@ -0,0 +1,231 @@
+from typing import Optional, Dict, Any, List, Tuple, Callable
+import threading
+
+# Defaults for metric handles; override via the handle_config argument of MetricCollector
+DEFAULT_METRIC_HANDLE_CONFIG: Dict[str, Any] = {
+    "max_bound_children": 10000, # Bound label children cached per handle; the oldest is dropped beyond this
+    # > 0 buffers counter increments and histogram observations and applies them this often. 0 writes through.
+    "buffer_flush_interval_seconds": 0.0,
+}
+
+
+class MetricHandle:
+    """
+    A metric with a fixed set of label names, as returned by MetricCollector.counter/gauge/histogram.
+
+    bind() resolves label values to the metric's child once and caches it, so emitting is a dict
+    lookup plus the child's inc/set/observe instead of prometheus_client's per-call label validation:
+
+        requests_total = collector.counter("requests_total", ("app_id", "component_id"))
+        requests_total.bind(app_id, component_id).inc()
+
+    Keep the bound child when the label values are known up front (e.g. per app).
+    """
+    __slots__ = ("name", "kind", "labelnames", "metric", "max_bound_children", "_buffer", "_sketch_for", "_guard", "_children")
+
+    def __init__(self, name: str, kind: str, metric: Any, labelnames: Tuple[str, ...], max_bound_children: int = 10000,
+                 buffer: Optional["MetricBuffer"] = None, sketch_for: Optional[Callable[[Dict[str, str]], Any]] = None,
+                 guard: Optional[Any] = None):
+        """
+        Initializes the handle. Use MetricCollector.counter/gauge/histogram instead of calling this directly.
+
+        Args:
+            name: The metric name.
+            kind: "counter", "gauge" or "histogram".
+            metric: The prometheus_client metric.
+            labelnames: The label names, in the order bind() takes their values.
+            max_bound_children: Maximum number of cached bound children.
+            buffer: Optional MetricBuffer that counter increments and histogram observations go through.
+            sketch_for: Optional function returning the quantile sketch for a label set; histogram observations are also added to it.
+            guard: Optional CardinalityGuard of the metric; it may redirect new label sets to an overflow series.
+        """
+        self.name = name
+        self.kind = kind
+        self.metric = metric
+        self.labelnames = labelnames
+        self.max_bound_children = max(1, max_bound_children)
+        self._buffer = buffer if kind != "gauge" else None # Gauges hold the last value, so they always write through
+        self._sketch_for = sketch_for if kind == "histogram" else None
+        self._guard = guard
+        self._children: Dict[Tuple[Any, ...], Any] = {}
+
+    def bind(self, *values: Any, **labels: Any) -> Any:
+        """
+        Returns the child for a set of label values, from the cache when possible.
+
+        Args:
+            *values: Label values in labelnames order (the fast form).
+            **labels: Label values by name, as an alternative to positional values.
+
+        Returns:
+            An object with the metric's methods (inc for counters; set/inc/dec for gauges; observe for histograms).
+
+        Raises:
+            ValueError: If the label values do not match the handle's label names.
+        """
+        key = values
+        if labels:
+            try:
+                key = tuple(labels[name] for name in self.labelnames)
+            except KeyError as e:
+                raise ValueError(f"Missing label {e} for metric {self.name}") from e
+            if values or len(labels) != len(self.labelnames):
+                raise ValueError(f"Metric {self.name} takes labels {list(self.labelnames)}, got {sorted(labels)}")
+        child = self._children.get(key)
+        if child is None:
+            child = self._bind_new(key)
+        return child
+
+    def forget(self, *values: Any):
+        """Drops a cached child, e.g. after its series was removed from the metric."""
+        self._children.pop(values, None)
+
+    def clear(self):
+        """Drops every cached child, so label values are resolved (and admitted by the guard) again on the next bind."""
+        self._children = {}
+
+    @property
+    def bound_children(self) -> int:
+        """The number of cached bound children."""
+        return len(self._children)
+
+    def _bind_new(self, key: Tuple[Any, ...]) -> Any:
+        """Resolves and caches the child for label values that are not cached yet."""
+        if len(key) != len(self.labelnames):
+            raise ValueError(f"Metric {self.name} takes labels {list(self.labelnames)}, got {len(key)} values")
+        labels = {name: str(value) for name, value in zip(self.labelnames, key)}
+        if self._guard is not None:
+            labels = self._guard.admit(labels)
+        # By name, so a handle's label order may differ from the order the metric was created with
+        child = self.metric.labels(**labels) if self.labelnames else self.metric
+        if self._buffer is not None:
+            child = _BufferedCounter(child, self._buffer) if self.kind == "counter" else _BufferedHistogram(child, self._buffer)
+        if self._sketch_for is not None:
+            child = _SketchedHistogram(child, self._sketch_for(labels))
+        if len(self._children) >= self.max_bound_children:
+            self._children.pop(next(iter(self._children))) # Drop the oldest; it is re-resolved if used again
+        self._children[key] = child
+        return child
+
+
+class _BufferShard:
+    """Pending updates recorded by one thread."""
+    __slots__ = ("lock", "counts", "observations")
+
+    def __init__(self):
+        self.lock = threading.Lock() # Only contended while the shard is being flushed
+        self.counts: Dict[Any, float] = {}
+        self.observations: Dict[Any, List[float]] = {}
+
+
+class MetricBuffer:
+    """
+    Accumulates counter increments and histogram observations in plain per-thread maps and applies them
+    to the prometheus_client children on flush(), taking the children's locks and histogram bucket
+    searches off the hot path. Scrapes see buffered updates only after the next flush.
+    """
+    def __init__(self):
+        """Initializes an empty buffer."""
+        self._local = threading.local()
+        self._shards: List[_BufferShard] = []
+        self._lock = threading.Lock()
+        self._flushes = 0
+        self._flushed_updates = 0
+
+    def add(self, child: Any, amount: float):
+        """Records a counter increment."""
+        shard = self._shard()
+        with shard.lock:
+            shard.counts[child] = shard.counts.get(child, 0.0) + amount
+
+    def observe(self, child: Any, value: float):
+        """Records a histogram observation."""
+        shard = self._shard()
+        with shard.lock:
+            values = shard.observations.get(child)
+            if values is None:
+                shard.observations[child] = [value]
+            else:
+                values.append(value)
+
+    def flush(self) -> int:
+        """
+        Applies all pending updates to their children.
+
+        Returns:
+            The number of updates applied (one per counter child, one per histogram observation).
+        """
+        with self._lock:
+            shards = list(self._shards)
+        applied = 0
+        for shard in shards:
+            with shard.lock:
+                counts, shard.counts = shard.counts, {}
+                observations, shard.observations = shard.observations, {}
+            for child, amount in counts.items():
+                child.inc(amount)
+            applied += len(counts)
+            for child, values in observations.items():
+                for value in values:
+                    child.observe(value)
+                applied += len(values)
+        self._flushes += 1
+        self._flushed_updates += applied
+        return applied
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns buffer counters.
+
+        Returns:
+            A dictionary with flushes, flushed_updates and the number of per-thread shards.
+        """
+        return {"flushes": self._flushes, "flushed_updates": self._flushed_updates, "shards": len(self._shards)}
+
+    def _shard(self) -> _BufferShard:
+        """Returns the calling thread's shard, creating it on first use."""
+        shard = getattr(self._local, "shard", None)
+        if shard is None:
+            shard = self._local.shard = _BufferShard()
+            with self._lock:
+                self._shards.append(shard)
+        return shard
+
+
+class _BufferedCounter:
+    """Bound counter child whose increments go through a MetricBuffer."""
+    __slots__ = ("_child", "_buffer")
+
+    def __init__(self, child: Any, buffer: MetricBuffer):
+        self._child = child
+        self._buffer = buffer
+
+    def inc(self, amount: float = 1.0):
+        if amount < 0:
+            raise ValueError("Counters can only be incremented by non-negative amounts.")
+        self._buffer.add(self._child, amount)
+
+
+class _BufferedHistogram:
+    """Bound histogram child whose observations go through a MetricBuffer."""
+    __slots__ = ("_child", "_buffer")
+
+    def __init__(self, child: Any, buffer: MetricBuffer):
+        self._child = child
+        self._buffer = buffer
+
+    def observe(self, amount: float):
+        self._buffer.observe(self._child, amount)
+
+
+class _SketchedHistogram:
+    """Bound histogram child whose observations are also added to a quantile sketch."""
+    __slots__ = ("_child", "_sketch")
+
+    def __init__(self, child: Any, sketch: Any):
+        self._child = child
+        self._sketch = sketch
+
+    def observe(self, amount: float):
+        self._child.observe(amount)
+        self._sketch.add(amount)
@@ -0,0 +1,152 @@
+from typing import Optional, Dict, Any, List, Sequence
+import math
+import threading
+
+# Values with a smaller magnitude than this are counted as zero
+_MIN_INDEXABLE_VALUE = 1e-9
+
+
+class DDSketch:
+    """
+    A streaming quantile sketch with relative-error guarantees (DDSketch, Masson et al., VLDB 2019).
+
+    Values are counted in logarithmically sized bins, so any quantile is returned within
+    relative_accuracy of the true value (e.g. 1% of 2.5 s) using a few KB of memory, whatever the number
+    of observations. Sketches of the same accuracy can be merged. If more than max_bins bins are in use,
+    the lowest ones are collapsed, which keeps the upper quantiles (p95/p99) accurate. Thread-safe.
+    """
+    def __init__(self, relative_accuracy: float = 0.01, max_bins: int = 2048):
+        """
+        Initializes an empty sketch.
+
+        Args:
+            relative_accuracy: Maximum relative error of returned quantiles, between 0 and 1.
+            max_bins: Maximum number of bins per sign before the lowest bins are collapsed.
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max(1, max_bins)
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._positive: Dict[int, int] = {}
+        self._negative: Dict[int, int] = {} # Keyed by the bin of the absolute value
+        self._zero_count = 0
+        self.count = 0
+        self.sum = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self._lock = threading.Lock()
+
+    def add(self, value: float):
+        """Adds one observation."""
+        with self._lock:
+            if value > _MIN_INDEXABLE_VALUE:
+                self._increment(self._positive, self._key(value))
+            elif value < -_MIN_INDEXABLE_VALUE:
+                self._increment(self._negative, self._key(-value))
+            else:
+                self._zero_count += 1
+            self.count += 1
+            self.sum += value
+            if value < self.min:
+                self.min = value
+            if value > self.max:
+                self.max = value
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Returns the approximate value at quantile q.
+
+        Args:
+            q: The quantile, between 0 and 1 (e.g. 0.99).
+
+        Returns:
+            The estimated value (clamped to the observed min/max), or None if the sketch is empty.
+        """
+        if not 0 <= q <= 1:
+            raise ValueError("q must be between 0 and 1")
+        with self._lock:
+            if not self.count:
+                return None
+            rank = q * (self.count - 1)
+            seen = 0
+            for key in sorted(self._negative, reverse=True): # Most negative values first
+                seen += self._negative[key]
+                if seen > rank:
+                    return min(max(-self._value(key), self.min), self.max)
+            seen += self._zero_count
+            if seen > rank:
+                return 0.0
+            for key in sorted(self._positive):
+                seen += self._positive[key]
+                if seen > rank:
+                    return min(max(self._value(key), self.min), self.max)
+            return self.max
+
+    def quantiles(self, qs: Sequence[float]) -> Dict[float, Optional[float]]:
+        """Returns quantile(q) for each q."""
+        return {q: self.quantile(q) for q in qs}
+
+    def merge(self, other: "DDSketch"):
+        """
+        Adds all observations of another sketch into this one.
+
+        Raises:
+            ValueError: If the sketches have different relative accuracy.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        with other._lock:
+            positive, negative = dict(other._positive), dict(other._negative)
+            zero_count, count, total, low, high = other._zero_count, other.count, other.sum, other.min, other.max
+        with self._lock:
+            for key, bin_count in positive.items():
+                self._increment(self._positive, key, bin_count)
+            for key, bin_count in negative.items():
+                self._increment(self._negative, key, bin_count)
+            self._zero_count += zero_count
+            self.count += count
+            self.sum += total
+            self.min = min(self.min, low)
+            self.max = max(self.max, high)
+
+    def summary(self, qs: Sequence[float] = (0.5, 0.95, 0.99)) -> Dict[str, Any]:
+        """
+        Returns count, sum, min, max and the requested quantiles, keyed "p50", "p95", "p99", "p99.9", etc.
+        """
+        summary: Dict[str, Any] = {"count": self.count, "sum": self.sum,
+                                   "min": self.min if self.count else None, "max": self.max if self.count else None}
+        for q, value in self.quantiles(qs).items():
+            summary[f"p{q * 100:g}"] = value
+        return summary
+
+    def _key(self, value: float) -> int:
+        """Returns the bin of a positive value: values in (gamma^(k-1), gamma^k] share bin k."""
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Returns the representative value of a bin, within relative_accuracy of every value in it."""
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _increment(self, bins: Dict[int, int], key: int, amount: int = 1):
+        """Counts into a bin, collapsing the two lowest bins while the store is over max_bins. Caller holds self._lock."""
+        bins[key] = bins.get(key, 0) + amount
+        if len(bins) > self.max_bins:
+            lowest, second = sorted(bins)[:2]
+            bins[second] += bins.pop(lowest)
+
+
+def merge_sketches(sketches: List[DDSketch]) -> Optional[DDSketch]:
+    """
+    Merges sketches into a new one (e.g. every component of an app).
+
+    Returns:
+        The merged sketch, or None if the list is empty.
+    """
+    if not sketches:
+        return None
+    merged = DDSketch(sketches[0].relative_accuracy, sketches[0].max_bins)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
@@ -11,6 +11,13 @@ from core.interfaces.optimization_oracle_interface import OptimizationOracleInte
 from core.interfaces.metric_collector_interface import MetricCollectorInterface
 from core.interfaces.state_manager_interface import StateManagerInterface
 
+# Defaults for metric-based optimization rules; override via the optimization_config argument of OptimizationOracle
+DEFAULT_OPTIMIZATION_CONFIG: Dict[str, Any] = {
+    "latency_metric": "request_router_sandbox_execution_duration_seconds", # Must be a quantile-sketched histogram
+    "p95_latency_threshold_seconds": 0.2,
+    "min_executions": 50, # Components that ran fewer times are not considered
+}
+
 class OptimizationOracle(OptimizationOracleInterface):
     """
     Analyzes operational metrics to identify opportunities for optimizing application performance,
@@ -18,16 +25,19 @@ class OptimizationOracle(OptimizationOracleInterface):
     It interacts with the MetricCollector to get performance data and the StateManager
     to access application definitions and store JIT artifacts.
     """
-    def __init__(self, metric_collector: MetricCollectorInterface, state_manager: StateManagerInterface):
+    def __init__(self, metric_collector: MetricCollectorInterface, state_manager: StateManagerInterface,
+                 optimization_config: Optional[Dict[str, Any]] = None):
         """
         Initializes the OptimizationOracle with references to the MetricCollector and StateManager.
 
         Args:
             metric_collector: An instance of MetricCollectorInterface to retrieve application metrics.
             state_manager: An instance of StateManagerInterface to access and update application definitions and state.
+            optimization_config: Optional overrides for DEFAULT_OPTIMIZATION_CONFIG (latency rule thresholds).
         """
         self.metric_collector = metric_collector
         self.state_manager = state_manager
+        self.optimization_config: Dict[str, Any] = {**DEFAULT_OPTIMIZATION_CONFIG, **(optimization_config or {})}
         # TODO: Initialize internal state for tracking application performance and optimization rules (Issue #XX)
         # self._app_performance_data: Dict[str, Any] = {} # appId: performance metrics
         # self._optimization_rules: Dict[str, Any] = {} # Global or per-app optimization rules
@@ -36,44 +46,27 @@ class OptimizationOracle(OptimizationOracleInterface):
         """
         Analyzes metrics for a specific application to identify optimization opportunities.
         This method would typically be triggered periodically or by specific events.
-        For POC, this is a placeholder with simulated logic.
+        Component latency quantiles come from the MetricCollector's in-process sketches (cumulative since startup).
 
         Args:
             appId: The ID of the application whose metrics should be analyzed.
         """
         print(f"Analyzing metrics for application: {appId}") # Basic logging
-        # TODO: Fetch relevant metrics from MetricCollector (Issue #XX)
-        # MetricCollectorInterface currently doesn't have a method to get metrics for a specific app.
-        # This interaction needs to be defined or metrics need to be accessed differently (e.g., via a metrics storage).
-        # For POC, simulate fetching metrics.
-        # app_metrics = await self.metric_collector.get_metrics_for_app(appId) # Assuming such a method exists
-
-        # TODO: Apply optimization rules (e.g., if latency for a component is consistently high, or cost is high) (Issue #XX)
-        # TODO: Fetch relevant metrics from MetricCollector (Issue #XX)
-        # MetricCollectorInterface currently doesn't have a method to get metrics for a specific app.
-        # This interaction needs to be defined or metrics need to be accessed differently (e.g., via a metrics storage).
-        # For POC, simulate fetching metrics.
-        # app_metrics = await self.metric_collector.get_metrics_for_app(appId) # Assuming such a method exists
-
-        print(f"Analyzing metrics for application: {appId}") # Basic logging
-
-        # TODO: Implement actual metric analysis and rule application (Issue #XX)
-        # For POC, simulate analysis and decision based on dummy metrics or simple rules.
-        # Example simulated metrics (replace with actual data from MetricCollector)
-        simulated_metrics = {
-            "execution_count": 100,
-            "average_latency_ms": 500,
-            "error_rate": 0.01
-        }
+        # Latency quantiles per component, computed in-process from the MetricCollector's quantile sketches
+        component_latencies = self.metric_collector.get_quantiles_by_label(
+            self.optimization_config["latency_metric"], "component_id", labels={"app_id": appId}, quantiles=(0.5, 0.95, 0.99)
+        )
 
         optimization_needed = False
         reason = ""
 
-        # Example simulated optimization rule: Trigger JIT if average latency > 200ms and execution count > 50
-        if simulated_metrics.get("average_latency_ms", 0) > 200 and simulated_metrics.get("execution_count", 0) > 50:
-            optimization_needed = True
-            reason = "High average latency and sufficient execution count."
-            print(f"Simulated analysis: Optimization recommended for {appId} due to {reason}") # Basic logging
+        # Rule: trigger JIT if a component's p95 latency is above the threshold and it ran often enough
+        for component_id, latency in component_latencies.items():
+            if latency["p95"] > self.optimization_config["p95_latency_threshold_seconds"] and latency["count"] >= self.optimization_config["min_executions"]:
+                optimization_needed = True
+                reason = f"High p95 latency ({latency['p95']:.3f}s over {latency['count']} executions) for component {component_id}."
+                print(f"Analysis: Optimization recommended for {appId} due to {reason}") # Basic logging
+                break
 
         # TODO: Add more complex rules based on cost, error rate, resource usage, etc. (Issue #XX)
 
@@ -1,4 +1,5 @@
 from typing import Optional, Dict, Any, List
+import asyncio
 import httpx # Using httpx for making HTTP requests to sandboxes
 import time # Import time for measuring duration
 # TODO: Import a library for parsing/validating sandbox responses (e.g., Pydantic) (Issue #XX)
@@ -23,6 +24,15 @@ from core.interfaces.tool_manager_interface import ToolManagerInterface
 from core.interfaces.event_bus_interface import EventBusInterface
 from core.interfaces.logging_service_interface import LoggingServiceInterface
 from core.interfaces.metric_collector_interface import MetricCollectorInterface
+from backend.src.core.request_router.sandbox_client_pool import SandboxClientPool
+from backend.src.core.event_bus.topic_trie import app_topic
+
+# Defaults for executing the tool calls a component returns; override via the tool_config argument of RequestRouter
+DEFAULT_TOOL_EXECUTION_CONFIG: Dict[str, Any] = {
+    "max_concurrent_tool_calls": 8, # Tool calls from one request executed at the same time
+    "tool_timeout_seconds": 30.0, # Default per-call timeout
+    "tool_timeouts": {}, # Per-tool overrides: tool_name -> timeout in seconds
+}
 
 
 class RequestRouter(RequestRouterInterface):
@@ -41,6 +51,8 @@ class RequestRouter(RequestRouterInterface):
         event_bus: EventBusInterface,
         logging_service: LoggingServiceInterface,
         metric_collector: MetricCollectorInterface,
+        http_config: Optional[Dict[str, Any]] = None,
+        tool_config: Optional[Dict[str, Any]] = None,
         # TODO: Add AuthenticationService/AuthorizationService if needed (Issue #XX)
     ):
         """
@@ -54,6 +66,8 @@ class RequestRouter(RequestRouterInterface):
             event_bus: Instance of EventBusInterface for publishing events.
             logging_service: Instance of LoggingServiceInterface for logging.
             metric_collector: Instance of MetricCollectorInterface for metrics.
+            http_config: Optional overrides for DEFAULT_SANDBOX_HTTP_CONFIG (per-sandbox connection limits and timeouts).
+            tool_config: Optional overrides for DEFAULT_TOOL_EXECUTION_CONFIG (tool call concurrency and timeouts).
         """
         self.app_registry = app_registry
         self.sandbox_manager = sandbox_manager
@@ -62,7 +76,13 @@ class RequestRouter(RequestRouterInterface):
         self.event_bus = event_bus
         self.logging_service = logging_service
         self.metric_collector = metric_collector
-        self._http_client = httpx.AsyncClient() # Async HTTP client for sandbox communication
+        # Handles for the metrics emitted on every request; children are bound per app/component on first use
+        self._requests_total = metric_collector.counter("request_router_requests_total", ("app_id", "component_id"))
+        self._successful_requests_total = metric_collector.counter("request_router_successful_requests_total", ("app_id", "component_id"))
+        self._sandbox_connections_total = metric_collector.counter("request_router_sandbox_connections_total", ("app_id", "reused"))
+        self._sandbox_execution_duration = metric_collector.histogram("request_router_sandbox_execution_duration_seconds", ("app_id", "component_id"))
+        self._sandbox_clients = SandboxClientPool(http_config) # Keep-alive HTTP client per sandbox
+        self.tool_config: Dict[str, Any] = {**DEFAULT_TOOL_EXECUTION_CONFIG, **(tool_config or {})}
         # TODO: Initialize AuthenticationService/AuthorizationService (Issue #XX)
 
     async def route_request(self, request: RequestPayload) -> ResponsePayload:
@@ -104,7 +124,7 @@ class RequestRouter(RequestRouterInterface):
              appId=app_id,
              requestId=request_id
         )
-        await self.metric_collector.increment_counter("request_router_requests_total", labels={"app_id": app_id, "component_id": component_id})
+        self._requests_total.bind(app_id, component_id).inc()
 
         # TODO: Authentication and Authorization (Placeholder for POC) (Issue #XX)
         # Validate API key/user and check permissions using ApplicationRegistry
@@ -164,11 +184,18 @@ class RequestRouter(RequestRouterInterface):
                  )
 
             sandbox_id = allocate_response["sandboxId"]
-            # TODO: Get sandbox network address/endpoint from allocation response or SandboxManager (Issue #XX)
-
-            # For POC, assume a fixed internal endpoint for the sandbox API
-            # In a real implementation, this would be dynamic based on the allocated container's network config (Issue #XX)
-            sandbox_api_url = f"http://localhost:8080/execute" # TODO: Replace with actual dynamic sandbox endpoint (Issue #XX)
+            sandbox_endpoint = allocate_response.get("endpoint") or await self.sandbox_manager.get_sandbox_endpoint(app_id, sandbox_id)
+            if not sandbox_endpoint:
+                print(f"Error: Could not resolve endpoint for sandbox {sandbox_id} of app {app_id}. Request ID: {request_id}")
+                await self.metric_collector.increment_counter("request_router_sandbox_allocation_failures_total", labels={"app_id": app_id})
+                await self.sandbox_manager.release_sandbox(app_id, sandbox_id, healthy=False)
+                return ResponsePayload(
+                    requestId=request_id,
+                    appId=app_id,
+                    success=False,
+                    message=f"Sandbox {sandbox_id} has no reachable endpoint."
+                )
+            sandbox_api_url = f"{sandbox_endpoint}/execute"
 
             # Construct request for Sandbox API /execute endpoint
             sandbox_execute_payload = SandboxExecuteRequest(
@@ -195,47 +222,48 @@ class RequestRouter(RequestRouterInterface):
                  metadata={"sandboxId": sandbox_id, "sandboxApiUrl": sandbox_api_url}
             )
             start_time = time.time() # For metrics
+            sandbox_healthy = True # Set to False when the sandbox itself fails, so the pool replaces it
 
             try:
                 # TODO: Use self.sandbox_api.execute_in_sandbox(sandbox_id, payload) if SandboxAPI is an internal service abstraction (Issue #XX)
                 # For now, direct HTTP call for POC simplicity
-                response = await self._http_client.post(sandbox_api_url, json=sandbox_execute_payload)
+                response, connection_reused = await self._sandbox_clients.post(sandbox_id, sandbox_endpoint, "/execute", json=sandbox_execute_payload)
+                self._sandbox_connections_total.bind(app_id, "true" if connection_reused else "false").inc()
                 response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
                 sandbox_response_data = response.json()
                 # TODO: Validate sandbox_response_data against expected schema (e.g., using Pydantic) (Issue #XX)
 
                 end_time = time.time()
                 duration = end_time - start_time
-                await self.metric_collector.observe_histogram("request_router_sandbox_execution_duration_seconds", duration, labels={"app_id": app_id, "component_id": component_id})
-                await self.metric_collector.increment_counter("request_router_successful_requests_total", labels={"app_id": app_id, "component_id": component_id})
+                self._sandbox_execution_duration.bind(app_id, component_id).observe(duration)
+                self._successful_requests_total.bind(app_id, component_id).inc()
 
                 print(f"Received response from sandbox {sandbox_id}. Request ID: {request_id}") # Basic logging
 
                 # Process sandbox response
                 final_result = sandbox_response_data.get("result") # Assuming 'result' field
                 tool_calls: List[ToolCall] = [ToolCall(**tc) for tc in sandbox_response_data.get("toolCalls", [])] # Assuming 'toolCalls' field
-                events: List[Event] = [Event(**e) for e in sandbox_response_data.get("events", [])] # Assuming 'events' field
+                events: List[Event] = self._to_app_events(app_id, sandbox_response_data.get("events", [])) # Assuming 'events' field
                 logs: List[LogMessage] = [LogMessage(**lm) for lm in sandbox_response_data.get("logs", [])] # Assuming 'logs' field
                 # TODO: Handle metrics reported by the sandbox if any (Issue #XX)
 
-                # Handle Tool Calls (Placeholder)
-                for tool_call in tool_calls:
-                    print(f"Processing Tool Call: {tool_call}") # Basic logging
-                    # TODO: Use ToolManager to execute the tool call (Issue #XX)
-                    # tool_result = await self.tool_manager.execute_tool(tool_call)
-                    # TODO: Potentially send tool_result back to the sandbox or process further (Issue #XX)
-
-                # Handle Events (Placeholder)
-                for event in events:
-                    print(f"Publishing Event: {event}") # Basic logging
-                    # TODO: Use EventBus to publish the event (Issue #XX)
-                    # await self.event_bus.publish(event)
-
-                # Handle Logs (Placeholder)
-                for log_message in logs:
-                    print(f"Processing Log Message: {log_message}") # Basic logging
-                    # TODO: Use LoggingService to process/store the log message (Issue #XX)
-                    # await self.logging_service.log_framework_message(...) # Or a dedicated app log method
+                # Execute tool calls concurrently while events and logs are flushed in batches.
+                # Only the tool calls decide whether the request succeeds; publish and log failures are reported and dropped.
+                tool_results, publish_error, log_error = await asyncio.gather(
+                    self._execute_tool_calls(tool_calls, app_id, request_id),
+                    self.event_bus.publish_batch(events),
+                    self.logging_service.log_application_messages(logs, component_id),
+                    return_exceptions=True,
+                )
+                if isinstance(tool_results, BaseException):
+                    raise tool_results
+                if isinstance(publish_error, BaseException):
+                    print(f"Error publishing {len(events)} event(s) from sandbox {sandbox_id}: {publish_error}. Request ID: {request_id}") # Basic logging
+                    # TODO: Log this error properly (Issue #XX)
+                if isinstance(log_error, BaseException):
+                    print(f"Error logging {len(logs)} message(s) from sandbox {sandbox_id}: {log_error}. Request ID: {request_id}") # Basic logging
+                    # TODO: Log this error properly (Issue #XX)
+                # TODO: Potentially send tool_results back to the sandbox or process further (Issue #XX)
 
                 # Construct final ResponsePayload
                 response_payload = ResponsePayload(
@@ -244,6 +272,7 @@ class RequestRouter(RequestRouterInterface):
                     success=True, # Assuming sandbox execution was successful if no HTTP error
                     result=final_result,
                     toolCalls=tool_calls, # Include tool calls in the response? Or handle internally? (Issue #XX)
+                    toolResults=tool_results, # Results in the same order as toolCalls
                     events=events, # Include events in the response? Or handle internally? (Issue #XX)
                     logs=logs, # Include logs in the response? Or handle internally? (Issue #XX)
                     # TODO: Add other relevant fields from sandbox response (Issue #XX)
@@ -272,7 +301,6 @@ class RequestRouter(RequestRouterInterface):
                      metadata={"sandboxId": sandbox_id, "status_code": e.response.status_code}
                 )
                 await self.metric_collector.increment_counter("request_router_sandbox_http_errors_total", labels={"app_id": app_id, "component_id": component_id, "status_code": str(e.response.status_code)})
-                # TODO: Release sandbox on error? (Issue #XX)
                 # TODO: Return a proper error ResponsePayload (Issue #XX)
                 return ResponsePayload(
                     requestId=request_id,
@@ -281,6 +309,7 @@ class RequestRouter(RequestRouterInterface):
                     message=f"Error communicating with sandbox: {e}"
                 )
             except httpx.RequestError as e:
+                 sandbox_healthy = False
                  print(f"Request error dispatching to sandbox {sandbox_id}: {e}")
                  await self.logging_service.log_framework_message(
                       level="ERROR",
@@ -292,7 +321,6 @@ class RequestRouter(RequestRouterInterface):
                       metadata={"sandboxId": sandbox_id}
                  )
                  await self.metric_collector.increment_counter("request_router_sandbox_request_errors_total", labels={"app_id": app_id, "component_id": component_id})
-                 # TODO: Release sandbox on error? (Issue #XX)
                  # TODO: Return a proper error ResponsePayload (Issue #XX)
                  return ResponsePayload(
                      requestId=request_id,
@@ -312,7 +340,6 @@ class RequestRouter(RequestRouterInterface):
                      metadata={"sandboxId": sandbox_id}
                 )
                 await self.metric_collector.increment_counter("request_router_unexpected_errors_total", labels={"app_id": app_id, "component_id": component_id})
-                # TODO: Release sandbox on error? (Issue #XX)
                 # TODO: Return a proper error ResponsePayload (Issue #XX)
                 return ResponsePayload(
                     requestId=request_id,
@@ -321,9 +348,10 @@ class RequestRouter(RequestRouterInterface):
                     message=f"An unexpected error occurred: {e}"
                 )
             finally:
-                 # TODO: Implement sandbox release/pooling logic here (Issue #XX)
-                 # await self.sandbox_manager.release_sandbox(app_id, sandbox_id) # Release the sandbox if not pooled
-                 pass # Add pass to satisfy expected indented block
+                 if not sandbox_healthy:
+                     await self._sandbox_clients.discard(sandbox_id) # Don't reuse connections to a failed sandbox
+                 # Return the sandbox to its warm pool (or have it replaced if it failed)
+                 await self.sandbox_manager.release_sandbox(app_id, sandbox_id, healthy=sandbox_healthy)
 
         except Exception as e:
             print(f"An unexpected error occurred during request routing for app {app_id}, component {component_id}: {e}")
@@ -345,4 +373,88 @@ class RequestRouter(RequestRouterInterface):
                 message=f"An unexpected error occurred during routing: {e}"
             )
 
+    async def _execute_tool_calls(self, tool_calls: List[ToolCall], app_id: str, request_id: str) -> List[ToolResult]:
+        """
+        Executes a request's tool calls concurrently through the ToolManager.
+        At most `max_concurrent_tool_calls` run at once and each call is bounded by its timeout.
+        Failures and timeouts become error ToolResults rather than failing the request.
+
+        Args:
+            tool_calls: The tool calls returned by the sandbox, assumed independent of each other.
+            app_id: The ID of the application (for logging and metrics).
+            request_id: The ID of the request (for logging).
+
+        Returns:
+            One ToolResult per tool call, in the same order as `tool_calls`.
+        """
+        if not tool_calls:
+            return []
+        semaphore = asyncio.Semaphore(max(1, self.tool_config["max_concurrent_tool_calls"]))
+
+        async def execute(tool_call: ToolCall) -> ToolResult:
+            timeout = self.tool_config["tool_timeouts"].get(tool_call.tool_name, self.tool_config["tool_timeout_seconds"])
+            async with semaphore:
+                start_time = time.time()
+                try:
+                    tool_result = await asyncio.wait_for(self.tool_manager.execute_tool(tool_call), timeout)
+                except asyncio.TimeoutError:
+                    print(f"Tool call '{tool_call.tool_name}' ({tool_call.tool_use_id}) timed out after {timeout}s. Request ID: {request_id}") # Basic logging
+                    await self.metric_collector.increment_counter("request_router_tool_call_timeouts_total", labels={"app_id": app_id, "tool_name": tool_call.tool_name})
+                    return ToolResult(tool_use_id=tool_call.tool_use_id, content=f"Error: Tool '{tool_call.tool_name}' timed out after {timeout}s", is_error=True)
+                except Exception as e:
+                    print(f"Error executing tool call '{tool_call.tool_name}' ({tool_call.tool_use_id}): {e}. Request ID: {request_id}") # Basic logging
+                    # TODO: Log this error properly (Issue #XX)
+                    return ToolResult(tool_use_id=tool_call.tool_use_id, content=f"Error: {e}", is_error=True)
+                await self.metric_collector.observe_histogram("request_router_tool_call_duration_seconds", time.time() - start_time, labels={"app_id": app_id, "tool_name": tool_call.tool_name})
+                return tool_result
+
+        print(f"Executing {len(tool_calls)} tool call(s) for Request ID: {request_id}") # Basic logging
+        return list(await asyncio.gather(*(execute(tool_call) for tool_call in tool_calls)))
+
+    def _to_app_events(self, app_id: str, raw_events: List[Dict[str, Any]]) -> List[Event]:
+        """
+        Builds the events a sandbox returned, publishing each under its application's "app.<appId>." namespace
+        so a sandbox can neither impersonate framework topics nor another app's. Invalid events are skipped.
+
+        Args:
+            app_id: The ID of the application whose sandbox returned the events.
+            raw_events: The events as returned by the sandbox.
+
+        Returns:
+            The events, with namespaced event types.
+        """
+        events = []
+        for raw_event in raw_events:
+            try:
+                event = Event(**raw_event)
+                event.event_type = app_topic(app_id, event.event_type)
+            except (TypeError, ValueError) as e:
+                print(f"Skipping invalid event from application '{app_id}': {e}") # Basic logging
+                continue
+            events.append(event)
+        return events
+
+    def get_connection_stats(self) -> Dict[str, Any]:
+        """
+        Returns connection reuse statistics for sandbox HTTP clients.
+
+        Returns:
+            A dictionary of request/connection counters and the number of open per-sandbox clients.
+        """
+        return self._sandbox_clients.get_stats()
+
+    async def discard_sandbox_connections(self, sandbox_id: str):
+        """
+        Drops the keep-alive client of a sandbox that no longer exists; requests still running on it finish first.
+        Registered with SandboxManager.add_sandbox_destroyed_listener.
+
+        Args:
+            sandbox_id: The ID of the destroyed sandbox.
+        """
+        await self._sandbox_clients.discard(sandbox_id)
+
+    async def close(self):
+        """Closes all sandbox HTTP clients. Call once on application shutdown."""
+        await self._sandbox_clients.close()
+
     # TODO: Add internal methods for authentication, authorization, component lookup, sandbox allocation, and dispatching requests to sandboxes (Issue #XX)
@@ -0,0 +1,185 @@
+from typing import Optional, Dict, Any, List, Set, Callable, Tuple
+from collections import OrderedDict
+import httpx
+
+# Defaults for sandbox HTTP connections; override via the http_config argument of RequestRouter
+DEFAULT_SANDBOX_HTTP_CONFIG: Dict[str, Any] = {
+    "max_connections_per_sandbox": 32, # Concurrent connections to one sandbox; further requests wait for a free one
+    "max_keepalive_connections_per_sandbox": 16, # Idle connections kept open for reuse
+    "keepalive_expiry_seconds": 30.0, # Idle connections are closed after this long
+    "connect_timeout_seconds": 2.0,
+    "read_timeout_seconds": 60.0, # Component execution happens while the router waits for the response
+    "write_timeout_seconds": 10.0,
+    "pool_timeout_seconds": 5.0, # How long a request waits for a free connection
+    "http2": False, # Multiplex requests over one connection; requires the 'h2' package
+    "max_sandbox_clients": 256, # Per-sandbox clients kept open; least recently used ones are closed first
+}
+
+
+class SandboxClientPool:
+    """
+    Keeps one keep-alive httpx.AsyncClient per sandbox endpoint, so requests to the same sandbox
+    reuse open connections and load spread across sandboxes is not funnelled through one pool.
+
+    Clients are kept in LRU order and retired when evicted, when their sandbox's endpoint changes or when
+    the sandbox is discarded. A retired client is closed once its in-flight requests have finished, so
+    retiring never cuts off a running request. New vs reused connections are counted with httpcore's
+    trace extension.
+    """
+    def __init__(self, http_config: Optional[Dict[str, Any]] = None, transport_factory: Optional[Callable[[], httpx.AsyncBaseTransport]] = None):
+        """
+        Initializes an empty client pool.
+
+        Args:
+            http_config: Optional overrides for DEFAULT_SANDBOX_HTTP_CONFIG.
+            transport_factory: Optional factory for a custom transport per client (e.g., for tests).
+        """
+        self.http_config: Dict[str, Any] = {**DEFAULT_SANDBOX_HTTP_CONFIG, **(http_config or {})}
+        self._transport_factory = transport_factory
+        self._clients: "OrderedDict[str, httpx.AsyncClient]" = OrderedDict() # sandbox_id -> client, least recently used first
+        self._endpoints: Dict[str, str] = {} # sandbox_id -> base URL the client was built for
+        self._in_flight: Dict[httpx.AsyncClient, int] = {} # client -> requests currently using it
+        self._retiring: Set[httpx.AsyncClient] = set() # Retired clients waiting for their in-flight requests
+        self._stats: Dict[str, int] = {"requests": 0, "new_connections": 0, "reused_connections": 0, "clients_evicted": 0}
+
+    async def get_client(self, sandbox_id: str, endpoint: str) -> httpx.AsyncClient:
+        """
+        Returns the keep-alive client for a sandbox, creating it on first use.
+        If the sandbox's endpoint changed, the old client is replaced.
+
+        Args:
+            sandbox_id: The ID of the sandbox.
+            endpoint: The sandbox API base URL (e.g., "http://172.18.0.5:8080").
+
+        Returns:
+            The httpx.AsyncClient for the sandbox.
+        """
+        client, stale = self._lookup(sandbox_id, endpoint)
+        for stale_client in stale:
+            await self._retire(stale_client)
+        return client
+
+    async def post(self, sandbox_id: str, endpoint: str, path: str, json: Any) -> Tuple[httpx.Response, bool]:
+        """
+        Posts a JSON body to a sandbox over its keep-alive client and records whether
+        the request opened a new connection or reused one.
+
+        Args:
+            sandbox_id: The ID of the sandbox.
+            endpoint: The sandbox API base URL.
+            path: The request path (e.g., "/execute").
+            json: The JSON-serializable request body.
+
+        Returns:
+            The httpx.Response, and True if the request went over an already open connection.
+
+        Raises:
+            httpx.RequestError: If the request could not be sent or the response not received.
+        """
+        client, stale = self._lookup(sandbox_id, endpoint)
+        self._in_flight[client] = self._in_flight.get(client, 0) + 1 # Counted before any await, so it cannot be closed under us
+        opened = False
+
+        async def trace(event_name: str, info: Dict[str, Any]):
+            nonlocal opened
+            if event_name == "connection.connect_tcp.complete":
+                opened = True
+
+        try:
+            for stale_client in stale:
+                await self._retire(stale_client)
+            response = await client.post(path, json=json, extensions={"trace": trace})
+        finally:
+            remaining = self._in_flight.pop(client) - 1
+            if remaining:
+                self._in_flight[client] = remaining
+            elif client in self._retiring:
+                self._retiring.discard(client)
+                await client.aclose()
+        self._stats["requests"] += 1
+        self._stats["new_connections" if opened else "reused_connections"] += 1
+        return response, not opened
+
+    async def discard(self, sandbox_id: str):
+        """
+        Forgets the client for a sandbox (e.g., after the sandbox failed or was destroyed) and closes it
+        once its in-flight requests have finished.
+
+        Args:
+            sandbox_id: The ID of the sandbox.
+        """
+        self._endpoints.pop(sandbox_id, None)
+        client = self._clients.pop(sandbox_id, None)
+        if client is not None:
+            await self._retire(client)
+
+    async def close(self):
+        """Closes every client, including retired ones with requests still in flight. Call once on application shutdown."""
+        clients = list(self._clients.values()) + list(self._retiring)
+        self._clients.clear()
+        self._endpoints.clear()
+        self._retiring.clear()
+        for client in clients:
+            await client.aclose()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns connection reuse statistics.
+
+        Returns:
+            A dictionary with request and connection counters, the reuse ratio and the number of open clients.
+        """
+        requests = self._stats["requests"]
+        return {
+            **self._stats,
+            "connection_reuse_ratio": self._stats["reused_connections"] / requests if requests else 0.0,
+            "open_clients": len(self._clients),
+            "retiring_clients": len(self._retiring),
+        }
+
+    def _lookup(self, sandbox_id: str, endpoint: str) -> Tuple[httpx.AsyncClient, List[httpx.AsyncClient]]:
+        """
+        Returns the client for a sandbox, building it if missing or if its endpoint changed, plus the clients
+        that were replaced or evicted to make room. Does not await, so concurrent callers never build duplicates.
+        """
+        client = self._clients.get(sandbox_id)
+        if client is not None and self._endpoints.get(sandbox_id) == endpoint:
+            self._clients.move_to_end(sandbox_id)
+            return client, []
+        stale = [client] if client is not None else [] # Endpoint changed (e.g., container restarted)
+        client = self._build_client(endpoint)
+        self._clients[sandbox_id] = client
+        self._clients.move_to_end(sandbox_id)
+        self._endpoints[sandbox_id] = endpoint
+        while len(self._clients) > self.http_config["max_sandbox_clients"]:
+            evicted_id, evicted = self._clients.popitem(last=False)
+            self._endpoints.pop(evicted_id, None)
+            stale.append(evicted)
+            self._stats["clients_evicted"] += 1
+        return client, stale
+
+    async def _retire(self, client: httpx.AsyncClient):
+        """Closes a client that is no longer handed out, or marks it to be closed by its last in-flight request."""
+        if self._in_flight.get(client):
+            self._retiring.add(client)
+        else:
+            await client.aclose()
+
+    def _build_client(self, endpoint: str) -> httpx.AsyncClient:
+        """Creates a keep-alive client with the configured limits and timeouts."""
+        config = self.http_config
+        limits = httpx.Limits(
+            max_connections=config["max_connections_per_sandbox"],
+            max_keepalive_connections=config["max_keepalive_connections_per_sandbox"],
+            keepalive_expiry=config["keepalive_expiry_seconds"],
+        )
+        timeout = httpx.Timeout(
+            connect=config["connect_timeout_seconds"],
+            read=config["read_timeout_seconds"],
+            write=config["write_timeout_seconds"],
+            pool=config["pool_timeout_seconds"],
+        )
+        kwargs: Dict[str, Any] = {}
+        if self._transport_factory is not None:
+            kwargs["transport"] = self._transport_factory()
+        return httpx.AsyncClient(base_url=endpoint, limits=limits, timeout=timeout, http2=config["http2"], **kwargs)
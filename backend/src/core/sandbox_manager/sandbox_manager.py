@@ -1,4 +1,7 @@
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Set, Tuple, Callable, Awaitable
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 import docker
 import docker.models.containers
 import time # Import time for measuring duration
@@ -11,6 +14,33 @@ from core.shared.data_models.data_models import (
 
 from core.interfaces.sandbox_manager_interface import SandboxManagerInterface
 from core.interfaces.application_registry_interface import ApplicationRegistryInterface
+from backend.src.core.sandbox_manager.sandbox_pool import SandboxPool, SandboxPoolExhaustedError
+
+# Defaults for warm sandbox pools; override via the pool_config argument of SandboxManager
+DEFAULT_POOL_CONFIG: Dict[str, Any] = {
+    "idle_ttl_seconds": 300.0, # Idle containers above min_instances are reaped after this long
+    "acquire_timeout_seconds": 30.0, # How long allocate_sandbox waits for a lease when a pool is at max_instances
+    "reaper_interval_seconds": 30.0, # How often the background reaper scans pools
+}
+
+# Defaults for Docker SDK calls; override via the docker_config argument of SandboxManager.
+# docker-py is synchronous, so every call runs on a bounded thread pool to keep the event loop free.
+DEFAULT_DOCKER_CONFIG: Dict[str, Any] = {
+    "max_concurrent_operations": 8, # Worker threads for Docker calls; further calls queue
+    "operation_timeout_seconds": 30.0, # Default timeout for list/get/exec/start/restart/reload
+    "run_timeout_seconds": 120.0, # Timeout for containers.run (may include an image pull)
+    "exec_timeout_seconds": 60.0, # Timeout for commands run with execute_command_in_sandbox
+    "stop_timeout_seconds": 10, # Grace period passed to container.stop before the container is killed
+    "max_parallel_container_operations": 16, # Containers handled concurrently by app-wide start/stop/restart/status
+    "sandbox_api_port": 8080, # Port the Sandbox API listens on inside each container
+    "sandbox_network": None, # Docker network shared with the backend; sandboxes are then reached by container IP
+    "sandbox_host": "127.0.0.1", # Host address of published sandbox ports when no shared network is configured
+}
+
+
+class SandboxOperationTimeoutError(Exception):
+    """Raised when a Docker operation does not finish within its configured timeout."""
+    pass
 
 class SandboxManager(SandboxManagerInterface):
     """
@@ -18,21 +48,56 @@ class SandboxManager(SandboxManagerInterface):
     It interacts with the ApplicationRegistry to get sandbox requirements and uses the Docker SDK
     to create, start, stop, remove, and monitor containers.
     """
-    def __init__(self, app_registry: ApplicationRegistryInterface):
+    def __init__(self, app_registry: ApplicationRegistryInterface, pool_config: Optional[Dict[str, Any]] = None, docker_config: Optional[Dict[str, Any]] = None):
         """
         Initializes the SandboxManager with a reference to the ApplicationRegistry and the Docker client.
 
         Args:
             app_registry: An instance of ApplicationRegistryInterface used to retrieve application-specific sandbox requirements.
+            pool_config: Optional overrides for DEFAULT_POOL_CONFIG (idle TTL, acquire timeout, reaper interval).
+            docker_config: Optional overrides for DEFAULT_DOCKER_CONFIG (concurrency limit and per-operation timeouts).
         """
         self.app_registry = app_registry
         self._docker_client: Optional[docker.DockerClient] = None
-        # TODO: Initialize internal state for managing sandbox pools and instances (Issue #XX)
-        # self._sandbox_pools: Dict[str, SandboxPoolConfig] = {} # app_id: pool_config
-        # self._sandbox_instances: Dict[str, List[docker.models.containers.Container]] = {} # app_id: list of container objects
+        self.docker_config: Dict[str, Any] = {**DEFAULT_DOCKER_CONFIG, **(docker_config or {})}
+        self._docker_executor = ThreadPoolExecutor(
+            max_workers=self.docker_config["max_concurrent_operations"],
+            thread_name_prefix="docker-op",
+        )
+        self.pool_config: Dict[str, Any] = {**DEFAULT_POOL_CONFIG, **(pool_config or {})}
+        # Warm pools keyed by (app_id, pool_id), and the pool each leased sandbox must be returned to
+        self._sandbox_pools: Dict[Tuple[str, str], SandboxPool] = {}
+        self._sandbox_leases: Dict[str, SandboxPool] = {} # sandbox_id -> pool
+        self._default_pool_ids: Dict[str, str] = {} # app_id -> pool_id used when allocate_sandbox gets no poolId
+        self._pool_creation_lock = asyncio.Lock()
+        self._pool_reaper_task: Optional[asyncio.Task] = None
+        self._pool_warm_tasks: Set[asyncio.Task] = set() # Background warm-ups of newly created pools
+        self._sandbox_endpoints: Dict[str, str] = {} # sandbox_id -> Sandbox API base URL, resolved once per container
+        self._late_result_tasks: Set[asyncio.Task] = set() # Cleanups of results that arrived after their caller gave up
+        self._sandbox_destroyed_listeners: List[Callable[[str], Awaitable[None]]] = []
 
         self._initialize_docker_client()
 
+    def add_sandbox_destroyed_listener(self, listener: Callable[[str], Awaitable[None]]):
+        """
+        Registers a callback invoked with a sandbox's ID when the sandbox is destroyed (released, reaped,
+        replaced after failing, or removed on shutdown), e.g. to drop connections to it.
+
+        Args:
+            listener: Async callable taking the sandbox ID. Errors are logged and ignored.
+        """
+        self._sandbox_destroyed_listeners.append(listener)
+
+    async def _forget_sandbox(self, sandbox_id: str):
+        """Drops a destroyed sandbox's cached endpoint and notifies the destroyed-sandbox listeners."""
+        self._sandbox_endpoints.pop(sandbox_id, None)
+        for listener in self._sandbox_destroyed_listeners:
+            try:
+                await listener(sandbox_id)
+            except Exception as e:
+                print(f"Error notifying listener about destroyed sandbox {sandbox_id}: {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+
     def _initialize_docker_client(self):
         """Initializes the Docker client."""
         try:
@@ -45,6 +110,72 @@ class SandboxManager(SandboxManagerInterface):
             self._docker_client = None # Ensure client is None if connection fails
             # TODO: Implement proper error handling or retry mechanism (Issue #XX)
 
+    async def _run_docker(self, func: Callable[..., Any], *args: Any, timeout: Optional[float] = None,
+                          on_late_result: Optional[Callable[[Any], Awaitable[None]]] = None, **kwargs: Any) -> Any:
+        """
+        Runs a blocking docker-py call on the bounded Docker executor so it never blocks the event loop.
+
+        Args:
+            func: The docker-py callable (e.g., container.stop).
+            *args: Positional arguments for func.
+            timeout: Seconds to wait for the result; defaults to operation_timeout_seconds.
+            on_late_result: Async callable that receives the result if the call still succeeds after it timed
+                            out or the caller was cancelled, e.g. to remove a container nobody is waiting for.
+            **kwargs: Keyword arguments for func.
+
+        Returns:
+            The result of func.
+
+        Raises:
+            SandboxOperationTimeoutError: If the call does not finish in time. The worker thread keeps running
+                                          until docker-py returns; only the awaiting coroutine is released.
+        """
+        timeout = self.docker_config["operation_timeout_seconds"] if timeout is None else timeout
+        loop = asyncio.get_running_loop()
+        call = functools.partial(func, *args, **kwargs)
+        future = loop.run_in_executor(self._docker_executor, call)
+        try:
+            # Shielded so giving up on the call does not discard a result that still needs cleaning up
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            self._handle_late_result(future, on_late_result)
+            raise SandboxOperationTimeoutError(f"Docker operation {getattr(func, '__qualname__', func)} timed out after {timeout}s")
+        except asyncio.CancelledError:
+            self._handle_late_result(future, on_late_result)
+            raise
+
+    def _handle_late_result(self, future: asyncio.Future, on_late_result: Optional[Callable[[Any], Awaitable[None]]]):
+        """Passes the result of an abandoned Docker call to on_late_result once (and if) it succeeds."""
+        def done(finished: asyncio.Future):
+            if finished.cancelled() or finished.exception() is not None or on_late_result is None:
+                return # exception() also marks a late failure as retrieved
+            self._spawn_cleanup(on_late_result(finished.result()))
+
+        future.add_done_callback(done)
+
+    def _spawn_cleanup(self, cleanup: Awaitable[None]):
+        """Runs a cleanup coroutine in its own task, so it completes even if the caller is cancelled. close() waits for it."""
+        task = asyncio.ensure_future(cleanup)
+        self._late_result_tasks.add(task)
+        task.add_done_callback(self._late_result_tasks.discard)
+
+    async def _run_docker_with_grace_period(self, func: Callable[..., Any]) -> Any:
+        """
+        Runs container.stop/restart, passing the configured grace period to Docker and
+        allowing for it in the operation timeout.
+        """
+        stop_timeout = self.docker_config["stop_timeout_seconds"]
+        # stop/restart have their own `timeout` (grace period) argument, so bind it with partial
+        return await self._run_docker(
+            functools.partial(func, timeout=stop_timeout),
+            timeout=stop_timeout + self.docker_config["operation_timeout_seconds"],
+        )
+
+    async def _stop_and_remove(self, container: docker.models.containers.Container):
+        """Stops and removes a container off the event loop."""
+        await self._run_docker_with_grace_period(container.stop)
+        await self._run_docker(container.remove)
+
     async def _get_app_sandboxes(self, app_id: str) -> List[docker.models.containers.Container]:
         """
         Retrieves all Docker containers associated with a specific application using container labels.
@@ -60,106 +191,304 @@ class SandboxManager(SandboxManagerInterface):
             return []
         try:
             # Assuming containers are labeled with 'app_id'
-            containers = self._docker_client.containers.list(all=True, filters={"label": f"app_id={app_id}"}) # Include stopped containers
+            containers = await self._run_docker(self._docker_client.containers.list, all=True, filters={"label": f"app_id={app_id}"}) # Include stopped containers
             return containers
-        except docker.errors.DockerException as e:
+        except (docker.errors.DockerException, SandboxOperationTimeoutError) as e:
             print(f"Error listing Docker containers for app {app_id}: {e}") # Basic logging
             # TODO: Log this error properly (Issue #XX)
             return []
 
-    async def allocate_sandbox(self, appId: str) -> Dict[str, Any]: # TODO: Return Sandbox instance/identifier (Issue #XX)
+    async def allocate_sandbox(self, appId: str, poolId: Optional[str] = None) -> Dict[str, Any]: # TODO: Return Sandbox instance/identifier (Issue #XX)
         """
-        Allocates a sandbox (Docker container) for a specific application.
-        This method should ideally allocate from a pool or create a new container
-        based on the application's sandbox requirements.
-        For POC, it creates and starts a single container.
+        Allocates a sandbox (Docker container) for a specific application by leasing it from a warm pool.
+        The pool for the requested SandboxPoolConfig is created on first use and warmed to min_instances in the
+        background (the first caller only waits for the container it leases), reuses idle containers, and scales
+        up to max_instances under load.
 
         Args:
             appId: The ID of the application requiring a sandbox.
+            poolId: Optional ID of the sandbox pool to allocate from. Defaults to the app's first pool.
 
         Returns:
             A dictionary indicating success/failure and details about the allocated sandbox.
+            The sandbox must be handed back with release_sandbox once the request completes.
         """
         if not self._docker_client:
             print("Error: Docker client not initialized. Cannot allocate sandbox.") # Basic logging
             # TODO: Return a proper error response (Issue #XX)
             return {"success": False, "message": "Docker client not initialized"}
 
-        # Get sandbox requirements from Application Registry
-        requirements_response = await self.app_registry.get_sandbox_requirements(appId)
-        if not requirements_response.get("success") or not requirements_response.get("sandboxRequirements"):
-            print(f"Error: Could not get sandbox requirements for app {appId}.") # Basic logging
+        try:
+            pool = await self._get_or_create_pool(appId, poolId)
+        except ValueError as e:
+            print(f"Error: {e}") # Basic logging
             # TODO: Log this error properly (Issue #XX)
-            # TODO: Return a proper error response (Issue #XX)
-            return {"success": False, "message": f"Could not get sandbox requirements for app {appId}"}
+            return {"success": False, "message": str(e)}
 
-        sandbox_config: SandboxPoolConfig = requirements_response["sandboxRequirements"] # TODO: Ensure this matches the actual return type (Issue #XX)
+        try:
+            container = await pool.acquire(timeout=self.pool_config["acquire_timeout_seconds"])
+        except SandboxPoolExhaustedError as e:
+            print(f"Error allocating sandbox for app {appId}: {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            return {"success": False, "message": str(e)}
 
-        # For POC, create and start a single container
+        self._sandbox_leases[container.id] = pool
+        endpoint = await self.get_sandbox_endpoint(appId, container.id)
+        return {"success": True, "sandboxId": container.id, "poolId": pool.pool_id, "status": "running", "endpoint": endpoint} # TODO: Return a Sandbox instance/identifier object
+
+    async def get_sandbox_endpoint(self, appId: str, sandbox_id: str) -> Optional[str]:
+        """
+        Returns the base URL of a sandbox's internal API (e.g., "http://172.18.0.5:8080").
+        Endpoints are resolved from the container's network settings once and cached for the container's lifetime.
+
+        Args:
+            appId: The ID of the application the sandbox belongs to.
+            sandbox_id: The ID of the sandbox container.
+
+        Returns:
+            The base URL, or None if the sandbox is unknown or has no reachable address.
+        """
+        endpoint = self._sandbox_endpoints.get(sandbox_id)
+        if endpoint is not None:
+            return endpoint
+        if not self._docker_client:
+            return None
         try:
-            # TODO: Implement pooling logic (allocate from pool or create new) (Issue #XX)
-            # TODO: Configure resource limits, volumes, networking, etc. based on sandbox_config (Issue #XX)
-            # TODO: Ensure the image exists (pull if necessary) (Issue #XX)
-            image = sandbox_config.image # Assuming image is a field in SandboxPoolConfig
+            container = await self._run_docker(self._docker_client.containers.get, sandbox_id)
+        except (docker.errors.DockerException, SandboxOperationTimeoutError) as e:
+            print(f"Error resolving endpoint for sandbox {sandbox_id} of app {appId}: {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            return None
+        endpoint = _sandbox_endpoint_from_attrs(container.attrs, self.docker_config)
+        if endpoint is not None:
+            self._sandbox_endpoints[sandbox_id] = endpoint
+        return endpoint
+
+    async def warm_application_pools(self, appId: str):
+        """
+        Creates and pre-warms every sandbox pool declared by an application, so the first
+        requests do not pay for container creation.
+
+        Args:
+            appId: The ID of the application.
+        """
+        pool_configs = await self._get_pool_configs(appId)
+        pools = [await self._get_or_create_pool(appId, _pool_field(pool_config, "pool_id"), warm_in_background=False)
+                 for pool_config in pool_configs]
+        await asyncio.gather(*(pool.warm() for pool in pools))
+
+    async def reap_idle_sandboxes(self) -> int:
+        """
+        Reaps containers that exceeded the idle TTL across all pools.
+
+        Returns:
+            The total number of containers reaped.
+        """
+        reaped = 0
+        for pool in list(self._sandbox_pools.values()):
+            reaped += await pool.reap_idle()
+        return reaped
+
+    def start_pool_reaper(self):
+        """
+        Starts the background task that periodically reaps idle pooled containers.
+        Must be called from a running event loop (e.g., a FastAPI startup handler).
+        """
+        if self._pool_reaper_task is None or self._pool_reaper_task.done():
+            self._pool_reaper_task = asyncio.create_task(self._run_pool_reaper())
+
+    async def shutdown_pools(self):
+        """
+        Stops the reaper and closes every pool, destroying idle containers.
+        Leased containers are destroyed as they are released.
+        """
+        if self._pool_reaper_task is not None:
+            self._pool_reaper_task.cancel()
+            self._pool_reaper_task = None
+        for pool in list(self._sandbox_pools.values()):
+            await pool.close()
+        if self._pool_warm_tasks: # Containers they were still starting are destroyed by the closed pools
+            await asyncio.gather(*self._pool_warm_tasks, return_exceptions=True)
+        self._sandbox_pools.clear()
+        self._default_pool_ids.clear()
+
+    async def close(self):
+        """
+        Shuts down sandbox pools and then the Docker executor. Call once on application shutdown.
+        """
+        await self.shutdown_pools()
+        if self._late_result_tasks:
+            await asyncio.gather(*self._late_result_tasks, return_exceptions=True)
+        self._docker_executor.shutdown(wait=False)
+
+    def get_pool_stats(self) -> List[Dict[str, Any]]:
+        """
+        Returns occupancy statistics for every sandbox pool.
+
+        Returns:
+            A list of per-pool statistics dictionaries.
+        """
+        return [pool.get_stats() for pool in self._sandbox_pools.values()]
+
+    async def _run_pool_reaper(self):
+        """Background loop for start_pool_reaper."""
+        while True:
+            await asyncio.sleep(self.pool_config["reaper_interval_seconds"])
+            try:
+                await self.reap_idle_sandboxes()
+            except Exception as e:
+                print(f"Error reaping idle sandboxes: {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+
+    async def _get_pool_configs(self, appId: str) -> List[Any]:
+        """
+        Fetches the app's sandbox pool configurations from the ApplicationRegistry.
+
+        Raises:
+            ValueError: If the app has no sandbox requirements.
+        """
+        requirements_response = await self.app_registry.get_sandbox_requirements(appId)
+        if not requirements_response.get("success") or not requirements_response.get("sandboxRequirements"):
+            raise ValueError(f"Could not get sandbox requirements for app {appId}")
+        pool_configs = requirements_response["sandboxRequirements"]
+        return pool_configs if isinstance(pool_configs, list) else [pool_configs]
+
+    async def _get_or_create_pool(self, appId: str, poolId: Optional[str] = None, warm_in_background: bool = True) -> SandboxPool:
+        """
+        Returns the warm pool for an app's pool configuration, creating it on first use.
+
+        Args:
+            appId: The ID of the application.
+            poolId: Optional pool ID; defaults to the app's first pool.
+            warm_in_background: Start warming a newly created pool to min_instances in a background task.
+                                The caller's acquire() then creates or waits for a single container.
+
+        Raises:
+            ValueError: If the app has no matching pool configuration or no image configured.
+        """
+        pool_key = (appId, poolId if poolId is not None else self._default_pool_ids.get(appId))
+        if pool_key in self._sandbox_pools:
+            return self._sandbox_pools[pool_key] # Fast path: no registry lookup once the pool exists
+
+        pool_configs = await self._get_pool_configs(appId)
+        if poolId is None:
+            pool_config = pool_configs[0]
+        else:
+            pool_config = next((c for c in pool_configs if _pool_field(c, "pool_id") == poolId), None)
+            if pool_config is None:
+                raise ValueError(f"Sandbox pool '{poolId}' not found for app {appId}")
+        pool_id = _pool_field(pool_config, "pool_id") or "default"
+        if poolId is None:
+            self._default_pool_ids[appId] = pool_id
+
+        async with self._pool_creation_lock:
+            pool = self._sandbox_pools.get((appId, pool_id))
+            if pool is not None:
+                return pool
+            image = _pool_field(pool_config, "image_name")
             if not image:
-                 print(f"Error: Sandbox image not specified for app {appId}.") # Basic logging
-                 # TODO: Return a proper error response (Issue #XX)
-                 return {"success": False, "message": f"Sandbox image not specified for app {appId}"}
-
-            print(f"Creating and starting sandbox container for app {appId} using image '{image}'.") # Basic logging
-            container = self._docker_client.containers.run(
-                image,
-                detach=True, # Run in background
-                labels={"app_id": appId}, # Label container with app_id
-                # TODO: Add command/entrypoint based on sandbox type (JIT, LLM Orchestrator) (Issue #XX)
-                # TODO: Mount volumes for definition state, logs, etc. (Issue #XX)
-                # TODO: Configure networking (Issue #XX)
-                # TODO: Set resource limits (CPU, memory) (Issue #XX)
+                raise ValueError(f"Sandbox image not specified for app {appId}")
+            command = _pool_field(pool_config, "command")
+            # TODO: Rebuild pools when the app's sandbox requirements change (Issue #XX)
+            # TODO: Configure resource limits, volumes, networking, etc. based on pool_config (Issue #XX)
+
+            network_kwargs: Dict[str, Any] = {"network": self.docker_config["sandbox_network"]}
+            if not self.docker_config["sandbox_network"]:
+                # Publish the Sandbox API on an ephemeral host port so sandboxes don't collide on one port
+                network_kwargs = {"ports": {f"{self.docker_config['sandbox_api_port']}/tcp": None}}
+
+            async def remove_abandoned_container(container: docker.models.containers.Container):
+                # Started after create_container gave up on it (timeout or cancellation); no pool tracks it
+                print(f"Removing sandbox container {container.id} for app {appId} (pool '{pool_id}') that started after its creation was abandoned.") # Basic logging
+                try:
+                    await self._stop_and_remove(container)
+                except Exception as e:
+                    print(f"Error removing abandoned sandbox container {container.id} for app {appId}: {e}") # Basic logging
+                    # TODO: Log this error properly (Issue #XX)
+
+            async def create_container() -> docker.models.containers.Container:
+                print(f"Creating and starting sandbox container for app {appId} (pool '{pool_id}') using image '{image}'.") # Basic logging
+                container = await self._run_docker(
+                    self._docker_client.containers.run,
+                    image,
+                    command=command,
+                    detach=True, # Run in background
+                    labels={"app_id": appId, "pool_id": pool_id}, # Label container with app_id and pool_id
+                    timeout=self.docker_config["run_timeout_seconds"],
+                    on_late_result=remove_abandoned_container,
+                    **network_kwargs,
+                )
+                try:
+                    await self._run_docker(container.reload) # Network settings are only populated once the container is running
+                except BaseException:
+                    # The container is running but will never reach the pool
+                    self._spawn_cleanup(remove_abandoned_container(container))
+                    raise
+                endpoint = _sandbox_endpoint_from_attrs(container.attrs, self.docker_config)
+                if endpoint is not None:
+                    self._sandbox_endpoints[container.id] = endpoint
+                return container
+
+            async def destroy_container(container: docker.models.containers.Container):
+                print(f"Stopping and removing pooled sandbox container {container.id} for app {appId}.") # Basic logging
+                await self._forget_sandbox(container.id)
+                await self._stop_and_remove(container)
+
+            pool = SandboxPool(
+                app_id=appId,
+                pool_id=pool_id,
+                min_instances=_pool_field(pool_config, "min_instances") or 0,
+                max_instances=_pool_field(pool_config, "max_instances") or 1,
+                create_container=create_container,
+                destroy_container=destroy_container,
+                idle_ttl_seconds=self.pool_config["idle_ttl_seconds"],
             )
-            print(f"Sandbox container created and started for app {appId}: {container.id}") # Basic logging
-            # TODO: Return a proper response including sandbox identifier and network info (Issue #XX)
-            return {"success": True, "sandboxId": container.id, "status": "running"} # TODO: Return a Sandbox instance/identifier object
+            self._sandbox_pools[(appId, pool_id)] = pool
+            if warm_in_background:
+                self._warm_pool_in_background(pool)
+        return pool
 
-        except docker.errors.ImageNotFound:
-            print(f"Error: Docker image '{image}' not found.") # Basic logging
-            # TODO: Implement image pulling or return error (Issue #XX)
-            # TODO: Return a proper error response (Issue #XX)
-            return {"success": False, "message": f"Docker image '{image}' not found"}
-        except docker.errors.APIError as e:
-            print(f"Error allocating sandbox for app {appId}: {e}") # Basic logging
-            # TODO: Log this error properly and return a proper error response (Issue #XX)
-            return {"success": False, "message": f"Docker API error: {e}"}
-        except Exception as e:
-            print(f"An unexpected error occurred during sandbox allocation for app {appId}: {e}") # Basic logging
-            # TODO: Log this error properly (Issue #XX)
-            # TODO: Return a proper error response (Issue #XX)
-            return {"success": False, "message": f"An unexpected error occurred: {e}"}
+    def _warm_pool_in_background(self, pool: SandboxPool):
+        """Warms a pool in its own task; containers become leasable one by one as they start. shutdown_pools() waits for it."""
+        task = asyncio.ensure_future(pool.warm())
+        self._pool_warm_tasks.add(task)
+        task.add_done_callback(self._pool_warm_tasks.discard)
 
 
-    async def release_sandbox(self, appId: str, sandbox_id: str): # TODO: Return a proper response (Issue #XX)
+    async def release_sandbox(self, appId: str, sandbox_id: str, healthy: bool = True): # TODO: Return a proper response (Issue #XX)
         """
         Releases a sandbox (Docker container).
-        For POC, stops and removes the container. In a pooled system, it might return
-        the container to the pool.
+        Pooled sandboxes are returned to their pool (or destroyed and replaced if unhealthy);
+        sandboxes not leased from a pool are stopped and removed.
 
         Args:
             appId: The ID of the application the sandbox belongs to.
             sandbox_id: The ID of the sandbox container to release.
+            healthy: False if the caller observed the sandbox failing (e.g., connection errors).
         """
+        pool = self._sandbox_leases.get(sandbox_id)
+        if pool is not None:
+            if pool.app_id != appId:
+                print(f"Warning: Container {sandbox_id} does not belong to app {appId}. Not releasing.") # Basic logging
+                return # TODO: Return a proper error/warning response (Issue #XX)
+            del self._sandbox_leases[sandbox_id]
+            await pool.release(sandbox_id, healthy=healthy)
+            return
+
         if not self._docker_client:
             print("Warning: Docker client not initialized. Cannot release sandbox.") # Basic logging
             return # TODO: Return a proper response (Issue #XX)
 
         try:
-            container = self._docker_client.containers.get(sandbox_id)
+            container = await self._run_docker(self._docker_client.containers.get, sandbox_id)
             # Optional: Verify container belongs to the correct app_id
             if container.labels.get("app_id") != appId:
                  print(f"Warning: Container {sandbox_id} does not belong to app {appId}. Not releasing.") # Basic logging
                  return # TODO: Return a proper error/warning response (Issue #XX)
 
             print(f"Stopping and removing sandbox container {sandbox_id} for app {appId}.") # Basic logging
-            container.stop()
-            container.remove()
+            await self._forget_sandbox(sandbox_id)
+            await self._stop_and_remove(container)
             print(f"Sandbox container {sandbox_id} released for app {appId}.") # Basic logging
             # TODO: Update internal state/pool (Issue #XX)
             # TODO: Return a proper success response (Issue #XX)
@@ -174,102 +503,115 @@ class SandboxManager(SandboxManagerInterface):
             # TODO: Log this error properly (Issue #XX)
 
 
-    async def start_application_sandboxes(self, appId: str): # TODO: Return a proper response (Issue #XX)
+    async def _fan_out(self, containers: List[docker.models.containers.Container], operation: Callable[[docker.models.containers.Container], Awaitable[Any]]) -> List[Any]:
         """
-        Starts all sandboxes associated with a specific application.
+        Runs an async operation for every container concurrently, with at most
+        `max_parallel_container_operations` in flight at once.
 
         Args:
-            appId: The ID of the application.
-        """
-        if not self._docker_client:
-            print("Warning: Docker client not initialized. Cannot start sandboxes.") # Basic logging
-            return # TODO: Return a proper response (Issue #XX)
+            containers: The containers to operate on.
+            operation: Async callable applied to each container. It should handle its own errors.
 
-        sandboxes = await self._get_app_sandboxes(appId)
-        if not sandboxes:
-            print(f"No sandboxes found for app {appId} to start.") # Basic logging
-            return # TODO: Return a proper response (Issue #XX)
-
-        print(f"Starting {len(sandboxes)} sandbox(es) for app {appId}.") # Basic logging
-        for container in sandboxes:
-            try:
-                container.start()
-                print(f"Started sandbox container: {container.id}") # Basic logging
-            except docker.errors.APIError as e:
-                print(f"Error starting sandbox container {container.id} for app {appId}: {e}") # Basic logging
-                # TODO: Log this error properly (Issue #XX)
-            except Exception as e:
-                print(f"An unexpected error occurred starting sandbox {container.id} for app {appId}: {e}") # Basic logging
-                # TODO: Log this error properly (Issue #XX)
+        Returns:
+            The operation results, in the same order as `containers`.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.docker_config["max_parallel_container_operations"]))
 
-        # TODO: Return a proper success/status response (Issue #XX)
+        async def run(container: docker.models.containers.Container) -> Any:
+            async with semaphore:
+                return await operation(container)
 
+        return await asyncio.gather(*(run(container) for container in containers))
 
-    async def stop_application_sandboxes(self, appId: str): # TODO: Return a proper response (Issue #XX)
+    async def _apply_to_app_sandboxes(self, appId: str, action: str, operation: Callable[[docker.models.containers.Container], Awaitable[Any]]) -> Dict[str, Any]:
         """
-        Stops all sandboxes associated with a specific application.
+        Applies a lifecycle operation (start/stop/restart) to all of an application's sandboxes in parallel
+        and aggregates the per-container outcome.
 
         Args:
             appId: The ID of the application.
+            action: Verb used in log messages and results (e.g., "start").
+            operation: Async callable performing the operation on one container.
+
+        Returns:
+            A dictionary with overall success, counts and a per-sandbox result list.
         """
         if not self._docker_client:
-            print("Warning: Docker client not initialized. Cannot stop sandboxes.") # Basic logging
-            return # TODO: Return a proper response (Issue #XX)
+            print(f"Warning: Docker client not initialized. Cannot {action} sandboxes.") # Basic logging
+            return {"success": False, "message": "Docker client not initialized", "results": []}
 
         sandboxes = await self._get_app_sandboxes(appId)
         if not sandboxes:
-            print(f"No sandboxes found for app {appId} to stop.") # Basic logging
-            return # TODO: Return a proper response (Issue #XX)
+            print(f"No sandboxes found for app {appId} to {action}.") # Basic logging
+            return {"success": True, "message": f"No sandboxes found for app {appId}", "results": []}
+
+        print(f"Running {action} on {len(sandboxes)} sandbox(es) for app {appId}.") # Basic logging
 
-        print(f"Stopping {len(sandboxes)} sandbox(es) for app {appId}.") # Basic logging
-        for container in sandboxes:
+        async def run(container: docker.models.containers.Container) -> Dict[str, Any]:
             try:
-                container.stop()
-                print(f"Stopped sandbox container: {container.id}") # Basic logging
-            except docker.errors.APIError as e:
-                print(f"Error stopping sandbox container {container.id} for app {appId}: {e}") # Basic logging
+                await operation(container)
+                print(f"Sandbox container {container.id}: {action} complete") # Basic logging
+                return {"sandboxId": container.id, "success": True}
+            except (docker.errors.APIError, SandboxOperationTimeoutError) as e:
+                print(f"Error running {action} on sandbox container {container.id} for app {appId}: {e}") # Basic logging
                 # TODO: Log this error properly (Issue #XX)
+                return {"sandboxId": container.id, "success": False, "message": str(e)}
             except Exception as e:
-                print(f"An unexpected error occurred stopping sandbox {container.id} for app {appId}: {e}") # Basic logging
+                print(f"An unexpected error occurred running {action} on sandbox {container.id} for app {appId}: {e}") # Basic logging
                 # TODO: Log this error properly (Issue #XX)
+                return {"sandboxId": container.id, "success": False, "message": str(e)}
 
-        # TODO: Return a proper success/status response (Issue #XX)
+        results = await self._fan_out(sandboxes, run)
+        failed = sum(1 for result in results if not result["success"])
+        return {
+            "success": failed == 0,
+            "message": f"{action} succeeded for {len(results) - failed} of {len(results)} sandbox(es) of app {appId}",
+            "results": results,
+        }
 
+    async def start_application_sandboxes(self, appId: str) -> Dict[str, Any]:
+        """
+        Starts all sandboxes associated with a specific application, in parallel.
 
-    async def restart_application_sandboxes(self, appId: str): # TODO: Return a proper response (Issue #XX)
+        Args:
+            appId: The ID of the application.
+
+        Returns:
+            A dictionary with overall success and a per-sandbox result list.
         """
-        Restarts all sandboxes associated with a specific application.
+        return await self._apply_to_app_sandboxes(appId, "start", lambda container: self._run_docker(container.start))
+
+
+    async def stop_application_sandboxes(self, appId: str) -> Dict[str, Any]:
+        """
+        Stops all sandboxes associated with a specific application, in parallel.
 
         Args:
             appId: The ID of the application.
+
+        Returns:
+            A dictionary with overall success and a per-sandbox result list.
         """
-        if not self._docker_client:
-            print("Warning: Docker client not initialized. Cannot restart sandboxes.") # Basic logging
-            return # TODO: Return a proper response (Issue #XX)
+        return await self._apply_to_app_sandboxes(appId, "stop", lambda container: self._run_docker_with_grace_period(container.stop))
 
-        sandboxes = await self._get_app_sandboxes(appId)
-        if not sandboxes:
-            print(f"No sandboxes found for app {appId} to restart.") # Basic logging
-            return # TODO: Return a proper response (Issue #XX)
 
-        print(f"Restarting {len(sandboxes)} sandbox(es) for app {appId}.") # Basic logging
-        for container in sandboxes:
-            try:
-                container.restart()
-                print(f"Restarted sandbox container: {container.id}") # Basic logging
-            except docker.errors.APIError as e:
-                print(f"Error restarting sandbox container {container.id} for app {appId}: {e}") # Basic logging
-                # TODO: Log this error properly (Issue #XX)
-            except Exception as e:
-                print(f"An unexpected error occurred restarting sandbox {container.id} for app {appId}: {e}") # Basic logging
-                # TODO: Log this error properly (Issue #XX)
+    async def restart_application_sandboxes(self, appId: str) -> Dict[str, Any]:
+        """
+        Restarts all sandboxes associated with a specific application, in parallel.
 
-        # TODO: Return a proper success/status response (Issue #XX)
+        Args:
+            appId: The ID of the application.
 
+        Returns:
+            A dictionary with overall success and a per-sandbox result list.
+        """
+        return await self._apply_to_app_sandboxes(appId, "restart", lambda container: self._run_docker_with_grace_period(container.restart))
 
-    async def get_application_sandbox_status(self, appId: str) -> List[SandboxStatus]: # TODO: Return a proper response (Issue #XX)
+
+    async def get_application_sandbox_status(self, appId: str) -> List[SandboxStatus]:
         """
         Retrieves the status of all sandboxes associated with a specific application.
+        Containers are inspected in parallel.
 
         Args:
             appId: The ID of the application.
@@ -282,36 +624,50 @@ class SandboxManager(SandboxManagerInterface):
             return [] # TODO: Return a proper response (Issue #XX)
 
         sandboxes = await self._get_app_sandboxes(appId)
-        status_list: List[SandboxStatus] = []
         print(f"Getting status for {len(sandboxes)} sandbox(es) for app {appId}.") # Basic logging
-        for container in sandboxes:
+
+        async def inspect(container: docker.models.containers.Container) -> SandboxStatus:
             try:
-                container.reload() # Get updated status
-                status_list.append(SandboxStatus(
-                    sandboxId=container.id,
-                    appId=appId,
-                    status=container.status, # Docker container status (running, exited, etc.)
-                    image=container.image.tags[0] if container.image.tags else container.image.id, # Get image name/id
-                    created=container.attrs.get("Created"),
-                    started_at=container.attrs.get("State", {}).get("StartedAt"),
-                    finished_at=container.attrs.get("State", {}).get("FinishedAt"),
-                    exit_code=container.attrs.get("State", {}).get("ExitCode"),
-                    # TODO: Add more details like resource usage, network info, etc. (Issue #XX)
-                ))
+                await self._run_docker(container.reload) # Get updated status
+                return _sandbox_status_from_attrs(container.id, appId, container.attrs)
             except docker.errors.NotFound:
                 print(f"Warning: Sandbox container {container.id} not found during status check.") # Basic logging
-                # Add a status indicating not found?
-                status_list.append(SandboxStatus(sandboxId=container.id, appId=appId, status="not_found"))
-            except docker.errors.APIError as e:
+                return SandboxStatus(sandbox_id=container.id, appId=appId, status="not_found")
+            except (docker.errors.APIError, SandboxOperationTimeoutError) as e:
                 print(f"Error getting status for sandbox container {container.id} for app {appId}: {e}") # Basic logging
                 # TODO: Log this error properly (Issue #XX)
-                status_list.append(SandboxStatus(sandboxId=container.id, appId=appId, status="error", details=str(e)))
+                return SandboxStatus(sandbox_id=container.id, appId=appId, status="error", details=str(e))
             except Exception as e:
                 print(f"An unexpected error occurred getting status for sandbox {container.id} for app {appId}: {e}") # Basic logging
                 # TODO: Log this error properly (Issue #XX)
-                status_list.append(SandboxStatus(sandboxId=container.id, appId=appId, status="error", details=str(e)))
+                return SandboxStatus(sandbox_id=container.id, appId=appId, status="error", details=str(e))
+
+        return await self._fan_out(sandboxes, inspect)
+
 
-        return status_list
+    async def list_all_sandboxes(self) -> List[SandboxStatus]:
+        """
+        Lists the sandboxes of every application with a single Docker list call.
+        Uses the list endpoint's summary data (sparse containers) instead of inspecting each container.
+
+        Returns:
+            A list of SandboxStatus objects for all sandbox containers, across applications.
+        """
+        if not self._docker_client:
+            print("Warning: Docker client not initialized. Cannot list sandboxes.") # Basic logging
+            return []
+        try:
+            # A bare label key matches every container carrying that label, whatever its value
+            containers = await self._run_docker(self._docker_client.containers.list, all=True, sparse=True, filters={"label": "app_id"})
+        except (docker.errors.DockerException, SandboxOperationTimeoutError) as e:
+            print(f"Error listing sandbox containers: {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
+            return []
+
+        return [
+            _sandbox_status_from_attrs(container.id, (container.attrs.get("Labels") or {}).get("app_id"), container.attrs)
+            for container in containers
+        ]
 
 
     async def execute_command_in_sandbox(self, appId: str, sandbox_id: str, command: str) -> Dict[str, Any]: # TODO: Return command output/status (Issue #XX)
@@ -333,7 +689,7 @@ class SandboxManager(SandboxManagerInterface):
             return {"success": False, "message": "Docker client not initialized"}
 
         try:
-            container = self._docker_client.containers.get(sandbox_id)
+            container = await self._run_docker(self._docker_client.containers.get, sandbox_id)
             # Optional: Verify container belongs to the correct app_id
             if container.labels.get("app_id") != appId:
                  print(f"Warning: Container {sandbox_id} does not belong to app {appId}. Not executing command.") # Basic logging
@@ -343,7 +699,10 @@ class SandboxManager(SandboxManagerInterface):
             print(f"Executing command '{command}' in sandbox {sandbox_id} for app {appId}.") # Basic logging
             # TODO: Implement security considerations for command execution (e.g., user, working_dir, environment) (Issue #XX)
             # TODO: Use hardened wrappers if available (as per security rules) (Issue #XX)
-            exec_result = container.exec_run(command, stream=False, demux=True) # stream=False for simple output
+            exec_result = await self._run_docker(
+                container.exec_run, command, stream=False, demux=True, # stream=False for simple output
+                timeout=self.docker_config["exec_timeout_seconds"],
+            )
 
             stdout = exec_result.output[0].decode('utf-8') if exec_result.output and exec_result.output[0] else ""
             stderr = exec_result.output[1].decode('utf-8') if exec_result.output and exec_result.output[1] else ""
@@ -372,3 +731,46 @@ class SandboxManager(SandboxManagerInterface):
     # TODO: Add internal methods for interacting with the Docker API (Issue #XX)
     # TODO: Add internal methods for managing sandbox pools and scaling (Issue #XX)
     # TODO: Add internal methods for handling sandbox health checks (Issue #XX)
+
+
+def _pool_field(pool_config: Any, name: str) -> Any:
+    """Reads a SandboxPoolConfig field from either the dataclass or a YAML-loaded dict."""
+    if isinstance(pool_config, dict):
+        return pool_config.get(name)
+    return getattr(pool_config, name, None)
+
+
+def _sandbox_status_from_attrs(sandbox_id: str, app_id: Optional[str], attrs: Dict[str, Any]) -> SandboxStatus:
+    """
+    Builds a SandboxStatus from container attributes.
+    Accepts both full inspect data (State is a dict) and list summaries (State is a string).
+    """
+    state = attrs.get("State")
+    if isinstance(state, dict):
+        status = state.get("Status", "unknown")
+        details = f"exit_code={state.get('ExitCode')}" if status == "exited" else state.get("Error") or None
+    else:
+        status = state or "unknown"
+        details = attrs.get("Status") # Human-readable summary, e.g. "Up 5 minutes"
+    created = attrs.get("Created")
+    if isinstance(created, (int, float)): # List summaries report a Unix timestamp
+        created = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(created))
+    # TODO: Add more details like resource usage, network info, etc. (Issue #XX)
+    return SandboxStatus(sandbox_id=sandbox_id, appId=app_id or "", status=status, details=details, createdAt=created)
+
+
+def _sandbox_endpoint_from_attrs(attrs: Dict[str, Any], docker_config: Dict[str, Any]) -> Optional[str]:
+    """
+    Derives a sandbox's API base URL from container inspect data.
+    Uses the container IP on the shared network when one is configured, otherwise the published host port.
+    """
+    port = docker_config["sandbox_api_port"]
+    network_settings = attrs.get("NetworkSettings") or {}
+    network = docker_config.get("sandbox_network")
+    if network:
+        ip_address = ((network_settings.get("Networks") or {}).get(network) or {}).get("IPAddress")
+        return f"http://{ip_address}:{port}" if ip_address else None
+    bindings = (network_settings.get("Ports") or {}).get(f"{port}/tcp") or []
+    if not bindings or not bindings[0].get("HostPort"):
+        return None
+    return f"http://{docker_config['sandbox_host']}:{bindings[0]['HostPort']}"
@@ -0,0 +1,261 @@
+from typing import Optional, Dict, Any, List, Set, Callable, Awaitable, Deque, Tuple
+from collections import deque
+import asyncio
+import time
+
+
+class SandboxPoolExhaustedError(Exception):
+    """Raised when no sandbox could be leased from a pool before the acquire timeout."""
+    pass
+
+
+class SandboxPool:
+    """
+    A warm pool of identical sandbox containers for one application pool definition.
+
+    The pool keeps at least `min_instances` containers running, leases idle containers to callers,
+    creates new ones on demand up to `max_instances`, and reaps containers that stay idle longer than
+    `idle_ttl_seconds` (never dropping below `min_instances`). Container creation and destruction are
+    delegated to the injected callables so the pool itself stays independent of the Docker SDK.
+    """
+    def __init__(
+        self,
+        app_id: str,
+        pool_id: str,
+        min_instances: int,
+        max_instances: int,
+        create_container: Callable[[], Awaitable[Any]],
+        destroy_container: Callable[[Any], Awaitable[None]],
+        idle_ttl_seconds: float = 300.0,
+    ):
+        """
+        Initializes an empty pool. Call warm() to pre-start the minimum number of containers.
+
+        Args:
+            app_id: The ID of the application the pool belongs to.
+            pool_id: The ID of the pool within the application's sandbox configuration.
+            min_instances: Number of containers kept running even when idle.
+            max_instances: Upper bound on containers (idle + leased + being created).
+            create_container: Async callable creating and starting a container; returns an object with an `id`.
+            destroy_container: Async callable stopping and removing a container.
+            idle_ttl_seconds: How long a container above `min_instances` may stay idle before being reaped.
+        """
+        self.app_id = app_id
+        self.pool_id = pool_id
+        self.min_instances = max(0, min_instances)
+        self.max_instances = max(1, max_instances, self.min_instances)
+        self.idle_ttl_seconds = idle_ttl_seconds
+        self._create_container = create_container
+        self._destroy_container = destroy_container
+        self._idle: Deque[Tuple[Any, float]] = deque() # (container, idle_since), most recently used on the right
+        self._leased: Dict[str, Any] = {} # container_id -> container
+        self._pending_creates = 0 # Containers being created, counted against max_instances
+        self._condition = asyncio.Condition()
+        self._closed = False
+        self._cleanup_tasks: Set[asyncio.Task] = set() # Slot releases/destroys that must outlive a cancelled caller
+
+    @property
+    def size(self) -> int:
+        """Total number of containers owned by the pool, including ones being created."""
+        return len(self._idle) + len(self._leased) + self._pending_creates
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns a snapshot of the pool's occupancy.
+
+        Returns:
+            A dictionary with idle, leased, pending and configured bounds.
+        """
+        return {
+            "appId": self.app_id,
+            "poolId": self.pool_id,
+            "idle": len(self._idle),
+            "leased": len(self._leased),
+            "pending": self._pending_creates,
+            "minInstances": self.min_instances,
+            "maxInstances": self.max_instances,
+        }
+
+    async def warm(self):
+        """
+        Creates containers until the pool holds `min_instances`, starting them concurrently.
+        Each container becomes leasable as soon as it is up, so acquire() need not wait for the whole pool.
+        Creation failures are logged and leave the pool smaller; the next warm() or acquire() retries.
+        """
+        missing = max(0, self.min_instances - self.size)
+        if missing:
+            await asyncio.gather(*(self._warm_one() for _ in range(missing)))
+
+    async def _warm_one(self):
+        """Reserves a slot if the pool is still below `min_instances` and creates an idle container in it."""
+        async with self._condition:
+            if self._closed or self.size >= self.min_instances:
+                return # A concurrent warm() or acquire() already filled the slot
+            self._pending_creates += 1
+        # No suspension point between reserving and _create_reserved, which releases the slot on any failure
+        await self._create_reserved(lease=False)
+
+    async def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Leases a container, reusing an idle one, creating one if below `max_instances`,
+        or waiting for a release otherwise.
+
+        Args:
+            timeout: Maximum seconds to wait for a container. None waits indefinitely.
+
+        Returns:
+            The leased container.
+
+        Raises:
+            SandboxPoolExhaustedError: If no container became available before the timeout,
+                                       or if the pool is closed.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            async with self._condition:
+                if self._closed:
+                    raise SandboxPoolExhaustedError(f"Sandbox pool '{self.pool_id}' for app '{self.app_id}' is closed")
+                if self._idle:
+                    container, _ = self._idle.pop() # Most recently used container is the warmest
+                    self._leased[container.id] = container
+                    return container
+                if self.size < self.max_instances:
+                    self._pending_creates += 1 # Reserve the slot before releasing the lock
+                else:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        raise SandboxPoolExhaustedError(
+                            f"No sandbox available in pool '{self.pool_id}' for app '{self.app_id}' "
+                            f"(max_instances={self.max_instances})"
+                        )
+                    try:
+                        await asyncio.wait_for(self._condition.wait(), remaining)
+                    except asyncio.TimeoutError:
+                        pass # Loop re-checks state and raises if the deadline has passed
+                    continue
+
+            container = await self._create_reserved(lease=True)
+            if container is None:
+                raise SandboxPoolExhaustedError(f"Failed to create sandbox in pool '{self.pool_id}' for app '{self.app_id}'")
+            return container
+
+    async def release(self, container_id: str, healthy: bool = True):
+        """
+        Returns a leased container to the pool. Unhealthy containers are destroyed instead
+        and the pool is topped back up to `min_instances`.
+
+        Args:
+            container_id: The ID of the leased container.
+            healthy: False if the caller saw the container misbehave (e.g., connection errors).
+        """
+        async with self._condition:
+            container = self._leased.pop(container_id, None)
+            if container is None:
+                print(f"Warning: Sandbox {container_id} is not leased from pool '{self.pool_id}' for app '{self.app_id}'.") # Basic logging
+                return
+            if healthy and not self._closed:
+                self._idle.append((container, time.monotonic()))
+                self._condition.notify()
+                return
+            self._condition.notify() # A slot below max_instances just opened up
+        await self._destroy(container)
+        if not self._closed:
+            await self.warm()
+
+    async def reap_idle(self) -> int:
+        """
+        Destroys containers that have been idle longer than `idle_ttl_seconds`, keeping at least
+        `min_instances` containers in the pool.
+
+        Returns:
+            The number of containers reaped.
+        """
+        expired: List[Any] = []
+        now = time.monotonic()
+        async with self._condition:
+            # The oldest idle containers sit on the left of the deque
+            while self._idle and self.size > self.min_instances:
+                container, idle_since = self._idle[0]
+                if now - idle_since < self.idle_ttl_seconds:
+                    break
+                self._idle.popleft()
+                expired.append(container)
+        for container in expired:
+            await self._destroy(container)
+        if expired:
+            print(f"Reaped {len(expired)} idle sandbox(es) from pool '{self.pool_id}' for app '{self.app_id}'.") # Basic logging
+        return len(expired)
+
+    async def close(self):
+        """
+        Closes the pool and destroys its idle containers. Leased containers are destroyed when released;
+        containers still being created are destroyed once they have started.
+        """
+        async with self._condition:
+            self._closed = True
+            idle = [container for container, _ in self._idle]
+            self._idle.clear()
+            self._condition.notify_all()
+        for container in idle:
+            await self._destroy(container)
+        if self._cleanup_tasks:
+            await asyncio.gather(*self._cleanup_tasks, return_exceptions=True)
+
+    async def _create_reserved(self, lease: bool) -> Optional[Any]:
+        """
+        Creates a container for a slot already counted in `_pending_creates` and moves it into leased
+        (lease=True) or idle, releasing the slot under the lock so `size` never dips while the container
+        changes hands.
+
+        The slot is also released if creation fails or the caller is cancelled; a container created by
+        then, or one that finishes starting after the pool was closed, is destroyed.
+
+        Returns:
+            The container, or None if creation failed or the pool was closed meanwhile.
+        """
+        container = None
+        try:
+            container = await self._create_container()
+            async with self._condition:
+                if not self._closed:
+                    self._pending_creates -= 1
+                    if lease:
+                        self._leased[container.id] = container
+                    else:
+                        self._idle.append((container, time.monotonic()))
+                        self._condition.notify()
+                    return container
+        except Exception as e:
+            if container is None:
+                print(f"Error creating sandbox for pool '{self.pool_id}' of app '{self.app_id}': {e}") # Basic logging
+                # TODO: Log this error properly (Issue #XX)
+        except BaseException: # Cancelled while creating or while waiting for the lock
+            self._pending_creates -= 1
+            self._spawn_cleanup(container)
+            raise
+        self._pending_creates -= 1
+        self._spawn_cleanup(container)
+        return None
+
+    def _spawn_cleanup(self, container: Optional[Any]):
+        """
+        Wakes a waiter for a released slot and destroys the container (if any) in a separate task, so it
+        completes even when the current caller is being cancelled.
+        """
+        async def cleanup():
+            async with self._condition:
+                self._condition.notify()
+            if container is not None:
+                await self._destroy(container)
+
+        task = asyncio.get_running_loop().create_task(cleanup())
+        self._cleanup_tasks.add(task)
+        task.add_done_callback(self._cleanup_tasks.discard)
+
+    async def _destroy(self, container: Any):
+        """Destroys a container, logging rather than raising on failure."""
+        try:
+            await self._destroy_container(container)
+        except Exception as e:
+            print(f"Error destroying sandbox {getattr(container, 'id', container)} in pool '{self.pool_id}': {e}") # Basic logging
+            # TODO: Log this error properly (Issue #XX)
@@ -0,0 +1,145 @@
+from typing import Optional, Dict, Any, Tuple
+from collections import OrderedDict
+import os
+
+# Defaults for the definition file content cache; override via the definition_cache_config argument of StateManager
+DEFAULT_DEFINITION_FILE_CACHE_CONFIG: Dict[str, Any] = {
+    "max_entries": 4096, # Least recently used files are evicted beyond this
+    "max_bytes": 64 * 1024 * 1024, # Total size of cached contents (as measured on disk)
+    "max_file_bytes": 1024 * 1024, # Larger files are read from disk every time
+}
+
+# (st_mtime_ns, st_ino, st_size): any write, replace (new inode) or truncation changes it
+StatSignature = Tuple[int, int, int]
+
+
+def stat_signature(stat_result: os.stat_result) -> StatSignature:
+    """Returns the fields of a stat result that change whenever the file content changes."""
+    return stat_result.st_mtime_ns, stat_result.st_ino, stat_result.st_size
+
+
+class DefinitionFileCache:
+    """
+    A bounded LRU cache of definition file contents keyed by (app_id, path).
+
+    Every lookup is validated against the file's current stat signature (mtime, inode, size), so edits
+    made outside the StateManager are picked up on the next read; writes through the StateManager
+    additionally invalidate entries eagerly. The cache is bounded both by entry count and by total bytes.
+    """
+    def __init__(self, max_entries: int = 4096, max_bytes: int = 64 * 1024 * 1024, max_file_bytes: int = 1024 * 1024):
+        """
+        Initializes an empty cache.
+
+        Args:
+            max_entries: Maximum number of cached files.
+            max_bytes: Maximum total size of cached contents.
+            max_file_bytes: Files larger than this are never cached.
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max_bytes
+        self.max_file_bytes = min(max_file_bytes, max_bytes)
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[StatSignature, str]]" = OrderedDict()
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._stale = 0
+        self._evictions = 0
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> "DefinitionFileCache":
+        """
+        Builds a cache from DEFAULT_DEFINITION_FILE_CACHE_CONFIG merged with overrides.
+
+        Args:
+            config: Optional overrides (max_entries, max_bytes, max_file_bytes).
+
+        Returns:
+            The configured DefinitionFileCache.
+        """
+        config = {**DEFAULT_DEFINITION_FILE_CACHE_CONFIG, **(config or {})}
+        return cls(config["max_entries"], config["max_bytes"], config["max_file_bytes"])
+
+    def get(self, app_id: str, path: str, signature: StatSignature) -> Optional[str]:
+        """
+        Returns the cached content of a file if it is still current.
+
+        Args:
+            app_id: The ID of the application.
+            path: The normalized path relative to the application's definition root.
+            signature: The file's current stat signature.
+
+        Returns:
+            The cached content, or None on a miss (including a stale entry, which is dropped).
+        """
+        key = (app_id, path)
+        entry = self._entries.get(key)
+        if entry is None:
+            self._misses += 1
+            return None
+        if entry[0] != signature:
+            self._drop(key)
+            self._stale += 1
+            self._misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self._hits += 1
+        return entry[1]
+
+    def put(self, app_id: str, path: str, signature: StatSignature, content: str):
+        """
+        Caches a file's content, evicting least recently used files to stay within the limits.
+
+        Args:
+            app_id: The ID of the application.
+            path: The normalized path relative to the application's definition root.
+            signature: The stat signature taken before the content was read.
+            content: The file content.
+        """
+        size = signature[2]
+        key = (app_id, path)
+        self._drop(key)
+        if size > self.max_file_bytes:
+            return
+        self._entries[key] = (signature, content)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            self._drop(next(iter(self._entries)))
+            self._evictions += 1
+
+    def invalidate(self, app_id: str, path: Optional[str] = None):
+        """
+        Drops cached files of an application.
+
+        Args:
+            app_id: The ID of the application.
+            path: Drop only this file; if None, every cached file of the application is dropped.
+        """
+        if path is not None:
+            self._drop((app_id, path))
+            return
+        for key in [key for key in self._entries if key[0] == app_id]:
+            self._drop(key)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns cache effectiveness and size counters.
+
+        Returns:
+            A dictionary with hits, misses, stale (entries found changed on disk), evictions, entries, bytes and hit_ratio.
+        """
+        lookups = self._hits + self._misses
+        return {
+            "hits": self._hits,
+            "misses": self._misses,
+            "stale": self._stale,
+            "evictions": self._evictions,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "hit_ratio": self._hits / lookups if lookups else 0.0,
+        }
+
+    def _drop(self, key: Tuple[str, str]):
+        """Removes an entry, if present, and releases its bytes."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[0][2]
@@ -0,0 +1,236 @@
+from typing import Dict, Any, List, Iterator, AsyncIterator
+from collections import OrderedDict
+from contextlib import contextmanager, asynccontextmanager
+import asyncio
+import os
+import threading
+import time
+import git
+
+# Defaults for per-application definition repositories; override via the definition_repo_config argument of StateManager
+DEFAULT_DEFINITION_REPO_CONFIG: Dict[str, Any] = {
+    "max_open_repos": 64, # Repo handles kept open; each may hold persistent `git cat-file` processes
+    "hot_apps_reported": 10, # Apps with the most lock wait time listed in the contention stats
+}
+
+
+class RepoHandleCache:
+    """
+    A bounded LRU cache of open git.Repo handles, keyed by application ID.
+
+    Opening a Repo re-stats the directory and re-reads its config, and every handle lazily starts
+    persistent `git cat-file` processes, so handles are reused across operations and the least recently
+    used one is closed (stopping its processes) once more than max_open_repos are open. A handle that is
+    leased (in use, possibly in a worker thread) when it is evicted is closed when its last lease ends.
+    The cache itself is thread-safe; a single Repo handle is not, so callers serialize their use of it.
+    """
+    def __init__(self, definition_state_path: str, max_open_repos: int = 64):
+        """
+        Initializes an empty cache.
+
+        Args:
+            definition_state_path: The root directory of the application repositories.
+            max_open_repos: Maximum number of open repository handles.
+        """
+        self.definition_state_path = definition_state_path
+        self.max_open_repos = max(1, max_open_repos)
+        self._repos: "OrderedDict[str, git.Repo]" = OrderedDict()
+        self._leases: Dict[int, int] = {} # id(repo) -> active leases
+        self._evicted_while_leased: Dict[int, git.Repo] = {}
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._repos)
+
+    def get(self, app_id: str) -> git.Repo:
+        """
+        Returns the open handle for an application's repository, opening it if needed.
+
+        Args:
+            app_id: The ID of the application.
+
+        Returns:
+            The cached git.Repo.
+
+        Raises:
+            FileNotFoundError: If the application has no repository.
+        """
+        with self._lock:
+            repo = self._repos.get(app_id)
+            if repo is not None:
+                self._repos.move_to_end(app_id)
+                self._hits += 1
+                return repo
+        repo_path = os.path.join(self.definition_state_path, app_id)
+        try:
+            repo = git.Repo(repo_path)
+        except (git.NoSuchPathError, git.InvalidGitRepositoryError) as e:
+            raise FileNotFoundError(f"No definition state repository for app {app_id}") from e
+        with self._lock:
+            self._misses += 1
+            if app_id in self._repos: # Opened concurrently by another thread; keep the first handle
+                repo.close()
+                return self._repos[app_id]
+            self._add(app_id, repo)
+        return repo
+
+    def put(self, app_id: str, repo: git.Repo):
+        """Caches a handle opened elsewhere (e.g. by git.Repo.init), closing any handle it replaces."""
+        with self._lock:
+            previous = self._repos.pop(app_id, None)
+            if previous is not None and previous is not repo:
+                self._close_or_defer(previous)
+            self._add(app_id, repo)
+
+    @contextmanager
+    def lease(self, app_id: str) -> Iterator[git.Repo]:
+        """
+        Context manager that yields an application's handle and keeps it open until the block exits,
+        even if it is evicted meanwhile.
+
+        Raises:
+            FileNotFoundError: If the application has no repository.
+        """
+        while True:
+            repo = self.get(app_id)
+            with self._lock:
+                if self._repos.get(app_id) is repo: # Not evicted between get() and here
+                    self._leases[id(repo)] = self._leases.get(id(repo), 0) + 1
+                    break
+        try:
+            yield repo
+        finally:
+            with self._lock:
+                remaining = self._leases[id(repo)] - 1
+                if remaining:
+                    self._leases[id(repo)] = remaining
+                else:
+                    del self._leases[id(repo)]
+                    if self._evicted_while_leased.pop(id(repo), None) is not None:
+                        repo.close()
+
+    def forget(self, app_id: str):
+        """Closes and drops an application's handle (e.g. when its repository is deleted)."""
+        with self._lock:
+            repo = self._repos.pop(app_id, None)
+            if repo is not None:
+                self._close_or_defer(repo)
+
+    def close(self):
+        """Closes every handle that is not leased; leased ones are closed when released."""
+        with self._lock:
+            while self._repos:
+                self._close_or_defer(self._repos.popitem(last=False)[1])
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns cache counters.
+
+        Returns:
+            A dictionary with open handles, hits, misses, evictions and currently leased handles.
+        """
+        with self._lock:
+            return {
+                "open": len(self._repos),
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "leased": len(self._leases),
+            }
+
+    def _add(self, app_id: str, repo: git.Repo):
+        """Inserts a handle and evicts the least recently used ones beyond the limit. Caller holds self._lock."""
+        self._repos[app_id] = repo
+        while len(self._repos) > self.max_open_repos:
+            _, evicted = self._repos.popitem(last=False)
+            self._evictions += 1
+            self._close_or_defer(evicted)
+
+    def _close_or_defer(self, repo: git.Repo):
+        """Closes a handle now, or when its last lease ends. Caller holds self._lock."""
+        if id(repo) in self._leases:
+            self._evicted_while_leased[id(repo)] = repo
+        else:
+            repo.close()
+
+
+class AppWriteLocks:
+    """
+    Per-application asyncio locks for definition state writes, with contention metrics.
+
+    Writes to one application's repository (working tree, index and commit) are serialized, so they
+    never race on `index.lock`; writes to different applications proceed in parallel. Locks are created
+    on first use and dropped when idle; the per-application counters are kept to identify hot apps.
+    """
+    def __init__(self, hot_apps_reported: int = 10):
+        """
+        Initializes the lock table.
+
+        Args:
+            hot_apps_reported: Number of applications listed in get_stats()["hot_apps"].
+        """
+        self.hot_apps_reported = hot_apps_reported
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self._users: Dict[str, int] = {} # Holders and waiters per app; the lock is dropped when this reaches 0
+        self._app_stats: Dict[str, Dict[str, Any]] = {}
+
+    @asynccontextmanager
+    async def hold(self, app_id: str) -> AsyncIterator[None]:
+        """
+        Async context manager that holds an application's write lock for the duration of the block.
+
+        Args:
+            app_id: The ID of the application.
+        """
+        lock = self._locks.get(app_id)
+        if lock is None:
+            lock = self._locks[app_id] = asyncio.Lock()
+        self._users[app_id] = self._users.get(app_id, 0) + 1
+        stats = self._app_stats.get(app_id)
+        if stats is None:
+            stats = self._app_stats[app_id] = {"acquisitions": 0, "contended": 0, "wait_seconds_total": 0.0,
+                                               "wait_seconds_max": 0.0, "hold_seconds_total": 0.0}
+        contended = lock.locked()
+        started = time.perf_counter()
+        try:
+            async with lock:
+                acquired = time.perf_counter()
+                waited = acquired - started
+                stats["acquisitions"] += 1
+                if contended:
+                    stats["contended"] += 1
+                stats["wait_seconds_total"] += waited
+                stats["wait_seconds_max"] = max(stats["wait_seconds_max"], waited)
+                try:
+                    yield
+                finally:
+                    stats["hold_seconds_total"] += time.perf_counter() - acquired
+        finally:
+            self._users[app_id] -= 1
+            if not self._users[app_id]:
+                del self._users[app_id]
+                del self._locks[app_id]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns lock contention counters.
+
+        Returns:
+            A dictionary with totals (acquisitions, contended, wait_seconds_total), the number of apps with a
+            lock currently in use, and "hot_apps": the apps with the most total wait time, with their counters.
+        """
+        hot_apps: List[Dict[str, Any]] = [
+            {"app_id": app_id, **stats}
+            for app_id, stats in sorted(self._app_stats.items(), key=lambda item: item[1]["wait_seconds_total"], reverse=True)
+            if stats["contended"]
+        ][:self.hot_apps_reported]
+        return {
+            "acquisitions": sum(stats["acquisitions"] for stats in self._app_stats.values()),
+            "contended": sum(stats["contended"] for stats in self._app_stats.values()),
+            "wait_seconds_total": sum(stats["wait_seconds_total"] for stats in self._app_stats.values()),
+            "active_apps": len(self._locks),
+            "hot_apps": hot_apps,
+        }
@@ -0,0 +1,254 @@
+from typing import Optional, Dict, Any, List, Callable, Awaitable, Set, TYPE_CHECKING
+import asyncio
+import os
+
+if TYPE_CHECKING: # Avoid a circular import; only needed for annotations
+    from backend.src.core.state_manager.state_manager import StateManager
+
+# Defaults for definition state writes; override via the definition_write_config argument of StateManager
+DEFAULT_DEFINITION_WRITE_CONFIG: Dict[str, Any] = {
+    # Single-file writes/deletes of an app arriving within this window share one Git commit. 0 disables coalescing.
+    "coalesce_window_seconds": 0.0,
+    "max_batch_files": 200, # A batch is committed early once it touches this many files
+}
+
+# Commits the given app-relative paths (as they are on disk) in one commit and returns its hex SHA
+CommitPaths = Callable[[str, List[str], str], Awaitable[str]]
+
+
+def batch_commit_message(messages: List[str]) -> str:
+    """
+    Combines the messages of coalesced writes into one commit message.
+
+    Args:
+        messages: The commit messages of the individual writes, in order.
+
+    Returns:
+        The single message if all writes used the same one, else a summary line followed by one bullet per distinct message.
+    """
+    distinct = list(dict.fromkeys(messages))
+    if len(distinct) == 1:
+        return distinct[0]
+    return f"Batch of {len(messages)} definition changes\n\n" + "\n".join(f"- {message}" for message in distinct)
+
+
+class DefinitionTransaction:
+    """
+    Stages definition file writes and deletes for one application and commits them as a single Git commit.
+
+    Nothing touches the working tree until commit(); rollback() (or leaving an `async with` block
+    without committing) discards the staged changes.
+
+    Example:
+        async with state_manager.begin_definition_transaction(app_id) as transaction:
+            transaction.set_file("workflows/a.yaml", content_a)
+            transaction.delete_file("workflows/old.yaml")
+            await transaction.commit("Rewrite workflows")
+    """
+    def __init__(self, state_manager: "StateManager", app_id: str):
+        """
+        Initializes an empty transaction. Use StateManager.begin_definition_transaction() instead of calling this directly.
+
+        Args:
+            state_manager: The StateManager that applies the changes.
+            app_id: The ID of the application.
+        """
+        self._state_manager = state_manager
+        self.app_id = app_id
+        self._changes: Dict[str, Optional[str]] = {} # Normalized path -> new content, or None to delete
+        self._closed = False
+
+    @property
+    def changed_paths(self) -> List[str]:
+        """The normalized paths staged in this transaction, in the order they were first touched."""
+        return list(self._changes)
+
+    def set_file(self, path: str, content: str):
+        """
+        Stages writing a file. A later set_file/delete_file on the same path replaces this change.
+
+        Args:
+            path: The path relative to the application's definition root.
+            content: The content to write.
+        """
+        self._ensure_open()
+        self._changes[os.path.normpath(path)] = content
+
+    def delete_file(self, path: str):
+        """
+        Stages deleting a file.
+
+        Args:
+            path: The path relative to the application's definition root.
+        """
+        self._ensure_open()
+        self._changes[os.path.normpath(path)] = None
+
+    async def commit(self, message: str) -> Optional[str]:
+        """
+        Writes all staged changes and records them in one Git commit (one index write).
+
+        Args:
+            message: The Git commit message.
+
+        Returns:
+            The hex SHA of the new commit, or None if nothing was staged.
+
+        Raises:
+            RuntimeError: If the transaction was already committed or rolled back.
+            ValueError: If a staged path escapes the application's directory (nothing is written).
+        """
+        self._ensure_open()
+        self._closed = True
+        if not self._changes:
+            return None
+        return await self._state_manager._apply_definition_changes(self.app_id, self._changes, message)
+
+    def rollback(self):
+        """Discards all staged changes. Does nothing if the transaction is already closed."""
+        self._changes = {}
+        self._closed = True
+
+    def _ensure_open(self):
+        if self._closed:
+            raise RuntimeError(f"Definition transaction for app {self.app_id} is already closed")
+
+    async def __aenter__(self) -> "DefinitionTransaction":
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        if not self._closed:
+            if exc_type is None:
+                print(f"Warning: Definition transaction for app {self.app_id} left without commit; discarding {len(self._changes)} changes.")
+                # TODO: Log this warning properly (Issue #XX)
+            self.rollback()
+
+
+class _PendingBatch:
+    """Writes of one app waiting for the coalescing window to close."""
+    def __init__(self, loop: asyncio.AbstractEventLoop):
+        self.paths: Dict[str, None] = {} # Ordered set of touched paths
+        self.messages: List[str] = []
+        self.future: asyncio.Future = loop.create_future()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class DefinitionWriteCoalescer:
+    """
+    Groups single-file definition writes for the same application into one Git commit.
+
+    Files are written to disk by the caller right away (so reads see them immediately); only the
+    Git index update and commit are deferred. The first write for an app opens a window of
+    `window_seconds`; every write in the window joins the batch and its caller waits until the
+    batch's commit completes (or fails), so awaiting a write still means it is committed.
+    A batch is committed in its own task, so a caller cancelled while flushing neither leaves the
+    other writers waiting nor the batch's files uncommitted.
+    """
+    def __init__(self, commit_paths: CommitPaths, window_seconds: float, max_batch_files: int = 200):
+        """
+        Initializes the coalescer.
+
+        Args:
+            commit_paths: Coroutine function committing (app_id, paths, message) and returning the commit SHA.
+            window_seconds: How long the first write of a batch waits for others.
+            max_batch_files: A batch touching this many files is committed without waiting for the window.
+        """
+        self._commit_paths = commit_paths
+        self.window_seconds = window_seconds
+        self.max_batch_files = max(1, max_batch_files)
+        self._pending: Dict[str, _PendingBatch] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
+        self._batches = 0
+        self._writes = 0
+
+    async def submit(self, app_id: str, path: str, message: str) -> str:
+        """
+        Adds a file change that is already on disk to the app's pending batch and waits for its commit.
+
+        Args:
+            app_id: The ID of the application.
+            path: The normalized path relative to the application's definition root.
+            message: The commit message for this change.
+
+        Returns:
+            The hex SHA of the commit that included the change.
+
+        Raises:
+            Exception: Whatever the batch commit raised.
+        """
+        batch = self._pending.get(app_id)
+        if batch is None:
+            loop = asyncio.get_running_loop()
+            batch = self._pending[app_id] = _PendingBatch(loop)
+            batch.timer = loop.call_later(self.window_seconds, self._schedule_flush, app_id, batch)
+        batch.paths[path] = None
+        batch.messages.append(message)
+        self._writes += 1
+        if len(batch.paths) >= self.max_batch_files:
+            await self.flush(app_id)
+        # Shielded so one cancelled caller does not cancel the shared result for the others
+        return await asyncio.shield(batch.future)
+
+    def pending_paths(self, app_id: str) -> List[str]:
+        """Returns the paths of an application's writes that are waiting for their commit."""
+        batch = self._pending.get(app_id)
+        return list(batch.paths) if batch is not None else []
+
+    async def flush(self, app_id: str):
+        """
+        Commits an application's pending batch now, if there is one. If the caller is cancelled,
+        the commit still completes and the batch's writers still get its result.
+
+        Args:
+            app_id: The ID of the application.
+        """
+        batch = self._pending.pop(app_id, None)
+        if batch is None:
+            return
+        if batch.timer is not None:
+            batch.timer.cancel()
+        self._batches += 1
+        task = asyncio.ensure_future(self._commit_batch(app_id, batch))
+        self._track(task)
+        await asyncio.shield(task)
+
+    async def flush_all(self):
+        """Commits every pending batch and waits for commits still running. Call before shutdown."""
+        for app_id in list(self._pending):
+            await self.flush(app_id)
+        await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns coalescing counters.
+
+        Returns:
+            A dictionary with writes (submitted changes), batches (commits made), pending_apps and writes_per_commit.
+        """
+        return {
+            "writes": self._writes,
+            "batches": self._batches,
+            "pending_apps": len(self._pending),
+            "writes_per_commit": self._writes / self._batches if self._batches else 0.0,
+        }
+
+    async def _commit_batch(self, app_id: str, batch: _PendingBatch):
+        """Commits a batch and resolves its future, whatever happens. Failures are left to its writers."""
+        try:
+            batch.future.set_result(await self._commit_paths(app_id, list(batch.paths), batch_commit_message(batch.messages)))
+        except asyncio.CancelledError:
+            batch.future.cancel()
+            raise
+        except Exception as e:
+            print(f"Error committing {len(batch.paths)} coalesced definition changes for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            batch.future.set_exception(e)
+
+    def _schedule_flush(self, app_id: str, batch: _PendingBatch):
+        """Timer callback: flushes the batch if it is still the app's pending one."""
+        if self._pending.get(app_id) is batch:
+            self._track(asyncio.ensure_future(self.flush(app_id)))
+
+    def _track(self, task: asyncio.Task):
+        self._flush_tasks.add(task) # Keep a reference until the task finishes
+        task.add_done_callback(self._flush_tasks.discard)
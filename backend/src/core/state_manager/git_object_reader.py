@@ -0,0 +1,249 @@
+from typing import Optional, Dict, Any, List, Tuple
+from collections import OrderedDict
+import os
+import git
+
+from backend.src.core.state_manager.definition_repos import RepoHandleCache
+
+# Defaults for reads from the Git object database; override via the git_object_cache_config argument of StateManager
+DEFAULT_GIT_OBJECT_CACHE_CONFIG: Dict[str, Any] = {
+    "max_blob_bytes": 32 * 1024 * 1024, # Total size of cached blob contents
+    "max_blob_entries": 8192,
+    "max_path_entries": 65536, # (commit, path) -> blob lookups
+    "max_repos": 64, # Repository handles kept open, each with a persistent `git cat-file --batch` process
+}
+
+
+class _LRU:
+    """Minimal LRU map bounded by entry count and, optionally, by the total size of its values."""
+    def __init__(self, max_entries: int, max_size: Optional[int] = None):
+        self.max_entries = max(1, max_entries)
+        self.max_size = max_size
+        self.size = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[Any, Tuple[Any, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Any) -> bool:
+        return key in self._entries
+
+    def get(self, key: Any) -> Any:
+        value, _ = self._entries[key]
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Any, value: Any, size: int = 0):
+        if self.max_size is not None and size > self.max_size:
+            return
+        self.pop(key)
+        self._entries[key] = (value, size)
+        self.size += size
+        while len(self._entries) > self.max_entries or (self.max_size is not None and self.size > self.max_size):
+            self.pop(next(iter(self._entries)))
+            self.evictions += 1
+
+    def pop(self, key: Any):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size -= entry[1]
+
+    def clear(self):
+        self._entries.clear()
+        self.size = 0
+
+
+class GitObjectReader:
+    """
+    Reads definition files and directories straight from an application's Git object database at a
+    given commit or ref, without touching the working tree.
+
+    Objects (loose or packed) are streamed through the persistent `git cat-file --batch` process of a
+    cached Repo handle, so a read costs no process spawn. Because Git objects are immutable, reads are
+    snapshot-consistent while writes are in flight and need no locks, and caches never need invalidation:
+    blob contents are cached by blob SHA and path lookups by (commit SHA, path). Only ref resolution
+    (e.g. "HEAD") is repeated per read.
+    """
+    def __init__(self, definition_state_path: str, max_blob_bytes: int = 32 * 1024 * 1024, max_blob_entries: int = 8192,
+                 max_path_entries: int = 65536, max_repos: int = 64):
+        """
+        Initializes the reader.
+
+        Args:
+            definition_state_path: The root directory of the application repositories.
+            max_blob_bytes: Maximum total size of cached blob contents.
+            max_blob_entries: Maximum number of cached blobs.
+            max_path_entries: Maximum number of cached (commit, path) lookups.
+            max_repos: Maximum number of open repository handles.
+        """
+        self.definition_state_path = definition_state_path
+        self._blobs = _LRU(max_blob_entries, max_blob_bytes) # blob SHA -> decoded content
+        self._paths = _LRU(max_path_entries) # (app_id, commit SHA, path) -> blob SHA, or None if not a file there
+        # Handles of its own: reads run on the event loop while writes may use the StateManager's handles in worker threads
+        self._repos = RepoHandleCache(definition_state_path, max_repos)
+        self._hits = 0
+        self._misses = 0
+
+    @classmethod
+    def from_config(cls, definition_state_path: str, config: Optional[Dict[str, Any]] = None) -> "GitObjectReader":
+        """
+        Builds a reader from DEFAULT_GIT_OBJECT_CACHE_CONFIG merged with overrides.
+
+        Args:
+            definition_state_path: The root directory of the application repositories.
+            config: Optional overrides (max_blob_bytes, max_blob_entries, max_path_entries, max_repos).
+
+        Returns:
+            The configured GitObjectReader.
+        """
+        config = {**DEFAULT_GIT_OBJECT_CACHE_CONFIG, **(config or {})}
+        return cls(definition_state_path, config["max_blob_bytes"], config["max_blob_entries"], config["max_path_entries"], config["max_repos"])
+
+    def resolve_commit(self, app_id: str, revision: str) -> git.Commit:
+        """
+        Resolves a commit SHA (full or abbreviated), ref name or revision expression to a commit.
+
+        Args:
+            app_id: The ID of the application.
+            revision: The revision, e.g. "HEAD", "main", "HEAD~2" or a commit SHA.
+
+        Returns:
+            The commit.
+
+        Raises:
+            FileNotFoundError: If the application has no repository.
+            ValueError: If the revision does not resolve to a commit.
+        """
+        repo = self._get_repo(app_id)
+        try:
+            return repo.commit(revision)
+        except (git.BadName, git.BadObject, ValueError) as e:
+            raise ValueError(f"Unknown revision '{revision}' for app {app_id}") from e
+
+    def read_file(self, app_id: str, path: str, revision: str) -> Optional[Tuple[str, str]]:
+        """
+        Reads a file's content as of a revision.
+
+        Args:
+            app_id: The ID of the application.
+            path: The path relative to the application's definition root.
+            revision: The commit or ref to read from.
+
+        Returns:
+            A tuple of (content, resolved commit SHA), or None if the path is not a file at that revision.
+
+        Raises:
+            FileNotFoundError: If the application has no repository.
+            ValueError: If the revision does not resolve to a commit.
+            UnicodeDecodeError: If the blob is not UTF-8 text.
+        """
+        commit = self.resolve_commit(app_id, revision)
+        path = _normalize(path)
+        path_key = (app_id, commit.hexsha, path)
+        if path_key in self._paths:
+            blob_sha = self._paths.get(path_key)
+        else:
+            blob_sha = None
+            try:
+                item = commit.tree / path
+                if item.type == "blob":
+                    blob_sha = item.hexsha
+            except KeyError:
+                pass
+            self._paths.put(path_key, blob_sha)
+        if blob_sha is None:
+            return None
+        if blob_sha in self._blobs:
+            self._hits += 1
+            return self._blobs.get(blob_sha), commit.hexsha
+        self._misses += 1
+        data = self._get_repo(app_id).odb.stream(bytes.fromhex(blob_sha)).read()
+        content = data.decode("utf-8")
+        self._blobs.put(blob_sha, content, len(data))
+        return content, commit.hexsha
+
+    def list_directory(self, app_id: str, path: str, revision: str) -> Optional[List[Tuple[str, str, bool, Optional[int]]]]:
+        """
+        Lists a directory as of a revision.
+
+        Args:
+            app_id: The ID of the application.
+            path: The directory path relative to the application's definition root ('' or '.' for the root).
+            revision: The commit or ref to read from.
+
+        Returns:
+            A list of (path, name, is_directory, size) tuples, or None if the path is not a directory at that revision.
+
+        Raises:
+            FileNotFoundError: If the application has no repository.
+            ValueError: If the revision does not resolve to a commit.
+        """
+        commit = self.resolve_commit(app_id, revision)
+        path = _normalize(path)
+        try:
+            tree = commit.tree / path if path else commit.tree
+        except KeyError:
+            return None
+        if tree.type != "tree":
+            return None
+        return [(item.path, item.name, item.type == "tree", item.size if item.type == "blob" else None) for item in tree]
+
+    def get_file_history(self, app_id: str, path: str, revision: str = "HEAD", max_count: int = 20) -> List[git.Commit]:
+        """
+        Returns the commits that changed a path, newest first.
+
+        Args:
+            app_id: The ID of the application.
+            path: The file or directory path relative to the application's definition root.
+            revision: The commit or ref to start from.
+            max_count: Maximum number of commits to return.
+
+        Returns:
+            The matching commits.
+
+        Raises:
+            FileNotFoundError: If the application has no repository.
+            ValueError: If the revision does not resolve to a commit.
+        """
+        commit = self.resolve_commit(app_id, revision)
+        path = _normalize(path)
+        repo = self._get_repo(app_id)
+        return list(repo.iter_commits(commit.hexsha, paths=path or None, max_count=max_count))
+
+    def forget_app(self, app_id: str):
+        """Closes the application's repository handle (e.g. when its repository is deleted)."""
+        self._repos.forget(app_id)
+
+    def close(self):
+        """Closes every open repository handle."""
+        self._repos.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Returns cache counters.
+
+        Returns:
+            A dictionary with blob hits/misses, cached blob count and bytes, evictions, path lookups and open repos.
+        """
+        return {
+            "blob_hits": self._hits,
+            "blob_misses": self._misses,
+            "blobs": len(self._blobs),
+            "blob_bytes": self._blobs.size,
+            "blob_evictions": self._blobs.evictions,
+            "paths": len(self._paths),
+            "repos": len(self._repos),
+        }
+
+    def _get_repo(self, app_id: str) -> git.Repo:
+        """Returns the cached Repo for an application, opening it if needed."""
+        return self._repos.get(app_id)
+
+
+def _normalize(path: str) -> str:
+    """Normalizes a path to the form Git trees use ('' for the root, '/' separators)."""
+    path = os.path.normpath(path).replace(os.sep, "/")
+    if path.startswith(".."):
+        raise ValueError("Path cannot be outside the application's directory")
+    return "" if path == "." else path
@@ -0,0 +1,330 @@
+from typing import Optional, Dict, List, Tuple, Callable
+from dataclasses import dataclass, field
+import re
+
+# In-process replacement for `git apply`: parses git-style unified diffs and applies them to
+# in-memory file contents. Like `git apply`, a hunk may match at an offset from the line numbers
+# in its header but its context must match exactly, and a patch is applied all-or-nothing.
+
+DEV_NULL = "/dev/null"
+_HUNK_HEADER = re.compile(r"^@@ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@")
+_TRAILING_WHITESPACE = re.compile(r"[ \t]+(?=\r?\n?$)")
+
+
+class PatchError(ValueError):
+    """Raised when a diff is malformed or uses a feature the applier does not support (e.g. binary patches)."""
+    pass
+
+
+@dataclass
+class Hunk:
+    """One @@ hunk. Lines are (op, text) with op in ' ', '-', '+'; text keeps its line ending."""
+    old_start: int
+    old_count: int
+    new_start: int
+    new_count: int
+    lines: List[Tuple[str, str]] = field(default_factory=list)
+
+
+@dataclass
+class FilePatch:
+    """The changes to one file. old_path is None for new files, new_path is None for deleted files."""
+    old_path: Optional[str] = None
+    new_path: Optional[str] = None
+    hunks: List[Hunk] = field(default_factory=list)
+
+    @property
+    def path(self) -> str:
+        """The path the file ends up at (or was deleted from)."""
+        return self.new_path or self.old_path
+
+    @property
+    def status(self) -> str:
+        if self.old_path is None:
+            return "added"
+        if self.new_path is None:
+            return "deleted"
+        return "renamed" if self.old_path != self.new_path else "modified"
+
+
+@dataclass
+class HunkResult:
+    """Outcome of one hunk. offset is how many lines away from its header position the hunk matched."""
+    index: int
+    old_start: int
+    new_start: int
+    applied: bool
+    offset: int = 0
+    message: Optional[str] = None
+
+
+@dataclass
+class FilePatchResult:
+    """Outcome of the patch for one file."""
+    path: str
+    status: str
+    applied: bool
+    old_path: Optional[str] = None
+    message: Optional[str] = None
+    hunks: List[HunkResult] = field(default_factory=list)
+
+
+@dataclass
+class PatchApplication:
+    """
+    The result of applying a diff in memory.
+
+    changes maps each affected path to its new content (None for deleted files); it is only
+    populated when every hunk of every file applied.
+    """
+    applied: bool
+    files: List[FilePatchResult]
+    changes: Dict[str, Optional[str]] = field(default_factory=dict)
+
+
+def split_lines(text: str) -> List[str]:
+    """Splits text into lines that keep their '\\n' (unlike str.splitlines, only '\\n' separates lines)."""
+    parts = text.split("\n")
+    lines = [part + "\n" for part in parts[:-1]]
+    if parts[-1]:
+        lines.append(parts[-1]) # Last line without a trailing newline
+    return lines
+
+
+def _parse_path(raw: str, prefix: str) -> Optional[str]:
+    """Extracts a path from a ---/+++/rename line, dropping quotes, timestamps and the a/ or b/ prefix."""
+    path = raw.rstrip("\r\n").split("\t", 1)[0]
+    if path.startswith('"') and path.endswith('"'):
+        path = path[1:-1]
+    if path == DEV_NULL:
+        return None
+    if prefix and path.startswith(prefix):
+        path = path[len(prefix):]
+    return path
+
+
+def validate_patch_path(path: str) -> Optional[str]:
+    """
+    Checks that a diff path stays inside the repository's working tree, as `git apply` does.
+
+    Returns:
+        An error message, or None if the path is safe.
+    """
+    if not path:
+        return "Diff has an empty path"
+    if path.startswith(("/", "\\")) or re.match(r"^[A-Za-z]:", path):
+        return f"Diff path must be relative: {path}"
+    for component in re.split(r"[/\\]", path):
+        if component == "..":
+            return f"Diff path must not contain '..': {path}"
+        if component.lower() == ".git":
+            return f"Diff path must not be inside .git: {path}"
+    return None
+
+
+def parse_unified_diff(diff: str) -> List[FilePatch]:
+    """
+    Parses a git-style (or plain) unified diff.
+
+    Args:
+        diff: The diff text.
+
+    Returns:
+        One FilePatch per file, in diff order.
+
+    Raises:
+        PatchError: If the diff is malformed, empty, contains binary patches, or has a path that is
+                    absolute, contains '..' or points into .git.
+    """
+    lines = split_lines(diff)
+    patches: List[FilePatch] = []
+    current: Optional[FilePatch] = None
+    i = 0
+    while i < len(lines):
+        line = lines[i]
+        if line.startswith("diff --git "):
+            current = FilePatch()
+            patches.append(current)
+            # Fallback paths for hunk-less patches (pure renames/mode changes); ---/+++ lines override them
+            match = re.match(r"^diff --git a/(.+) b/(.+?)\r?\n?$", line)
+            if match:
+                current.old_path, current.new_path = match.group(1), match.group(2)
+        elif line.startswith("--- ") and i + 1 < len(lines) and lines[i + 1].startswith("+++ "):
+            if current is None or current.hunks:
+                current = FilePatch()
+                patches.append(current)
+            current.old_path = _parse_path(line[4:], "a/")
+            current.new_path = _parse_path(lines[i + 1][4:], "b/")
+            i += 1
+        elif line.startswith("new file mode") and current is not None:
+            current.old_path = None
+        elif line.startswith("deleted file mode") and current is not None:
+            current.new_path = None
+        elif line.startswith("rename from ") and current is not None:
+            current.old_path = _parse_path(line[len("rename from "):], "")
+        elif line.startswith("rename to ") and current is not None:
+            current.new_path = _parse_path(line[len("rename to "):], "")
+        elif line.startswith("GIT binary patch") or line.startswith("Binary files "):
+            raise PatchError("Binary patches are not supported")
+        elif line.startswith("@@"):
+            if current is None:
+                raise PatchError(f"Hunk without a file header at line {i + 1}")
+            hunk, i = _parse_hunk(lines, i)
+            current.hunks.append(hunk)
+            continue
+        i += 1
+    if not patches:
+        raise PatchError("Diff contains no file changes")
+    for patch in patches:
+        if patch.old_path is None and patch.new_path is None:
+            raise PatchError("Diff has a file patch without a path")
+        for path in (patch.old_path, patch.new_path):
+            error = validate_patch_path(path) if path is not None else None
+            if error:
+                raise PatchError(error)
+    return patches
+
+
+def _parse_hunk(lines: List[str], i: int) -> Tuple[Hunk, int]:
+    """Parses the hunk whose header is lines[i]; returns it and the index of the first line after it."""
+    match = _HUNK_HEADER.match(lines[i])
+    if not match:
+        raise PatchError(f"Malformed hunk header at line {i + 1}: {lines[i].rstrip()}")
+    old_start, old_count, new_start, new_count = (int(g) if g is not None else 1 for g in match.groups())
+    hunk = Hunk(old_start, old_count, new_start, new_count)
+    old_remaining, new_remaining = old_count, new_count
+    i += 1
+    while i < len(lines) and (old_remaining > 0 or new_remaining > 0):
+        line = lines[i]
+        op, text = line[:1], line[1:]
+        if line in ("\n", "\r\n"): # Blank context line whose leading space was stripped by an editor
+            op, text = " ", line
+        if op == " ":
+            old_remaining -= 1
+            new_remaining -= 1
+        elif op == "-":
+            old_remaining -= 1
+        elif op == "+":
+            new_remaining -= 1
+        elif op == "\\":
+            _strip_last_newline(hunk)
+            i += 1
+            continue
+        else:
+            raise PatchError(f"Unexpected line in hunk at line {i + 1}: {line.rstrip()}")
+        if not text.endswith("\n"):
+            text += "\n" # Diff text ended without a newline; only a "\ No newline" marker means the file line lacks one
+        hunk.lines.append((op, text))
+        i += 1
+    if old_remaining != 0 or new_remaining != 0:
+        raise PatchError(f"Hunk {match.group(0)} is truncated")
+    if i < len(lines) and lines[i].startswith("\\"): # "\ No newline at end of file" after the last line
+        _strip_last_newline(hunk)
+        i += 1
+    return hunk, i
+
+
+def _strip_last_newline(hunk: Hunk):
+    """Applies a '\\ No newline at end of file' marker to the preceding hunk line."""
+    if hunk.lines:
+        op, text = hunk.lines[-1]
+        hunk.lines[-1] = (op, text[:-1] if text.endswith("\n") else text)
+
+
+def _find_hunk(lines: List[str], old: List[str], expected: int, earliest: int) -> Optional[int]:
+    """Finds where `old` occurs in `lines`, trying `expected` first and then alternating outwards."""
+    last_start = len(lines) - len(old)
+    if last_start < earliest:
+        return None
+    expected = min(max(expected, earliest), last_start)
+    for distance in range(0, max(expected - earliest, last_start - expected) + 1):
+        for position in (expected - distance, expected + distance) if distance else (expected,):
+            if earliest <= position <= last_start and lines[position:position + len(old)] == old:
+                return position
+    return None
+
+
+def apply_file_patch(original: Optional[str], patch: FilePatch, fix_whitespace: bool = False) -> Tuple[Optional[str], FilePatchResult]:
+    """
+    Applies one file's hunks to its current content.
+
+    Args:
+        original: The current content, or None if the file does not exist.
+        patch: The parsed changes for the file.
+        fix_whitespace: Strip trailing whitespace from added lines (like `git apply --whitespace=fix`).
+
+    Returns:
+        A tuple of (new content or None if the file is deleted, result). The content is meaningless if result.applied is False.
+    """
+    result = FilePatchResult(path=patch.path, status=patch.status, applied=False,
+                             old_path=patch.old_path if patch.status == "renamed" else None)
+    if patch.old_path is None and original is not None:
+        result.message = "File already exists"
+        return None, result
+    if patch.old_path is not None and original is None:
+        result.message = "File does not exist"
+        return None, result
+    lines = split_lines(original or "")
+    output: List[str] = []
+    cursor = 0 # Lines before this index are already copied or consumed
+    offset = 0 # Offset at which the previous hunk matched; later hunks are expected to be shifted alike
+    applied = True
+    for index, hunk in enumerate(patch.hunks):
+        old = [text for op, text in hunk.lines if op != "+"]
+        new = [_TRAILING_WHITESPACE.sub("", text) if fix_whitespace and op == "+" else text for op, text in hunk.lines if op != "-"]
+        header_position = hunk.old_start - 1 if hunk.old_count else hunk.old_start # Pure insertions go after old_start
+        position = _find_hunk(lines, old, header_position + offset, cursor)
+        if position is None:
+            applied = False
+            result.hunks.append(HunkResult(index, hunk.old_start, hunk.new_start, False, message="Context does not match the current file"))
+            continue
+        offset = position - header_position
+        result.hunks.append(HunkResult(index, hunk.old_start, hunk.new_start, True, offset=offset))
+        output.extend(lines[cursor:position])
+        output.extend(new)
+        cursor = position + len(old)
+    output.extend(lines[cursor:])
+    if applied and patch.new_path is None and output:
+        applied = False
+        result.message = "Deletion patch does not cover the whole file"
+    result.applied = applied
+    if not applied:
+        result.message = result.message or "One or more hunks failed to apply"
+        return None, result
+    return (None if patch.new_path is None else "".join(output)), result
+
+
+def apply_patch(diff: str, read_file: Callable[[str], Optional[str]], fix_whitespace: bool = False) -> PatchApplication:
+    """
+    Applies a multi-file diff in memory. Nothing is written; the caller persists `changes` if `applied`.
+
+    Args:
+        diff: The git-style unified diff.
+        read_file: Returns a file's current content by path, or None if it does not exist.
+        fix_whitespace: Strip trailing whitespace from added lines.
+
+    Returns:
+        A PatchApplication with per-file and per-hunk results.
+
+    Raises:
+        PatchError: If the diff is malformed, has an unsafe path, or renames a file onto an existing one.
+    """
+    changes: Dict[str, Optional[str]] = {}
+    results: List[FilePatchResult] = []
+    for patch in parse_unified_diff(diff):
+        if patch.status == "renamed":
+            target = changes[patch.new_path] if patch.new_path in changes else read_file(patch.new_path)
+            if target is not None:
+                raise PatchError(f"Rename target already exists: {patch.new_path}")
+        # For new files the target is read so an existing file is not overwritten.
+        # Earlier patches in the same diff may already have changed (or removed) the file.
+        source = patch.old_path if patch.old_path is not None else patch.new_path
+        original = changes[source] if source in changes else read_file(source)
+        content, result = apply_file_patch(original, patch, fix_whitespace)
+        results.append(result)
+        if result.applied:
+            if patch.status == "renamed":
+                changes[patch.old_path] = None
+            changes[patch.path] = content
+    applied = all(result.applied for result in results)
+    return PatchApplication(applied=applied, files=results, changes=changes if applied else {})
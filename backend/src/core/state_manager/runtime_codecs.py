@@ -0,0 +1,217 @@
+from typing import Optional, Dict, Any, Union
+import json
+import re
+import yaml
+
+# Optional fast codecs and compression. Each falls back gracefully when the package is missing.
+try:
+    import orjson
+except ImportError: # pragma: no cover - depends on the environment
+    orjson = None
+try:
+    import msgpack
+except ImportError: # pragma: no cover - depends on the environment
+    msgpack = None
+try:
+    import zstandard
+except ImportError: # pragma: no cover - depends on the environment
+    zstandard = None
+
+# Encoded runtime values start with a 3-byte header: MAGIC, codec tag, flags.
+# Legacy values were written as plain YAML text, which never starts with a NUL byte,
+# so anything without the header is decoded as YAML.
+HEADER_MAGIC = 0x00
+HEADER_SIZE = 3
+FLAG_ZSTD = 0x01
+
+# Integers are stored as bare decimal text (no header) so Redis INCRBY/DECRBY can operate on them in place
+_INTEGER_VALUE = re.compile(rb"-?[0-9]+")
+
+# Defaults for runtime value encoding; override via the runtime_codec_config argument of StateManager
+DEFAULT_RUNTIME_CODEC_CONFIG: Dict[str, Any] = {
+    # Codec used for new writes: orjson-backed JSON when available, else msgpack, else standard-library JSON
+    "codec": "json" if orjson is not None or msgpack is None else "msgpack",
+    "compression_threshold_bytes": 1024, # Payloads at least this large are zstd-compressed (if zstandard is installed)
+    "compression_level": 3,
+}
+
+
+class RuntimeValueDecodeError(ValueError):
+    """Raised when a stored runtime value cannot be decoded."""
+    pass
+
+
+class RuntimeValueCodec:
+    """Base class for runtime value codecs. Subclasses set `name` and a unique one-byte `tag`."""
+    name = ""
+    tag = b""
+
+    def encode(self, value: Any) -> bytes:
+        """Encodes a value to bytes."""
+        raise NotImplementedError
+
+    def decode(self, data: bytes) -> Any:
+        """Decodes bytes produced by encode()."""
+        raise NotImplementedError
+
+
+class JsonCodec(RuntimeValueCodec):
+    """JSON, using orjson when available and the standard library otherwise (the wire format is identical)."""
+    name = "json"
+    tag = b"j"
+
+    def encode(self, value: Any) -> bytes:
+        if orjson is not None:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS)
+        return json.dumps(value, separators=(",", ":")).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+
+
+class MsgpackCodec(RuntimeValueCodec):
+    """MessagePack; compact binary encoding. Requires the 'msgpack' package."""
+    name = "msgpack"
+    tag = b"m"
+
+    def __init__(self):
+        if msgpack is None:
+            raise ValueError("The 'msgpack' runtime value codec requires the 'msgpack' package")
+
+    def encode(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def decode(self, data: bytes) -> Any:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+
+
+class YamlCodec(RuntimeValueCodec):
+    """YAML; the legacy format. Kept so values can still be written as YAML if configured."""
+    name = "yaml"
+    tag = b"y"
+
+    def encode(self, value: Any) -> bytes:
+        return yaml.dump(value).encode("utf-8")
+
+    def decode(self, data: bytes) -> Any:
+        return yaml.safe_load(data.decode("utf-8"))
+
+
+CODEC_CLASSES = {codec.name: codec for codec in (JsonCodec, MsgpackCodec, YamlCodec)}
+
+
+class RuntimeValueSerializer:
+    """
+    Encodes runtime state values with a configurable codec and optional zstd compression,
+    prefixing each value with a header that records the codec and compression used.
+
+    Decoding dispatches on the header, so values written with any registered codec (or the
+    legacy header-less YAML format) stay readable when the configured codec changes.
+    """
+    def __init__(self, codec: str = "json", compression_threshold_bytes: Optional[int] = 1024, compression_level: int = 3):
+        """
+        Initializes the serializer.
+
+        Args:
+            codec: Name of the codec for new writes ("json", "msgpack" or "yaml").
+            compression_threshold_bytes: Encoded payloads at least this large are zstd-compressed.
+                                         None disables compression. Ignored if zstandard is not installed.
+            compression_level: zstd compression level.
+
+        Raises:
+            ValueError: If the codec is unknown or its package is not installed.
+        """
+        if codec not in CODEC_CLASSES:
+            raise ValueError(f"Unknown runtime value codec: {codec}")
+        self.codec = CODEC_CLASSES[codec]()
+        self._decoders: Dict[bytes, RuntimeValueCodec] = {self.codec.tag: self.codec}
+        self.compression_threshold_bytes = compression_threshold_bytes if zstandard is not None else None
+        self._compressor = zstandard.ZstdCompressor(level=compression_level) if zstandard is not None else None
+        self._decompressor = zstandard.ZstdDecompressor() if zstandard is not None else None
+
+    @classmethod
+    def from_config(cls, config: Optional[Dict[str, Any]] = None) -> "RuntimeValueSerializer":
+        """
+        Builds a serializer from DEFAULT_RUNTIME_CODEC_CONFIG merged with overrides.
+
+        Args:
+            config: Optional overrides (codec, compression_threshold_bytes, compression_level).
+
+        Returns:
+            The configured RuntimeValueSerializer.
+        """
+        config = {**DEFAULT_RUNTIME_CODEC_CONFIG, **(config or {})}
+        return cls(config["codec"], config["compression_threshold_bytes"], config["compression_level"])
+
+    def dumps(self, value: Any) -> bytes:
+        """
+        Encodes a value for storage.
+
+        Args:
+            value: The value to encode (JSON-compatible types for the json codec).
+
+        Returns:
+            Header followed by the (possibly compressed) payload, or bare decimal text for integers.
+
+        Raises:
+            TypeError: If the value cannot be encoded by the configured codec.
+        """
+        if type(value) is int: # Not bool; counters must stay INCRBY-compatible
+            return str(value).encode("ascii")
+        payload = self.codec.encode(value)
+        flags = 0
+        if self.compression_threshold_bytes is not None and len(payload) >= self.compression_threshold_bytes:
+            compressed = self._compressor.compress(payload)
+            if len(compressed) < len(payload): # Only keep compression when it pays off
+                payload = compressed
+                flags |= FLAG_ZSTD
+        return bytes((HEADER_MAGIC,)) + self.codec.tag + bytes((flags,)) + payload
+
+    def loads(self, data: Optional[Union[bytes, str]]) -> Any:
+        """
+        Decodes a stored value, whichever codec wrote it.
+
+        Args:
+            data: The raw stored value. None (missing key) and empty values decode to None.
+
+        Returns:
+            The decoded value.
+
+        Raises:
+            RuntimeValueDecodeError: If the value is corrupt, uses an unknown codec, or needs an unavailable package.
+        """
+        if not data:
+            return None
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+        try:
+            if data[0] != HEADER_MAGIC:
+                if _INTEGER_VALUE.fullmatch(data):
+                    return int(data) # Counter written by dumps() or INCRBY
+                return yaml.safe_load(data.decode("utf-8")) # Legacy header-less YAML value
+            if len(data) < HEADER_SIZE:
+                raise RuntimeValueDecodeError("Truncated runtime value header")
+            codec = self._get_decoder(data[1:2])
+            flags = data[2]
+            payload = data[HEADER_SIZE:]
+            if flags & FLAG_ZSTD:
+                if self._decompressor is None:
+                    raise RuntimeValueDecodeError("Runtime value is zstd-compressed but the 'zstandard' package is not installed")
+                payload = self._decompressor.decompress(payload)
+            return codec.decode(payload)
+        except RuntimeValueDecodeError:
+            raise
+        except Exception as e:
+            raise RuntimeValueDecodeError(f"Could not decode runtime value: {e}") from e
+
+    def _get_decoder(self, tag: bytes) -> RuntimeValueCodec:
+        """Returns (and memoizes) the codec instance for a header tag."""
+        decoder = self._decoders.get(tag)
+        if decoder is None:
+            codec_class = next((c for c in CODEC_CLASSES.values() if c.tag == tag), None)
+            if codec_class is None:
+                raise RuntimeValueDecodeError(f"Unknown runtime value codec tag: {tag!r}")
+            decoder = self._decoders[tag] = codec_class() # Raises ValueError if its package is missing
+        return decoder
@@ -1,20 +1,54 @@
-from typing import Optional, Dict, Any, List
-from typing import Optional, Dict, Any, List
+from typing import Optional, Dict, Any, List, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import asdict
+import asyncio
 import os
+import stat
 import git
-import yaml
 import redis
-import subprocess # Import subprocess for git apply
+import redis.asyncio
 
 from core.interfaces.state_manager_interface import StateManagerInterface
-from core.shared.data_models.data_models import FileInfo # Assuming FileInfo data model exists
+from core.shared.data_models.data_models import FileInfo, CommitInfo # Assuming FileInfo data model exists
+from backend.src.core.state_manager.runtime_codecs import RuntimeValueSerializer, RuntimeValueDecodeError
+from backend.src.core.state_manager.definition_file_cache import DefinitionFileCache, stat_signature
+from backend.src.core.state_manager.patch_applier import apply_patch, PatchError
+from backend.src.core.state_manager.git_object_reader import GitObjectReader
+from backend.src.core.state_manager.definition_writes import DEFAULT_DEFINITION_WRITE_CONFIG, DefinitionTransaction, DefinitionWriteCoalescer
+from backend.src.core.state_manager.definition_repos import DEFAULT_DEFINITION_REPO_CONFIG, RepoHandleCache, AppWriteLocks
+
+# Defaults for the runtime state Redis connection pool; entries in runtime_state_config override them
+DEFAULT_RUNTIME_STATE_CONFIG: Dict[str, Any] = {
+    "max_connections": 50, # Upper bound on pooled connections; callers beyond it wait for a free one
+    "socket_timeout": 5.0,
+    "socket_connect_timeout": 2.0,
+    "health_check_interval": 30, # Seconds between PINGs on idle pooled connections
+}
+
+# Separates the application ID from the key in Redis, so app IDs may not contain it
+RUNTIME_KEY_SEPARATOR = ":"
+
+# Keys requested per SCAN call when listing or bulk-expiring an application's runtime keys
+RUNTIME_SCAN_BATCH_SIZE = 500
+
+# INCRBY that sets the TTL only when the counter has none (i.e. it was just created), so fixed-window
+# counters expire at the end of their window instead of being extended by every increment.
+_INCREMENT_WITH_TTL_SCRIPT = """
+local value = redis.call('INCRBY', KEYS[1], ARGV[1])
+if redis.call('TTL', KEYS[1]) == -1 then
+    redis.call('EXPIRE', KEYS[1], ARGV[2])
+end
+return value
+"""
 
 class StateManager(StateManagerInterface):
     """
     Manages application state, abstracting access to Definition/Config (Git/YAML) and Runtime (Redis) state stores.
     This component is critical for persisting application definitions, configurations, and runtime data.
     """
-    def __init__(self, definition_state_path: str, runtime_state_config: dict):
+    def __init__(self, definition_state_path: str, runtime_state_config: dict, runtime_codec_config: Optional[Dict[str, Any]] = None,
+                 definition_cache_config: Optional[Dict[str, Any]] = None, definition_write_config: Optional[Dict[str, Any]] = None,
+                 git_object_cache_config: Optional[Dict[str, Any]] = None, definition_repo_config: Optional[Dict[str, Any]] = None):
         """
         Initializes the StateManager.
 
@@ -22,13 +56,34 @@ class StateManager(StateManagerInterface):
             definition_state_path: The absolute path to the root directory where application definition state Git repositories will be stored.
                                    Each application will have its own subdirectory within this path, initialized as a Git repository.
             runtime_state_config: A dictionary containing configuration parameters for connecting to the Redis instance used for runtime state.
+                                  Connection pool settings (see DEFAULT_RUNTIME_STATE_CONFIG) may be included.
+            runtime_codec_config: Optional overrides for DEFAULT_RUNTIME_CODEC_CONFIG (codec and compression of runtime values).
+            definition_cache_config: Optional overrides for DEFAULT_DEFINITION_FILE_CACHE_CONFIG (limits of the definition file content cache).
+            definition_write_config: Optional overrides for DEFAULT_DEFINITION_WRITE_CONFIG (coalescing of definition writes into batched commits).
+            git_object_cache_config: Optional overrides for DEFAULT_GIT_OBJECT_CACHE_CONFIG (caches for reads at a given revision).
+            definition_repo_config: Optional overrides for DEFAULT_DEFINITION_REPO_CONFIG (open repository handles and write lock stats).
         """
         self.definition_state_path = definition_state_path
-        self.runtime_state_config = runtime_state_config
-        self._redis_client: Optional[redis.Redis] = None
-        # The main StateManager instance doesn't hold a single repo reference,
-        # as each app has its own repo. Repo instances are managed per-app as needed.
-        # self._repo: Optional[git.Repo] = None # Removed as it's per-app
+        self.runtime_state_config: Dict[str, Any] = {**DEFAULT_RUNTIME_STATE_CONFIG, **(runtime_state_config or {})}
+        self._redis_client: Optional[redis.asyncio.Redis] = None
+        self._runtime_codec = RuntimeValueSerializer.from_config(runtime_codec_config)
+        self._definition_cache = DefinitionFileCache.from_config(definition_cache_config)
+        self._git_objects = GitObjectReader.from_config(definition_state_path, git_object_cache_config)
+        self.definition_write_config: Dict[str, Any] = {**DEFAULT_DEFINITION_WRITE_CONFIG, **(definition_write_config or {})}
+        self._definition_write_coalescer: Optional[DefinitionWriteCoalescer] = None
+        if self.definition_write_config["coalesce_window_seconds"] > 0:
+            self._definition_write_coalescer = DefinitionWriteCoalescer(
+                self._commit_definition_paths,
+                self.definition_write_config["coalesce_window_seconds"],
+                self.definition_write_config["max_batch_files"],
+            )
+        # The main StateManager instance doesn't hold a single repo reference, as each app has its own repo.
+        # Repo handles are cached per app, and each app's writes are serialized by its own lock.
+        self.definition_repo_config: Dict[str, Any] = {**DEFAULT_DEFINITION_REPO_CONFIG, **(definition_repo_config or {})}
+        self._repos = RepoHandleCache(definition_state_path, self.definition_repo_config["max_open_repos"])
+        self._write_locks = AppWriteLocks(self.definition_repo_config["hot_apps_reported"])
+        # Writes per app whose files may be on disk before their commit (see has_pending_definition_writes)
+        self._uncommitted_definition_writes: Dict[str, int] = {}
 
         self._initialize_definition_state_root() # Initialize the root directory
         self._initialize_runtime_state()
@@ -42,19 +97,51 @@ class StateManager(StateManagerInterface):
 
 
     def _initialize_runtime_state(self):
-        """Initializes the Redis client for runtime state."""
+        """
+        Initializes the asyncio Redis client for runtime state, backed by a sized connection pool.
+        Connections are opened lazily by the pool, so no network I/O happens here;
+        use check_runtime_state_connection() to verify connectivity from a running event loop.
+        """
         try:
-            # Use connection_pool for better performance in async contexts if needed later
-            # For POC, direct connection is fine.
-            self._redis_client = redis.Redis(**self.runtime_state_config, decode_responses=True) # Decode responses to get strings
-            # Ping to check connection
-            self._redis_client.ping()
-            print("Redis client initialized and connected.")
-        except redis.exceptions.ConnectionError as e:
-            print(f"Error connecting to Redis: {e}")
-            self._redis_client = None # Ensure client is None if connection fails
+            # Values are binary (codec header + payload), so responses are not decoded to strings
+            connection_pool = redis.asyncio.ConnectionPool(**self.runtime_state_config, decode_responses=False)
+            self._redis_client = redis.asyncio.Redis(connection_pool=connection_pool)
+            self._increment_with_ttl_script = self._redis_client.register_script(_INCREMENT_WITH_TTL_SCRIPT)
+            print(f"Redis client initialized (pool of up to {self.runtime_state_config['max_connections']} connections).")
+        except (redis.exceptions.RedisError, TypeError, ValueError) as e:
+            print(f"Error configuring Redis client: {e}")
+            self._redis_client = None # Ensure client is None if configuration fails
             # TODO: Implement proper error handling or retry mechanism (Issue #XX)
 
+    async def check_runtime_state_connection(self) -> bool:
+        """
+        Pings Redis to verify the runtime state store is reachable.
+
+        Returns:
+            True if Redis answered the ping, False otherwise.
+        """
+        if not self._redis_client:
+            return False
+        try:
+            await self._redis_client.ping()
+            return True
+        except redis.exceptions.RedisError as e:
+            print(f"Error connecting to Redis: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            return False
+
+    async def close(self):
+        """
+        Commits any coalesced definition writes, closes cached Git repository handles, then closes the
+        Redis client and disconnects its connection pool. Call once on application shutdown.
+        """
+        if self._definition_write_coalescer:
+            await self._definition_write_coalescer.flush_all()
+        self._git_objects.close()
+        self._repos.close()
+        if self._redis_client:
+            await self._redis_client.aclose()
+
     def _get_app_definition_path(self, app_id: str, path: str) -> str:
         """
         Gets the absolute path for an app's definition file or directory within its Git repository.
@@ -67,16 +154,58 @@ class StateManager(StateManagerInterface):
             The absolute path on the filesystem.
 
         Raises:
-            ValueError: If the provided path attempts to escape the application's directory.
+            ValueError: If the provided path is absolute, escapes the application's directory or points into its .git directory.
         """
         # Ensure path is relative and safe
         relative_path = os.path.normpath(path)
-        if relative_path.startswith('..'):
+        if os.path.isabs(relative_path) or relative_path.split(os.sep)[0] == '..':
              raise ValueError("Path cannot be outside the application's directory")
+        if any(part.lower() == '.git' for part in relative_path.split(os.sep)):
+             raise ValueError("Path cannot be inside the application's .git directory")
         # Construct the full path within the definition state repo
         full_path = os.path.join(self.definition_state_path, app_id, relative_path)
         return full_path
 
+    def get_definition_cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns hit-rate and size counters of the definition file content cache.
+
+        Returns:
+            A dictionary with hits, misses, stale, evictions, entries, bytes and hit_ratio.
+        """
+        return self._definition_cache.get_stats()
+
+    def has_pending_definition_writes(self, app_id: str) -> bool:
+        """
+        Returns whether an application has definition writes whose files may already be on disk but are not
+        committed yet (e.g. waiting in the coalescing window). Files read meanwhile may not match HEAD.
+
+        Args:
+            app_id: The ID of the application.
+        """
+        return self._uncommitted_definition_writes.get(app_id, 0) > 0
+
+    def get_definition_write_stats(self) -> Dict[str, Any]:
+        """
+        Returns counters of the definition write coalescer.
+
+        Returns:
+            A dictionary with writes, batches, pending_apps and writes_per_commit, or {"enabled": False} if coalescing is off.
+        """
+        if not self._definition_write_coalescer:
+            return {"enabled": False}
+        return {"enabled": True, **self._definition_write_coalescer.get_stats()}
+
+    def get_definition_repo_stats(self) -> Dict[str, Any]:
+        """
+        Returns counters of the cached repository handles and of the per-app write locks.
+
+        Returns:
+            A dictionary with "repos" (open handles, hits, misses, evictions) and "write_locks"
+            (acquisitions, contended acquisitions, total wait time and the most contended apps).
+        """
+        return {"repos": self._repos.get_stats(), "write_locks": self._write_locks.get_stats()}
+
     def _get_app_runtime_key(self, app_id: str, key: str) -> str:
         """
         Gets the namespaced key for an app's runtime state in Redis.
@@ -87,14 +216,37 @@ class StateManager(StateManagerInterface):
 
         Returns:
             The namespaced key (e.g., 'app_id:key').
+
+        Raises:
+            ValueError: If the app ID contains ':' (its keys would be indistinguishable from another app's).
         """
+        _check_runtime_app_id(app_id)
         # Simple namespacing: app_id:key
-        return f"{app_id}:{key}"
+        return f"{app_id}{RUNTIME_KEY_SEPARATOR}{key}"
+
+    def _get_app_runtime_pattern(self, app_id: str, pattern: str) -> str:
+        """
+        Gets a SCAN MATCH pattern restricted to an app's runtime namespace.
+
+        Args:
+            app_id: The ID of the application.
+            pattern: Glob pattern for keys within the namespace (e.g., 'session:*').
+
+        Returns:
+            The namespaced pattern. Glob characters in the app ID are escaped, so an app can only match its own keys.
+
+        Raises:
+            ValueError: If the app ID contains ':'.
+        """
+        _check_runtime_app_id(app_id)
+        escaped_app_id = "".join(f"\\{c}" if c in "*?[]\\" else c for c in app_id)
+        return self._get_app_runtime_key(escaped_app_id, pattern)
 
     def _get_app_repo(self, app_id: str) -> git.Repo:
         """
         Gets the Git repository instance for a specific application.
-        Initializes the repository if it doesn't exist.
+        Initializes the repository if it doesn't exist. Handles are cached (see RepoHandleCache); writes
+        must hold the application's write lock while using the returned handle.
 
         Args:
             app_id: The ID of the application.
@@ -114,12 +266,12 @@ class StateManager(StateManagerInterface):
             repo.index.add(['.gitignore'])
             repo.index.commit(f"Initial commit for application {app_id} definition state")
             print(f"Initialized Git repository for application: {app_id} at {app_repo_path}")
+            self._repos.put(app_id, repo)
             return repo
         else:
             try:
-                repo = git.Repo(app_repo_path)
-                return repo
-            except git.exc.InvalidGitRepositoryError:
+                return self._repos.get(app_id)
+            except FileNotFoundError:
                 # If directory exists but is not a Git repo, this is an error state for this design.
                 # It implies the directory was created outside the StateManager's control.
                 # For POC, we'll raise an error. A robust system might attempt recovery.
@@ -130,7 +282,7 @@ class StateManager(StateManagerInterface):
                  raise # Re-raise the exception
 
 
-    async def get_definition_file_content(self, app_id: str, path: str) -> Optional[str]:
+    async def get_definition_file_content(self, app_id: str, path: str, revision: Optional[str] = None) -> Optional[str]:
         """
         Retrieves the content of a definition file for a specific application.
         This is used to read application configurations, workflows, prompts, etc.
@@ -138,20 +290,70 @@ class StateManager(StateManagerInterface):
         Args:
             app_id: The ID of the application.
             path: The path to the file relative to the application's definition root (e.g., 'config/app.yaml').
+            revision: Optional commit SHA or ref (e.g., 'HEAD', 'HEAD~1'). When given, the file is read from the
+                      Git object database as of that commit: a snapshot unaffected by writes in flight.
+                      When omitted, the current working tree is read.
 
         Returns:
-            The content of the file as a string, or None if the file does not exist.
+            The content of the file as a string, or None if the file (or the revision) does not exist.
         """
-        full_path = self._get_app_definition_path(app_id, path)
-        if os.path.exists(full_path) and os.path.isfile(full_path):
+        if revision is not None:
             try:
-                with open(full_path, 'r', encoding='utf-8') as f: # Specify encoding
-                    return f.read()
-            except Exception as e:
-                print(f"Error reading definition file {full_path}: {e}")
+                result = self._git_objects.read_file(app_id, path, revision)
+                return result[0] if result else None
+            except (FileNotFoundError, ValueError, UnicodeDecodeError) as e:
+                print(f"Error reading definition file {path} at {revision} for app {app_id}: {e}")
                 # TODO: Log this error properly (Issue #XX)
-                return None # Return None on read error
-        return None # Return None if file does not exist
+                return None
+        full_path = self._get_app_definition_path(app_id, path)
+        cache_path = os.path.normpath(path)
+        try:
+            stat_result = os.stat(full_path)
+        except OSError:
+            self._definition_cache.invalidate(app_id, cache_path)
+            return None # Return None if file does not exist
+        if not stat.S_ISREG(stat_result.st_mode):
+            return None
+        # Served from memory while the file's mtime/inode/size are unchanged; one stat() instead of open+read
+        signature = stat_signature(stat_result)
+        content = self._definition_cache.get(app_id, cache_path, signature)
+        if content is not None:
+            return content
+        try:
+            with open(full_path, 'r', encoding='utf-8') as f: # Specify encoding
+                content = f.read()
+        except Exception as e:
+            print(f"Error reading definition file {full_path}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            return None # Return None on read error
+        # A write racing this read changes the signature, so the entry is treated as stale on the next lookup
+        self._definition_cache.put(app_id, cache_path, signature, content)
+        return content
+
+    async def get_definition_revision(self, app_id: str) -> Optional[str]:
+        """
+        Returns the HEAD commit hash of an application's definition state repository.
+        Used by callers (e.g., ApplicationRegistry) to validate caches of parsed definition files.
+        Pending coalesced writes are not committed here; while has_pending_definition_writes() is true,
+        the working tree may be ahead of the returned revision, so it must not key a cache then.
+
+        Args:
+            app_id: The ID of the application.
+
+        Returns:
+            The hex SHA of HEAD, or None if the application has no repository or no commits yet.
+        """
+        app_repo_path = os.path.join(self.definition_state_path, app_id)
+        if not os.path.isdir(app_repo_path):
+            return None # Do not initialize a repository on a read
+        try:
+            # Through the reader's own handle: the write handle may be in use by a worker thread
+            return self._git_objects.resolve_commit(app_id, "HEAD").hexsha
+        except (FileNotFoundError, ValueError) as e:
+            # ValueError is raised when HEAD does not point to a commit yet
+            print(f"Error reading HEAD revision for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            return None
 
     async def set_definition_file_content(self, app_id: str, path: str, content: str, message: str):
         """
@@ -166,24 +368,26 @@ class StateManager(StateManagerInterface):
             message: The Git commit message describing the change.
         """
         full_path = self._get_app_definition_path(app_id, path)
-        directory = os.path.dirname(full_path)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-            print(f"Created directory: {directory}") # Log directory creation
 
-        try:
+        def write_file():
+            self._get_app_repo(app_id) # Initialize the repository before creating any directories in it
+            directory = os.path.dirname(full_path)
+            if not os.path.exists(directory):
+                os.makedirs(directory)
+                print(f"Created directory: {directory}") # Log directory creation
             with open(full_path, 'w', encoding='utf-8') as f: # Specify encoding
                 f.write(content)
 
-            repo = self._get_app_repo(app_id) # Get or initialize the app's repo
+        try:
             relative_repo_path = os.path.join(os.path.normpath(path)) # Path relative to app's repo root
-            repo.index.add([relative_repo_path])
-            repo.index.commit(message)
+            await self._record_definition_change(app_id, relative_repo_path, message, write_file)
             print(f"Committed change to {relative_repo_path} for app {app_id} with message: '{message}'") # Log commit
         except Exception as e:
             print(f"Error setting definition file content for {full_path}: {e}")
             # TODO: Implement proper error handling and potentially Git rollback (Issue #XX)
             raise # Re-raise the exception
+        finally:
+            self._definition_cache.invalidate(app_id, os.path.normpath(path))
 
 
     async def delete_definition_file(self, app_id: str, path: str, message: str):
@@ -198,22 +402,275 @@ class StateManager(StateManagerInterface):
         full_path = self._get_app_definition_path(app_id, path)
         if os.path.exists(full_path) and os.path.isfile(full_path):
             try:
-                os.remove(full_path)
-                repo = self._get_app_repo(app_id) # Get the app's repo
                 relative_repo_path = os.path.join(os.path.normpath(path)) # Path relative to app's repo root
-                repo.index.remove([relative_repo_path])
-                repo.index.commit(message)
+                await self._record_definition_change(app_id, relative_repo_path, message, lambda: os.remove(full_path))
                 print(f"Deleted and committed {relative_repo_path} for app {app_id} with message: '{message}'") # Log deletion
             except Exception as e:
                 print(f"Error deleting definition file {full_path}: {e}")
                 # TODO: Implement proper error handling and potentially Git rollback (Issue #XX)
                 raise # Re-raise the exception
+            finally:
+                self._definition_cache.invalidate(app_id, os.path.normpath(path))
         else:
             print(f"Warning: File not found for deletion: {full_path}")
             # TODO: Log this warning properly (Issue #XX)
 
 
-    async def list_definition_directory(self, app_id: str, path: str) -> List[FileInfo]:
+    async def get_definition_file_history(self, app_id: str, path: str, max_count: int = 20, revision: str = "HEAD") -> List[CommitInfo]:
+        """
+        Returns the commits that changed a definition file (or any file under a directory), newest first.
+
+        Args:
+            app_id: The ID of the application.
+            path: The path relative to the application's definition root ('.' for the whole repository).
+            max_count: Maximum number of commits to return.
+            revision: The commit or ref to walk back from.
+
+        Returns:
+            A list of CommitInfo objects, or an empty list if the application or revision does not exist.
+        """
+        try:
+            commits = self._git_objects.get_file_history(app_id, path, revision, max_count)
+        except (FileNotFoundError, ValueError) as e:
+            print(f"Error reading history of {path} for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            return []
+        return [CommitInfo(hash=commit.hexsha, author=str(commit.author), message=commit.message,
+                           timestamp=commit.committed_datetime.isoformat()) for commit in commits]
+
+    def get_git_object_cache_stats(self) -> Dict[str, Any]:
+        """
+        Returns counters of the caches used for reads at a given revision.
+
+        Returns:
+            A dictionary with blob hits/misses, cached blobs and bytes, evictions, cached path lookups and open repositories.
+        """
+        return self._git_objects.get_stats()
+
+    def begin_definition_transaction(self, app_id: str) -> DefinitionTransaction:
+        """
+        Starts a transaction that groups several definition file writes and deletes into one Git commit,
+        e.g. when an agent rewrites many files at once. See DefinitionTransaction.
+
+        Args:
+            app_id: The ID of the application.
+
+        Returns:
+            A new, empty DefinitionTransaction. Stage changes with set_file/delete_file, then await commit(message).
+        """
+        return DefinitionTransaction(self, app_id)
+
+    async def _apply_definition_changes(self, app_id: str, changes: Dict[str, Optional[str]], message: str) -> str:
+        """
+        Writes/deletes a set of definition files and commits them together. Used by DefinitionTransaction.commit().
+
+        Args:
+            app_id: The ID of the application.
+            changes: Normalized path -> new content, or None to delete the file.
+            message: The Git commit message.
+
+        Returns:
+            The hex SHA of the new commit.
+
+        Raises:
+            ValueError: If a path escapes the application's directory (checked before anything is written).
+        """
+        full_paths = {path: self._get_app_definition_path(app_id, path) for path in changes} # Validate every path first
+        await self._flush_definition_writes(app_id) # Keep coalesced single-file writes in their own, earlier commit
+
+        def write_and_commit() -> str:
+            self._get_app_repo(app_id) # Initialize the repository before creating any directories in it
+            originals = {path: _read_bytes(full_path) for path, full_path in full_paths.items()}
+            try:
+                for path, content in changes.items():
+                    full_path = full_paths[path]
+                    if content is None:
+                        if os.path.isfile(full_path):
+                            os.remove(full_path)
+                    else:
+                        os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                        with open(full_path, 'w', encoding='utf-8', newline='') as f: # Write line endings exactly as given
+                            f.write(content)
+                return self._commit_index(app_id, list(changes), message)
+            except BaseException:
+                self._restore_definition_files(app_id, full_paths, originals)
+                raise
+
+        try:
+            with self._uncommitted_definition_write(app_id):
+                async with self._write_locks.hold(app_id):
+                    commit_sha = await asyncio.to_thread(write_and_commit)
+            print(f"Committed {len(changes)} definition changes for app {app_id} with message: '{message}'") # Log commit
+            return commit_sha
+        except Exception as e:
+            print(f"Error committing definition transaction for app {app_id}; changes rolled back: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            raise
+        finally:
+            for path in changes:
+                self._definition_cache.invalidate(app_id, path)
+
+    async def _record_definition_change(self, app_id: str, path: str, message: str, write: Callable[[], None]) -> str:
+        """
+        Applies a single file change to the working tree and commits it, through the write coalescer if enabled.
+        The change and the commit run in a worker thread while the application's write lock is held.
+
+        Args:
+            app_id: The ID of the application.
+            path: The normalized path of the changed file.
+            message: The Git commit message.
+            write: Blocking function that writes or removes the file.
+
+        Returns:
+            The hex SHA of the commit that includes the change.
+        """
+        def write_and_commit() -> str:
+            write()
+            return self._commit_index(app_id, [path], message)
+
+        with self._uncommitted_definition_write(app_id):
+            if self._definition_write_coalescer:
+                async with self._write_locks.hold(app_id):
+                    await asyncio.to_thread(write)
+                return await self._definition_write_coalescer.submit(app_id, path, message)
+            async with self._write_locks.hold(app_id):
+                return await asyncio.to_thread(write_and_commit)
+
+    @contextmanager
+    def _uncommitted_definition_write(self, app_id: str) -> Iterator[None]:
+        """Marks an application as having uncommitted definition writes while the block runs."""
+        self._uncommitted_definition_writes[app_id] = self._uncommitted_definition_writes.get(app_id, 0) + 1
+        try:
+            yield
+        finally:
+            remaining = self._uncommitted_definition_writes[app_id] - 1
+            if remaining:
+                self._uncommitted_definition_writes[app_id] = remaining
+            else:
+                del self._uncommitted_definition_writes[app_id]
+
+    async def _flush_definition_writes(self, app_id: str):
+        """Commits any coalesced writes pending for an application."""
+        if self._definition_write_coalescer:
+            await self._definition_write_coalescer.flush(app_id)
+
+    async def _commit_definition_paths(self, app_id: str, paths: List[str], message: str) -> str:
+        """
+        Commits the current on-disk state of the given paths under the application's write lock, in a
+        worker thread. Used by the write coalescer.
+
+        Args:
+            app_id: The ID of the application.
+            paths: Normalized paths relative to the application's definition root.
+            message: The Git commit message.
+
+        Returns:
+            The hex SHA of the new commit.
+
+        Raises:
+            Exception: Whatever the commit raised, after the files were put back as they are at HEAD.
+        """
+        def commit() -> str:
+            try:
+                return self._commit_index(app_id, paths, message)
+            except BaseException:
+                # Files rewritten by writes of the next batch meanwhile are left to that batch's commit
+                pending = set(self._definition_write_coalescer.pending_paths(app_id)) if self._definition_write_coalescer else set()
+                self._restore_committed_files(app_id, [path for path in paths if path not in pending])
+                raise
+
+        async with self._write_locks.hold(app_id):
+            try:
+                return await asyncio.to_thread(commit)
+            finally:
+                for path in paths:
+                    self._definition_cache.invalidate(app_id, path)
+
+    def _commit_index(self, app_id: str, paths: List[str], message: str) -> str:
+        """
+        Stages the current on-disk state of the given paths (files that no longer exist are removed from
+        the index) and commits them. The index is read, locked and written once for the whole batch.
+        Blocking; callers hold the application's write lock.
+
+        Returns:
+            The hex SHA of the new commit.
+        """
+        with self._repos.lease(app_id) as repo: # Kept open even if evicted while committing
+            index = self._stage_paths(repo, app_id, paths)
+            return index.commit(message).hexsha
+
+    def _stage_paths(self, repo: git.Repo, app_id: str, paths: List[str]) -> git.IndexFile:
+        """Stages the on-disk state of the given paths and writes the index. Returns the index."""
+        index = repo.index
+        existing = []
+        for path in paths:
+            if os.path.isfile(self._get_app_definition_path(app_id, path)):
+                existing.append(path)
+            else:
+                index.entries.pop((path.replace(os.sep, "/"), 0), None) # Deleted; drop from the index
+        if existing:
+            index.add(existing, write=False)
+        index.write()
+        return index
+
+    def _restore_definition_files(self, app_id: str, full_paths: Dict[str, str], originals: Dict[str, Optional[bytes]]):
+        """
+        Puts files back as they were before a failed multi-file change and re-stages them, so neither the
+        working tree nor the index keeps part of the change. Blocking; callers hold the application's write lock.
+
+        Args:
+            app_id: The ID of the application.
+            full_paths: Normalized path -> absolute path of every file the change touched.
+            originals: Normalized path -> the file's previous bytes, or None if it did not exist.
+        """
+        for path, original in originals.items():
+            full_path = full_paths[path]
+            try:
+                if original is None:
+                    if os.path.isfile(full_path):
+                        os.remove(full_path)
+                else:
+                    os.makedirs(os.path.dirname(full_path), exist_ok=True)
+                    with open(full_path, 'wb') as f:
+                        f.write(original)
+            except OSError as e:
+                print(f"Error restoring definition file {full_path} for app {app_id}: {e}")
+                # TODO: Log this error properly (Issue #XX)
+        try:
+            with self._repos.lease(app_id) as repo:
+                self._stage_paths(repo, app_id, list(originals))
+        except Exception as e:
+            print(f"Error restoring the Git index for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+
+    def _restore_committed_files(self, app_id: str, paths: List[str]):
+        """
+        Puts files back as they are at HEAD (removing those HEAD does not have) and re-stages them, after
+        a failed commit of coalesced writes. Blocking; callers hold the application's write lock.
+
+        Args:
+            app_id: The ID of the application.
+            paths: Normalized paths relative to the application's definition root.
+        """
+        originals: Dict[str, Optional[bytes]] = {}
+        try:
+            with self._repos.lease(app_id) as repo:
+                try:
+                    tree = repo.head.commit.tree
+                except ValueError:
+                    tree = None # No commits yet
+                for path in paths:
+                    try:
+                        originals[path] = tree[path.replace(os.sep, "/")].data_stream.read() if tree is not None else None
+                    except KeyError:
+                        originals[path] = None
+        except Exception as e:
+            print(f"Error reading committed definition files for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            return
+        self._restore_definition_files(app_id, {path: self._get_app_definition_path(app_id, path) for path in paths}, originals)
+
+    async def list_definition_directory(self, app_id: str, path: str, revision: Optional[str] = None) -> List[FileInfo]:
         """
         Lists the contents of a directory within an application's definition state.
         This is used to browse application files (configs, workflows, prompts).
@@ -221,10 +678,20 @@ class StateManager(StateManagerInterface):
         Args:
             app_id: The ID of the application.
             path: The path to the directory relative to the application's definition root.
+            revision: Optional commit SHA or ref; when given, the directory is listed from the Git object database as of that commit.
 
         Returns:
             A list of FileInfo objects for the contents of the directory.
         """
+        if revision is not None:
+            try:
+                entries = self._git_objects.list_directory(app_id, path, revision)
+            except (FileNotFoundError, ValueError) as e:
+                print(f"Error listing definition directory {path} at {revision} for app {app_id}: {e}")
+                # TODO: Log this error properly (Issue #XX)
+                return []
+            return [FileInfo(path=item_path, name=name, type="directory" if is_dir else "file", size=size)
+                    for item_path, name, is_dir, size in entries or []]
         full_path = self._get_app_definition_path(app_id, path)
         file_list: List[FileInfo] = []
         if os.path.exists(full_path) and os.path.isdir(full_path):
@@ -234,7 +701,7 @@ class StateManager(StateManagerInterface):
                     is_dir = os.path.isdir(item_path)
                     # Construct relative path for FileInfo
                     relative_item_path = os.path.join(os.path.normpath(path), item_name)
-                    file_list.append(FileInfo(path=relative_item_path, is_directory=is_dir))
+                    file_list.append(FileInfo(path=relative_item_path, name=item_name, type="directory" if is_dir else "file"))
                 return file_list
             except Exception as e:
                 print(f"Error listing directory {full_path}: {e}")
@@ -242,21 +709,29 @@ class StateManager(StateManagerInterface):
                 return [] # Return empty list on error
         return [] # Return empty list if directory does not exist or is not a directory
 
-    async def apply_definition_diff(self, app_id: str, diff: str, message: str):
+    async def apply_definition_diff(self, app_id: str, diff: str, message: str, fix_whitespace: bool = True) -> Dict[str, Any]:
         """
         Applies a Git-style diff to the definition state for a specific application and commits the change.
         This method allows applying patches to multiple files or complex changes atomically.
-        NOTE: This implementation uses the `git apply` command via subprocess, which is basic
-        and does not handle conflicts automatically. For POC purposes.
+
+        The diff is parsed and applied in memory by patch_applier (in a worker thread, off the event loop).
+        Every hunk is validated against the current files before anything is written; if all apply,
+        the resulting files are written and committed in a single commit, otherwise nothing changes.
 
         Args:
             app_id: The ID of the application.
             diff: The Git-style diff content as a string.
             message: The Git commit message.
+            fix_whitespace: Strip trailing whitespace from added lines (as `git apply --whitespace=fix` did).
+
+        Returns:
+            A dictionary with "success", "message", "revision" (the new commit SHA, if applied) and
+            "files": per-file results with per-hunk "applied", "offset" and failure "message".
 
         Raises:
-            subprocess.CalledProcessError: If the `git apply` command fails.
-            Exception: For other unexpected errors.
+            FileNotFoundError: If the application has no definition state directory.
+            PatchError: If the diff is malformed or unsupported (e.g., binary).
+            ValueError: If the diff references a path outside the application's directory.
         """
         app_repo_path = os.path.join(self.definition_state_path, app_id)
         if not os.path.exists(app_repo_path) or not os.path.isdir(app_repo_path):
@@ -264,44 +739,44 @@ class StateManager(StateManagerInterface):
              # TODO: Log this error properly (Issue #XX)
              raise FileNotFoundError(f"Application directory not found: {app_repo_path}")
 
+        await self._flush_definition_writes(app_id) # Commit coalesced writes first so they are not folded into the diff's commit
         try:
-            # Use subprocess to run git apply
-            # --whitespace=fix attempts to fix whitespace issues
-            # - reads diff from stdin
-            # cwd sets the working directory to the application's repo
-            result = subprocess.run(
-                ['git', 'apply', '--whitespace=fix', '-'],
-                cwd=app_repo_path,
-                input=diff.encode('utf-8'), # Provide diff content via stdin
-                capture_output=True,
-                text=True, # Capture output as text
-                check=True # Raise CalledProcessError if command returns non-zero exit code
-            )
-            print(f"Diff applied successfully for app {app_id} with message: '{message}'")
-            if result.stdout:
-                print("git apply stdout:\n", result.stdout)
-            if result.stderr:
-                 # git apply often writes informational messages to stderr even on success
-                 print("git apply stderr:\n", result.stderr)
-
-            # Commit the changes after applying the diff
-            repo = self._get_app_repo(app_id) # Get the app's repo
-            repo.index.add(A=True) # Add all changed files (including new/deleted)
-            repo.index.commit(message)
-            print(f"Committed changes after diff for app {app_id} with message: '{message}'") # Log commit
-
-        except subprocess.CalledProcessError as e:
-            print(f"Error applying diff for app {app_id}: {e}")
-            print("git apply stdout:\n", e.stdout)
-            print("git apply stderr:\n", e.stderr)
+            patch = await asyncio.to_thread(apply_patch, diff, lambda path: self._read_definition_file(app_id, path), fix_whitespace)
+            files = [asdict(file_result) for file_result in patch.files]
+            if not patch.applied:
+                failed = [file_result.path for file_result in patch.files if not file_result.applied]
+                print(f"Diff for app {app_id} did not apply cleanly to: {', '.join(failed)}") # Basic logging
+                return {"success": False, "message": f"Diff does not apply to: {', '.join(failed)}", "revision": None, "files": files}
+            changes = {os.path.normpath(path): content for path, content in patch.changes.items()}
+            revision = await self._apply_definition_changes(app_id, changes, message)
+            print(f"Diff applied and committed for app {app_id} with message: '{message}'") # Log commit
+            return {"success": True, "message": f"Applied diff to {len(patch.files)} files", "revision": revision, "files": files}
+        except PatchError as e:
+            print(f"Error parsing diff for app {app_id}: {e}")
             # TODO: Log this error properly (Issue #XX)
-            # TODO: Consider Git reset/rollback on failure (Issue #XX)
             raise # Re-raise the exception
         except Exception as e:
             print(f"Unexpected error during diff application for app {app_id}: {e}")
             # TODO: Log this error properly (Issue #XX)
             raise # Re-raise the exception
+        finally:
+            self._definition_cache.invalidate(app_id) # A diff can touch any file of the app
+
+    def _read_definition_file(self, app_id: str, path: str) -> Optional[str]:
+        """
+        Reads a definition file synchronously (for use in worker threads), bypassing the content cache.
+
+        Returns:
+            The file content, or None if the file does not exist.
 
+        Raises:
+            ValueError: If the path escapes the application's directory.
+        """
+        full_path = self._get_app_definition_path(app_id, path)
+        if not os.path.isfile(full_path):
+            return None
+        with open(full_path, 'r', encoding='utf-8', newline='') as f: # Keep CRLF line endings as they are for exact hunk matching
+            return f.read()
 
     async def get_runtime_value(self, app_id: str, key: str) -> Optional[Any]:
         """
@@ -313,21 +788,19 @@ class StateManager(StateManagerInterface):
             key: The key for the runtime value.
 
         Returns:
-            The value associated with the key, deserialized from YAML, or None if the key does not exist.
+            The value associated with the key, decoded with the codec recorded in its header
+            (or as YAML for legacy values), or None if the key does not exist.
         """
         if self._redis_client:
             namespaced_key = self._get_app_runtime_key(app_id, key)
             try:
-                value = self._redis_client.get(namespaced_key)
-                if value:
-                    # Attempt to deserialize from YAML
-                    return yaml.safe_load(value)
-                return None # Return None if key does not exist
+                value = await self._redis_client.get(namespaced_key)
+                return self._runtime_codec.loads(value) # None if key does not exist
             except redis.exceptions.RedisError as e:
                 print(f"Redis error getting runtime value for {namespaced_key}: {e}")
                 # TODO: Log this error properly (Issue #XX)
                 return None # Return None on Redis error
-            except (yaml.YAMLError, UnicodeDecodeError) as e:
+            except RuntimeValueDecodeError as e:
                  print(f"Deserialization error for runtime value {namespaced_key}: {e}")
                  # TODO: Log this error properly (Issue #XX)
                  # Decide whether to return raw value or None on deserialization error
@@ -342,22 +815,21 @@ class StateManager(StateManagerInterface):
             # TODO: Implement proper error handling (Issue #XX)
             return None
 
-    async def set_runtime_value(self, app_id: str, key: str, value: Any):
+    async def set_runtime_value(self, app_id: str, key: str, value: Any, ttl_seconds: Optional[int] = None):
         """
         Sets a runtime value for a specific application in Redis.
-        Serializes the value to YAML before storing.
+        Encodes the value with the configured runtime codec (see runtime_codecs) before storing.
 
         Args:
             app_id: The ID of the application.
             key: The key for the runtime value.
             value: The value to set (can be any serializable Python object).
+            ttl_seconds: Optional time-to-live; the key expires after this many seconds. Without it any existing TTL is cleared.
         """
         if self._redis_client:
             namespaced_key = self._get_app_runtime_key(app_id, key)
             try:
-                # Serialize value to YAML before storing
-                serialized_value = yaml.dump(value)
-                self._redis_client.set(namespaced_key, serialized_value)
+                await self._redis_client.set(namespaced_key, self._runtime_codec.dumps(value), ex=ttl_seconds)
                 # print(f"Set runtime value for {namespaced_key}") # Optional: Log set
             except redis.exceptions.RedisError as e:
                 print(f"Redis error setting runtime value for {namespaced_key}: {e}")
@@ -384,7 +856,7 @@ class StateManager(StateManagerInterface):
         if self._redis_client:
             namespaced_key = self._get_app_runtime_key(app_id, key)
             try:
-                self._redis_client.delete(namespaced_key)
+                await self._redis_client.delete(namespaced_key)
                 # print(f"Deleted runtime value for {namespaced_key}") # Optional: Log deletion
             except redis.exceptions.RedisError as e:
                 print(f"Redis error deleting runtime value for {namespaced_key}: {e}")
@@ -398,3 +870,321 @@ class StateManager(StateManagerInterface):
             print("Warning: Redis client not initialized. Cannot delete runtime value.")
             # TODO: Implement proper error handling (Issue #XX)
             pass # For POC, just pass silently after warning
+
+    async def get_runtime_values(self, app_id: str, keys: List[str]) -> Dict[str, Any]:
+        """
+        Retrieves several runtime values for an application in a single round trip (MGET).
+
+        Args:
+            app_id: The ID of the application.
+            keys: The keys to retrieve.
+
+        Returns:
+            A dictionary mapping each key that exists to its deserialized value. Missing keys,
+            and values that fail to deserialize, are omitted.
+
+        Raises:
+            redis.exceptions.RedisError: If the Redis command fails.
+        """
+        if not keys:
+            return {}
+        if not self._redis_client:
+            print("Warning: Redis client not initialized. Cannot get runtime values.")
+            # TODO: Implement proper error handling (Issue #XX)
+            return {}
+        namespaced_keys = [self._get_app_runtime_key(app_id, key) for key in keys]
+        try:
+            raw_values = await self._redis_client.mget(namespaced_keys)
+        except redis.exceptions.RedisError as e:
+            print(f"Redis error getting {len(keys)} runtime values for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            raise
+        values: Dict[str, Any] = {}
+        for key, raw_value in zip(keys, raw_values):
+            if raw_value is None:
+                continue
+            try:
+                values[key] = self._runtime_codec.loads(raw_value)
+            except RuntimeValueDecodeError as e:
+                print(f"Deserialization error for runtime value {self._get_app_runtime_key(app_id, key)}: {e}")
+                # TODO: Log this error properly (Issue #XX)
+        return values
+
+    async def set_runtime_values(self, app_id: str, values: Dict[str, Any], ttl_seconds: Optional[int] = None):
+        """
+        Sets several runtime values for an application atomically in a single round trip
+        (MSET, or a MULTI/EXEC pipeline of SET ... EX when a TTL is given, since MSET cannot set expiries).
+
+        Args:
+            app_id: The ID of the application.
+            values: A dictionary mapping keys to values (any serializable Python objects).
+            ttl_seconds: Optional time-to-live applied to every key.
+
+        Raises:
+            redis.exceptions.RedisError: If the Redis command fails.
+        """
+        if not values:
+            return
+        if not self._redis_client:
+            print("Warning: Redis client not initialized. Cannot set runtime values.")
+            # TODO: Implement proper error handling (Issue #XX)
+            return
+        mapping = {self._get_app_runtime_key(app_id, key): self._runtime_codec.dumps(value) for key, value in values.items()}
+        try:
+            if ttl_seconds is None:
+                await self._redis_client.mset(mapping)
+            else:
+                async with self._redis_client.pipeline(transaction=True) as pipe:
+                    for namespaced_key, encoded in mapping.items():
+                        pipe.set(namespaced_key, encoded, ex=ttl_seconds)
+                    await pipe.execute()
+        except redis.exceptions.RedisError as e:
+            print(f"Redis error setting {len(values)} runtime values for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            raise
+
+    async def delete_runtime_values(self, app_id: str, keys: List[str]) -> int:
+        """
+        Deletes several runtime values for an application in a single round trip (multi-key DEL).
+
+        Args:
+            app_id: The ID of the application.
+            keys: The keys to delete.
+
+        Returns:
+            The number of keys that existed and were deleted.
+
+        Raises:
+            redis.exceptions.RedisError: If the Redis command fails.
+        """
+        if not keys:
+            return 0
+        if not self._redis_client:
+            print("Warning: Redis client not initialized. Cannot delete runtime values.")
+            # TODO: Implement proper error handling (Issue #XX)
+            return 0
+        try:
+            return await self._redis_client.delete(*(self._get_app_runtime_key(app_id, key) for key in keys))
+        except redis.exceptions.RedisError as e:
+            print(f"Redis error deleting {len(keys)} runtime values for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            raise
+
+    async def increment_runtime_value(self, app_id: str, key: str, amount: int = 1, ttl_seconds: Optional[int] = None) -> int:
+        """
+        Atomically increments an integer runtime value (INCRBY), creating it at 0 if missing.
+        Counters are stored as bare integers, so they can also be read with get_runtime_value
+        and initialized with set_runtime_value.
+
+        Args:
+            app_id: The ID of the application.
+            key: The key of the counter.
+            amount: The amount to add; negative values decrement.
+            ttl_seconds: Optional time-to-live, applied only when the counter has no TTL yet (fixed-window counters).
+
+        Returns:
+            The value after the increment.
+
+        Raises:
+            redis.exceptions.ResponseError: If the stored value is not an integer.
+            redis.exceptions.RedisError: If the Redis command fails.
+        """
+        if not self._redis_client:
+            print("Warning: Redis client not initialized. Cannot increment runtime value.")
+            # TODO: Implement proper error handling (Issue #XX)
+            return 0
+        namespaced_key = self._get_app_runtime_key(app_id, key)
+        try:
+            if ttl_seconds is None:
+                return await self._redis_client.incrby(namespaced_key, amount)
+            return await self._increment_with_ttl_script(keys=[namespaced_key], args=[amount, ttl_seconds])
+        except redis.exceptions.RedisError as e:
+            print(f"Redis error incrementing runtime value {namespaced_key}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            raise
+
+    async def decrement_runtime_value(self, app_id: str, key: str, amount: int = 1, ttl_seconds: Optional[int] = None) -> int:
+        """
+        Atomically decrements an integer runtime value. See increment_runtime_value.
+
+        Returns:
+            The value after the decrement.
+        """
+        return await self.increment_runtime_value(app_id, key, -amount, ttl_seconds)
+
+    async def compare_and_set_runtime_value(self, app_id: str, key: str, expected: Any, value: Any, ttl_seconds: Optional[int] = None) -> bool:
+        """
+        Sets a runtime value only if its current value equals `expected`.
+
+        With expected=None the key must not exist, which is a single SET NX (e.g. acquiring a lock, usually
+        with a TTL). Otherwise the key is WATCHed, its decoded value compared, and the write made in MULTI/EXEC,
+        so a concurrent change makes the call return False instead of overwriting it. Nothing is retried here.
+
+        Args:
+            app_id: The ID of the application.
+            key: The key for the runtime value.
+            expected: The value the key must currently hold, or None if it must be absent.
+            value: The new value.
+            ttl_seconds: Optional time-to-live for the new value.
+
+        Returns:
+            True if the value was written, False if the current value did not match.
+
+        Raises:
+            RuntimeValueDecodeError: If the current value cannot be decoded.
+            redis.exceptions.RedisError: If a Redis command fails.
+        """
+        encoded = self._runtime_codec.dumps(value)
+        if expected is None and self._redis_client:
+            namespaced_key = self._get_app_runtime_key(app_id, key)
+            try:
+                return bool(await self._redis_client.set(namespaced_key, encoded, ex=ttl_seconds, nx=True))
+            except redis.exceptions.RedisError as e:
+                print(f"Redis error setting runtime value {namespaced_key} if absent: {e}")
+                # TODO: Log this error properly (Issue #XX)
+                raise
+        return await self._compare_and_write(app_id, key, expected, lambda pipe, namespaced_key: pipe.set(namespaced_key, encoded, ex=ttl_seconds))
+
+    async def compare_and_delete_runtime_value(self, app_id: str, key: str, expected: Any) -> bool:
+        """
+        Deletes a runtime value only if its current value equals `expected` (e.g. releasing a lock
+        only when it is still held by the caller's token).
+
+        Args:
+            app_id: The ID of the application.
+            key: The key for the runtime value.
+            expected: The value the key must currently hold.
+
+        Returns:
+            True if the value was deleted, False if it was missing or did not match.
+
+        Raises:
+            RuntimeValueDecodeError: If the current value cannot be decoded.
+            redis.exceptions.RedisError: If a Redis command fails.
+        """
+        if expected is None:
+            return False # A missing key has nothing to delete
+        return await self._compare_and_write(app_id, key, expected, lambda pipe, namespaced_key: pipe.delete(namespaced_key))
+
+    async def _compare_and_write(self, app_id: str, key: str, expected: Any, write: Callable[[Any, str], Any]) -> bool:
+        """
+        Runs `write(pipe, namespaced_key)` in a MULTI/EXEC transaction if the key's current decoded value equals `expected`.
+
+        Returns:
+            True if the transaction executed, False on a mismatch or if the key changed after it was read (WatchError).
+        """
+        if not self._redis_client:
+            print("Warning: Redis client not initialized. Cannot compare-and-set runtime value.")
+            # TODO: Implement proper error handling (Issue #XX)
+            return False
+        namespaced_key = self._get_app_runtime_key(app_id, key)
+        try:
+            async with self._redis_client.pipeline(transaction=True) as pipe:
+                await pipe.watch(namespaced_key)
+                current = self._runtime_codec.loads(await pipe.get(namespaced_key))
+                if current is None or current != expected:
+                    await pipe.unwatch()
+                    return False
+                pipe.multi()
+                write(pipe, namespaced_key)
+                await pipe.execute()
+                return True
+        except redis.exceptions.WatchError:
+            return False # Another writer changed the key between our read and our write
+        except redis.exceptions.RedisError as e:
+            print(f"Redis error in compare-and-set of runtime value {namespaced_key}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            raise
+
+    async def scan_runtime_keys(self, app_id: str, pattern: str = "*", limit: Optional[int] = None) -> List[str]:
+        """
+        Lists an application's runtime keys matching a glob pattern, using incremental SCAN
+        (never KEYS) so large keyspaces do not block Redis.
+
+        Args:
+            app_id: The ID of the application.
+            pattern: Glob pattern for keys within the app's namespace (e.g., 'session:*').
+            limit: Optional maximum number of keys to return.
+
+        Returns:
+            The matching keys, without the app namespace prefix. Order is unspecified.
+
+        Raises:
+            redis.exceptions.RedisError: If a Redis command fails.
+        """
+        if not self._redis_client:
+            print("Warning: Redis client not initialized. Cannot scan runtime keys.")
+            # TODO: Implement proper error handling (Issue #XX)
+            return []
+        prefix_length = len(self._get_app_runtime_key(app_id, ""))
+        keys: List[str] = []
+        try:
+            async for namespaced_key in self._redis_client.scan_iter(match=self._get_app_runtime_pattern(app_id, pattern), count=RUNTIME_SCAN_BATCH_SIZE):
+                if isinstance(namespaced_key, bytes):
+                    namespaced_key = namespaced_key.decode("utf-8")
+                keys.append(namespaced_key[prefix_length:])
+                if limit is not None and len(keys) >= limit:
+                    break
+        except redis.exceptions.RedisError as e:
+            print(f"Redis error scanning runtime keys for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            raise
+        return keys
+
+    async def expire_runtime_values(self, app_id: str, ttl_seconds: int, pattern: str = "*") -> int:
+        """
+        Sets a TTL on every runtime key of an application matching a glob pattern, e.g. to let an
+        app's state age out after it is stopped. Keys are found with SCAN and expired with one
+        pipelined round trip per SCAN batch.
+
+        Args:
+            app_id: The ID of the application.
+            ttl_seconds: The time-to-live to apply. 0 expires the keys immediately.
+            pattern: Glob pattern for keys within the app's namespace.
+
+        Returns:
+            The number of keys whose TTL was set.
+
+        Raises:
+            redis.exceptions.RedisError: If a Redis command fails.
+        """
+        if not self._redis_client:
+            print("Warning: Redis client not initialized. Cannot expire runtime values.")
+            # TODO: Implement proper error handling (Issue #XX)
+            return 0
+        expired = 0
+        batch: List[Any] = []
+        try:
+            async for namespaced_key in self._redis_client.scan_iter(match=self._get_app_runtime_pattern(app_id, pattern), count=RUNTIME_SCAN_BATCH_SIZE):
+                batch.append(namespaced_key)
+                if len(batch) >= RUNTIME_SCAN_BATCH_SIZE:
+                    expired += await self._expire_keys(batch, ttl_seconds)
+                    batch = []
+            if batch:
+                expired += await self._expire_keys(batch, ttl_seconds)
+        except redis.exceptions.RedisError as e:
+            print(f"Redis error expiring runtime values for app {app_id}: {e}")
+            # TODO: Log this error properly (Issue #XX)
+            raise
+        return expired
+
+    async def _expire_keys(self, namespaced_keys: List[Any], ttl_seconds: int) -> int:
+        """Applies EXPIRE to a batch of keys in one non-transactional pipeline and returns how many were set."""
+        async with self._redis_client.pipeline(transaction=False) as pipe:
+            for namespaced_key in namespaced_keys:
+                pipe.expire(namespaced_key, ttl_seconds)
+            return sum(1 for result in await pipe.execute() if result)
+
+
+def _check_runtime_app_id(app_id: str):
+    """Rejects app IDs containing the namespace separator: with "a:b" allowed, app "a"'s key "b:k" and app "a:b"'s key "k" would collide."""
+    if not app_id or RUNTIME_KEY_SEPARATOR in app_id:
+        raise ValueError(f"Invalid application ID for runtime state: '{app_id}'")
+
+
+def _read_bytes(full_path: str) -> Optional[bytes]:
+    """Returns a file's content, or None if it does not exist."""
+    if not os.path.isfile(full_path):
+        return None
+    with open(full_path, 'rb') as f:
+        return f.read()
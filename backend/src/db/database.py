@@ -1,6 +1,8 @@
 import os
 from typing import Generator
 
+from sqlalchemy import inspect, text
+from sqlalchemy.engine import Engine
 from sqlmodel import create_engine, Session, SQLModel
 
 # Get database URL from environment variables
@@ -25,8 +27,33 @@ def create_db_and_tables():
     # TODO: Implement a proper database migration strategy (e.g., Alembic) for production (Issue #XX)
     print("Creating database tables...") # Basic logging
     SQLModel.metadata.create_all(engine)
+    upgrade_api_key_table(engine)
     print("Database tables created.") # Basic logging
 
+def upgrade_api_key_table(db_engine: Engine):
+    """
+    Adds the ApiKey.key_id column to an apikey table created before API keys had the form
+    "pak_<key_id>_<secret>" (create_all does not alter existing tables).
+
+    Keys issued before then cannot be looked up by key_id (their stored hash covers the whole key), so
+    existing rows get a unique placeholder key_id ("legacy_<id>") and are deactivated; reissue them
+    with ApplicationRegistry.create_api_key.
+
+    Args:
+        db_engine: The engine of the database to upgrade.
+    """
+    # TODO: Replace with a proper migration once a migration tool is adopted (Issue #XX)
+    inspector = inspect(db_engine)
+    if not inspector.has_table("apikey") or "key_id" in {column["name"] for column in inspector.get_columns("apikey")}:
+        return
+    print("Upgrading apikey table: adding key_id and deactivating keys issued in the old format...") # Basic logging
+    with db_engine.begin() as connection:
+        connection.execute(text("ALTER TABLE apikey ADD COLUMN key_id VARCHAR"))
+        connection.execute(text("UPDATE apikey SET key_id = 'legacy_' || CAST(id AS VARCHAR), is_active = :inactive"), {"inactive": False})
+        if db_engine.dialect.name != "sqlite": # SQLite cannot alter a column's nullability
+            connection.execute(text("ALTER TABLE apikey ALTER COLUMN key_id SET NOT NULL"))
+        connection.execute(text("CREATE UNIQUE INDEX ix_apikey_key_id ON apikey (key_id)"))
+
 def get_session() -> Generator[Session, None, None]:
     """
     Dependency function to get a database session for FastAPI.
@@ -4,8 +4,9 @@ from sqlmodel import Field, SQLModel
 # Define a simple model for storing API keys
 class ApiKey(SQLModel, table=True):
     id: Optional[int] = Field(default=None, primary_key=True)
+    key_id: str = Field(unique=True, index=True) # Public part of the key ("pak_<key_id>_<secret>"), used for lookup
     app_id: str = Field(index=True)
-    hashed_key: str
+    hashed_key: str # bcrypt hash of the key's secret part
     user_id: Optional[str] = Field(default=None, index=True)
     permissions: str # Store as comma-separated string for simplicity in POC
     is_active: bool = Field(default=True)
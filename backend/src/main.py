@@ -24,8 +24,11 @@ from prometheus_client import start_http_server # Import for exposing metrics
 # TODO: Implement proper configuration loading (e.g., from config files, environment variables)
 # For now, using placeholder values
 DEFINITION_STATE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "app_definitions") # Path relative to project root
+LOG_STORE_PATH = os.path.join(os.path.dirname(__file__), "..", "..", "log_store") # Segment files of the queryable log store
 RUNTIME_STATE_CONFIG = {"host": "localhost", "port": 6379, "db": 0} # Placeholder Redis config
+EVENT_STREAM_CONFIG = {"enabled": False, "redis": RUNTIME_STATE_CONFIG} # Set "enabled" to persist events in a Redis stream shared by replicas
 MCP_SETTINGS = {} # Placeholder MCP settings
+METRIC_HISTOGRAM_CONFIG = {"buckets": {}} # Framework-wide histogram overrides (see DEFAULT_HISTOGRAM_CONFIG); apps add theirs under config.metrics
 # TODO: Add other configuration settings (e.g., sandbox image, network config)
 
 
@@ -34,9 +37,9 @@ MCP_SETTINGS = {} # Placeholder MCP settings
 # This order reflects the dependency graph.
 
 # Foundational Services
-event_bus_instance = EventBus()
-logging_service_instance = LoggingService()
-metric_collector_instance = MetricCollector()
+event_bus_instance = EventBus(stream_config=EVENT_STREAM_CONFIG)
+logging_service_instance = LoggingService(store_config={"path": LOG_STORE_PATH})
+metric_collector_instance = MetricCollector(histogram_config=METRIC_HISTOGRAM_CONFIG)
 mcp_hub_instance = McpHub(settings=MCP_SETTINGS) # MCP Hub needs settings
 sandbox_api_instance = SandboxAPI() # SandboxAPI client (no dependencies in __init__)
 
@@ -70,6 +73,14 @@ request_router_instance = RequestRouter(
 
 # --- Wire Components (e.g., EventBus subscribers) ---
 # Connect components that need to interact asynchronously via the EventBus
+# EventBus checks subscriptions to other apps' "app.<appId>..." topics against their inter-app permissions
+event_bus_instance.set_permission_provider(app_registry_instance.get_application_permissions)
+# Keep-alive connections to a sandbox are dropped when SandboxManager destroys it (release, reap, replacement)
+sandbox_manager_instance.add_sandbox_destroyed_listener(request_router_instance.discard_sandbox_connections)
+# An app's histogram buckets and quantile sketches (config.metrics in its definition) are applied when the definition loads
+app_registry_instance.add_definition_loaded_listener(
+    lambda definition: metric_collector_instance.apply_app_metric_config(definition.appId, definition.config.get("metrics"))
+)
 # Example: LoggingService might subscribe to events from EventBus
 # event_bus_instance.subscribe("log_event", logging_service_instance.log_application_message) # Assuming log_event type and method name
 
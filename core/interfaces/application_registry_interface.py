@@ -1,7 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import List, Optional, Dict, Any
 
-from core.shared.data_models import AppDefinition, ComponentDefinition # Assuming these are needed
+from core.shared.data_models.data_models import AppDefinition, ComponentDefinition # Assuming these are needed
 
 class ApplicationRegistryInterface(ABC):
     """
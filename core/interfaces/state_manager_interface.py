@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 class StateManagerInterface(ABC):
     """
@@ -31,6 +31,40 @@ class StateManagerInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_definition_revision(self, app_id: str) -> Optional[str]:
+        """
+        Returns the current HEAD revision of an application's definition state repository.
+
+        Callers use this as a cheap version stamp to validate caches of parsed definition files.
+
+        Args:
+            app_id: The ID of the application.
+
+        Returns:
+            The commit hash of HEAD, or None if the application has no definition repository yet.
+
+        Raises:
+            IOError: If there is an error interacting with the Git repository.
+        """
+        pass
+
+    @abstractmethod
+    def has_pending_definition_writes(self, app_id: str) -> bool:
+        """
+        Returns whether an application has definition writes that may be on disk but are not committed yet.
+
+        While this is true, definition files may not match get_definition_revision(), so callers must not
+        cache what they read under that revision.
+
+        Args:
+            app_id: The ID of the application.
+
+        Returns:
+            True if writes are pending.
+        """
+        pass
+
     @abstractmethod
     def apply_definition_diff(self, app_id: str, file_path: str, diff_content: str, expected_base_revision: str, commit_message: str, author: Optional[str] = None) -> str:
         """
@@ -101,6 +135,20 @@ class StateManagerInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def begin_definition_transaction(self, app_id: str) -> Any:
+        """
+        Starts a transaction grouping several definition file writes and deletes into a single commit.
+
+        Args:
+            app_id: The ID of the application.
+
+        Returns:
+            A transaction object with set_file(path, content), delete_file(path), rollback() and
+            an awaitable commit(commit_message) returning the new revision.
+        """
+        pass
+
     @abstractmethod
     def list_definition_directory(self, app_id: str, dir_path: str, recursive: bool = False, revision: Optional[str] = None) -> List[str]:
         """
@@ -122,6 +170,25 @@ class StateManagerInterface(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_definition_file_history(self, app_id: str, path: str, max_count: int = 20, revision: str = "HEAD") -> List[Any]:
+        """
+        Returns the commits that changed a file (or any file under a directory), newest first.
+
+        Args:
+            app_id: The ID of the application.
+            path: The path relative to the application's state root.
+            max_count: Maximum number of commits to return.
+            revision: The Git revision to walk back from.
+
+        Returns:
+            A list of CommitInfo objects.
+
+        Raises:
+            IOError: If there is an error interacting with the Git repository.
+        """
+        pass
+
     # --- Runtime State Methods (Redis) ---
 
     @abstractmethod
@@ -177,8 +244,147 @@ class StateManagerInterface(ABC):
         """
         pass
 
-    # Optional: Add increment/decrement methods if needed
-    # @abstractmethod
-    # def increment_runtime_value(self, app_id: str, key: str, amount: int = 1) -> int:
-    #     """Atomically increments a numerical value by the specified amount."""
-    #     pass
+    @abstractmethod
+    def get_runtime_values(self, app_id: str, keys: List[str]) -> Dict[str, str]:
+        """
+        Retrieves several values from the runtime state in a single round trip.
+
+        Args:
+            app_id: The ID of the application.
+            keys: The keys to retrieve.
+
+        Returns:
+            A dictionary mapping each key that exists to its value. Missing keys are omitted.
+
+        Raises:
+            IOError: If there is an error interacting with the runtime state store.
+        """
+        pass
+
+    @abstractmethod
+    def set_runtime_values(self, app_id: str, values: Dict[str, str], ttl_seconds: Optional[int] = None) -> bool:
+        """
+        Sets several key-value pairs in the runtime state atomically, in a single round trip.
+
+        Args:
+            app_id: The ID of the application.
+            values: A dictionary mapping keys to the values to store.
+            ttl_seconds: Optional time-to-live in seconds, applied to every key.
+
+        Returns:
+            True if the operation was successful, False otherwise.
+
+        Raises:
+            IOError: If there is an error interacting with the runtime state store.
+        """
+        pass
+
+    @abstractmethod
+    def delete_runtime_values(self, app_id: str, keys: List[str]) -> int:
+        """
+        Deletes several keys from the runtime state in a single round trip.
+
+        Args:
+            app_id: The ID of the application.
+            keys: The keys to delete.
+
+        Returns:
+            The number of keys that existed and were deleted.
+
+        Raises:
+            IOError: If there is an error interacting with the runtime state store.
+        """
+        pass
+
+    @abstractmethod
+    def increment_runtime_value(self, app_id: str, key: str, amount: int = 1, ttl_seconds: Optional[int] = None) -> int:
+        """
+        Atomically increments an integer value by the specified amount, creating it at 0 if missing.
+
+        Args:
+            app_id: The ID of the application.
+            key: The key of the counter.
+            amount: The amount to add; negative values decrement.
+            ttl_seconds: Optional time-to-live in seconds, applied only when the counter has no TTL yet.
+
+        Returns:
+            The value after the increment.
+
+        Raises:
+            IOError: If there is an error interacting with the runtime state store.
+        """
+        pass
+
+    @abstractmethod
+    def compare_and_set_runtime_value(self, app_id: str, key: str, expected: Optional[str], value: str, ttl_seconds: Optional[int] = None) -> bool:
+        """
+        Atomically sets a value only if the current value equals `expected` (or, if `expected` is None, only if the key does not exist).
+
+        Args:
+            app_id: The ID of the application.
+            key: The key for the value.
+            expected: The value the key must currently hold, or None if it must be absent.
+            value: The new value.
+            ttl_seconds: Optional time-to-live in seconds.
+
+        Returns:
+            True if the value was written, False if the current value did not match.
+
+        Raises:
+            IOError: If there is an error interacting with the runtime state store.
+        """
+        pass
+
+    @abstractmethod
+    def compare_and_delete_runtime_value(self, app_id: str, key: str, expected: str) -> bool:
+        """
+        Atomically deletes a key only if its current value equals `expected`.
+
+        Args:
+            app_id: The ID of the application.
+            key: The key to delete.
+            expected: The value the key must currently hold.
+
+        Returns:
+            True if the key was deleted, False if it was missing or did not match.
+
+        Raises:
+            IOError: If there is an error interacting with the runtime state store.
+        """
+        pass
+
+    @abstractmethod
+    def scan_runtime_keys(self, app_id: str, pattern: str = "*", limit: Optional[int] = None) -> List[str]:
+        """
+        Lists the application's runtime keys matching a glob pattern, without blocking the store.
+
+        Args:
+            app_id: The ID of the application.
+            pattern: Glob pattern for keys within the application's namespace.
+            limit: Optional maximum number of keys to return.
+
+        Returns:
+            The matching keys (without the application namespace).
+
+        Raises:
+            IOError: If there is an error interacting with the runtime state store.
+        """
+        pass
+
+    @abstractmethod
+    def expire_runtime_values(self, app_id: str, ttl_seconds: int, pattern: str = "*") -> int:
+        """
+        Sets a time-to-live on every runtime key of the application matching a glob pattern.
+
+        Args:
+            app_id: The ID of the application.
+            ttl_seconds: The time-to-live in seconds. 0 expires the keys immediately.
+            pattern: Glob pattern for keys within the application's namespace.
+
+        Returns:
+            The number of keys whose time-to-live was set.
+
+        Raises:
+            IOError: If there is an error interacting with the runtime state store.
+        """
+        pass
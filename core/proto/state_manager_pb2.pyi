@@ -7,18 +7,22 @@ from typing import ClassVar as _ClassVar, Iterable as _Iterable, Mapping as _Map
 DESCRIPTOR: _descriptor.FileDescriptor
 
 class GetDefinitionFileContentRequest(_message.Message):
-    __slots__ = ("app_id", "path")
+    __slots__ = ("app_id", "path", "revision")
     APP_ID_FIELD_NUMBER: _ClassVar[int]
     PATH_FIELD_NUMBER: _ClassVar[int]
+    REVISION_FIELD_NUMBER: _ClassVar[int]
     app_id: str
     path: str
-    def __init__(self, app_id: _Optional[str] = ..., path: _Optional[str] = ...) -> None: ...
+    revision: str
+    def __init__(self, app_id: _Optional[str] = ..., path: _Optional[str] = ..., revision: _Optional[str] = ...) -> None: ...
 
 class GetDefinitionFileContentResponse(_message.Message):
-    __slots__ = ("content",)
+    __slots__ = ("content", "commit_hash")
     CONTENT_FIELD_NUMBER: _ClassVar[int]
+    COMMIT_HASH_FIELD_NUMBER: _ClassVar[int]
     content: str
-    def __init__(self, content: _Optional[str] = ...) -> None: ...
+    commit_hash: str
+    def __init__(self, content: _Optional[str] = ..., commit_hash: _Optional[str] = ...) -> None: ...
 
 class SetDefinitionFileContentRequest(_message.Message):
     __slots__ = ("app_id", "path", "content", "commit_message")
@@ -59,14 +63,16 @@ class DeleteDefinitionFileResponse(_message.Message):
     def __init__(self, success: bool = ..., error_message: _Optional[str] = ...) -> None: ...
 
 class ListDefinitionDirectoryRequest(_message.Message):
-    __slots__ = ("app_id", "path", "recursive")
+    __slots__ = ("app_id", "path", "recursive", "revision")
     APP_ID_FIELD_NUMBER: _ClassVar[int]
     PATH_FIELD_NUMBER: _ClassVar[int]
     RECURSIVE_FIELD_NUMBER: _ClassVar[int]
+    REVISION_FIELD_NUMBER: _ClassVar[int]
     app_id: str
     path: str
     recursive: bool
-    def __init__(self, app_id: _Optional[str] = ..., path: _Optional[str] = ..., recursive: bool = ...) -> None: ...
+    revision: str
+    def __init__(self, app_id: _Optional[str] = ..., path: _Optional[str] = ..., recursive: bool = ..., revision: _Optional[str] = ...) -> None: ...
 
 class FileInfo(_message.Message):
     __slots__ = ("name", "path", "type")
@@ -94,6 +100,40 @@ class ListDefinitionDirectoryResponse(_message.Message):
     error_message: str
     def __init__(self, files: _Optional[_Iterable[_Union[FileInfo, _Mapping]]] = ..., success: bool = ..., error_message: _Optional[str] = ...) -> None: ...
 
+class GetFileHistoryRequest(_message.Message):
+    __slots__ = ("app_id", "path", "max_count", "revision")
+    APP_ID_FIELD_NUMBER: _ClassVar[int]
+    PATH_FIELD_NUMBER: _ClassVar[int]
+    MAX_COUNT_FIELD_NUMBER: _ClassVar[int]
+    REVISION_FIELD_NUMBER: _ClassVar[int]
+    app_id: str
+    path: str
+    max_count: int
+    revision: str
+    def __init__(self, app_id: _Optional[str] = ..., path: _Optional[str] = ..., max_count: _Optional[int] = ..., revision: _Optional[str] = ...) -> None: ...
+
+class CommitInfo(_message.Message):
+    __slots__ = ("commit_hash", "author", "message", "timestamp")
+    COMMIT_HASH_FIELD_NUMBER: _ClassVar[int]
+    AUTHOR_FIELD_NUMBER: _ClassVar[int]
+    MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    TIMESTAMP_FIELD_NUMBER: _ClassVar[int]
+    commit_hash: str
+    author: str
+    message: str
+    timestamp: str
+    def __init__(self, commit_hash: _Optional[str] = ..., author: _Optional[str] = ..., message: _Optional[str] = ..., timestamp: _Optional[str] = ...) -> None: ...
+
+class GetFileHistoryResponse(_message.Message):
+    __slots__ = ("commits", "success", "error_message")
+    COMMITS_FIELD_NUMBER: _ClassVar[int]
+    SUCCESS_FIELD_NUMBER: _ClassVar[int]
+    ERROR_MESSAGE_FIELD_NUMBER: _ClassVar[int]
+    commits: _containers.RepeatedCompositeFieldContainer[CommitInfo]
+    success: bool
+    error_message: str
+    def __init__(self, commits: _Optional[_Iterable[_Union[CommitInfo, _Mapping]]] = ..., success: bool = ..., error_message: _Optional[str] = ...) -> None: ...
+
 class GetRuntimeValueRequest(_message.Message):
     __slots__ = ("app_id", "key")
     APP_ID_FIELD_NUMBER: _ClassVar[int]
@@ -56,6 +56,11 @@ class StateManagerStub(object):
                 request_serializer=state__manager__pb2.ListDefinitionDirectoryRequest.SerializeToString,
                 response_deserializer=state__manager__pb2.ListDefinitionDirectoryResponse.FromString,
                 _registered_method=True)
+        self.GetFileHistory = channel.unary_unary(
+                '/statemanager.StateManager/GetFileHistory',
+                request_serializer=state__manager__pb2.GetFileHistoryRequest.SerializeToString,
+                response_deserializer=state__manager__pb2.GetFileHistoryResponse.FromString,
+                _registered_method=True)
         self.GetRuntimeValue = channel.unary_unary(
                 '/statemanager.StateManager/GetRuntimeValue',
                 request_serializer=state__manager__pb2.GetRuntimeValueRequest.SerializeToString,
@@ -98,7 +103,13 @@ class StateManagerServicer(object):
         raise NotImplementedError('Method not implemented!')
 
     def ListDefinitionDirectory(self, request, context):
-        """rpc GetFileHistory (GetFileHistoryRequest) returns (GetFileHistoryResponse); // Future: Get file history/commits
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetFileHistory(self, request, context):
+        """Commits that changed a file/directory
         """
         context.set_code(grpc.StatusCode.UNIMPLEMENTED)
         context.set_details('Method not implemented!')
@@ -146,6 +157,11 @@ def add_StateManagerServicer_to_server(servicer, server):
                     request_deserializer=state__manager__pb2.ListDefinitionDirectoryRequest.FromString,
                     response_serializer=state__manager__pb2.ListDefinitionDirectoryResponse.SerializeToString,
             ),
+            'GetFileHistory': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetFileHistory,
+                    request_deserializer=state__manager__pb2.GetFileHistoryRequest.FromString,
+                    response_serializer=state__manager__pb2.GetFileHistoryResponse.SerializeToString,
+            ),
             'GetRuntimeValue': grpc.unary_unary_rpc_method_handler(
                     servicer.GetRuntimeValue,
                     request_deserializer=state__manager__pb2.GetRuntimeValueRequest.FromString,
@@ -282,6 +298,33 @@ class StateManager(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def GetFileHistory(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/statemanager.StateManager/GetFileHistory',
+            state__manager__pb2.GetFileHistoryRequest.SerializeToString,
+            state__manager__pb2.GetFileHistoryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
     @staticmethod
     def GetRuntimeValue(request,
             target,
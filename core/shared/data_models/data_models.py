@@ -56,10 +56,10 @@ class LogMessage:
     level: str # "debug", "info", "warn", "error", "critical"
     message: str
     appId: str
+    timestamp: str # ISO 8601 timestamp
     taskId: Optional[str] = None
     requestId: Optional[str] = None
     traceId: Optional[str] = None
-    timestamp: str # ISO 8601 timestamp
     context: Dict[str, Any] = field(default_factory=dict) # Additional structured context
 
 # 4.7 AppDefinition
@@ -80,7 +80,7 @@ class AppDefinition:
     author: Optional[str] = None
     license: Optional[str] = None
     createdAt: Optional[str] = None # ISO 8601 timestamp
-    updatedAt: Optional[str] = Field(default=None) # ISO 8601 timestamp
+    updatedAt: Optional[str] = None # ISO 8601 timestamp
     sandboxPools: List["SandboxPoolConfig"] = field(default_factory=list) # List of sandbox pool configurations
     components: Dict[str, "ComponentDefinition"] = field(default_factory=dict) # Dictionary of component definitions
     config: Dict[str, Any] = field(default_factory=dict) # Application-specific configuration
@@ -220,14 +220,33 @@ class SandboxPoolConfig:
     # TODO: Add resource limits, environment variables, etc. (Issue #XX)
 
 # 4.19 ComponentDefinition (Proposed Placeholder)
+@dataclass
+class RouteMatcher:
+    """Defines criteria for matching incoming HTTP requests to a component."""
+    path_pattern: str # e.g., "/api/users/:id"
+    methods: List[str] = field(default_factory=list) # e.g., ["GET", "POST"]; empty matches any method
+
 @dataclass
 class ComponentDefinition:
     """Definition of an application component (workflow, prompt, JIT)."""
     component_id: str # Unique ID within the application
     type: str # "workflow", "prompt", "jit"
     definition: Any # The actual definition (e.g., YAML for workflow, string for prompt, code for JIT)
+    route_matcher: Optional[RouteMatcher] = None # Optional: If triggered by HTTP requests
     # TODO: Add input/output schema, dependencies, configuration, etc. (Issue #XX)
 
+# 4.19.1 HttpRequestDetails
+@dataclass
+class HttpRequestDetails:
+    """Details for an HTTP source request, used to resolve a component by route."""
+    method: str
+    path: str
+    route_pattern: Optional[str] = None # Filled in by the framework once a route matches
+    path_parameters: Dict[str, str] = field(default_factory=dict) # Extracted from ":name" segments
+    query_parameters: Dict[str, str] = field(default_factory=dict)
+    headers: Dict[str, str] = field(default_factory=dict)
+    body: Optional[str] = None
+
 # 4.20 InterAppPermission (Proposed Placeholder)
 @dataclass
 class InterAppPermission:
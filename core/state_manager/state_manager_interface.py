@@ -26,6 +26,10 @@ class StateManagerService(state_manager_pb2_grpc.StateManagerServicer):
         # TODO: Implement logic to list directory contents from Git
         pass
 
+    def GetFileHistory(self, request, context):
+        # TODO: Implement logic to get file history from Git (StateManager.get_definition_file_history)
+        pass
+
     def GetRuntimeValue(self, request, context):
         # TODO: Implement logic to get value from Redis
         pass
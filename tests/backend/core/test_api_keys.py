@@ -0,0 +1,74 @@
+import time
+import pytest
+
+from backend.src.core.application_registry.api_keys import (
+    VerifiedApiKeyCache,
+    generate_api_key,
+    parse_api_key,
+    verify_api_key_secret,
+)
+
+
+def test_generated_key_round_trips():
+    """Test that a generated key parses back to its key_id and verifies against its stored hash."""
+    # Act
+    key_id, api_key, hashed_secret = generate_api_key()
+    parsed = parse_api_key(api_key)
+
+    # Assert
+    assert parsed is not None
+    assert parsed[0] == key_id
+    assert verify_api_key_secret(parsed[1], hashed_secret) is True
+    assert verify_api_key_secret("wrong-secret", hashed_secret) is False
+
+@pytest.mark.parametrize("api_key", ["", "plainkey", "pak_short_secret", "xyz_0123456789abcdef_secret", "pak_0123456789abcdef_"])
+def test_parse_api_key_rejects_malformed_keys(api_key):
+    """Test that keys not in the pak_<key_id>_<secret> format are rejected."""
+    assert parse_api_key(api_key) is None
+
+def test_verify_api_key_secret_handles_malformed_hash():
+    """Test that a corrupt stored hash fails verification instead of raising."""
+    assert verify_api_key_secret("secret", "not-a-bcrypt-hash") is False
+
+def test_cache_hit_requires_matching_key():
+    """Test that the cache only serves an entry for the exact key that was verified."""
+    # Arrange
+    cache = VerifiedApiKeyCache()
+    cache.put("0123456789abcdef", "pak_0123456789abcdef_secret", {"appId": "app_1"})
+
+    # Act / Assert
+    assert cache.get("0123456789abcdef", "pak_0123456789abcdef_secret") == {"appId": "app_1"}
+    assert cache.get("0123456789abcdef", "pak_0123456789abcdef_forged") is None
+    assert cache.get_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+def test_cache_expires_and_evicts_least_recently_used():
+    """Test TTL expiry and the max_entries bound."""
+    # Arrange
+    cache = VerifiedApiKeyCache(max_entries=2, ttl_seconds=0.05)
+    cache.put("a", "key_a", {"appId": "app_1"})
+    cache.put("b", "key_b", {"appId": "app_1"})
+    cache.get("a", "key_a") # "b" is now least recently used
+
+    # Act
+    cache.put("c", "key_c", {"appId": "app_2"})
+
+    # Assert
+    assert cache.get("b", "key_b") is None
+    assert cache.get("a", "key_a") is not None
+    time.sleep(0.06)
+    assert cache.get("a", "key_a") is None
+
+def test_cache_invalidate_by_key_and_app():
+    """Test dropping single keys and all keys of an application."""
+    # Arrange
+    cache = VerifiedApiKeyCache()
+    cache.put("a", "key_a", {"appId": "app_1"})
+    cache.put("b", "key_b", {"appId": "app_1"})
+    cache.put("c", "key_c", {"appId": "app_2"})
+
+    # Act
+    cache.invalidate(key_id="c")
+    cache.invalidate(app_id="app_1")
+
+    # Assert
+    assert cache.get_stats()["size"] == 0
@@ -1,7 +1,10 @@
 import pytest
+import yaml
 from unittest.mock import AsyncMock, MagicMock # For mocking async and sync methods
 
 from backend.src.core.application_registry.application_registry import ApplicationRegistry
+from backend.src.core.application_registry.api_keys import generate_api_key
+from backend.src.db.models import ApiKey
 from core.shared.data_models.data_models import AppDefinition, AppStatus
 from core.interfaces.state_manager_interface import StateManagerInterface
 from sqlmodel import Session
@@ -15,6 +18,8 @@ def mock_state_manager():
     mock.get_definition_file_content.return_value = None # Default to not found
     mock.set_definition_file_content.return_value = None # Default success (no specific return)
     mock.delete_definition_file.return_value = None # Default success
+    mock.get_definition_revision.return_value = None # Default: no repo, so nothing is cached
+    mock.has_pending_definition_writes = MagicMock(return_value=False)
     return mock
 
 @pytest.fixture
@@ -185,9 +190,170 @@ async def test_list_active_applications(app_registry, sample_app_definition):
     assert result["applications"][0]["appId"] == app_id
     assert result["applications"][0]["status"] == AppStatus.ACTIVE
 
+@pytest.mark.asyncio
+async def test_get_app_definition_cache_hit_same_revision(app_registry, mock_state_manager, sample_app_definition):
+    """Test that a parsed AppDefinition is served from cache while the repo HEAD is unchanged."""
+    # Arrange
+    mock_state_manager.get_definition_revision.return_value = "rev1"
+    mock_state_manager.get_definition_file_content.return_value = yaml.dump(sample_app_definition.__dict__)
+
+    # Act
+    first = await app_registry._get_app_definition(sample_app_definition.appId)
+    second = await app_registry._get_app_definition(sample_app_definition.appId)
+
+    # Assert
+    assert first is second
+    mock_state_manager.get_definition_file_content.assert_called_once()
+    assert app_registry.get_app_definition_cache_stats() == {"hits": 1, "misses": 1, "size": 1}
+
+@pytest.mark.asyncio
+async def test_get_app_definition_cache_miss_on_new_revision(app_registry, mock_state_manager, sample_app_definition):
+    """Test that a new HEAD commit (e.g., from apply_definition_diff) forces a re-read."""
+    # Arrange
+    mock_state_manager.get_definition_file_content.return_value = yaml.dump(sample_app_definition.__dict__)
+    mock_state_manager.get_definition_revision.return_value = "rev1"
+    await app_registry._get_app_definition(sample_app_definition.appId)
+
+    # Act
+    mock_state_manager.get_definition_revision.return_value = "rev2"
+    await app_registry._get_app_definition(sample_app_definition.appId)
+
+    # Assert
+    assert mock_state_manager.get_definition_file_content.call_count == 2
+    assert app_registry.get_app_definition_cache_stats()["misses"] == 2
+
+@pytest.mark.asyncio
+async def test_get_app_definition_is_not_cached_while_writes_are_pending(app_registry, mock_state_manager, sample_app_definition):
+    """Test that definitions read while uncommitted writes are on disk are neither served from nor put in the cache."""
+    # Arrange
+    app_id = sample_app_definition.appId
+    app_registry._cache_app_definition(app_id, "rev1", sample_app_definition)
+    mock_state_manager.get_definition_revision.return_value = "rev1" # The pending write is not committed yet
+    mock_state_manager.get_definition_file_content.return_value = yaml.dump({**sample_app_definition.__dict__, "version": "2.0.0"})
+    mock_state_manager.has_pending_definition_writes.return_value = True
+
+    # Act
+    definition = await app_registry._get_app_definition(app_id)
+
+    # Assert
+    assert definition.version == "2.0.0"
+    assert app_id not in app_registry._app_definitions_cache
+    assert app_id not in app_registry._route_tables
+    mock_state_manager.get_definition_revision.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_set_app_definition_replaces_cache_entry(app_registry, mock_state_manager, sample_app_definition):
+    """Test that saving a definition replaces the cached entry with the new revision."""
+    # Arrange
+    app_id = sample_app_definition.appId
+    stale_definition = AppDefinition(**{**sample_app_definition.__dict__, "version": "0.9.0"})
+    app_registry._app_definitions_cache[app_id] = ("rev1", stale_definition)
+    mock_state_manager.get_definition_revision.return_value = "rev2"
+
+    # Act
+    await app_registry._set_app_definition(app_id, sample_app_definition, "Update")
+
+    # Assert
+    assert app_registry._app_definitions_cache[app_id] == ("rev2", sample_app_definition)
+    assert app_id in app_registry._route_tables
+
+@pytest.mark.asyncio
+async def test_definition_loaded_listeners_see_parsed_and_saved_definitions(app_registry, mock_state_manager, sample_app_definition):
+    """Test that listeners get definitions when they are parsed or saved, not on cache hits, and that their errors are ignored."""
+    # Arrange
+    app_id = sample_app_definition.appId
+    loaded = []
+    app_registry.add_definition_loaded_listener(lambda definition: 1 / 0)
+    app_registry.add_definition_loaded_listener(loaded.append)
+    mock_state_manager.get_definition_revision.return_value = "rev1"
+    mock_state_manager.get_definition_file_content.return_value = yaml.dump(sample_app_definition.__dict__)
+
+    # Act
+    await app_registry._set_app_definition(app_id, sample_app_definition, "Register")
+    app_registry.invalidate_app_definition_cache(app_id)
+    parsed = await app_registry._get_app_definition(app_id)
+    await app_registry._get_app_definition(app_id) # Cache hit
+
+    # Assert
+    assert loaded == [sample_app_definition, parsed]
+
+@pytest.mark.asyncio
+async def test_get_component_definition_by_route(app_registry, sample_app_definition):
+    """Test resolving a component from HTTP route input via the compiled route table."""
+    # Arrange
+    component = {"component_id": "get_user", "type": "jit", "definition": None,
+                 "route_matcher": {"path_pattern": "/api/users/:id", "methods": ["GET"]}}
+    definition = AppDefinition(**{**sample_app_definition.__dict__, "components": {"get_user": component}})
+    app_registry._get_app_definition = AsyncMock(return_value=definition)
+
+    # Act
+    result = await app_registry.get_component_definition(definition.appId, routeInput={"method": "GET", "path": "/api/users/42"})
+    missing = await app_registry.get_component_definition(definition.appId, routeInput={"method": "POST", "path": "/api/users/42"})
+
+    # Assert
+    assert result["success"] is True
+    assert result["componentId"] == "get_user"
+    assert result["pathParameters"] == {"id": "42"}
+    assert missing["success"] is False
+
+@pytest.fixture
+def stored_api_key(mock_db_session):
+    """Fixture storing one active API key row behind the mock database session."""
+    key_id, api_key, hashed_secret = generate_api_key()
+    row = ApiKey(key_id=key_id, app_id="test_app_001", hashed_key=hashed_secret, user_id="user_1", permissions="read,write", is_active=True)
+    mock_db_session.exec.return_value.first.return_value = row
+    return api_key, row
+
+@pytest.mark.asyncio
+async def test_validate_api_key_success_is_cached(app_registry, mock_db_session, stored_api_key):
+    """Test that a valid key is verified once and then served from the verified-key cache."""
+    # Arrange
+    api_key, _ = stored_api_key
+
+    # Act
+    first = await app_registry.validate_api_key(api_key)
+    second = await app_registry.validate_api_key(api_key)
+
+    # Assert
+    assert first == {"success": True, "appId": "test_app_001", "userId": "user_1", "permissions": ["read", "write"]}
+    assert second == first
+    mock_db_session.exec.assert_called_once()
+    assert app_registry.get_api_key_cache_stats()["hits"] == 1
+
+@pytest.mark.asyncio
+async def test_validate_api_key_rejects_wrong_secret_and_malformed_keys(app_registry, mock_db_session, stored_api_key):
+    """Test that a known key_id with the wrong secret, and malformed keys, are rejected."""
+    # Arrange
+    _, row = stored_api_key
+    forged_key = f"pak_{row.key_id}_not-the-secret"
+
+    # Act
+    forged = await app_registry.validate_api_key(forged_key)
+    malformed = await app_registry.validate_api_key("not-an-api-key")
+
+    # Assert
+    assert forged["success"] is False
+    assert malformed["success"] is False
+    mock_db_session.exec.assert_called_once() # Malformed keys never reach the database
+
+@pytest.mark.asyncio
+async def test_set_api_key_active_invalidates_cache(app_registry, mock_db_session, stored_api_key):
+    """Test that revoking a key takes effect immediately despite the cache."""
+    # Arrange
+    api_key, row = stored_api_key
+    await app_registry.validate_api_key(api_key)
+
+    # Act
+    revoke_result = await app_registry.set_api_key_active(row.key_id, False)
+    mock_db_session.exec.return_value.first.return_value = None # The query filters on is_active
+    result = await app_registry.validate_api_key(api_key)
+
+    # Assert
+    assert revoke_result["success"] is True
+    assert row.is_active is False
+    assert result["success"] is False
+
 # TODO: Add tests for get_sandbox_requirements (Issue #XX)
-# TODO: Add tests for get_component_definition (Issue #XX)
 # TODO: Add tests for get_app_configuration_value (Issue #XX)
-# TODO: Add tests for validate_api_key (Issue #XX) - requires mocking db_session more extensively
 # TODO: Add tests for get_application_permissions (Issue #XX)
 # TODO: Add tests for get_user_permissions_for_app (Issue #XX)
@@ -0,0 +1,60 @@
+import prometheus_client
+import pytest
+
+from backend.src.core.metric_collector.cardinality import OVERFLOW_LABEL_VALUE, CardinalityGuard
+from backend.src.core.metric_collector.metric_handles import MetricHandle
+
+
+@pytest.fixture
+def registry():
+    """Fixture providing an isolated Prometheus registry."""
+    return prometheus_client.CollectorRegistry()
+
+def guarded_counter(registry, max_series):
+    counter = prometheus_client.Counter("requests", "Requests", ["app_id", "component_id"], registry=registry)
+    guard = CardinalityGuard("requests", "counter", counter, ("app_id", "component_id"), max_series)
+    return MetricHandle("requests", "counter", counter, ("app_id", "component_id"), guard=guard), guard
+
+def test_new_label_sets_overflow_beyond_limit(registry):
+    """Test that label sets beyond max_series are recorded under the __other__ series."""
+    # Arrange
+    handle, guard = guarded_counter(registry, max_series=2)
+
+    # Act
+    for component_id in ("a", "b", "c", "d"):
+        handle.bind("app1", component_id).inc()
+    handle.bind("app1", "a").inc() # Known series still pass through
+
+    # Assert
+    assert registry.get_sample_value("requests_total", {"app_id": "app1", "component_id": "a"}) == 2
+    assert registry.get_sample_value("requests_total", {"app_id": OVERFLOW_LABEL_VALUE, "component_id": OVERFLOW_LABEL_VALUE}) == 2
+    assert registry.get_sample_value("requests_total", {"app_id": "app1", "component_id": "c"}) is None
+    assert guard.get_stats() == {"series": 3, "max_series": 2, "overflowed": 2, "expired": 0}
+
+def test_unchanged_series_expire_and_free_capacity(registry):
+    """Test that series whose value stopped changing are removed after the TTL, and active ones are kept."""
+    # Arrange
+    handle, guard = guarded_counter(registry, max_series=2)
+    handle.bind("app1", "idle").inc()
+    handle.bind("app1", "busy").inc()
+    guard.expire(ttl_seconds=10, now=1000.0) # First sweep records the current values
+
+    # Act
+    handle.bind("app1", "busy").inc()
+    removed = guard.expire(ttl_seconds=10, now=1011.0)
+    handle.clear()
+    handle.bind("app1", "new").inc()
+
+    # Assert
+    assert removed == [("app1", "idle")]
+    assert registry.get_sample_value("requests_total", {"app_id": "app1", "component_id": "idle"}) is None
+    assert registry.get_sample_value("requests_total", {"app_id": "app1", "component_id": "new"}) == 1 # Capacity was freed
+    assert guard.get_stats()["expired"] == 1
+
+def test_gauges_never_expire(registry):
+    """Test that gauge series are kept however long their value stays the same."""
+    gauge = prometheus_client.Gauge("depth", "Depth", ["app_id"], registry=registry)
+    guard = CardinalityGuard("depth", "gauge", gauge, ("app_id",))
+    MetricHandle("depth", "gauge", gauge, ("app_id",), guard=guard).bind("app1").set(3)
+    assert guard.expire(ttl_seconds=1, now=10**9) == []
+    assert len(guard) == 1
@@ -0,0 +1,31 @@
+import os
+from sqlalchemy import create_engine, inspect, text
+from sqlmodel import SQLModel, Session, select
+
+os.environ.setdefault("DATABASE_URL", "sqlite://") # database.py requires it at import time
+
+from backend.src.db.database import upgrade_api_key_table
+from backend.src.db.models import ApiKey
+
+
+def test_upgrade_adds_key_id_and_deactivates_old_format_keys():
+    """Test that an apikey table from before key_id gets the column, placeholder IDs and inactive legacy keys."""
+    # Arrange
+    engine = create_engine("sqlite://")
+    with engine.begin() as connection:
+        connection.execute(text("CREATE TABLE apikey (id INTEGER PRIMARY KEY, app_id VARCHAR NOT NULL, hashed_key VARCHAR NOT NULL, "
+                                "user_id VARCHAR, permissions VARCHAR NOT NULL, is_active BOOLEAN NOT NULL)"))
+        connection.execute(text("INSERT INTO apikey (app_id, hashed_key, permissions, is_active) VALUES ('app1', 'h', '', 1), ('app2', 'h', '', 1)"))
+    SQLModel.metadata.create_all(engine) # Leaves the existing table as it is
+
+    # Act
+    upgrade_api_key_table(engine)
+    upgrade_api_key_table(engine) # A second startup finds nothing to do
+
+    # Assert
+    assert any(index["name"] == "ix_apikey_key_id" and index["unique"] for index in inspect(engine).get_indexes("apikey"))
+    with Session(engine) as session:
+        session.add(ApiKey(key_id="abc123", app_id="app3", hashed_key="h", permissions=""))
+        session.commit()
+        keys = {key.app_id: (key.key_id, key.is_active) for key in session.exec(select(ApiKey))}
+    assert keys == {"app1": ("legacy_1", False), "app2": ("legacy_2", False), "app3": ("abc123", True)}
@@ -0,0 +1,67 @@
+from backend.src.core.state_manager.definition_file_cache import DefinitionFileCache
+
+
+def test_hit_requires_matching_signature():
+    """Test that an entry is served only while the file's stat signature is unchanged."""
+    # Arrange
+    cache = DefinitionFileCache()
+    cache.put("app", "config/app.yaml", (1, 10, 5), "hello")
+
+    # Act
+    hit = cache.get("app", "config/app.yaml", (1, 10, 5))
+    stale = cache.get("app", "config/app.yaml", (2, 10, 5))
+
+    # Assert
+    assert hit == "hello"
+    assert stale is None
+    stats = cache.get_stats()
+    assert (stats["hits"], stats["misses"], stats["stale"], stats["entries"], stats["bytes"]) == (1, 1, 1, 0, 0)
+    assert stats["hit_ratio"] == 0.5
+
+def test_lru_eviction_by_entries_and_bytes():
+    """Test that least recently used files are evicted to respect both the entry and the byte limit."""
+    # Arrange
+    cache = DefinitionFileCache(max_entries=2, max_bytes=10)
+    cache.put("app", "a", (1, 1, 4), "aaaa")
+    cache.put("app", "b", (1, 2, 4), "bbbb")
+    cache.get("app", "a", (1, 1, 4)) # "b" becomes least recently used
+
+    # Act
+    cache.put("app", "c", (1, 3, 4), "cccc")
+
+    # Assert
+    assert cache.get("app", "b", (1, 2, 4)) is None
+    assert cache.get("app", "a", (1, 1, 4)) == "aaaa"
+    assert cache.get_stats()["evictions"] == 1
+
+    # Act: a larger file pushes out entries until the byte limit holds
+    cache.put("app", "d", (1, 4, 8), "dddddddd")
+
+    # Assert
+    stats = cache.get_stats()
+    assert stats["entries"] == 1
+    assert stats["bytes"] == 8
+
+def test_oversized_files_are_not_cached():
+    """Test that files above max_file_bytes are never cached."""
+    cache = DefinitionFileCache(max_file_bytes=3)
+    cache.put("app", "big", (1, 1, 4), "abcd")
+    assert cache.get_stats()["entries"] == 0
+
+def test_invalidate_single_file_and_whole_app():
+    """Test invalidation of one file and of every file of an application."""
+    # Arrange
+    cache = DefinitionFileCache()
+    for path in ("a", "b"):
+        cache.put("app1", path, (1, 1, 1), "x")
+    cache.put("app2", "a", (1, 1, 1), "x")
+
+    # Act
+    cache.invalidate("app1", "a")
+    single = cache.get_stats()["entries"]
+    cache.invalidate("app1")
+
+    # Assert
+    assert single == 2
+    assert cache.get_stats()["entries"] == 1
+    assert cache.get("app2", "a", (1, 1, 1)) == "x"
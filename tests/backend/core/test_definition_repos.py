@@ -0,0 +1,70 @@
+import asyncio
+import git
+import pytest
+from unittest.mock import patch
+
+from backend.src.core.state_manager.definition_repos import AppWriteLocks, RepoHandleCache
+
+
+@pytest.fixture
+def repos_root(tmp_path):
+    """Fixture creating three empty application repositories."""
+    for app_id in ("app1", "app2", "app3"):
+        git.Repo.init(tmp_path / app_id)
+    return tmp_path
+
+def test_handles_are_reused_and_lru_evicted(repos_root):
+    """Test that handles are cached, and the least recently used one is closed beyond the limit."""
+    # Arrange
+    cache = RepoHandleCache(str(repos_root), max_open_repos=2)
+    first = cache.get("app1")
+
+    # Act
+    with patch.object(first, "close") as close:
+        assert cache.get("app1") is first
+        cache.get("app2")
+        cache.get("app3") # Evicts app1
+
+    # Assert
+    close.assert_called_once()
+    assert cache.get_stats() == {"open": 2, "hits": 1, "misses": 3, "evictions": 1, "leased": 0}
+    with pytest.raises(FileNotFoundError):
+        cache.get("missing")
+
+def test_handle_evicted_while_leased_is_closed_on_release(repos_root):
+    """Test that a handle evicted while leased stays open until its lease ends."""
+    # Arrange
+    cache = RepoHandleCache(str(repos_root), max_open_repos=1)
+
+    # Act / Assert
+    with patch.object(git.Repo, "close") as close:
+        with cache.lease("app1"):
+            cache.get("app2") # Evicts the leased app1 handle
+            assert close.call_count == 0
+        assert close.call_count == 1
+    assert cache.get_stats()["leased"] == 0
+
+@pytest.mark.asyncio
+async def test_write_locks_serialize_per_app_and_record_contention():
+    """Test that one app's writers run one at a time, other apps are not blocked, and waits are counted."""
+    # Arrange
+    locks = AppWriteLocks()
+    active = {"app1": 0, "app2": 0}
+    peak = {"app1": 0, "app2": 0}
+
+    async def write(app_id):
+        async with locks.hold(app_id):
+            active[app_id] += 1
+            peak[app_id] = max(peak[app_id], active[app_id])
+            await asyncio.sleep(0.01)
+            active[app_id] -= 1
+
+    # Act
+    await asyncio.gather(write("app1"), write("app1"), write("app1"), write("app2"))
+
+    # Assert
+    assert peak == {"app1": 1, "app2": 1}
+    stats = locks.get_stats()
+    assert (stats["acquisitions"], stats["contended"], stats["active_apps"]) == (4, 2, 0)
+    assert [app["app_id"] for app in stats["hot_apps"]] == ["app1"]
+    assert stats["hot_apps"][0]["wait_seconds_total"] > 0
@@ -0,0 +1,124 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+
+from backend.src.core.state_manager.definition_writes import (
+    DefinitionTransaction,
+    DefinitionWriteCoalescer,
+    batch_commit_message,
+)
+
+
+@pytest.mark.asyncio
+async def test_writes_within_window_share_one_commit():
+    """Test that concurrent writes for one app are committed together and every caller gets the commit SHA."""
+    # Arrange
+    commit_paths = AsyncMock(return_value="abc123")
+    coalescer = DefinitionWriteCoalescer(commit_paths, window_seconds=0.01)
+
+    # Act
+    shas = await asyncio.gather(
+        coalescer.submit("app", "a.yaml", "Update a"),
+        coalescer.submit("app", "b.yaml", "Update b"),
+        coalescer.submit("app", "a.yaml", "Update a"),
+    )
+
+    # Assert
+    assert shas == ["abc123"] * 3
+    commit_paths.assert_awaited_once_with("app", ["a.yaml", "b.yaml"], "Batch of 3 definition changes\n\n- Update a\n- Update b")
+    assert coalescer.get_stats() == {"writes": 3, "batches": 1, "pending_apps": 0, "writes_per_commit": 3.0}
+
+@pytest.mark.asyncio
+async def test_apps_are_batched_separately_and_full_batches_flush_early():
+    """Test that each app gets its own commit and a batch at max_batch_files does not wait for the window."""
+    # Arrange
+    commit_paths = AsyncMock(return_value="sha")
+    coalescer = DefinitionWriteCoalescer(commit_paths, window_seconds=60, max_batch_files=2)
+
+    # Act
+    await asyncio.wait_for(asyncio.gather(
+        coalescer.submit("app1", "a", "m"),
+        coalescer.submit("app1", "b", "m"),
+    ), timeout=1)
+    pending = asyncio.ensure_future(coalescer.submit("app2", "a", "m"))
+    await asyncio.sleep(0)
+    await coalescer.flush_all()
+    await pending
+
+    # Assert
+    assert [call.args[:2] for call in commit_paths.await_args_list] == [("app1", ["a", "b"]), ("app2", ["a"])]
+
+@pytest.mark.asyncio
+async def test_commit_failure_is_raised_to_every_writer():
+    """Test that a failed batch commit propagates to all callers in the batch."""
+    # Arrange
+    coalescer = DefinitionWriteCoalescer(AsyncMock(side_effect=OSError("index.lock exists")), window_seconds=0.01)
+
+    # Act
+    results = await asyncio.gather(coalescer.submit("app", "a", "m"), coalescer.submit("app", "b", "m"), return_exceptions=True)
+
+    # Assert
+    assert all(isinstance(result, OSError) for result in results)
+
+@pytest.mark.asyncio
+async def test_cancelled_flushing_writer_does_not_strand_the_batch():
+    """Test that cancelling the writer that filled the batch still commits it for the writers waiting on it."""
+    # Arrange
+    release = asyncio.Event()
+    async def commit_paths(app_id, paths, message):
+        await release.wait()
+        return "sha"
+    coalescer = DefinitionWriteCoalescer(commit_paths, window_seconds=60, max_batch_files=2)
+    waiting = asyncio.ensure_future(coalescer.submit("app", "a", "m"))
+    await asyncio.sleep(0)
+    flushing = asyncio.ensure_future(coalescer.submit("app", "b", "m")) # Fills the batch and flushes it
+    await asyncio.sleep(0)
+
+    # Act
+    flushing.cancel()
+    await asyncio.gather(flushing, return_exceptions=True)
+    release.set()
+
+    # Assert
+    assert await asyncio.wait_for(waiting, timeout=1) == "sha"
+    assert flushing.cancelled()
+
+def test_batch_commit_message_keeps_single_message():
+    """Test that identical messages are not summarized."""
+    assert batch_commit_message(["Update config", "Update config"]) == "Update config"
+
+@pytest.mark.asyncio
+async def test_transaction_stages_until_commit():
+    """Test that a transaction hands its last change per path to the StateManager once, then closes."""
+    # Arrange
+    state_manager = AsyncMock()
+    state_manager._apply_definition_changes.return_value = "sha1"
+    transaction = DefinitionTransaction(state_manager, "app")
+
+    # Act
+    transaction.set_file("config/./app.yaml", "v: 1")
+    transaction.set_file("workflows/old.yaml", "x")
+    transaction.delete_file("workflows/old.yaml")
+    sha = await transaction.commit("Rewrite")
+
+    # Assert
+    assert sha == "sha1"
+    state_manager._apply_definition_changes.assert_awaited_once_with("app", {"config/app.yaml": "v: 1", "workflows/old.yaml": None}, "Rewrite")
+    with pytest.raises(RuntimeError):
+        transaction.set_file("a", "b")
+
+@pytest.mark.asyncio
+async def test_transaction_context_rolls_back_on_error():
+    """Test that leaving an async with block through an exception discards staged changes."""
+    # Arrange
+    state_manager = AsyncMock()
+
+    # Act
+    with pytest.raises(ValueError):
+        async with DefinitionTransaction(state_manager, "app") as transaction:
+            transaction.set_file("a", "b")
+            raise ValueError("agent failed")
+
+    # Assert
+    assert transaction.changed_paths == []
+    state_manager._apply_definition_changes.assert_not_called()
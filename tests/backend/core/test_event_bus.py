@@ -0,0 +1,305 @@
+import asyncio
+import importlib
+import sys
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+# EventBus imports its interface from core.interfaces, where it has not been added yet; use the placeholder
+sys.modules.setdefault("core.interfaces.event_bus_interface", importlib.import_module("core.event_bus.event_bus_interface"))
+
+from core.shared.data_models.data_models import Event
+from backend.src.core.event_bus.event_bus import EventBus
+
+
+def make_event(event_type, payload=None):
+    return Event(event_type=event_type, timestamp="2024-01-01T00:00:00Z", payload=payload)
+
+def stream_entry(bus, entry_id, event):
+    """Encodes an event as a stream entry the way redis-py returns it (bytes keys and values)."""
+    fields = bus._encode_stream_entry(event, None)
+    return entry_id, {key.encode(): value.encode() if isinstance(value, str) else value for key, value in fields.items()}
+
+@pytest.fixture
+def bus():
+    """Fixture providing an in-memory EventBus. Tests close it to stop its workers."""
+    return EventBus()
+
+@pytest.fixture
+def stream():
+    """Fixture providing a mock Redis Streams backend."""
+    event_stream = MagicMock()
+    event_stream.config = {"claim_idle_seconds": 60.0, "max_unhandled_deliveries": 3, "max_in_flight": 100}
+    event_stream.delivery_counts = AsyncMock(return_value={})
+    event_stream.touch = AsyncMock()
+    event_stream.close = AsyncMock()
+    return event_stream
+
+@pytest.fixture
+def stream_bus(stream):
+    """Fixture providing an EventBus consuming from the mock stream backend. Tests close it to stop its workers."""
+    event_bus = EventBus()
+    event_bus._stream = stream
+    return event_bus
+
+async def wait_until(condition, timeout=1.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition() and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.005)
+
+@pytest.mark.asyncio
+async def test_publish_dispatches_to_every_matching_subscription(bus):
+    """Test that an event reaches exact and wildcard subscriptions alike, but not unrelated ones."""
+    # Arrange
+    received = {"exact": [], "single": [], "multi": [], "other": []}
+    async def exact(event): received["exact"].append(event.payload)
+    async def single(event): received["single"].append(event.payload)
+    def multi(event): received["multi"].append(event.payload) # Sync handlers are supported too
+    async def other(event): received["other"].append(event.payload)
+    await bus.subscribe("app.app1.done", exact)
+    await bus.subscribe("app.app1.*", single)
+    await bus.subscribe("app.#", multi)
+    await bus.subscribe("app.app2.#", other)
+
+    # Act
+    await bus.publish(make_event("app.app1.done", 1))
+    await wait_until(lambda: len(received["exact"]) + len(received["single"]) + len(received["multi"]) == 3)
+
+    # Assert
+    assert received == {"exact": [1], "single": [1], "multi": [1], "other": []}
+    stats = bus.get_event_stats()["app.app1.done"]
+    assert (stats["published"], stats["delivered"]) == (1, 3)
+    await bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_subscribe_checks_inter_app_permissions_once(bus):
+    """Test that subscriptions to another app's topics follow its permissions and the grant is cached."""
+    # Arrange
+    provider = AsyncMock(return_value={"success": True, "permissions": [
+        {"allowed_source_app_id": "app2", "allowed_events": ["orders:*"]},
+        {"allowed_source_app_id": "app3", "allowed_events": ["#"]},
+    ]})
+    bus.set_permission_provider(provider)
+    async def handler(event): pass
+
+    # Act
+    allowed = await bus.subscribe("app.app1.orders:created", handler, app_id="app2")
+    denied = await bus.subscribe("app.app1.payments:#", handler, app_id="app2")
+    own = await bus.subscribe("app.app2.#", handler, app_id="app2")
+    spanning = await bus.subscribe("app.*.orders:created", handler, app_id="app2")
+
+    # Assert
+    assert allowed == {"success": True}
+    assert denied["success"] is False
+    assert own == {"success": True} # An app's own namespace needs no permission
+    assert spanning["success"] is False # Would include every app's topics
+    provider.assert_awaited_once_with("app1")
+    await bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_invalidate_permissions_drops_cached_grants(bus):
+    """Test that a revoked permission applies to new subscriptions once the cache is invalidated."""
+    # Arrange
+    provider = AsyncMock(return_value={"permissions": [{"allowed_source_app_id": "app2", "allowed_events": ["#"]}]})
+    bus.set_permission_provider(provider)
+    async def handler(event): pass
+    await bus.subscribe("app.app1.a", handler, app_id="app2")
+    provider.return_value = {"permissions": []}
+
+    # Act
+    cached = await bus.subscribe("app.app1.b", handler, app_id="app2")
+    bus.invalidate_permissions("app1")
+    revoked = await bus.subscribe("app.app1.c", handler, app_id="app2")
+
+    # Assert
+    assert cached == {"success": True}
+    assert revoked["success"] is False
+    assert provider.await_count == 2
+    await bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_permission_provider_errors_deny_without_caching(bus):
+    """Test that a failing permission lookup denies the subscription and is retried next time."""
+    # Arrange
+    provider = AsyncMock(side_effect=[RuntimeError("registry down"),
+                                      {"permissions": [{"allowed_source_app_id": "app2", "allowed_events": ["#"]}]}])
+    bus.set_permission_provider(provider)
+    async def handler(event): pass
+
+    # Act
+    first = await bus.subscribe("app.app1.a", handler, app_id="app2")
+    second = await bus.subscribe("app.app1.a", handler, app_id="app2")
+
+    # Assert
+    assert first["success"] is False
+    assert second == {"success": True}
+    await bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_stream_entry_is_acked_after_every_subscription_handled_it(stream_bus, stream):
+    """Test that a stream entry is acked once, after the last of its matching subscriptions finished."""
+    # Arrange
+    release = asyncio.Event()
+    handled = []
+    async def fast(event): handled.append("fast")
+    async def slow(event):
+        await release.wait()
+        handled.append("slow")
+    await stream_bus.subscribe("orders:created", fast)
+    await stream_bus.subscribe("orders:*", slow)
+
+    # Act
+    await stream_bus._consume_stream_entries([stream_entry(stream_bus, b"1-0", make_event("orders:created"))])
+    await wait_until(lambda: handled == ["fast"])
+    acked_early = stream.ack.call_count
+    release.set()
+    await wait_until(lambda: stream.ack.called)
+
+    # Assert
+    assert acked_early == 0
+    stream.ack.assert_called_once_with(b"1-0")
+    assert stream_bus._stream_entries_in_flight == {}
+    await stream_bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_stream_entries_without_local_subscribers_stay_pending(stream_bus, stream):
+    """Test that entries no local subscription matches are not acked, unless delivered too often already."""
+    # Arrange
+    stream.delivery_counts.return_value = {b"2-0": 3, b"3-0": 1}
+    entries = [stream_entry(stream_bus, b"2-0", make_event("orders:created")), stream_entry(stream_bus, b"3-0", make_event("orders:created"))]
+
+    # Act
+    await stream_bus._consume_stream_entries(entries) # Newly read: left for other replicas
+    read_acks = stream.ack.call_count
+    await stream_bus._consume_stream_entries(entries, claimed=True)
+
+    # Assert
+    assert read_acks == 0
+    stream.delivery_counts.assert_awaited_once_with([b"2-0", b"3-0"])
+    stream.ack.assert_called_once_with(b"2-0")
+    await stream_bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_failed_handler_leaves_stream_entry_pending_for_retry(stream_bus, stream):
+    """Test that an entry whose handler raised is not acked, so it is claimed and handled again."""
+    # Arrange
+    calls = []
+    async def flaky(event):
+        calls.append(event.payload)
+        if len(calls) == 1:
+            raise RuntimeError("downstream unavailable")
+    await stream_bus.subscribe("orders:created", flaky)
+    entry = stream_entry(stream_bus, b"1-0", make_event("orders:created", 1))
+    stream.delivery_counts.return_value = {b"1-0": 2}
+
+    # Act
+    await stream_bus._consume_stream_entries([entry])
+    await wait_until(lambda: len(calls) == 1 and not stream_bus._stream_entries_in_flight)
+    acked_after_failure = stream.ack.call_count
+    await stream_bus._consume_stream_entries([entry], claimed=True) # Claimed again after claim_idle_seconds
+    await wait_until(lambda: stream.ack.called)
+
+    # Assert
+    assert acked_after_failure == 0
+    assert calls == [1, 1]
+    stream.ack.assert_called_once_with(b"1-0")
+    assert stream_bus.get_event_stats()["orders:created"]["handler_errors"] == 1
+    await stream_bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_stream_entry_is_given_up_after_max_deliveries(stream_bus, stream):
+    """Test that a claimed entry delivered max_unhandled_deliveries times is acked without calling its handler again."""
+    # Arrange
+    handler = AsyncMock()
+    handler.__name__ = "handler"
+    await stream_bus.subscribe("orders:created", handler)
+    stream.delivery_counts.return_value = {b"1-0": 3}
+
+    # Act
+    await stream_bus._consume_stream_entries([stream_entry(stream_bus, b"1-0", make_event("orders:created"))], claimed=True)
+    await asyncio.sleep(0.01)
+
+    # Assert
+    handler.assert_not_called()
+    stream.ack.assert_called_once_with(b"1-0")
+    assert stream_bus.get_event_stats()["orders:created"]["dropped"] == 1
+    await stream_bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_dropped_stream_event_is_left_for_redelivery(stream_bus, stream):
+    """Test that an event dropped by a full queue is never acked, and no longer counted as in flight."""
+    # Arrange
+    stream_bus._config["queue_size"] = 1
+    release = asyncio.Event()
+    async def handler(event): await release.wait()
+    await stream_bus.subscribe("orders:created", handler)
+    entries = [stream_entry(stream_bus, f"{i}-0".encode(), make_event("orders:created", i)) for i in range(3)]
+
+    # Act
+    await stream_bus._consume_stream_entries(entries[:1])
+    await wait_until(lambda: not len(stream_bus._subscriptions["orders:created"][0].queue)) # The worker holds entry 0
+    await stream_bus._consume_stream_entries(entries[1:]) # Entry 2 pushes entry 1 out of the queue
+    in_flight = set(stream_bus._stream_entries_in_flight)
+    release.set()
+    await wait_until(lambda: stream.ack.call_count == 2)
+
+    # Assert
+    assert in_flight == {b"0-0", b"2-0"}
+    assert [call.args[0] for call in stream.ack.call_args_list] == [b"0-0", b"2-0"]
+    await stream_bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_long_running_stream_entries_are_refreshed_not_reclaimed(stream_bus, stream):
+    """Test that entries still being handled get their idle time reset instead of being dropped from tracking."""
+    # Arrange
+    release = asyncio.Event()
+    async def handler(event): await release.wait()
+    await stream_bus.subscribe("orders:created", handler)
+    await stream_bus._consume_stream_entries([stream_entry(stream_bus, b"1-0", make_event("orders:created"))])
+    stream_bus._stream_entries_in_flight[b"1-0"].idle_since -= 45 # Handled for longer than half of claim_idle_seconds
+
+    # Act
+    await stream_bus._refresh_stream_deliveries()
+    await stream_bus._consume_stream_entries([stream_entry(stream_bus, b"1-0", make_event("orders:created"))], claimed=True)
+    release.set()
+    await wait_until(lambda: stream.ack.called)
+
+    # Assert
+    stream.touch.assert_awaited_once_with([b"1-0"])
+    stream.ack.assert_called_once_with(b"1-0") # Handled once, not dispatched again
+    await stream_bus.close(drain_timeout=0)
+
+@pytest.mark.asyncio
+async def test_close_drains_queued_events_before_stopping_workers():
+    """Test that close() lets the workers handle queued events and then stops them."""
+    # Arrange
+    bus = EventBus()
+    handled = []
+    async def handler(event):
+        await asyncio.sleep(0.001)
+        handled.append(event.payload)
+    await bus.subscribe("orders:created", handler)
+    for i in range(5):
+        await bus.publish(make_event("orders:created", i))
+
+    # Act
+    await bus.close(drain_timeout=1.0)
+
+    # Assert
+    assert handled == [0, 1, 2, 3, 4]
+    assert bus.get_subscription_stats() == {}
+
+@pytest.mark.asyncio
+async def test_close_gives_up_after_drain_timeout():
+    """Test that close() stops workers stuck on a handler once the drain timeout passed."""
+    # Arrange
+    bus = EventBus()
+    async def stuck(event): await asyncio.Event().wait()
+    await bus.subscribe("orders:created", stuck)
+    await bus.publish(make_event("orders:created"))
+    await bus.publish(make_event("orders:created"))
+
+    # Act
+    await asyncio.wait_for(bus.close(drain_timeout=0.05), 1.0)
+
+    # Assert
+    assert bus.get_subscription_stats() == {}
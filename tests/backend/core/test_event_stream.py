@@ -0,0 +1,203 @@
+import asyncio
+import pytest
+import redis
+from unittest.mock import AsyncMock, MagicMock # For mocking the async Redis client
+
+from backend.src.core.event_bus.event_stream import RedisEventStream
+
+
+@pytest.fixture
+def client():
+    """Fixture providing a mock asyncio Redis client with a mock pipeline."""
+    redis_client = AsyncMock()
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(return_value=[b"1-0", b"1-1"])
+    redis_client.pipeline = MagicMock(return_value=pipe)
+    return redis_client
+
+@pytest.fixture
+def stream(client):
+    """Fixture providing a RedisEventStream on the mock client."""
+    return RedisEventStream(client, {"enabled": True, "consumer_name": "replica-1", "publish_batch_size": 2, "ack_batch_size": 2})
+
+def test_from_config_is_disabled_by_default():
+    assert RedisEventStream.from_config() is None
+
+@pytest.mark.asyncio
+async def test_flush_outbox_pipelines_xadds_with_approximate_maxlen(stream, client):
+    """Test that buffered entries are written in pipelined batches, trimmed to the approximate MAXLEN."""
+    # Arrange
+    for i in range(3):
+        stream.append({"type": "trigger:new_data", "data": str(i)})
+
+    # Act
+    await stream.flush_outbox()
+
+    # Assert
+    pipe = client.pipeline.return_value
+    assert pipe.execute.await_count == 2 # Batches of 2 and 1
+    assert pipe.xadd.call_count == 3
+    pipe.xadd.assert_called_with("nexus:events", {"type": "trigger:new_data", "data": "2"}, maxlen=1000000, approximate=True)
+    assert (await stream.get_stats())["published"] == 3
+
+@pytest.mark.asyncio
+async def test_failed_publish_keeps_entries_buffered_in_order(stream, client):
+    """Test that entries stay buffered, in order, when Redis is unavailable."""
+    # Arrange
+    client.pipeline.return_value.execute.side_effect = redis.exceptions.ConnectionError("down")
+    stream.append({"data": "a"})
+    stream.append({"data": "b"})
+
+    # Act
+    with pytest.raises(redis.exceptions.RedisError):
+        await stream.flush_outbox()
+
+    # Assert
+    assert list(stream._outbox) == [{"data": "a"}, {"data": "b"}]
+    assert stream._stats["publish_errors"] == 1
+
+@pytest.mark.asyncio
+async def test_read_creates_group_once_and_reads_new_entries(stream, client):
+    """Test that read() creates the consumer group (tolerating BUSYGROUP) and reads with XREADGROUP ">"."""
+    # Arrange
+    client.xgroup_create.side_effect = redis.exceptions.ResponseError("BUSYGROUP Consumer Group name already exists")
+    client.xreadgroup.return_value = [[b"nexus:events", [(b"1-0", {b"type": b"a"}), (b"1-1", {b"type": b"b"})]]]
+
+    # Act
+    entries = await stream.read()
+    await stream.read()
+
+    # Assert
+    assert [entry_id for entry_id, _ in entries] == [b"1-0", b"1-1"]
+    client.xgroup_create.assert_awaited_once_with("nexus:events", "nexus-backend", id="$", mkstream=True)
+    client.xreadgroup.assert_awaited_with("nexus-backend", "replica-1", {"nexus:events": ">"}, count=100, block=1000)
+
+@pytest.mark.asyncio
+async def test_acks_are_batched_and_retried_after_errors(stream, client):
+    """Test that acknowledgements are sent in batches and kept for the next flush when XACK fails."""
+    # Arrange
+    for entry_id in (b"1-0", b"1-1", b"1-2"):
+        stream.ack(entry_id)
+    client.xack.side_effect = [2, redis.exceptions.ConnectionError("down"), 1]
+
+    # Act
+    await stream.flush_acks()
+    remaining = list(stream._acks)
+    await stream.flush_acks()
+
+    # Assert
+    assert remaining == [b"1-2"]
+    assert [call.args for call in client.xack.await_args_list] == [
+        ("nexus:events", "nexus-backend", b"1-0", b"1-1"),
+        ("nexus:events", "nexus-backend", b"1-2"),
+        ("nexus:events", "nexus-backend", b"1-2"),
+    ]
+    assert stream._stats["acked"] == 3
+
+@pytest.mark.asyncio
+async def test_claim_stale_skips_deleted_entries(stream, client):
+    """Test that entries idle past claim_idle_seconds are claimed, skipping entries trimmed meanwhile."""
+    # Arrange
+    client.xautoclaim.return_value = [b"0-0", [(b"1-0", {b"type": b"a"}), (b"1-1", None)], []]
+
+    # Act
+    entries = await stream.claim_stale()
+
+    # Assert
+    assert entries == [(b"1-0", {b"type": b"a"})]
+    client.xautoclaim.assert_awaited_once_with("nexus:events", "nexus-backend", "replica-1", min_idle_time=60000, start_id="0-0", count=100)
+
+@pytest.mark.asyncio
+async def test_trim_removes_entries_older_than_retention(stream, client):
+    """Test that trim() applies the time-based retention with XTRIM MINID."""
+    # Arrange
+    client.xtrim.return_value = 5
+
+    # Act
+    removed = await stream.trim(now=1_000_000.0)
+
+    # Assert
+    assert removed == 5
+    client.xtrim.assert_awaited_once_with("nexus:events", minid=f"{(1_000_000 - 7 * 24 * 3600) * 1000}-0", approximate=True)
+
+@pytest.mark.asyncio
+async def test_claim_stale_resumes_from_the_returned_cursor(stream, client):
+    """Test that consecutive claims continue the scan of the pending entries instead of restarting it."""
+    # Arrange
+    client.xautoclaim.side_effect = [[b"5-0", [(b"1-0", {b"type": b"a"})], []], [b"0-0", [], []], [b"0-0", [], []]]
+
+    # Act
+    await stream.claim_stale()
+    await stream.claim_stale()
+    await stream.claim_stale()
+
+    # Assert
+    assert [call.kwargs["start_id"] for call in client.xautoclaim.await_args_list] == ["0-0", b"5-0", b"0-0"]
+
+@pytest.mark.asyncio
+async def test_touch_resets_idle_time_without_counting_a_delivery(stream, client):
+    """Test that touch() re-claims entries for this consumer with XCLAIM JUSTID."""
+    # Act
+    await stream.touch([b"1-0", b"1-1"])
+
+    # Assert
+    client.xclaim.assert_awaited_once_with("nexus:events", "nexus-backend", "replica-1", 0, [b"1-0", b"1-1"], justid=True)
+
+@pytest.mark.asyncio
+async def test_delivery_counts_skips_entries_no_longer_pending(stream, client):
+    """Test that delivery counts are read with one pipelined XPENDING per entry."""
+    # Arrange
+    pipe = client.pipeline.return_value
+    pipe.execute.return_value = [[{"message_id": b"1-0", "times_delivered": 4}], []]
+
+    # Act
+    counts = await stream.delivery_counts([b"1-0", b"1-1"])
+
+    # Assert
+    assert counts == {b"1-0": 4}
+    pipe.xpending_range.assert_called_with("nexus:events", "nexus-backend", min=b"1-1", max=b"1-1", count=1)
+
+@pytest.mark.asyncio
+async def test_close_lets_the_publisher_finish_its_batch(stream, client):
+    """Test that close() waits for a batch the publisher is writing instead of cancelling it, then writes the rest."""
+    # Arrange
+    release = asyncio.Event()
+    written = []
+    async def execute():
+        await release.wait()
+        written.append(pipe.xadd.call_count)
+        return []
+    pipe = client.pipeline.return_value
+    pipe.execute = AsyncMock(side_effect=execute)
+    stream.start()
+    for i in range(2):
+        stream.append({"data": str(i)}) # A full batch wakes the publisher
+    while not pipe.execute.await_count:
+        await asyncio.sleep(0.001)
+    stream.append({"data": "2"})
+
+    # Act
+    closing = asyncio.ensure_future(stream.close())
+    await asyncio.sleep(0.01)
+    release.set()
+    await asyncio.wait_for(closing, 1)
+
+    # Assert
+    assert pipe.xadd.call_count == 3
+    assert not stream._outbox
+    assert stream._stats["published"] == 3
+
+@pytest.mark.asyncio
+async def test_cancelled_flush_keeps_the_batch_buffered(stream, client):
+    """Test that entries of a batch whose write was cancelled are put back in the outbox, in order."""
+    # Arrange
+    client.pipeline.return_value.execute = AsyncMock(side_effect=asyncio.CancelledError())
+    stream.append({"data": "a"})
+    stream.append({"data": "b"})
+
+    # Act
+    with pytest.raises(asyncio.CancelledError):
+        await stream.flush_outbox()
+
+    # Assert
+    assert list(stream._outbox) == [{"data": "a"}, {"data": "b"}]
@@ -0,0 +1,77 @@
+import git
+import pytest
+
+from backend.src.core.state_manager.git_object_reader import GitObjectReader
+
+
+@pytest.fixture
+def app_repo(tmp_path):
+    """Fixture creating an app repository with two commits, packed with git gc."""
+    repo = git.Repo.init(tmp_path / "test_app_001")
+    with repo.config_writer() as config:
+        config.set_value("user", "name", "Test")
+        config.set_value("user", "email", "test@example.com")
+    app_path = tmp_path / "test_app_001"
+    (app_path / "config").mkdir()
+    (app_path / "config" / "app.yaml").write_text("version: 1\n")
+    (app_path / "README.md").write_text("readme\n")
+    repo.index.add(["config/app.yaml", "README.md"])
+    repo.index.commit("First")
+    (app_path / "config" / "app.yaml").write_text("version: 2\n")
+    repo.index.add(["config/app.yaml"])
+    repo.index.commit("Second")
+    repo.git.gc() # Move objects into a pack
+    return repo
+
+def test_reads_file_at_revision(app_repo, tmp_path):
+    """Test that files are read from the object store at any revision, independent of the working tree."""
+    # Arrange
+    reader = GitObjectReader(str(tmp_path))
+    (tmp_path / "test_app_001" / "config" / "app.yaml").write_text("uncommitted\n")
+
+    # Act
+    head = reader.read_file("test_app_001", "config/app.yaml", "HEAD")
+    previous = reader.read_file("test_app_001", "./config/app.yaml", "HEAD~1")
+
+    # Assert
+    assert head == ("version: 2\n", app_repo.head.commit.hexsha)
+    assert previous[0] == "version: 1\n"
+    assert reader.read_file("test_app_001", "config/missing.yaml", "HEAD") is None
+    assert reader.read_file("test_app_001", "config", "HEAD") is None # A directory is not a file
+
+def test_blob_cache_hits(app_repo, tmp_path):
+    """Test that repeated reads of a blob are served from the cache."""
+    # Arrange
+    reader = GitObjectReader(str(tmp_path))
+
+    # Act
+    for _ in range(3):
+        reader.read_file("test_app_001", "README.md", "HEAD")
+    reader.read_file("test_app_001", "README.md", "HEAD~1") # Same blob in the older commit
+
+    # Assert
+    stats = reader.get_stats()
+    assert (stats["blob_hits"], stats["blob_misses"], stats["blobs"]) == (3, 1, 1)
+
+def test_list_directory_and_history(app_repo, tmp_path):
+    """Test directory listing at a revision and the history of a file."""
+    # Arrange
+    reader = GitObjectReader(str(tmp_path))
+
+    # Act
+    root = reader.list_directory("test_app_001", ".", "HEAD")
+    history = reader.get_file_history("test_app_001", "config/app.yaml")
+    readme_history = reader.get_file_history("test_app_001", "README.md")
+
+    # Assert
+    assert sorted(root) == [("README.md", "README.md", False, 7), ("config", "config", True, None)]
+    assert [commit.message for commit in history] == ["Second", "First"]
+    assert [commit.message for commit in readme_history] == ["First"]
+
+def test_unknown_revision_and_app(app_repo, tmp_path):
+    """Test that unknown revisions raise ValueError and unknown apps FileNotFoundError."""
+    reader = GitObjectReader(str(tmp_path))
+    with pytest.raises(ValueError):
+        reader.read_file("test_app_001", "README.md", "does-not-exist")
+    with pytest.raises(FileNotFoundError):
+        reader.read_file("other_app", "README.md", "HEAD")
@@ -0,0 +1,59 @@
+import logging
+from unittest.mock import patch
+
+from backend.src.core.logging_service.log_limits import LogLimiter
+
+
+def test_app_and_component_buckets_limit_bursts():
+    """Test that a component cannot exceed its burst and that other components of the app still log."""
+    # Arrange
+    limiter = LogLimiter(app_burst=5, app_rate_per_second=0.0, component_burst=3, component_rate_per_second=0.0)
+
+    # Act
+    chatty = [limiter.admit_application(logging.INFO, "app1", "llm") for _ in range(4)]
+    others = [limiter.admit_application(logging.INFO, "app1", "parser") for _ in range(3)]
+
+    # Assert
+    assert chatty == [True, True, True, False]
+    assert others == [True, True, False] # The app's 5 tokens are used up
+    stats = limiter.get_stats()
+    assert stats["rate_limited_component"] == 1 and stats["rate_limited_app"] == 1
+    assert stats["top_suppressed_apps"] == {"app1": 2}
+
+def test_buckets_refill_over_time_and_overrides_apply():
+    """Test refill at the configured rate and a per-app override."""
+    # Arrange
+    limiter = LogLimiter(app_burst=1, app_rate_per_second=1.0, app_overrides={"vip": {"burst": 3, "rate_per_second": 1.0}})
+
+    with patch("backend.src.core.logging_service.log_limits.time.monotonic", side_effect=[0.0, 0.1, 0.1, 1.2]):
+        # Act
+        first = limiter.admit_application(logging.INFO, "app1", "c")
+        second = limiter.admit_application(logging.INFO, "app1", "c")
+        third = limiter.admit_application(logging.INFO, "app1", "c")
+        after_refill = limiter.admit_application(logging.INFO, "app1", "c")
+
+    # Assert
+    assert (first, second, third, after_refill) == (True, False, False, True)
+    assert all(limiter.admit_application(logging.INFO, "vip", "c") for _ in range(3))
+
+def test_errors_bypass_limits_and_sampling():
+    """Test that messages at or above bypass_level are always kept."""
+    limiter = LogLimiter(app_burst=0, trace_sample_rate=0.0)
+    assert not limiter.admit_application(logging.INFO, "app1", "c", "trace-1")
+    assert limiter.admit_application(logging.ERROR, "app1", "c", "trace-1")
+    assert limiter.admit_framework(logging.CRITICAL, "trace-1")
+    assert limiter.get_stats()["bypassed"] == 2
+
+def test_trace_sampling_is_deterministic_per_trace():
+    """Test that a trace is either kept or dropped as a whole, at roughly the configured rate."""
+    # Arrange
+    limiter = LogLimiter(trace_sample_rate=0.25)
+    trace_ids = [f"trace-{i}" for i in range(2000)]
+
+    # Act
+    decisions = {trace_id: limiter.admit_framework(logging.INFO, trace_id) for trace_id in trace_ids}
+
+    # Assert
+    assert all(limiter.admit_application(logging.INFO, "app1", "c", trace_id) == kept for trace_id, kept in list(decisions.items())[:50])
+    assert 0.2 < sum(decisions.values()) / len(trace_ids) < 0.3
+    assert limiter.admit_framework(logging.INFO, None) # Messages without a trace are not sampled
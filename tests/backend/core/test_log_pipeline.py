@@ -0,0 +1,112 @@
+import threading
+import pytest
+
+from backend.src.core.logging_service.log_pipeline import AsyncLogPipeline
+
+
+def make_pipeline(written, **kwargs):
+    """Builds a pipeline whose writer only runs when woken (flush/close or a full batch)."""
+    kwargs.setdefault("flush_interval_seconds", 60.0)
+    return AsyncLogPipeline(written.extend, **kwargs)
+
+def test_records_are_written_in_batches_and_order():
+    """Test that the writer drains the buffer in order, batch_size records per write."""
+    # Arrange
+    batches = []
+    pipeline = AsyncLogPipeline(batches.append, capacity=100, batch_size=4, flush_interval_seconds=60.0)
+
+    # Act
+    for i in range(10):
+        pipeline.submit(i)
+    pipeline.flush(timeout=5)
+    pipeline.close()
+
+    # Assert
+    assert [record for batch in batches for record in batch] == list(range(10))
+    assert max(len(batch) for batch in batches) <= 4
+    stats = pipeline.get_stats()
+    assert stats["written"] == 10 and stats["buffered"] == 0
+    assert not pipeline.submit("after close")
+
+@pytest.mark.parametrize("policy, expected", [
+    ("drop_oldest", [3, 4, 5, 6, 7]), # The ring buffer keeps the newest records
+    ("drop", [0, 1, 2, 3, 4]),
+])
+def test_overflow_policies_drop_and_count(policy, expected):
+    """Test that a full buffer drops records according to the policy and counts them."""
+    # Arrange
+    written = []
+    pipeline = make_pipeline(written, capacity=5, batch_size=100, overflow_policy=policy)
+
+    # Act
+    for i in range(8):
+        pipeline.submit(i)
+    pipeline.close()
+
+    # Assert
+    assert written == expected
+    assert pipeline.get_stats()["dropped_overflow"] == 3
+    assert pipeline.get_stats()["high_water"] == 5
+
+def test_sample_policy_keeps_every_nth_record_above_threshold():
+    """Test that the sample policy keeps one of sample_rate records once the buffer is above the threshold."""
+    # Arrange
+    written = []
+    pipeline = make_pipeline(written, capacity=100, batch_size=1000, overflow_policy="sample", sample_threshold=0.1, sample_rate=5)
+
+    # Act
+    for i in range(30):
+        pipeline.submit(i)
+    pipeline.close()
+
+    # Assert
+    assert written[:10] == list(range(10)) # Below the threshold everything is kept
+    assert written[10:] == [14, 19, 24, 29]
+    assert pipeline.get_stats()["dropped_sampled"] == 16
+
+@pytest.mark.asyncio
+async def test_block_policy_waits_for_space():
+    """Test that submit_async under the block policy waits for the writer instead of dropping."""
+    # Arrange
+    written = []
+    release = threading.Event()
+    def slow_write(batch):
+        release.wait(5)
+        written.extend(batch)
+    pipeline = AsyncLogPipeline(slow_write, capacity=2, batch_size=1, flush_interval_seconds=0.01, overflow_policy="block",
+                                block_timeout_seconds=5.0)
+
+    # Act
+    for i in range(2):
+        pipeline.submit(i)
+    threading.Timer(0.05, release.set).start()
+    accepted = [await pipeline.submit_async(i) for i in range(2, 6)]
+    pipeline.close()
+
+    # Assert
+    assert accepted == [True] * 4
+    assert written == list(range(6))
+    assert pipeline.get_stats()["dropped_overflow"] == 0
+
+def test_write_errors_are_counted_and_do_not_stop_the_writer():
+    """Test that a failing batch write is counted and later batches are still written."""
+    # Arrange
+    written = []
+    def flaky_write(batch):
+        if batch[0] == "bad":
+            raise IOError("disk full")
+        written.extend(batch)
+    pipeline = AsyncLogPipeline(flaky_write, capacity=10, batch_size=1, flush_interval_seconds=60.0)
+
+    # Act
+    pipeline.submit("bad")
+    pipeline.submit("good")
+    pipeline.close()
+
+    # Assert
+    assert written == ["good"]
+    assert pipeline.get_stats()["write_errors"] == 1
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        AsyncLogPipeline(lambda batch: None, overflow_policy="spill")
@@ -0,0 +1,63 @@
+import json
+import logging
+import pytest
+
+from backend.src.core.logging_service.log_store import LogStore
+
+
+def row(ts, level=logging.INFO, trace_id=None, app_id="app1", component="main", message="m"):
+    line = json.dumps({"timestamp": ts, "message": message, "traceId": trace_id, "appId": app_id, "component_name": component})
+    return (ts, level, trace_id, app_id, component, None, line)
+
+@pytest.fixture
+def store(tmp_path):
+    """Fixture providing a LogStore with 100-second segments."""
+    log_store = LogStore(str(tmp_path / "logs"), segment_seconds=100, retention_seconds=1000)
+    yield log_store
+    log_store.close()
+
+def test_query_filters_across_segments(store):
+    """Test that queries combine filters and return matches from all segments, newest first."""
+    # Arrange
+    store.append([row(10, trace_id="t1", message="a"), row(150, trace_id="t1", app_id="app2", message="b"),
+                  row(160, level=logging.ERROR, message="c"), row(250, trace_id="t1", component="llm", message="d")])
+
+    # Act
+    by_trace = store.query(traceId="t1")
+    by_app = store.query(appId="app1")
+    by_component = store.query(componentId="llm")
+    errors = store.query(level=logging.WARNING)
+    in_range = store.query(since=100, until=200)
+
+    # Assert
+    assert [entry["message"] for entry in by_trace] == ["d", "b", "a"]
+    assert [entry["message"] for entry in by_app] == ["d", "c", "a"]
+    assert [entry["message"] for entry in by_component] == ["d"]
+    assert [entry["message"] for entry in errors] == ["c"]
+    assert [entry["message"] for entry in in_range] == ["c", "b"]
+    assert len(store.query(limit=2)) == 2
+    assert store.get_stats()["segments"] == 3
+
+def test_retention_deletes_old_segments_by_age_and_size(store):
+    """Test that expired segments are deleted, then the oldest ones while over the size limit, keeping the newest."""
+    # Arrange
+    store.append([row(10), row(150), row(250), row(350)])
+
+    # Act
+    deleted_by_age = store.enforce_retention(now=1150) # The window [0, 100) ended 1050 s ago
+    store.max_total_bytes = 0
+    deleted_by_size = store.enforce_retention(now=1150)
+
+    # Assert
+    assert deleted_by_age == 1
+    assert deleted_by_size == 2
+    assert [entry["timestamp"] for entry in store.query()] == [350]
+    assert store.get_stats()["segments_deleted"] == 3
+    store.append([row(360)]) # The newest segment's writer stays usable
+    assert len(store.query()) == 2
+
+def test_trace_query_uses_index(store):
+    """Test that trace lookups are index seeks rather than table scans."""
+    store.append([row(10, trace_id="t1")])
+    plan = store._writer(0).execute("EXPLAIN QUERY PLAN SELECT line FROM logs WHERE trace_id = ? ORDER BY ts DESC", ("t1",)).fetchall()
+    assert "logs_trace" in " ".join(str(step) for step in plan)
@@ -0,0 +1,31 @@
+import importlib
+import sys
+import pytest
+
+# LoggingService imports its interface from core.interfaces, where it has not been added yet; use the placeholder
+sys.modules.setdefault("core.interfaces.logging_service_interface", importlib.import_module("core.logging_service.logging_service_interface"))
+
+from core.shared.data_models.data_models import LogMessage
+from backend.src.core.logging_service.logging_service import LoggingService
+
+
+@pytest.mark.asyncio
+async def test_application_log_message_is_written_with_routing_component(tmp_path):
+    """Test that a real LogMessage (no component_name or metadata fields) is logged under the routed component."""
+    # Arrange
+    service = LoggingService(store_config={"path": str(tmp_path / "logs")})
+    log_message = LogMessage(level="warning", message="disk almost full", appId="app1", timestamp="2026-01-01T00:00:00Z",
+                             requestId="req1", traceId="trace1", context={"disk": "/data"})
+
+    # Act
+    await service.log_application_messages([log_message], component_name="worker")
+    assert service.flush(timeout=5)
+    result = await service.query_logs(componentId="worker")
+    await service.close()
+
+    # Assert
+    assert result["success"]
+    [entry] = result["logs"]
+    assert entry["message"] == "disk almost full"
+    assert entry["appId"] == "app1" and entry["traceId"] == "trace1" and entry["context"] == {"disk": "/data"}
+    assert entry["component_name"] == "worker"
@@ -0,0 +1,30 @@
+import importlib
+import sys
+
+# MetricCollector imports its interface from core.interfaces, where it has not been added yet; use the placeholder
+sys.modules.setdefault("core.interfaces.metric_collector_interface", importlib.import_module("core.metric_collector.metric_collector_interface"))
+
+from backend.src.core.metric_collector.metric_collector import MetricCollector
+
+
+def test_app_metric_config_sets_buckets_and_sketches_of_new_histograms():
+    """Test that an app's histogram settings apply to histograms it has not used yet and leave existing ones alone."""
+    # Arrange
+    collector = MetricCollector(histogram_config={"buckets": {"framework_seconds": [1.0, 2.0]}},
+                                handle_config={"buffer_flush_interval_seconds": 0})
+    collector._get_or_create_histogram("existing_seconds", [])
+    metric_config = {"histograms": {
+        "app_latency_seconds": {"buckets": [5.0, 0.5], "quantile_sketch": True},
+        "existing_seconds": {"buckets": [3.0]},
+    }}
+
+    # Act
+    collector.apply_app_metric_config("app1", metric_config)
+    collector.apply_app_metric_config("app1", metric_config) # Unchanged on the next load: skipped
+
+    # Assert
+    assert collector.histogram_config["buckets"]["framework_seconds"] == [1.0, 2.0]
+    assert collector.histogram_config["buckets"]["app_latency_seconds"] == [0.5, 5.0]
+    assert "existing_seconds" not in collector.histogram_config["buckets"]
+    assert collector._app_histogram_configs["app1"] == metric_config["histograms"]
+    assert "app_latency_seconds" in collector._sketched_metrics
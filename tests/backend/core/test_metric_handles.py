@@ -0,0 +1,96 @@
+import threading
+import prometheus_client
+import pytest
+
+from backend.src.core.metric_collector.metric_handles import MetricBuffer, MetricHandle
+from backend.src.core.metric_collector.quantile_sketch import DDSketch
+
+
+@pytest.fixture
+def registry():
+    """Fixture providing an isolated Prometheus registry."""
+    return prometheus_client.CollectorRegistry()
+
+def sample(registry, name, **labels):
+    return registry.get_sample_value(name, labels)
+
+def test_bind_caches_children(registry):
+    """Test that bind() returns the same child for the same label values, given positionally or by name."""
+    # Arrange
+    counter = prometheus_client.Counter("requests_total", "Requests", ["app_id", "component_id"], registry=registry)
+    handle = MetricHandle("requests_total", "counter", counter, ("app_id", "component_id"))
+
+    # Act
+    child = handle.bind("app1", "main")
+    child.inc()
+    handle.bind(component_id="main", app_id="app1").inc(2)
+
+    # Assert
+    assert handle.bind("app1", "main") is child
+    assert handle.bound_children == 1
+    assert sample(registry, "requests_total", app_id="app1", component_id="main") == 3
+
+def test_handle_label_order_may_differ_from_metric(registry):
+    """Test that a handle whose label order differs from the metric's binds values by name."""
+    counter = prometheus_client.Counter("events", "Events", ["a", "b"], registry=registry)
+    MetricHandle("events", "counter", counter, ("b", "a")).bind("B", "A").inc()
+    assert sample(registry, "events_total", a="A", b="B") == 1
+
+def test_bind_rejects_wrong_labels_and_bounds_cache(registry):
+    """Test label validation and that the child cache is bounded."""
+    # Arrange
+    gauge = prometheus_client.Gauge("depth", "Depth", ["app_id"], registry=registry)
+    handle = MetricHandle("depth", "gauge", gauge, ("app_id",), max_bound_children=2)
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        handle.bind("a", "b")
+    with pytest.raises(ValueError):
+        handle.bind(other="x")
+    for app_id in ("a", "b", "c"):
+        handle.bind(app_id).set(1)
+    assert handle.bound_children == 2
+
+def test_buffered_updates_apply_on_flush(registry):
+    """Test that buffered counter and histogram updates, including from other threads, reach Prometheus on flush."""
+    # Arrange
+    buffer = MetricBuffer()
+    counter = MetricHandle("calls", "counter", prometheus_client.Counter("calls", "Calls", ["app_id"], registry=registry), ("app_id",), buffer=buffer)
+    histogram = MetricHandle("latency", "histogram", prometheus_client.Histogram("latency", "Latency", registry=registry), (), buffer=buffer)
+
+    # Act
+    for _ in range(3):
+        counter.bind("app1").inc()
+        histogram.bind().observe(0.2)
+    thread = threading.Thread(target=lambda: counter.bind("app1").inc(5))
+    thread.start()
+    thread.join()
+    before_flush = sample(registry, "calls_total", app_id="app1")
+    applied = buffer.flush()
+
+    # Assert
+    assert before_flush == 0 # The child exists once bound, but nothing was applied yet
+    assert applied == 5 # One counter child per thread shard (2) + three observations
+    assert sample(registry, "calls_total", app_id="app1") == 8
+    assert sample(registry, "latency_count") == 3
+    assert buffer.get_stats()["shards"] == 2
+    with pytest.raises(ValueError):
+        counter.bind("app1").inc(-1)
+
+def test_histogram_observations_feed_sketch_per_label_set(registry):
+    """Test that a sketched histogram adds every observation to the sketch of its label set."""
+    # Arrange
+    sketches = {}
+    histogram = prometheus_client.Histogram("duration", "Duration", ["app_id"], buckets=[0.1, 1.0, 10.0], registry=registry)
+    handle = MetricHandle("duration", "histogram", histogram, ("app_id",),
+                          sketch_for=lambda labels: sketches.setdefault(labels["app_id"], DDSketch()))
+
+    # Act
+    for value in (0.5, 1.5, 2.5):
+        handle.bind("app1").observe(value)
+    handle.bind("app2").observe(20.0)
+
+    # Assert
+    assert sketches["app1"].count == 3 and sketches["app2"].count == 1
+    assert sketches["app1"].quantile(0.5) == pytest.approx(1.5, rel=0.01)
+    assert sample(registry, "duration_bucket", app_id="app1", le="1.0") == 1
@@ -0,0 +1,135 @@
+import pytest
+
+from backend.src.core.state_manager.patch_applier import PatchError, apply_patch, parse_unified_diff
+
+ORIGINAL = "".join(f"line {i}\n" for i in range(1, 21))
+
+MODIFY_DIFF = """diff --git a/config/app.yaml b/config/app.yaml
+index 1111111..2222222 100644
+--- a/config/app.yaml
++++ b/config/app.yaml
+@@ -2,3 +2,3 @@
+ line 2
+-line 3
++line three
+ line 4
+@@ -15,3 +15,4 @@
+ line 15
+ line 16
++line 16.5
+ line 17
+"""
+
+
+def read_from(files):
+    return lambda path: files.get(path)
+
+def test_multi_hunk_modification():
+    """Test that every hunk of a modification applies and is reported."""
+    # Act
+    result = apply_patch(MODIFY_DIFF, read_from({"config/app.yaml": ORIGINAL}))
+
+    # Assert
+    assert result.applied
+    content = result.changes["config/app.yaml"]
+    assert "line three\n" in content and "line 3\n" not in content
+    assert "line 16\nline 16.5\nline 17\n" in content
+    assert [(h.applied, h.offset) for h in result.files[0].hunks] == [(True, 0), (True, 0)]
+    assert result.files[0].status == "modified"
+
+def test_hunks_match_at_an_offset():
+    """Test that hunks still apply when lines were inserted above them, and report the offset."""
+    # Arrange
+    shifted = "header a\nheader b\n" + ORIGINAL
+
+    # Act
+    result = apply_patch(MODIFY_DIFF, read_from({"config/app.yaml": shifted}))
+
+    # Assert
+    assert result.applied
+    assert [h.offset for h in result.files[0].hunks] == [2, 2]
+
+def test_mismatching_hunk_fails_whole_patch_with_per_hunk_results():
+    """Test that a hunk whose context is gone fails, the other hunk is still reported, and no changes are returned."""
+    # Arrange
+    edited = ORIGINAL.replace("line 16\n", "line sixteen\n")
+
+    # Act
+    result = apply_patch(MODIFY_DIFF, read_from({"config/app.yaml": edited}))
+
+    # Assert
+    assert not result.applied
+    assert result.changes == {}
+    assert [h.applied for h in result.files[0].hunks] == [True, False]
+    assert result.files[0].hunks[1].message
+
+def test_new_deleted_and_renamed_files():
+    """Test file creation, deletion and rename-with-edit in one diff."""
+    # Arrange
+    diff = """diff --git a/prompts/new.txt b/prompts/new.txt
+new file mode 100644
+--- /dev/null
++++ b/prompts/new.txt
+@@ -0,0 +1,2 @@
++hello
++world
+\\ No newline at end of file
+diff --git a/old.txt b/old.txt
+deleted file mode 100644
+--- a/old.txt
++++ /dev/null
+@@ -1 +0,0 @@
+-bye
+diff --git a/a.yaml b/b.yaml
+similarity index 80%
+rename from a.yaml
+rename to b.yaml
+--- a/a.yaml
++++ b/b.yaml
+@@ -1,2 +1,2 @@
+ name: x
+-v: 1
++v: 2
+"""
+    files = {"old.txt": "bye\n", "a.yaml": "name: x\nv: 1\n"}
+
+    # Act
+    result = apply_patch(diff, read_from(files))
+
+    # Assert
+    assert result.applied
+    assert result.changes == {"prompts/new.txt": "hello\nworld", "old.txt": None, "a.yaml": None, "b.yaml": "name: x\nv: 2\n"}
+    assert [f.status for f in result.files] == ["added", "deleted", "renamed"]
+
+def test_creating_an_existing_file_fails():
+    """Test that a new-file patch does not overwrite an existing file."""
+    diff = "--- /dev/null\n+++ b/a.txt\n@@ -0,0 +1 @@\n+x\n"
+    result = apply_patch(diff, read_from({"a.txt": "y\n"}))
+    assert not result.applied
+    assert result.files[0].message == "File already exists"
+
+def test_fix_whitespace_strips_added_trailing_whitespace():
+    """Test that fix_whitespace cleans added lines only."""
+    diff = "--- a/a.txt\n+++ b/a.txt\n@@ -1 +1,2 @@\n a  \n+b \t\n"
+    result = apply_patch(diff, read_from({"a.txt": "a  \n"}), fix_whitespace=True)
+    assert result.changes["a.txt"] == "a  \nb\n"
+
+@pytest.mark.parametrize("diff", ["", "just text\n", "--- a/x\n+++ b/x\n@@ -1,2 +1,2 @@\n-a\n", "diff --git a/x b/x\nGIT binary patch\n"])
+def test_malformed_diffs_raise(diff):
+    """Test that empty, truncated and binary diffs raise PatchError."""
+    with pytest.raises(PatchError):
+        parse_unified_diff(diff)
+
+@pytest.mark.parametrize("header", ["--- /dev/null\n+++ /tmp/x/evil.txt\n", "--- /dev/null\n+++ b/.git/info/evil\n",
+                                    "--- a/x\n+++ b/../x\n", "--- a/config/../../x\n+++ b/x\n"])
+def test_paths_outside_the_working_tree_raise(header):
+    """Test that absolute, '..' and .git paths are rejected before anything is read, like `git apply` does."""
+    read_file = lambda path: pytest.fail(f"read {path}")
+    with pytest.raises(PatchError):
+        apply_patch(header + "@@ -0,0 +1 @@\n+x\n", read_file)
+
+def test_rename_onto_an_existing_file_raises():
+    """Test that a rename does not silently overwrite its target."""
+    diff = "diff --git a/a.txt b/b.txt\nsimilarity index 100%\nrename from a.txt\nrename to b.txt\n"
+    with pytest.raises(PatchError):
+        apply_patch(diff, read_from({"a.txt": "a\n", "b.txt": "b\n"}))
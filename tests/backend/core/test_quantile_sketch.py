@@ -0,0 +1,74 @@
+import random
+import pytest
+
+from backend.src.core.metric_collector.quantile_sketch import DDSketch, merge_sketches
+
+
+def exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+def test_quantiles_are_within_relative_accuracy():
+    """Test that p50/p95/p99 of a skewed latency distribution are within 1% of the exact values."""
+    # Arrange
+    rng = random.Random(42)
+    values = [rng.lognormvariate(-1, 1.2) for _ in range(20000)] # Roughly 50 ms to 60 s
+    sketch = DDSketch(relative_accuracy=0.01)
+
+    # Act
+    for value in values:
+        sketch.add(value)
+
+    # Assert
+    for q in (0.5, 0.95, 0.99):
+        assert sketch.quantile(q) == pytest.approx(exact_quantile(values, q), rel=0.01)
+    assert sketch.count == 20000
+    assert sketch.quantile(0) == pytest.approx(min(values), rel=0.01)
+    assert sketch.quantile(1) == pytest.approx(max(values), rel=0.01)
+
+def test_merge_matches_single_sketch():
+    """Test that merging per-component sketches gives the same quantiles as one sketch of all values."""
+    # Arrange
+    parts = [[i * 0.01 + j for i in range(100)] for j in range(3)]
+    sketches = []
+    for part in parts:
+        sketch = DDSketch()
+        for value in part:
+            sketch.add(value)
+        sketches.append(sketch)
+    combined = DDSketch()
+    for value in (v for part in parts for v in part):
+        combined.add(value)
+
+    # Act
+    merged = merge_sketches(sketches)
+
+    # Assert
+    assert merged.summary() == combined.summary()
+    assert merge_sketches([]) is None
+
+def test_zero_negative_and_empty():
+    """Test that zeros and negative values are placed correctly and an empty sketch has no quantiles."""
+    # Arrange
+    sketch = DDSketch()
+    assert sketch.quantile(0.5) is None
+
+    # Act
+    for value in (-10.0, -1.0, 0.0, 0.0, 1.0, 10.0):
+        sketch.add(value)
+
+    # Assert
+    assert sketch.quantile(0) == -10.0
+    assert sketch.quantile(0.4) == 0.0
+    assert sketch.quantile(0.2) == pytest.approx(-1.0, rel=0.01)
+    assert sketch.summary((0.5, 0.999))["p50"] == 0.0
+    assert sketch.summary((0.5, 0.999))["p99.9"] == pytest.approx(1.0, rel=0.01) # Rank 4.995 of 0..5
+
+def test_bins_are_bounded():
+    """Test that the lowest bins collapse beyond max_bins while upper quantiles stay accurate."""
+    sketch = DDSketch(max_bins=50)
+    values = [1.05 ** i for i in range(500)]
+    for value in values:
+        sketch.add(value)
+    assert len(sketch._positive) == 50
+    assert sketch.quantile(0.99) == pytest.approx(exact_quantile(values, 0.99), rel=0.01)
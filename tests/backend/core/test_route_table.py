@@ -0,0 +1,74 @@
+import pytest
+
+from backend.src.core.application_registry.route_table import RouteTable, methods_to_bitmap, ALL_METHODS
+
+
+@pytest.fixture
+def route_table():
+    """Fixture to provide a RouteTable with a mix of static, parameter and catch-all routes."""
+    table = RouteTable()
+    table.add_route("/api/users", ["GET"], "list_users")
+    table.add_route("/api/users", ["POST"], "create_user")
+    table.add_route("/api/users/me", ["GET"], "current_user")
+    table.add_route("/api/users/:id", ["GET", "PUT"], "get_user")
+    table.add_route("/api/users/:userId/posts/:postId", [], "get_post")
+    table.add_route("/static/*path", ["GET"], "static_files")
+    return table
+
+def test_resolve_static_route(route_table):
+    """Test that static routes resolve by method."""
+    assert route_table.resolve("GET", "/api/users").component_id == "list_users"
+    assert route_table.resolve("post", "/api/users/").component_id == "create_user"
+
+def test_resolve_prefers_static_over_parameter(route_table):
+    """Test that a static segment wins over a parameter segment at the same depth."""
+    match = route_table.resolve("GET", "/api/users/me")
+    assert match.component_id == "current_user"
+    assert match.path_parameters == {}
+
+def test_resolve_extracts_path_parameters(route_table):
+    """Test that ':name' segments are captured into path_parameters."""
+    match = route_table.resolve("GET", "/api/users/42?verbose=1")
+    assert match.component_id == "get_user"
+    assert match.route_pattern == "/api/users/:id"
+    assert match.path_parameters == {"id": "42"}
+
+    match = route_table.resolve("DELETE", "/api/users/me/posts/7")
+    assert match.component_id == "get_post"
+    assert match.path_parameters == {"userId": "me", "postId": "7"}
+
+def test_resolve_catch_all(route_table):
+    """Test that a trailing '*name' segment captures the remaining path."""
+    match = route_table.resolve("GET", "/static/css/site.css")
+    assert match.component_id == "static_files"
+    assert match.path_parameters == {"path": "css/site.css"}
+
+def test_resolve_no_match(route_table):
+    """Test unknown paths and disallowed methods."""
+    assert route_table.resolve("GET", "/api/unknown") is None
+    assert route_table.resolve("DELETE", "/api/users/42") is None
+    assert route_table.resolve("BREW", "/api/users") is None
+
+def test_add_route_conflict_raises():
+    """Test that two components claiming the same pattern and method are rejected."""
+    table = RouteTable()
+    table.add_route("/api/items/:id", ["GET"], "a")
+    with pytest.raises(ValueError):
+        table.add_route("/api/items/:itemId", ["GET", "POST"], "b")
+
+def test_from_components_accepts_dicts():
+    """Test building from a YAML-loaded component registry of plain dicts."""
+    components = {
+        "get_item": {"component_id": "get_item", "route_matcher": {"path_pattern": "/items/:id", "methods": ["GET"]}},
+        "background_job": {"component_id": "background_job"},
+    }
+    table = RouteTable.from_components(components)
+    assert len(table) == 1
+    assert table.resolve("GET", "/items/5").path_parameters == {"id": "5"}
+
+def test_methods_to_bitmap():
+    """Test method bitmap conversion."""
+    assert methods_to_bitmap(None) == ALL_METHODS
+    assert methods_to_bitmap(["GET", "get"]) == methods_to_bitmap(["GET"])
+    with pytest.raises(ValueError):
+        methods_to_bitmap(["BREW"])
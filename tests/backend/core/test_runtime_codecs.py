@@ -0,0 +1,93 @@
+import pytest
+import yaml
+
+from backend.src.core.state_manager import runtime_codecs
+from backend.src.core.state_manager.runtime_codecs import (
+    FLAG_ZSTD,
+    RuntimeValueDecodeError,
+    RuntimeValueSerializer,
+)
+
+SAMPLE_VALUE = {"user": "alice", "cart": [{"sku": "A-1", "qty": 2, "price": 9.99}], "active": True, "note": None}
+
+
+@pytest.mark.parametrize("codec", ["json", "yaml"] + (["msgpack"] if runtime_codecs.msgpack is not None else []))
+def test_round_trip_per_codec(codec):
+    """Test that every available codec round-trips a representative value."""
+    # Arrange
+    serializer = RuntimeValueSerializer(codec=codec)
+
+    # Act
+    encoded = serializer.dumps(SAMPLE_VALUE)
+
+    # Assert
+    assert encoded[0] == runtime_codecs.HEADER_MAGIC
+    assert serializer.loads(encoded) == SAMPLE_VALUE
+
+def test_legacy_yaml_values_are_decoded():
+    """Test that header-less values written by the old YAML serializer still decode, as bytes or str."""
+    # Arrange
+    serializer = RuntimeValueSerializer(codec="json")
+    legacy = yaml.dump(SAMPLE_VALUE)
+
+    # Act / Assert
+    assert serializer.loads(legacy) == SAMPLE_VALUE
+    assert serializer.loads(legacy.encode("utf-8")) == SAMPLE_VALUE
+
+def test_values_written_with_another_codec_are_decoded():
+    """Test that switching the configured codec keeps earlier values readable."""
+    # Arrange
+    written = RuntimeValueSerializer(codec="yaml").dumps(SAMPLE_VALUE)
+
+    # Act / Assert
+    assert RuntimeValueSerializer(codec="json").loads(written) == SAMPLE_VALUE
+
+@pytest.mark.skipif(runtime_codecs.zstandard is None, reason="zstandard is not installed")
+def test_large_values_are_compressed():
+    """Test that payloads above the threshold are zstd-compressed and still round-trip."""
+    # Arrange
+    serializer = RuntimeValueSerializer(codec="json", compression_threshold_bytes=256)
+    large_value = {"items": ["repeated payload"] * 200}
+
+    # Act
+    encoded = serializer.dumps(large_value)
+    small = serializer.dumps({"a": 1})
+
+    # Assert
+    assert encoded[2] & FLAG_ZSTD
+    assert not small[2] & FLAG_ZSTD
+    assert serializer.loads(encoded) == large_value
+
+@pytest.mark.parametrize("data", [b"\x00j", b"\x00?\x00{}", b"\x00j\x00{not json"])
+def test_corrupt_values_raise_decode_error(data):
+    """Test that truncated, unknown-codec and corrupt values raise RuntimeValueDecodeError."""
+    with pytest.raises(RuntimeValueDecodeError):
+        RuntimeValueSerializer(codec="json").loads(data)
+
+@pytest.mark.parametrize("value", [0, 42, -7, 10**20])
+def test_integers_are_stored_as_bare_decimals(value):
+    """Test that integers skip the header so Redis INCRBY can operate on them, and still round-trip."""
+    # Arrange
+    serializer = RuntimeValueSerializer(codec="json")
+
+    # Act
+    encoded = serializer.dumps(value)
+
+    # Assert
+    assert encoded == str(value).encode("ascii")
+    assert serializer.loads(encoded) == value
+
+def test_booleans_keep_the_codec_header():
+    """Test that booleans are not mistaken for integers."""
+    serializer = RuntimeValueSerializer(codec="json")
+    assert serializer.loads(serializer.dumps(True)) is True
+    assert serializer.dumps(True)[0] == runtime_codecs.HEADER_MAGIC
+
+def test_missing_values_decode_to_none():
+    """Test that a missing key (None) decodes to None."""
+    assert RuntimeValueSerializer().loads(None) is None
+
+def test_unknown_codec_is_rejected():
+    """Test that configuring an unknown codec fails early."""
+    with pytest.raises(ValueError):
+        RuntimeValueSerializer(codec="pickle")
@@ -0,0 +1,121 @@
+import asyncio
+import httpx
+import pytest
+
+from backend.src.core.request_router.sandbox_client_pool import SandboxClientPool
+
+
+@pytest.fixture
+def seen_urls():
+    """Fixture recording the URLs requested through the mock transport."""
+    return []
+
+@pytest.fixture
+def client_pool(seen_urls):
+    """Fixture for a SandboxClientPool whose clients use a mock transport."""
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen_urls.append(str(request.url))
+        return httpx.Response(200, json={"result": "ok"})
+
+    return SandboxClientPool({"max_sandbox_clients": 2}, transport_factory=lambda: httpx.MockTransport(handler))
+
+@pytest.mark.asyncio
+async def test_get_client_reuses_client_per_sandbox(client_pool):
+    """Test that each sandbox gets its own client and keeps it across calls."""
+    # Act
+    first = await client_pool.get_client("sandbox-1", "http://10.0.0.1:8080")
+    again = await client_pool.get_client("sandbox-1", "http://10.0.0.1:8080")
+    other = await client_pool.get_client("sandbox-2", "http://10.0.0.2:8080")
+
+    # Assert
+    assert first is again
+    assert other is not first
+    assert client_pool.get_stats()["open_clients"] == 2
+
+@pytest.mark.asyncio
+async def test_get_client_replaces_client_when_endpoint_changes(client_pool):
+    """Test that a changed endpoint closes the stale client and builds a new one."""
+    # Arrange
+    stale = await client_pool.get_client("sandbox-1", "http://10.0.0.1:8080")
+
+    # Act
+    fresh = await client_pool.get_client("sandbox-1", "http://10.0.0.9:8080")
+
+    # Assert
+    assert fresh is not stale
+    assert stale.is_closed
+
+@pytest.mark.asyncio
+async def test_least_recently_used_client_is_evicted(client_pool):
+    """Test that clients beyond max_sandbox_clients are closed in LRU order."""
+    # Arrange
+    first = await client_pool.get_client("sandbox-1", "http://10.0.0.1:8080")
+    second = await client_pool.get_client("sandbox-2", "http://10.0.0.2:8080")
+    await client_pool.get_client("sandbox-1", "http://10.0.0.1:8080") # sandbox-2 is now least recently used
+
+    # Act
+    await client_pool.get_client("sandbox-3", "http://10.0.0.3:8080")
+
+    # Assert
+    assert second.is_closed
+    assert not first.is_closed
+    assert client_pool.get_stats()["clients_evicted"] == 1
+
+@pytest.mark.asyncio
+async def test_post_targets_sandbox_endpoint_and_counts_requests(client_pool, seen_urls):
+    """Test that post sends to the sandbox's own endpoint and updates the counters."""
+    # Act
+    response, _ = await client_pool.post("sandbox-1", "http://10.0.0.1:8080", "/execute", json={"x": 1})
+    await client_pool.post("sandbox-2", "http://10.0.0.2:8080", "/execute", json={"x": 2})
+
+    # Assert
+    assert response.json() == {"result": "ok"}
+    assert seen_urls == ["http://10.0.0.1:8080/execute", "http://10.0.0.2:8080/execute"]
+    stats = client_pool.get_stats()
+    assert stats["requests"] == 2
+    assert stats["new_connections"] + stats["reused_connections"] == 2
+
+@pytest.mark.asyncio
+async def test_discard_and_close_close_clients(client_pool):
+    """Test that discard closes one sandbox's client and close closes the rest."""
+    # Arrange
+    first = await client_pool.get_client("sandbox-1", "http://10.0.0.1:8080")
+    second = await client_pool.get_client("sandbox-2", "http://10.0.0.2:8080")
+
+    # Act
+    await client_pool.discard("sandbox-1")
+    await client_pool.close()
+
+    # Assert
+    assert first.is_closed and second.is_closed
+    assert client_pool.get_stats()["open_clients"] == 0
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("retire", ["discard", "evict"])
+async def test_retired_client_closes_after_in_flight_request(retire):
+    """Test that discarding or evicting a sandbox's client lets its running request finish before closing it."""
+    # Arrange
+    release = asyncio.Event()
+    async def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.host == "10.0.0.1":
+            await release.wait()
+        return httpx.Response(200, json={"result": "ok"})
+    client_pool = SandboxClientPool({"max_sandbox_clients": 1}, transport_factory=lambda: httpx.MockTransport(handler))
+    request = asyncio.create_task(client_pool.post("sandbox-1", "http://10.0.0.1:8080", "/execute", json={}))
+    await asyncio.sleep(0.01)
+    client = await client_pool.get_client("sandbox-1", "http://10.0.0.1:8080")
+
+    # Act
+    if retire == "discard":
+        await client_pool.discard("sandbox-1")
+    else:
+        await client_pool.post("sandbox-2", "http://10.0.0.2:8080", "/execute", json={})
+    closed_while_running = client.is_closed
+    release.set()
+    response, _ = await request
+
+    # Assert
+    assert not closed_while_running
+    assert response.json() == {"result": "ok"}
+    assert client.is_closed
+    assert client_pool.get_stats()["retiring_clients"] == 0
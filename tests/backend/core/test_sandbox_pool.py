@@ -0,0 +1,191 @@
+import asyncio
+import itertools
+import pytest
+
+from backend.src.core.sandbox_manager.sandbox_pool import SandboxPool, SandboxPoolExhaustedError
+
+
+class FakeContainer:
+    """Minimal stand-in for a docker-py Container."""
+    _ids = itertools.count()
+
+    def __init__(self):
+        self.id = f"container-{next(self._ids)}"
+
+@pytest.fixture
+def lifecycle():
+    """Fixture recording created and destroyed containers."""
+    record = {"created": [], "destroyed": []}
+
+    async def create_container():
+        container = FakeContainer()
+        record["created"].append(container.id)
+        return container
+
+    async def destroy_container(container):
+        record["destroyed"].append(container.id)
+
+    record["create"] = create_container
+    record["destroy"] = destroy_container
+    return record
+
+def make_pool(lifecycle, min_instances=1, max_instances=2, idle_ttl_seconds=300.0):
+    return SandboxPool("test_app_001", "default", min_instances, max_instances,
+                       lifecycle["create"], lifecycle["destroy"], idle_ttl_seconds=idle_ttl_seconds)
+
+@pytest.mark.asyncio
+async def test_warm_creates_min_instances(lifecycle):
+    """Test that warming pre-starts min_instances containers."""
+    pool = make_pool(lifecycle, min_instances=2, max_instances=3)
+
+    await pool.warm()
+
+    assert len(lifecycle["created"]) == 2
+    assert pool.get_stats()["idle"] == 2
+
+@pytest.mark.asyncio
+async def test_acquire_reuses_released_container(lifecycle):
+    """Test that a released container is leased again instead of creating a new one."""
+    pool = make_pool(lifecycle)
+    await pool.warm()
+
+    first = await pool.acquire()
+    await pool.release(first.id)
+    second = await pool.acquire()
+
+    assert second is first
+    assert len(lifecycle["created"]) == 1
+
+@pytest.mark.asyncio
+async def test_acquire_scales_to_max_then_times_out(lifecycle):
+    """Test scaling up to max_instances and the acquire timeout beyond it."""
+    pool = make_pool(lifecycle, min_instances=1, max_instances=2)
+    await pool.warm()
+
+    await pool.acquire()
+    await pool.acquire()
+
+    with pytest.raises(SandboxPoolExhaustedError):
+        await pool.acquire(timeout=0.01)
+    assert len(lifecycle["created"]) == 2
+
+@pytest.mark.asyncio
+async def test_waiting_acquire_gets_released_container(lifecycle):
+    """Test that a caller waiting on a full pool is handed the next released container."""
+    pool = make_pool(lifecycle, min_instances=1, max_instances=1)
+    leased = await pool.acquire()
+
+    waiter = asyncio.create_task(pool.acquire(timeout=1))
+    await asyncio.sleep(0)
+    await pool.release(leased.id)
+
+    assert (await waiter) is leased
+
+@pytest.mark.asyncio
+async def test_unhealthy_release_replaces_container(lifecycle):
+    """Test that an unhealthy container is destroyed and the pool refilled to min_instances."""
+    pool = make_pool(lifecycle, min_instances=1, max_instances=1)
+    leased = await pool.acquire()
+
+    await pool.release(leased.id, healthy=False)
+
+    assert lifecycle["destroyed"] == [leased.id]
+    assert pool.get_stats()["idle"] == 1
+    assert len(lifecycle["created"]) == 2
+
+@pytest.mark.asyncio
+async def test_reap_idle_keeps_min_instances(lifecycle):
+    """Test that idle containers past the TTL are reaped down to min_instances."""
+    pool = make_pool(lifecycle, min_instances=1, max_instances=3, idle_ttl_seconds=0)
+    leased = [await pool.acquire() for _ in range(3)]
+    for container in leased:
+        await pool.release(container.id)
+
+    reaped = await pool.reap_idle()
+
+    assert reaped == 2
+    assert pool.get_stats()["idle"] == 1
+
+@pytest.mark.asyncio
+async def test_cancelled_acquire_releases_slot_and_destroys_late_container(lifecycle):
+    """Test that cancelling acquire() mid-create gives the slot back and destroys a container finishing too late."""
+    # Arrange
+    started, finish = asyncio.Event(), asyncio.Event()
+    async def slow_create():
+        started.set()
+        await finish.wait()
+        return await lifecycle["create"]()
+    pool = SandboxPool("test_app_001", "default", 0, 1, slow_create, lifecycle["destroy"])
+    acquire = asyncio.create_task(pool.acquire())
+    await started.wait()
+
+    # Act
+    async with pool._condition: # Hold the lock so the finished container cannot be handed over
+        finish.set()
+        await asyncio.sleep(0)
+        acquire.cancel()
+        await asyncio.sleep(0)
+    with pytest.raises(asyncio.CancelledError):
+        await acquire
+    await asyncio.gather(*pool._cleanup_tasks)
+
+    # Assert
+    assert pool.size == 0
+    assert len(lifecycle["created"]) == 1
+    assert lifecycle["destroyed"] == lifecycle["created"]
+    pool._create_container = lifecycle["create"]
+    assert (await pool.acquire(timeout=0.1)).id in lifecycle["created"] # The slot is usable again
+
+@pytest.mark.asyncio
+async def test_warm_racing_close_does_not_keep_containers(lifecycle):
+    """Test that containers finishing after close() are destroyed instead of added to the idle list."""
+    # Arrange
+    release = asyncio.Event()
+    async def slow_create():
+        await release.wait()
+        return await lifecycle["create"]()
+    pool = SandboxPool("test_app_001", "default", 3, 3, slow_create, lifecycle["destroy"])
+    warm = asyncio.create_task(pool.warm())
+    await asyncio.sleep(0.01) # Let every creation start
+
+    # Act
+    await pool.close()
+    release.set()
+    await warm
+    await asyncio.gather(*pool._cleanup_tasks)
+
+    # Assert
+    assert pool.get_stats()["idle"] == 0
+    assert pool.size == 0
+    assert lifecycle["created"] == lifecycle["destroyed"] and len(lifecycle["created"]) == 3 # All were already starting
+
+@pytest.mark.asyncio
+async def test_warm_starts_containers_concurrently_and_acquire_takes_the_first_ready(lifecycle):
+    """Test that warming starts every missing container at once and acquire() waits for one instead of the whole pool."""
+    # Arrange
+    releases = [asyncio.Event() for _ in range(3)]
+    started = []
+    async def create_in_order():
+        index = len(started)
+        started.append(index)
+        await releases[index].wait()
+        return await lifecycle["create"]()
+    pool = SandboxPool("test_app_001", "default", 3, 3, create_in_order, lifecycle["destroy"])
+    warm = asyncio.create_task(pool.warm())
+    await asyncio.sleep(0.01)
+
+    # Act
+    assert len(started) == 3 # All missing containers are being created at once
+    acquire = asyncio.create_task(pool.acquire(timeout=1))
+    await asyncio.sleep(0.01)
+    assert not acquire.done() # At max_instances: waits for a warming container rather than creating another
+    releases[1].set()
+    container = await acquire
+
+    # Assert
+    assert container.id == lifecycle["created"][0]
+    assert not warm.done()
+    releases[0].set()
+    releases[2].set()
+    await warm
+    assert pool.get_stats()["idle"] == 2 and pool.get_stats()["leased"] == 1
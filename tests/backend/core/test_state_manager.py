@@ -0,0 +1,523 @@
+import asyncio
+import git
+import pytest
+import redis
+import yaml
+from unittest.mock import AsyncMock, MagicMock # For mocking the async Redis client
+
+from backend.src.core.state_manager.state_manager import StateManager
+from backend.src.core.state_manager.runtime_codecs import RuntimeValueSerializer
+from backend.src.core.state_manager.patch_applier import PatchError
+
+
+@pytest.fixture
+def state_manager(tmp_path):
+    """Fixture to create a StateManager with a temporary definition root and a mock Redis client."""
+    manager = StateManager(definition_state_path=str(tmp_path), runtime_state_config={"host": "localhost", "port": 6379, "db": 0})
+    manager._redis_client = AsyncMock()
+    return manager
+
+def mock_pipeline(manager, current_value=None):
+    """Attaches a mock pipeline (usable as an async context manager) to the manager's Redis client and returns it."""
+    pipe = MagicMock()
+    pipe.__aenter__.return_value = pipe
+    pipe.watch = AsyncMock()
+    pipe.unwatch = AsyncMock()
+    pipe.get = AsyncMock(return_value=current_value)
+    pipe.execute = AsyncMock(return_value=[])
+    manager._redis_client.pipeline = MagicMock(return_value=pipe)
+    return pipe
+
+def mock_scan(manager, keys):
+    """Makes scan_iter yield the given raw keys."""
+    async def scan_iter(**kwargs):
+        for key in keys:
+            yield key
+    manager._redis_client.scan_iter = MagicMock(side_effect=scan_iter)
+
+@pytest.mark.asyncio
+async def test_get_runtime_values_uses_single_mget(state_manager):
+    """Test that batch reads issue one MGET with namespaced keys and skip missing keys."""
+    # Arrange
+    state_manager._redis_client.mget.return_value = [state_manager._runtime_codec.dumps({"a": 1}), None, state_manager._runtime_codec.dumps("text")]
+
+    # Act
+    values = await state_manager.get_runtime_values("test_app_001", ["k1", "k2", "k3"])
+
+    # Assert
+    state_manager._redis_client.mget.assert_awaited_once_with(["test_app_001:k1", "test_app_001:k2", "test_app_001:k3"])
+    assert values == {"k1": {"a": 1}, "k3": "text"}
+
+@pytest.mark.asyncio
+async def test_set_runtime_values_uses_single_mset(state_manager):
+    """Test that batch writes issue one MSET with serialized values."""
+    # Act
+    await state_manager.set_runtime_values("test_app_001", {"k1": [1, 2], "k2": "v"})
+
+    # Assert
+    state_manager._redis_client.mset.assert_awaited_once_with({
+        "test_app_001:k1": state_manager._runtime_codec.dumps([1, 2]),
+        "test_app_001:k2": state_manager._runtime_codec.dumps("v"),
+    })
+
+@pytest.mark.asyncio
+async def test_delete_runtime_values_uses_single_delete(state_manager):
+    """Test that batch deletes issue one multi-key DEL and return the deleted count."""
+    # Arrange
+    state_manager._redis_client.delete.return_value = 2
+
+    # Act
+    deleted = await state_manager.delete_runtime_values("test_app_001", ["k1", "k2", "k3"])
+
+    # Assert
+    state_manager._redis_client.delete.assert_awaited_once_with("test_app_001:k1", "test_app_001:k2", "test_app_001:k3")
+    assert deleted == 2
+
+@pytest.mark.asyncio
+async def test_batch_operations_with_no_keys_skip_redis(state_manager):
+    """Test that empty batches do not touch Redis."""
+    # Act
+    values = await state_manager.get_runtime_values("test_app_001", [])
+    await state_manager.set_runtime_values("test_app_001", {})
+    deleted = await state_manager.delete_runtime_values("test_app_001", [])
+
+    # Assert
+    assert values == {}
+    assert deleted == 0
+    state_manager._redis_client.mget.assert_not_called()
+    state_manager._redis_client.mset.assert_not_called()
+    state_manager._redis_client.delete.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_get_runtime_value_reads_legacy_yaml_and_other_codecs(state_manager):
+    """Test that values written as legacy YAML or with a different codec remain readable."""
+    # Arrange
+    legacy_value = yaml.dump({"count": 3}).encode("utf-8")
+    yaml_tagged_value = RuntimeValueSerializer(codec="yaml").dumps(["x"])
+    state_manager._redis_client.get.side_effect = [legacy_value, yaml_tagged_value]
+
+    # Act
+    legacy = await state_manager.get_runtime_value("test_app_001", "legacy")
+    tagged = await state_manager.get_runtime_value("test_app_001", "tagged")
+
+    # Assert
+    assert legacy == {"count": 3}
+    assert tagged == ["x"]
+
+@pytest.mark.asyncio
+async def test_set_runtime_value_with_ttl(state_manager):
+    """Test that a TTL is passed to SET as EX."""
+    # Act
+    await state_manager.set_runtime_value("test_app_001", "session", {"u": 1}, ttl_seconds=60)
+
+    # Assert
+    state_manager._redis_client.set.assert_awaited_once_with("test_app_001:session", state_manager._runtime_codec.dumps({"u": 1}), ex=60)
+
+@pytest.mark.asyncio
+async def test_set_runtime_values_with_ttl_uses_transaction(state_manager):
+    """Test that batch writes with a TTL use one MULTI/EXEC pipeline of SET ... EX instead of MSET."""
+    # Arrange
+    pipe = mock_pipeline(state_manager)
+
+    # Act
+    await state_manager.set_runtime_values("test_app_001", {"k1": "a", "k2": "b"}, ttl_seconds=30)
+
+    # Assert
+    state_manager._redis_client.pipeline.assert_called_once_with(transaction=True)
+    assert pipe.set.call_count == 2
+    pipe.set.assert_any_call("test_app_001:k1", state_manager._runtime_codec.dumps("a"), ex=30)
+    pipe.execute.assert_awaited_once()
+    state_manager._redis_client.mset.assert_not_called()
+
+@pytest.mark.asyncio
+async def test_increment_runtime_value(state_manager):
+    """Test that increments use INCRBY, and a TTL goes through the server-side script in the same round trip."""
+    # Arrange
+    state_manager._redis_client.incrby.return_value = 4
+    state_manager._increment_with_ttl_script = AsyncMock(return_value=1)
+
+    # Act
+    plain = await state_manager.increment_runtime_value("test_app_001", "hits", 2)
+    windowed = await state_manager.decrement_runtime_value("test_app_001", "quota", ttl_seconds=60)
+
+    # Assert
+    assert plain == 4
+    assert windowed == 1
+    state_manager._redis_client.incrby.assert_awaited_once_with("test_app_001:hits", 2)
+    state_manager._increment_with_ttl_script.assert_awaited_once_with(keys=["test_app_001:quota"], args=[-1, 60])
+
+@pytest.mark.asyncio
+async def test_counters_are_readable_and_settable(state_manager):
+    """Test that integers are stored as bare decimals, so INCRBY and get_runtime_value interoperate."""
+    # Arrange
+    state_manager._redis_client.get.return_value = b"-12"
+
+    # Act
+    await state_manager.set_runtime_value("test_app_001", "hits", 7)
+    value = await state_manager.get_runtime_value("test_app_001", "hits")
+
+    # Assert
+    state_manager._redis_client.set.assert_awaited_once_with("test_app_001:hits", b"7", ex=None)
+    assert value == -12
+
+@pytest.mark.asyncio
+async def test_compare_and_set_absent_key_uses_set_nx(state_manager):
+    """Test that expected=None is a single SET NX (lock acquisition)."""
+    # Arrange
+    state_manager._redis_client.set.return_value = None # Key already existed
+
+    # Act
+    acquired = await state_manager.compare_and_set_runtime_value("test_app_001", "lock", None, "owner-1", ttl_seconds=10)
+
+    # Assert
+    assert acquired is False
+    state_manager._redis_client.set.assert_awaited_once_with("test_app_001:lock", state_manager._runtime_codec.dumps("owner-1"), ex=10, nx=True)
+
+@pytest.mark.asyncio
+async def test_compare_and_set_writes_when_value_matches(state_manager):
+    """Test that a matching current value is replaced inside MULTI/EXEC."""
+    # Arrange
+    pipe = mock_pipeline(state_manager, current_value=state_manager._runtime_codec.dumps({"v": 1}))
+
+    # Act
+    written = await state_manager.compare_and_set_runtime_value("test_app_001", "doc", {"v": 1}, {"v": 2})
+
+    # Assert
+    assert written is True
+    pipe.watch.assert_awaited_once_with("test_app_001:doc")
+    pipe.multi.assert_called_once()
+    pipe.set.assert_called_once_with("test_app_001:doc", state_manager._runtime_codec.dumps({"v": 2}), ex=None)
+    pipe.execute.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_compare_and_set_rejects_mismatch_and_concurrent_change(state_manager):
+    """Test that a mismatching value, or a change between read and write, returns False without retrying."""
+    # Arrange
+    pipe = mock_pipeline(state_manager, current_value=state_manager._runtime_codec.dumps("other"))
+
+    # Act
+    mismatch = await state_manager.compare_and_set_runtime_value("test_app_001", "doc", "mine", "new")
+    pipe.get.return_value = state_manager._runtime_codec.dumps("mine")
+    pipe.execute.side_effect = redis.exceptions.WatchError()
+    raced = await state_manager.compare_and_set_runtime_value("test_app_001", "doc", "mine", "new")
+
+    # Assert
+    assert mismatch is False
+    assert raced is False
+    pipe.unwatch.assert_awaited_once()
+    pipe.execute.assert_awaited_once()
+
+@pytest.mark.asyncio
+async def test_compare_and_delete_runtime_value(state_manager):
+    """Test that a lock is released only by the holder of the matching token."""
+    # Arrange
+    pipe = mock_pipeline(state_manager, current_value=state_manager._runtime_codec.dumps("owner-1"))
+
+    # Act
+    released = await state_manager.compare_and_delete_runtime_value("test_app_001", "lock", "owner-1")
+
+    # Assert
+    assert released is True
+    pipe.delete.assert_called_once_with("test_app_001:lock")
+
+@pytest.mark.asyncio
+async def test_scan_runtime_keys_is_namespaced(state_manager):
+    """Test that scanning is confined to the app's namespace, strips the prefix and honours the limit."""
+    # Arrange
+    mock_scan(state_manager, [b"app*1:session:a", b"app*1:session:b", b"app*1:session:c"])
+
+    # Act
+    keys = await state_manager.scan_runtime_keys("app*1", "session:*", limit=2)
+
+    # Assert
+    assert keys == ["session:a", "session:b"]
+    state_manager._redis_client.scan_iter.assert_called_once_with(match="app\\*1:session:*", count=500)
+
+@pytest.mark.asyncio
+async def test_runtime_keys_reject_app_ids_that_could_collide(state_manager):
+    """Test that an app ID containing ':' is rejected, so app "a" scanning '*' cannot reach app "a:b"'s keys."""
+    # Arrange
+    mock_scan(state_manager, [b"a:b:y"]) # Only reachable as app "a"'s own key "b:y"
+
+    # Act / Assert
+    with pytest.raises(ValueError):
+        await state_manager.set_runtime_value("a:b", "y", 1)
+    with pytest.raises(ValueError):
+        await state_manager.scan_runtime_keys("a:b")
+    with pytest.raises(ValueError):
+        await state_manager.expire_runtime_values("a:b", 0)
+    state_manager._redis_client.set.assert_not_called()
+    state_manager._redis_client.scan_iter.assert_not_called()
+
+    assert await state_manager.scan_runtime_keys("a") == ["b:y"]
+    state_manager._redis_client.scan_iter.assert_called_once_with(match="a:*", count=500)
+
+@pytest.mark.asyncio
+async def test_expire_runtime_values_pipelines_expire(state_manager):
+    """Test that bulk expiry pipelines EXPIRE for every scanned key and counts the keys it updated."""
+    # Arrange
+    mock_scan(state_manager, [b"test_app_001:a", b"test_app_001:b"])
+    pipe = mock_pipeline(state_manager)
+    pipe.execute.return_value = [True, False]
+
+    # Act
+    expired = await state_manager.expire_runtime_values("test_app_001", 120)
+
+    # Assert
+    assert expired == 1
+    state_manager._redis_client.pipeline.assert_called_once_with(transaction=False)
+    pipe.expire.assert_any_call(b"test_app_001:a", 120)
+    pipe.expire.assert_any_call(b"test_app_001:b", 120)
+
+@pytest.mark.asyncio
+async def test_definition_file_reads_are_cached_until_changed(state_manager, tmp_path):
+    """Test that repeated reads are served from the cache and external edits are picked up via the stat signature."""
+    # Arrange
+    config_file = tmp_path / "test_app_001" / "config" / "app.yaml"
+    config_file.parent.mkdir(parents=True)
+    config_file.write_text("name: one\n")
+
+    # Act
+    first = await state_manager.get_definition_file_content("test_app_001", "config/app.yaml")
+    second = await state_manager.get_definition_file_content("test_app_001", "./config/app.yaml")
+    config_file.write_text("name: two, edited outside\n")
+    third = await state_manager.get_definition_file_content("test_app_001", "config/app.yaml")
+
+    # Assert
+    assert first == second == "name: one\n"
+    assert third == "name: two, edited outside\n"
+    stats = state_manager.get_definition_cache_stats()
+    assert (stats["hits"], stats["stale"]) == (1, 1)
+
+@pytest.mark.asyncio
+async def test_definition_writes_invalidate_cache(state_manager):
+    """Test that writing and deleting through the StateManager invalidate cached contents."""
+    # Arrange
+    state_manager._get_app_repo("test_app_001") # Initialize the app's repository
+    await state_manager.set_definition_file_content("test_app_001", "config/app.yaml", "v: 1\n", "Add config")
+    assert await state_manager.get_definition_file_content("test_app_001", "config/app.yaml") == "v: 1\n"
+
+    # Act
+    await state_manager.set_definition_file_content("test_app_001", "config/app.yaml", "v: 2\n", "Update config")
+    updated = await state_manager.get_definition_file_content("test_app_001", "config/app.yaml")
+    await state_manager.delete_definition_file("test_app_001", "config/app.yaml", "Remove config")
+    deleted = await state_manager.get_definition_file_content("test_app_001", "config/app.yaml")
+
+    # Assert
+    assert updated == "v: 2\n"
+    assert deleted is None
+    assert state_manager.get_definition_cache_stats()["entries"] == 0
+
+@pytest.mark.asyncio
+async def test_definition_transaction_makes_one_commit(state_manager):
+    """Test that a transaction writing and deleting several files produces a single commit."""
+    # Arrange
+    repo = state_manager._get_app_repo("test_app_001")
+    await state_manager.set_definition_file_content("test_app_001", "workflows/old.yaml", "old\n", "Add old workflow")
+    commits_before = len(list(repo.iter_commits()))
+
+    # Act
+    transaction = state_manager.begin_definition_transaction("test_app_001")
+    for i in range(5):
+        transaction.set_file(f"workflows/w{i}.yaml", f"step: {i}\n")
+    transaction.delete_file("workflows/old.yaml")
+    sha = await transaction.commit("Rewrite workflows")
+
+    # Assert
+    assert len(list(repo.iter_commits())) == commits_before + 1
+    assert repo.head.commit.hexsha == sha
+    assert sorted(diff.b_path or diff.a_path for diff in repo.head.commit.parents[0].diff(repo.head.commit)) == \
+        ["workflows/old.yaml"] + [f"workflows/w{i}.yaml" for i in range(5)]
+    assert not repo.is_dirty(untracked_files=True)
+    assert await state_manager.get_definition_file_content("test_app_001", "workflows/w3.yaml") == "step: 3\n"
+
+@pytest.mark.asyncio
+async def test_coalesced_writes_share_one_commit(tmp_path):
+    """Test that single-file writes within the coalescing window are committed together."""
+    # Arrange
+    manager = StateManager(str(tmp_path), {"host": "localhost"}, definition_write_config={"coalesce_window_seconds": 0.05})
+    repo = manager._get_app_repo("test_app_001")
+
+    # Act
+    await asyncio.gather(*(manager.set_definition_file_content("test_app_001", f"prompts/p{i}.txt", f"{i}", f"Update p{i}") for i in range(4)))
+
+    # Assert
+    assert len(list(repo.iter_commits())) == 2 # Initial commit + one batch
+    assert repo.head.commit.message.startswith("Batch of 4 definition changes")
+    assert manager.get_definition_write_stats()["batches"] == 1
+
+@pytest.mark.asyncio
+async def test_definition_revision_leaves_coalesced_writes_pending(tmp_path):
+    """Test that reading the revision does not commit a write waiting in the coalescing window, and reports it as pending."""
+    # Arrange
+    manager = StateManager(str(tmp_path), {"host": "localhost"}, definition_write_config={"coalesce_window_seconds": 0.2})
+    transaction = manager.begin_definition_transaction("test_app_001") # Transactions are committed right away
+    transaction.set_file("config/app.yaml", "v: 1\n")
+    before = await transaction.commit("First config")
+    write = asyncio.create_task(manager.set_definition_file_content("test_app_001", "config/app.yaml", "v: 2\n", "Second config"))
+    await asyncio.sleep(0.05) # Written to the working tree, commit pending
+
+    # Act
+    revision = await manager.get_definition_revision("test_app_001")
+    pending = manager.has_pending_definition_writes("test_app_001")
+    await asyncio.wait_for(write, 5)
+
+    # Assert
+    assert revision == before
+    assert pending is True
+    assert manager.has_pending_definition_writes("test_app_001") is False
+    assert await manager.get_definition_revision("test_app_001") != before
+
+@pytest.mark.asyncio
+async def test_apply_definition_diff_from_git_diff(state_manager, tmp_path):
+    """Test that a diff produced by git is applied in-process and committed once, with per-hunk results."""
+    # Arrange
+    repo = state_manager._get_app_repo("test_app_001")
+    transaction = state_manager.begin_definition_transaction("test_app_001")
+    transaction.set_file("config/app.yaml", "".join(f"key{i}: {i}\n" for i in range(30)))
+    transaction.set_file("prompts/old.txt", "obsolete\n")
+    await transaction.commit("Seed definitions")
+    app_path = tmp_path / "test_app_001"
+    (app_path / "config" / "app.yaml").write_text("".join(f"key{i}: {i * 10 if i in (3, 25) else i}\n" for i in range(30)))
+    (app_path / "prompts" / "old.txt").unlink()
+    (app_path / "prompts" / "new.txt").write_text("fresh\n")
+    repo.git.add(A=True)
+    diff = repo.git.diff("--cached") + "\n"
+    repo.git.reset("--hard")
+    assert await state_manager.get_definition_file_content("test_app_001", "config/app.yaml") == "".join(f"key{i}: {i}\n" for i in range(30))
+
+    # Act
+    result = await state_manager.apply_definition_diff("test_app_001", diff, "Apply agent edit")
+
+    # Assert
+    assert result["success"] is True
+    assert result["revision"] == repo.head.commit.hexsha
+    assert {f["path"]: f["status"] for f in result["files"]} == {"config/app.yaml": "modified", "prompts/new.txt": "added", "prompts/old.txt": "deleted"}
+    assert all(hunk["applied"] for f in result["files"] for hunk in f["hunks"])
+    assert "key25: 250\n" in await state_manager.get_definition_file_content("test_app_001", "config/app.yaml")
+    assert not (app_path / "prompts" / "old.txt").exists()
+    assert not repo.is_dirty(untracked_files=True)
+
+@pytest.mark.asyncio
+async def test_apply_definition_diff_conflict_changes_nothing(state_manager, tmp_path):
+    """Test that a diff whose context no longer matches reports the failed hunk and leaves files and history untouched."""
+    # Arrange
+    repo = state_manager._get_app_repo("test_app_001")
+    await state_manager.set_definition_file_content("test_app_001", "a.txt", "one\ntwo\n", "Add a")
+    head = repo.head.commit.hexsha
+    diff = "--- a/a.txt\n+++ b/a.txt\n@@ -1,2 +1,2 @@\n one\n-TWO\n+three\n"
+
+    # Act
+    result = await state_manager.apply_definition_diff("test_app_001", diff, "Conflicting edit")
+
+    # Assert
+    assert result["success"] is False
+    assert result["files"][0]["hunks"][0]["applied"] is False
+    assert repo.head.commit.hexsha == head
+    assert (tmp_path / "test_app_001" / "a.txt").read_text() == "one\ntwo\n"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("target", ["/tmp/evil.txt", ".git/info/evil"])
+async def test_apply_definition_diff_rejects_paths_outside_the_repository(state_manager, tmp_path, target):
+    """Test that a diff targeting an absolute path or the .git directory raises without writing anything."""
+    # Arrange
+    state_manager._get_app_repo("test_app_001")
+    target = str(tmp_path / "outside" / "evil.txt") if target.startswith("/") else target
+    diff = f"--- /dev/null\n+++ {target if target.startswith('/') else 'b/' + target}\n@@ -0,0 +1 @@\n+pwned\n"
+
+    # Act / Assert
+    with pytest.raises(PatchError):
+        await state_manager.apply_definition_diff("test_app_001", diff, "Escape")
+    assert not (tmp_path / "outside").exists()
+    assert not (tmp_path / "test_app_001" / ".git" / "info" / "evil").exists()
+
+@pytest.mark.asyncio
+async def test_failed_commit_rolls_back_files_and_index(state_manager, tmp_path, monkeypatch):
+    """Test that a multi-file change whose commit fails leaves the working tree and index as they were."""
+    # Arrange
+    repo = state_manager._get_app_repo("test_app_001")
+    await state_manager.set_definition_file_content("test_app_001", "a.txt", "one\n", "Add a")
+    head = repo.head.commit.hexsha
+    def fail_commit(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(git.IndexFile, "commit", fail_commit)
+    transaction = state_manager.begin_definition_transaction("test_app_001")
+    transaction.set_file("a.txt", "two\n")
+    transaction.set_file("b.txt", "new\n")
+
+    # Act
+    with pytest.raises(OSError):
+        await transaction.commit("Doomed")
+
+    # Assert
+    monkeypatch.undo()
+    assert repo.head.commit.hexsha == head
+    assert (tmp_path / "test_app_001" / "a.txt").read_text() == "one\n"
+    assert not (tmp_path / "test_app_001" / "b.txt").exists()
+    assert not repo.is_dirty(untracked_files=True)
+
+@pytest.mark.asyncio
+async def test_failed_coalesced_commit_restores_committed_files(tmp_path, monkeypatch):
+    """Test that files of a coalesced batch whose commit fails are put back as they are at HEAD."""
+    # Arrange
+    manager = StateManager(str(tmp_path), {"host": "localhost"}, definition_write_config={"coalesce_window_seconds": 0.01})
+    repo = manager._get_app_repo("test_app_001")
+    await manager.set_definition_file_content("test_app_001", "a.txt", "one\n", "Add a")
+    head = repo.head.commit.hexsha
+    def fail_commit(*args, **kwargs):
+        raise OSError("disk full")
+    monkeypatch.setattr(git.IndexFile, "commit", fail_commit)
+
+    # Act
+    results = await asyncio.gather(manager.set_definition_file_content("test_app_001", "a.txt", "two\n", "Change a"),
+                                   manager.set_definition_file_content("test_app_001", "b.txt", "new\n", "Add b"),
+                                   return_exceptions=True)
+
+    # Assert
+    monkeypatch.undo()
+    assert all(isinstance(result, OSError) for result in results)
+    assert repo.head.commit.hexsha == head
+    assert (tmp_path / "test_app_001" / "a.txt").read_text() == "one\n"
+    assert not (tmp_path / "test_app_001" / "b.txt").exists()
+    assert not repo.is_dirty(untracked_files=True)
+    assert await manager.get_definition_file_content("test_app_001", "a.txt") == "one\n"
+
+@pytest.mark.asyncio
+async def test_definition_reads_at_revision_are_snapshots(state_manager):
+    """Test that reads at a revision see committed state only, and history lists the file's commits."""
+    # Arrange
+    state_manager._get_app_repo("test_app_001")
+    await state_manager.set_definition_file_content("test_app_001", "config/app.yaml", "v: 1\n", "First config")
+    first = await state_manager.get_definition_revision("test_app_001")
+    await state_manager.set_definition_file_content("test_app_001", "config/app.yaml", "v: 2\n", "Second config")
+
+    # Act
+    at_first = await state_manager.get_definition_file_content("test_app_001", "config/app.yaml", revision=first)
+    at_head = await state_manager.get_definition_file_content("test_app_001", "config/app.yaml", revision="HEAD")
+    unknown = await state_manager.get_definition_file_content("test_app_001", "config/app.yaml", revision="nope")
+    listing = await state_manager.list_definition_directory("test_app_001", "config", revision=first)
+    history = await state_manager.get_definition_file_history("test_app_001", "config/app.yaml")
+
+    # Assert
+    assert (at_first, at_head, unknown) == ("v: 1\n", "v: 2\n", None)
+    assert [(f.path, f.type) for f in listing] == [("config/app.yaml", "file")]
+    assert [c.message for c in history] == ["Second config", "First config"]
+
+@pytest.mark.asyncio
+async def test_concurrent_writes_to_one_app_are_serialized(state_manager):
+    """Test that concurrent writes to a new app each get their own commit on a reused repository handle."""
+    # Act
+    await asyncio.gather(*(state_manager.set_definition_file_content("test_app_001", f"prompts/p{i}.txt", f"{i}\n", f"Add p{i}") for i in range(5)),
+                         state_manager.set_definition_file_content("test_app_002", "config/app.yaml", "v: 1\n", "Add config"))
+
+    # Assert
+    repo = state_manager._get_app_repo("test_app_001")
+    assert len(list(repo.iter_commits())) == 6 # Initial commit + one per write
+    assert not repo.is_dirty(untracked_files=True)
+    stats = state_manager.get_definition_repo_stats()
+    assert stats["repos"]["open"] == 2
+    assert stats["write_locks"]["acquisitions"] == 6
+    assert stats["write_locks"]["contended"] == 4
+    assert stats["write_locks"]["hot_apps"][0]["app_id"] == "test_app_001"
+
+# TODO: Add tests for definition state methods (Issue #XX)
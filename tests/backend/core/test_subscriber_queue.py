@@ -0,0 +1,79 @@
+import asyncio
+import pytest
+
+from backend.src.core.event_bus.subscriber_queue import SubscriberQueue
+
+
+async def drain(queue):
+    return [(await queue.get())[1] for _ in range(len(queue))]
+
+@pytest.mark.asyncio
+async def test_higher_priority_events_are_delivered_first():
+    """Test that events are delivered by priority, then in publish order."""
+    # Arrange
+    queue = SubscriberQueue(maxsize=10)
+
+    # Act
+    for event, priority in (("a", 5), ("b", 1), ("c", 5), ("d", 1)):
+        queue.put_nowait(event, priority)
+
+    # Assert
+    assert queue.depth_by_priority() == {5: 2, 1: 2}
+    assert await drain(queue) == ["b", "d", "a", "c"]
+
+@pytest.mark.asyncio
+async def test_drop_oldest_evicts_lowest_priority_first():
+    """Test that a full drop_oldest queue evicts the oldest event of the lowest priority."""
+    # Arrange
+    queue = SubscriberQueue(maxsize=3, overflow_policy="drop_oldest")
+    for event, priority in (("low1", 9), ("high", 1), ("low2", 9)):
+        queue.put_nowait(event, priority)
+
+    # Act
+    dropped = queue.put_nowait("new", 5)
+
+    # Assert
+    assert dropped == "low1"
+    assert queue.dropped == 1
+    assert await drain(queue) == ["high", "new", "low2"]
+
+@pytest.mark.asyncio
+async def test_block_waits_for_room_then_drops_after_timeout():
+    """Test that put() under the block policy waits for a consumer, and drops the event if none comes in time."""
+    # Arrange
+    queue = SubscriberQueue(maxsize=1, overflow_policy="block")
+    queue.put_nowait("first", 5)
+
+    # Act
+    consumer = asyncio.create_task(queue.get())
+    unblocked = await queue.put("second", 5, timeout=1.0)
+    timed_out = await queue.put("third", 5, timeout=0.01)
+
+    # Assert
+    assert (await consumer)[1] == "first"
+    assert unblocked is None
+    assert timed_out == "third"
+    assert await drain(queue) == ["second"]
+
+@pytest.mark.asyncio
+async def test_spill_keeps_order_and_reads_back(tmp_path):
+    """Test that overflowing events are spilled to disk and delivered afterwards in publish order."""
+    # Arrange
+    queue = SubscriberQueue(maxsize=2, overflow_policy="spill", spill_path=str(tmp_path))
+
+    # Act
+    for i in range(6):
+        assert queue.put_nowait({"n": i}, 5) is None
+    first = (await queue.get())[1]
+    queue.put_nowait({"n": 6}, 5) # Still spilled: older events are waiting in the spill file
+    rest = await drain(queue)
+
+    # Assert
+    assert [event["n"] for event in [first] + rest] == list(range(7))
+    assert queue.spilled_total == 5
+    queue.close()
+    assert list(tmp_path.iterdir()) == []
+
+def test_unknown_overflow_policy_is_rejected():
+    with pytest.raises(ValueError):
+        SubscriberQueue(overflow_policy="drop")
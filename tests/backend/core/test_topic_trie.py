@@ -0,0 +1,72 @@
+import pytest
+
+from backend.src.core.event_bus.topic_trie import TopicTrie, pattern_covers, validate_pattern, app_topic
+
+
+@pytest.fixture
+def trie():
+    """Fixture providing a trie with exact, single- and multi-segment wildcard patterns."""
+    topic_trie = TopicTrie()
+    for pattern in ("trigger:new_data", "trigger:*", "app.app1.#", "app.*.status", "#", "http:/api/trigger"):
+        topic_trie.add(pattern, pattern)
+    return topic_trie
+
+@pytest.mark.parametrize("topic, expected", [
+    ("trigger:new_data", {"trigger:new_data", "trigger:*", "#"}),
+    ("trigger:other", {"trigger:*", "#"}),
+    ("trigger:a:b", {"#"}), # "*" matches exactly one segment
+    ("app.app1", {"app.app1.#", "#"}), # "#" also matches no segments
+    ("app.app1.status", {"app.app1.#", "app.*.status", "#"}),
+    ("app.app2.status", {"app.*.status", "#"}),
+    ("http:/api/trigger", {"http:/api/trigger", "#"}),
+])
+def test_match_supports_wildcards(trie, topic, expected):
+    """Test that a topic matches exact patterns, "*" for one segment and "#" for the rest."""
+    assert set(trie.match(topic)) == expected
+
+def test_remove_prunes_and_invalidates_cache(trie):
+    """Test that removed patterns stop matching, including for topics matched (and cached) before."""
+    # Arrange
+    assert "trigger:*" in trie.match("trigger:other")
+
+    # Act
+    removed = trie.remove("trigger:*", "trigger:*")
+    removed_again = trie.remove("trigger:*", "trigger:*")
+
+    # Assert
+    assert removed and not removed_again
+    assert set(trie.match("trigger:other")) == {"#"}
+    assert len(trie) == 5
+
+def test_invalid_patterns_are_rejected():
+    assert validate_pattern("app.#.status") is not None
+    assert validate_pattern("trigger:new*") is not None
+    with pytest.raises(ValueError):
+        TopicTrie().add("a.#.b", "value")
+
+@pytest.mark.parametrize("pattern, other, covered", [
+    ("trigger:*", "trigger:new_data", True),
+    ("trigger:*", "trigger:*", True),
+    ("trigger:*", "trigger:#", False),
+    ("trigger:#", "trigger:a:b", True),
+    ("#", "anything:at:all", True),
+    ("trigger:new_data", "trigger:*", False),
+    ("http:/api/trigger", "http:/api/trigger", True),
+])
+def test_pattern_covers(pattern, other, covered):
+    """Test pattern containment used for inter-app permission checks."""
+    assert pattern_covers(pattern, other) is covered
+
+@pytest.mark.parametrize("event_type, topic", [
+    ("trigger:new_data", "app.app1.trigger:new_data"),
+    ("app.app1.done", "app.app1.done"),
+    ("app.app2.done", "app.app1.app.app2.done"), # Cannot publish into another app's namespace
+])
+def test_app_topic_namespaces_sandbox_events(event_type, topic):
+    """Test that an app's events are published below its own "app.<appId>." prefix."""
+    assert app_topic("app1", event_type) == topic
+
+@pytest.mark.parametrize("app_id, event_type", [("app1", "trigger:*"), ("app1", "a.#"), ("app1", ""), ("app.1", "done"), ("", "done")])
+def test_app_topic_rejects_wildcards_and_invalid_app_ids(app_id, event_type):
+    with pytest.raises(ValueError):
+        app_topic(app_id, event_type)
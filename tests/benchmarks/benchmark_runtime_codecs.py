@@ -0,0 +1,68 @@
+"""
+Micro-benchmark for runtime state value codecs.
+
+Compares encode/decode time and encoded size of the legacy YAML format against the
+codecs in backend.src.core.state_manager.runtime_codecs on representative runtime values.
+
+Usage (from the repository root):
+    PYTHONPATH=. python tests/benchmarks/benchmark_runtime_codecs.py [--iterations N]
+"""
+from typing import Any, Dict, List, Tuple
+import argparse
+import timeit
+import yaml
+
+from backend.src.core.state_manager import runtime_codecs
+from backend.src.core.state_manager.runtime_codecs import RuntimeValueSerializer
+
+# Representative runtime values: counters/flags, session data, workflow state and a large cached result
+SAMPLE_VALUES: Dict[str, Any] = {
+    "scalar": 42,
+    "session": {"user_id": "u-1842", "roles": ["editor", "viewer"], "expires_at": "2025-06-01T12:00:00Z", "mfa": True},
+    "workflow_state": {
+        "workflow_id": "wf-77",
+        "step": 5,
+        "history": [{"step": i, "status": "done", "duration_ms": 120 + i, "output": {"ok": True}} for i in range(20)],
+    },
+    "cached_result": {"rows": [{"id": i, "name": f"item-{i}", "price": i * 1.25, "tags": ["a", "b"]} for i in range(500)]},
+}
+
+
+def _legacy_yaml() -> Tuple[Any, Any]:
+    return (lambda value: yaml.dump(value).encode("utf-8")), (lambda data: yaml.safe_load(data.decode("utf-8")))
+
+
+def _candidates() -> List[Tuple[str, Any, Any]]:
+    """Returns (label, encode, decode) for every codec available in this environment."""
+    dumps, loads = _legacy_yaml()
+    candidates = [("yaml (legacy)", dumps, loads)]
+    codecs = ["json"] + (["msgpack"] if runtime_codecs.msgpack is not None else [])
+    for codec in codecs:
+        plain = RuntimeValueSerializer(codec=codec, compression_threshold_bytes=None)
+        candidates.append((f"{codec}", plain.dumps, plain.loads))
+        if runtime_codecs.zstandard is not None:
+            compressed = RuntimeValueSerializer(codec=codec, compression_threshold_bytes=1024)
+            candidates.append((f"{codec}+zstd>=1KiB", compressed.dumps, compressed.loads))
+    return candidates
+
+
+def run(iterations: int):
+    """Prints a table of per-value encode/decode latency (microseconds) and encoded size (bytes)."""
+    print(f"orjson: {runtime_codecs.orjson is not None}, msgpack: {runtime_codecs.msgpack is not None}, "
+          f"zstandard: {runtime_codecs.zstandard is not None}, iterations: {iterations}")
+    print(f"{'value':<16}{'codec':<20}{'encode us':>12}{'decode us':>12}{'bytes':>10}")
+    for value_name, value in SAMPLE_VALUES.items():
+        # Scale iterations down for the large value so every row takes similar wall time
+        count = max(1, iterations // 50) if value_name == "cached_result" else iterations
+        for label, encode, decode in _candidates():
+            encoded = encode(value)
+            assert decode(encoded) == value, f"{label} failed to round-trip {value_name}"
+            encode_us = timeit.timeit(lambda: encode(value), number=count) / count * 1e6
+            decode_us = timeit.timeit(lambda: decode(encoded), number=count) / count * 1e6
+            print(f"{value_name:<16}{label:<20}{encode_us:>12.1f}{decode_us:>12.1f}{len(encoded):>10}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--iterations", type=int, default=2000, help="Iterations per measurement for small values")
+    run(parser.parse_args().iterations)